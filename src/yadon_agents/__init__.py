@@ -1,5 +1,21 @@
 """ヤドン・エージェント — マルチエージェントシステム"""
 
-from pathlib import Path
+from __future__ import annotations
 
-PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    PROJECT_ROOT: Path
+
+
+def __getattr__(name: str) -> object:
+    # yadon _send 等の高速経路で pathlib を読み込まないよう、PROJECT_ROOT は初めて参照されたときに求める
+    if name == "PROJECT_ROOT":
+        from pathlib import Path
+
+        root = Path(__file__).resolve().parent.parent.parent
+        globals()["PROJECT_ROOT"] = root
+        return root
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,6 +6,7 @@ import json
 import logging
 import socket
 import threading
+import time
 from typing import Any
 
 from yadon_agents.config.agent import SOCKET_ACCEPT_TIMEOUT, SOCKET_CONNECTION_TIMEOUT
@@ -15,12 +16,16 @@ from yadon_agents.domain.ports.agent_port import (
     AgentPort,
     BubbleCallback,
 )
+from yadon_agents.infra import metrics, profiler
 from yadon_agents.infra import protocol as proto
 
 __all__ = ["BaseAgent"]
 
 logger = logging.getLogger(__name__)
 
+# メトリクスの type ラベルに使う値。クライアントが送った任意の値で時系列が増えないよう固定する
+_METRIC_MESSAGE_TYPES = frozenset({"task", "status"})
+
 
 class BaseAgent(AgentPort):
     """エージェントの共通基盤。サブクラスは handle_task(msg) を実装する。"""
@@ -31,9 +36,28 @@ class BaseAgent(AgentPort):
         self.project_dir = project_dir
         self.server_sock: socket.socket | None = None
         self.running = False
+        self.started = threading.Event()
+        """serve_forever の起動処理が終わった（成功なら ready_at、失敗なら startup_error が入る）"""
+        self.ready_at: float | None = None
+        self.startup_error: str | None = None
+        self.task_started: float | None = None
+        self.current_detail: str | None = None
+        """実行中の処理の説明（ヤドラン: フェーズ、ヤドン: サブタスクの指示の要約）"""
+        self.last_backend: str | None = None
         self.current_task_id: str | None = None
         self._on_bubble: BubbleCallback | None = None
 
+    @property
+    def current_task_id(self) -> str | None:
+        return self._current_task_id
+
+    @current_task_id.setter
+    def current_task_id(self, task_id: str | None) -> None:
+        self._current_task_id = task_id
+        self.task_started = time.time() if task_id else None
+        if not task_id:
+            self.current_detail = None
+
     @property
     def name(self) -> str:
         return self._name
@@ -62,14 +86,28 @@ class BaseAgent(AgentPort):
             current_task=self.current_task_id,
         ).to_dict()
 
+    def activity(self) -> dict[str, Any]:
+        """yadon top 向けの現在の状態（ソケット往復なしにプロセス内で読む）"""
+        return {
+            "name": self.name,
+            "state": "busy" if self.current_task_id else ("idle" if self.running else "stopped"),
+            "current_task": self.current_task_id,
+            "detail": self.current_detail,
+            "started": self.task_started,
+            "backend": self.last_backend,
+        }
+
     def handle_connection(self, conn: socket.socket) -> None:
+        metrics.SOCKET_CONNECTIONS_ACTIVE.inc(agent=self.name)
         try:
             conn.settimeout(SOCKET_CONNECTION_TIMEOUT)
             msg = proto.receive_message(conn)
             msg_type = msg.get("type", "")
+            metric_type = msg_type if isinstance(msg_type, str) and msg_type in _METRIC_MESSAGE_TYPES else "other"
+            metrics.SOCKET_CONNECTIONS.inc(agent=self.name, type=metric_type)
 
             if msg_type == "task":
-                response = self.handle_task(msg)
+                response = profiler.run_task(self.name, self.handle_task, msg)
             elif msg_type == "status":
                 response = self.handle_status(msg)
             else:
@@ -101,12 +139,21 @@ class BaseAgent(AgentPort):
             except Exception:
                 pass
         finally:
+            metrics.SOCKET_CONNECTIONS_ACTIVE.dec(agent=self.name)
             conn.close()
 
     def serve_forever(self) -> None:
         try:
-            self.server_sock = proto.create_server_socket(self.sock_path)
+            try:
+                self.server_sock = proto.create_server_socket(self.sock_path)
+            except Exception as e:
+                self.startup_error = str(e) or type(e).__name__
+                self.started.set()
+                raise
             self.running = True
+            # listen 済みなので、accept の前に来た接続もバックログで待たせられる
+            self.ready_at = time.monotonic()
+            self.started.set()
             logger.info("%s 起動: %s", self.name, self.sock_path)
 
             while self.running:
@@ -120,6 +167,7 @@ class BaseAgent(AgentPort):
                     thread = threading.Thread(
                         target=self.handle_connection,
                         args=(conn,),
+                        name=f"{self.name}-conn",
                         daemon=True,
                     )
                     thread.start()
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import json
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any
 
@@ -14,8 +15,13 @@ from yadon_agents.config.agent import (
     BUBBLE_RESULT_MAX_LENGTH,
     BUBBLE_TASK_MAX_LENGTH,
     CLAUDE_DECOMPOSE_TIMEOUT,
+    LEASE_POLL_INTERVAL,
     SOCKET_DISPATCH_TIMEOUT,
     SOCKET_STATUS_TIMEOUT,
+    get_context_bundle,
+    get_manifest_max_bytes,
+    get_stall_retries,
+    get_worktree_isolation,
     get_yadon_count,
 )
 from yadon_agents.domain.formatting import summarize_for_bubble
@@ -26,9 +32,19 @@ from yadon_agents.domain.messages import (
     TaskMessage,
 )
 from yadon_agents.domain.ports.llm_port import LLMRunnerPort
-from yadon_agents.domain.task_types import Phase, Subtask
+from yadon_agents.domain.run_result import LLMRunResult, LLMUsage, ResourceUsage, sum_resources, sum_usage
+from yadon_agents.domain.task_types import Phase, Subtask, subtask_paths
+from yadon_agents.infra import metrics
 from yadon_agents.infra import protocol as proto
+from yadon_agents.infra import tracing
+from yadon_agents.infra.circuit_breaker import breaker_snapshot
 from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.infra.change_manifest import build_manifest, capture
+from yadon_agents.infra.concurrency import limiter_snapshot
+from yadon_agents.infra.context_bundle import build_bundle
+from yadon_agents.infra.history import get_history
+from yadon_agents.infra.leases import LeaseTable, schedule_order
+from yadon_agents.infra.worktree import WorktreeError, WorktreePool, is_git_repo
 from yadon_agents.themes import get_theme
 
 __all__ = ["YadoranManager"]
@@ -110,6 +126,97 @@ def _aggregate_results(all_results: list[dict[str, Any]]) -> tuple[str, str, str
     return overall_status, "\n".join(summaries), "\n\n".join(full_output_parts)
 
 
+def _summarize_usage(payloads_by_phase: dict[str, list[dict[str, Any]]]) -> dict[str, Any]:
+    """フェーズ別の結果ペイロードから使用量をタスク全体・フェーズ別・バックエンド別に集計する。"""
+    phases: dict[str, LLMUsage] = {}
+    backends: dict[str, LLMUsage] = {}
+    for phase_name, payloads in payloads_by_phase.items():
+        phase_items: list[LLMUsage] = []
+        for payload in payloads:
+            raw = payload.get("usage")
+            if not isinstance(raw, dict):
+                continue
+            usage = LLMUsage.from_dict(raw)
+            phase_items.append(usage)
+            backend = payload.get("backend")
+            if backend:
+                backends[backend] = backends.get(backend, LLMUsage(calls=0)) + usage
+        phases[phase_name] = sum_usage(phase_items)
+    return {
+        "total": sum_usage(phases.values()).to_dict(),
+        "phases": {name: u.to_dict() for name, u in phases.items()},
+        "backends": {name: u.to_dict() for name, u in backends.items()},
+    }
+
+
+def _summarize_resources(payloads_by_phase: dict[str, list[dict[str, Any]]]) -> dict[str, Any] | None:
+    """フェーズ別の結果ペイロードから資源使用量を集計する。
+
+    フェーズ内のサブタスクは並列に実行されるため、フェーズごとに最大RSSの合計
+    （parallel_rss_kb）も求める。ホストのメモリ見積もりと YADON_COUNT の決定に使う。
+    """
+    phases: dict[str, dict[str, Any]] = {}
+    totals: list[ResourceUsage] = []
+    for phase_name, payloads in payloads_by_phase.items():
+        items = [
+            ResourceUsage.from_dict(p["resources"]) for p in payloads if isinstance(p.get("resources"), dict)
+        ]
+        if not items:
+            continue
+        summary = sum_resources(items).to_dict()
+        summary["parallel_rss_kb"] = sum(item.max_rss_kb for item in items)
+        phases[phase_name] = summary
+        totals.extend(items)
+    if not totals:
+        return None
+    return {
+        "total": sum_resources(totals).to_dict(),
+        "peak_parallel_rss_kb": max(p["parallel_rss_kb"] for p in phases.values()),
+        "phases": phases,
+    }
+
+
+def _with_context(subtask: Subtask, context: str) -> Subtask:
+    """サブタスクの指示の末尾に context を添えたコピーを返す。"""
+    result: Subtask = {"instruction": f"{subtask['instruction']}\n\n{context}"}
+    if "paths" in subtask:
+        result["paths"] = subtask["paths"]
+    return result
+
+
+def _try_merge(pool: WorktreePool, tree: Path, base: str) -> bool:
+    """worktree の変更をマージする。競合または git の失敗なら False。"""
+    try:
+        return pool.merge(tree, base)
+    except WorktreeError as e:
+        logger.warning("worktree の変更を取り込めません (%s): %s", tree.name, e)
+        return False
+
+
+def _keep_unapplied(
+    pool: WorktreePool, tree: Path, base: str, result: dict[str, Any], worker_name: str, sub_task_id: str,
+) -> None:
+    """マージしないサブタスクの変更をパッチとして残し、適用していないことを result に記録する。
+
+    worktree は次のタスクで base にリセットされるため、ここで残さないと変更は消える。
+    """
+    patch = None
+    try:
+        patch = pool.save_patch(tree, base, sub_task_id)
+    except (WorktreeError, OSError) as e:
+        logger.warning("%s の変更を保存できません（worktree: %s）: %s", worker_name, tree, e)
+        note = f"変更は作業ツリーに適用していません（worktree: {tree}、次の実行で破棄されます）"
+    else:
+        if patch is None:
+            return
+        logger.warning("%s の変更は作業ツリーに適用していません: %s", worker_name, patch)
+        note = f"変更は作業ツリーに適用していません（パッチ: {patch}）"
+    payload = result.setdefault("payload", {})
+    payload["unapplied_changes"] = str(patch) if patch is not None else str(tree)
+    summary = payload.get("summary")
+    payload["summary"] = f"{summary} — {note}" if summary else note
+
+
 class YadoranManager(BaseAgent):
     """マネージャー。タスクを分解してワーカーに並列配分する。"""
 
@@ -117,13 +224,18 @@ class YadoranManager(BaseAgent):
         self,
         project_dir: str | None = None,
         claude_runner: LLMRunnerPort | None = None,
+        socket_prefix: str | None = None,
     ):
         self.yadon_count = get_yadon_count()
         self.claude_runner = claude_runner or SubprocessClaudeRunner()
+        self._leases = LeaseTable()
+        self._history = get_history()
+        self._phase_name: str | None = None
         theme = get_theme()
         self._theme = theme
+        self._socket_prefix = socket_prefix or theme.socket_prefix
         manager_name = theme.agent_role_manager
-        sock_path = proto.agent_socket_path(manager_name, prefix=theme.socket_prefix)
+        sock_path = proto.agent_socket_path(manager_name, prefix=self._socket_prefix)
         if project_dir is None:
             project_dir = str(PROJECT_ROOT)
         super().__init__(name=manager_name, sock_path=sock_path, project_dir=project_dir)
@@ -134,10 +246,17 @@ class YadoranManager(BaseAgent):
 
     def _worker_socket_path(self, name: str) -> str:
         """ワーカーのソケットパスを返す。"""
-        return proto.agent_socket_path(name, prefix=self._theme.socket_prefix)
+        return proto.agent_socket_path(name, prefix=self._socket_prefix)
 
     def decompose_task(self, instruction: str, project_dir: str) -> list[Phase]:
         """claude -p --model sonnet でタスクを3フェーズに分解する。"""
+        phases, _ = self._decompose(instruction, project_dir)
+        return phases
+
+    def _decompose(
+        self, instruction: str, project_dir: str, run_id: str | None = None,
+    ) -> tuple[list[Phase], LLMRunResult | None]:
+        """タスクを分解し、(フェーズリスト, 分解呼び出しの実行結果) を返す。"""
         theme = self._theme
         prefix = theme.manager_prompt_prefix.format(
             instructions_path=theme.instructions_manager,
@@ -159,7 +278,7 @@ class YadoranManager(BaseAgent):
     {{
       "name": "implement",
       "subtasks": [
-        {{"instruction": "実装サブタスク1の具体的な指示"}}
+        {{"instruction": "実装サブタスク1の具体的な指示", "paths": ["変更するファイルやディレクトリ"]}}
       ]
     }},
     {{
@@ -184,11 +303,18 @@ class YadoranManager(BaseAgent):
 - 各フェーズ内のサブタスクは最大{self.yadon_count}つまで（並列実行される）
 - フェーズ間は逐次実行される（implement完了後にdocs、docs完了後にreview）
 - 各サブタスクには十分な情報を含める（{theme.role_names.worker}は他のサブタスクの内容を知らない）
+- paths には各サブタスクが変更するファイル・ディレクトリを作業ディレクトリからの相対パスで列挙する（同じパスを触るサブタスクは順番に実行される）
 - docsフェーズでは、実装内容に関連するCLAUDE.md, README.md, 指示書等を更新する
 - reviewフェーズでは、実装とドキュメントの品質・整合性を確認し、問題を指摘する
 """
+        run_result: LLMRunResult | None = None
         try:
-            output, _ = self.claude_runner.run(prompt=prompt, model_tier="manager", cwd=project_dir, timeout=CLAUDE_DECOMPOSE_TIMEOUT)
+            with tracing.span("manager.decompose"):
+                run_result = self.claude_runner.run_detailed(
+                    prompt=prompt, model_tier="manager", cwd=project_dir,
+                    timeout=CLAUDE_DECOMPOSE_TIMEOUT, run_id=run_id,
+                )
+            output = run_result.output
             data = _extract_json(output)
             phases: list[Phase] = data.get("phases", [])
             strategy = data.get("strategy", "")
@@ -196,7 +322,7 @@ class YadoranManager(BaseAgent):
             if phases:
                 total = sum(len(p.get("subtasks", [])) for p in phases)
                 logger.info("タスク分解: %dフェーズ %d個 — %s", len(phases), total, strategy)
-                return phases
+                return phases, run_result
 
         except json.JSONDecodeError:
             logger.warning("タスク分解のJSONパースに失敗、そのまま1タスクとして実行。出力: %s", output[:500])
@@ -208,26 +334,53 @@ class YadoranManager(BaseAgent):
 
         # フォールバック: 旧形式互換（1フェーズ implement のみ）
         fallback: Phase = {"name": "implement", "subtasks": [{"instruction": instruction}]}
-        return [fallback]
+        return [fallback], run_result
 
     def dispatch_to_yadon(
         self, yadon_number: int, subtask: Subtask, project_dir: str, sub_task_id: str,
     ) -> dict[str, Any]:
         """1体のワーカーにサブタスクを送信し、結果を受信する。"""
         worker_name = self._worker_name(yadon_number)
-        sock_path = self._worker_socket_path(worker_name)
-
-        msg = TaskMessage(
-            from_agent=self.name,
-            instruction=subtask["instruction"],
-            project_dir=project_dir,
-            task_id=sub_task_id,
-        ).to_dict()
+        started_at = time.time()
+        result = self._send_subtask(yadon_number, subtask, project_dir, sub_task_id)
+        if self._history is not None:
+            result_payload = result.get("payload", {})
+            self._history.record_subtask(
+                subtask_id=sub_task_id,
+                task_id=self.current_task_id,
+                phase=self._phase_name,
+                worker=worker_name,
+                status=result.get("status"),
+                backend=result_payload.get("backend"),
+                started=started_at,
+                duration=time.time() - started_at,
+                summary=result_payload.get("summary"),
+                output_path=result_payload.get("output_path"),
+                usage=result_payload.get("usage"),
+                resources=result_payload.get("resources"),
+            )
+        return result
 
+    def _send_subtask(
+        self, yadon_number: int, subtask: Subtask, project_dir: str, sub_task_id: str,
+    ) -> dict[str, Any]:
+        worker_name = self._worker_name(yadon_number)
+        sock_path = self._worker_socket_path(worker_name)
         try:
-            return proto.send_message(sock_path, msg, timeout=SOCKET_DISPATCH_TIMEOUT)
+            with tracing.span("manager.dispatch", worker=worker_name, task=sub_task_id):
+                msg = TaskMessage(
+                    from_agent=self.name,
+                    instruction=subtask["instruction"],
+                    project_dir=project_dir,
+                    task_id=sub_task_id,
+                    trace=tracing.context(),
+                ).to_dict()
+                result = proto.send_message(sock_path, msg, timeout=SOCKET_DISPATCH_TIMEOUT)
+            metrics.SUBTASKS.inc(worker=worker_name, status=str(result.get("status")))
+            return result
         except Exception as e:
             logger.error("%s への送信失敗: %s", worker_name, e)
+            metrics.DISPATCH_ERRORS.inc(worker=worker_name)
             return ResultMessage(
                 task_id=sub_task_id,
                 from_agent=worker_name,
@@ -236,43 +389,214 @@ class YadoranManager(BaseAgent):
                 summary=f"{self._theme.role_names.worker}{yadon_number}への送信に失敗",
             ).to_dict()
 
-    def _dispatch_phase(
-        self, phase: Phase, project_dir: str, task_id: str, phase_index: int,
-    ) -> list[dict[str, Any]]:
-        """1フェーズ内のサブタスクをワーカーに並列配分して結果を収集する。"""
-        subtasks = phase.get("subtasks", [])
-        phase_name = phase.get("name", f"phase{phase_index}")
+    def _dispatch_with_retry(
+        self, yadon_number: int, subtask: Subtask, project_dir: str, sub_task_id: str,
+    ) -> dict[str, Any]:
+        """サブタスクを送信し、出力が停滞して打ち切られた場合は再送する。"""
+        result = self.dispatch_to_yadon(yadon_number, subtask, project_dir, sub_task_id)
+        for attempt in range(1, get_stall_retries() + 1):
+            if result.get("status") != "stalled":
+                break
+            logger.warning(
+                "%s の出力が停滞したため再実行します (%d回目): %s",
+                self._worker_name(yadon_number), attempt, sub_task_id,
+            )
+            result = self.dispatch_to_yadon(
+                yadon_number, subtask, project_dir, f"{sub_task_id}-retry{attempt}",
+            )
+        return result
 
-        results: list[dict[str, Any]] = []
-        with ThreadPoolExecutor(max_workers=self.yadon_count) as executor:
-            futures = {}
-            for i, subtask in enumerate(subtasks[:self.yadon_count]):
-                yadon_num = i + 1
-                sub_task_id = f"{task_id}-{phase_name}-sub{yadon_num}"
-                future = executor.submit(
-                    self.dispatch_to_yadon, yadon_num, subtask, project_dir, sub_task_id,
+    def _run_subtasks(
+        self,
+        jobs: dict[int, tuple[Subtask, str, str]],
+        phase_name: str,
+        paths: dict[int, frozenset[str]] | None = None,
+    ) -> dict[int, dict[str, Any]]:
+        """ワーカー番号 -> (サブタスク, 作業ディレクトリ, サブタスクID) を並列に実行する。
+
+        paths を渡すと各サブタスクのパスのリースを取得してから配分し、
+        リースが重なるサブタスクは先行するサブタスクの完了まで待たせる。
+        """
+        results: dict[int, dict[str, Any]] = {}
+        if not jobs:
+            return results
+        paths = paths or {}
+        pending = schedule_order({n: paths.get(n, frozenset()) for n in jobs})
+        dispatch_pool = ThreadPoolExecutor(max_workers=self.yadon_count, thread_name_prefix=f"{self.name}-dispatch")
+        with dispatch_pool as executor:
+            running: dict[Future[dict[str, Any]], int] = {}
+            while pending or running:
+                for yadon_num in list(pending):
+                    subtask, workdir, sub_task_id = jobs[yadon_num]
+                    holder = self._worker_name(yadon_num)
+                    if not self._leases.try_acquire(holder, sub_task_id, paths.get(yadon_num, frozenset())):
+                        continue
+                    pending.remove(yadon_num)
+                    future = executor.submit(
+                        tracing.wrap(self._dispatch_with_retry), yadon_num, subtask, workdir, sub_task_id,
+                    )
+                    running[future] = yadon_num
+                metrics.SUBTASKS_WAITING.set(len(pending))
+                self.current_detail = (
+                    f"{phase_name}: 完了 {len(results)}/{len(jobs)} 実行中 {len(running)} 待ち {len(pending)}"
                 )
-                futures[future] = yadon_num
-
-            for future in as_completed(futures):
-                yadon_num = futures[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
+                if pending:
+                    logger.info("リース待ち (%s): %s", phase_name, ", ".join(jobs[n][2] for n in pending))
+                if not running:
+                    time.sleep(LEASE_POLL_INTERVAL)
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yadon_num = running.pop(future)
                     worker_name = self._worker_name(yadon_num)
-                    logger.error("%s 実行エラー (%s): %s", worker_name, phase_name, e)
-                    results.append(ResultMessage(
-                        task_id="unknown",
-                        from_agent=worker_name,
-                        status="error",
-                        output=str(e),
-                        summary="実行エラー",
-                    ).to_dict())
+                    self._leases.release(worker_name)
+                    try:
+                        results[yadon_num] = future.result()
+                    except Exception as e:
+                        logger.error("%s 実行エラー (%s): %s", worker_name, phase_name, e)
+                        results[yadon_num] = ResultMessage(
+                            task_id="unknown",
+                            from_agent=worker_name,
+                            status="error",
+                            output=str(e),
+                            summary="実行エラー",
+                        ).to_dict()
 
         return results
 
+    @tracing.traced("manager.dispatch_phase")
+    def _dispatch_phase(
+        self, phase: Phase, project_dir: str, task_id: str, phase_index: int, context: str = "",
+    ) -> list[dict[str, Any]]:
+        """1フェーズ内のサブタスクをワーカーに並列配分して結果を収集する（ワーカー番号順）。
+
+        context（リポジトリ概要・前フェーズまでの変更マニフェスト）は各サブタスクの指示の末尾に添える。
+        """
+        subtasks = phase.get("subtasks", [])[:self.yadon_count]
+        phase_name = phase.get("name", f"phase{phase_index}")
+        sub_task_ids = {i + 1: f"{task_id}-{phase_name}-sub{i + 1}" for i in range(len(subtasks))}
+        paths = {n: subtask_paths(subtask) for n, subtask in enumerate(subtasks, 1)}
+        if context:
+            subtasks = [_with_context(subtask, context) for subtask in subtasks]
+        tracing.annotate(phase=phase_name, subtasks=len(subtasks))
+
+        if len(subtasks) > 1 and get_worktree_isolation() and is_git_repo(project_dir):
+            try:
+                return self._dispatch_phase_in_worktrees(subtasks, project_dir, sub_task_ids, phase_name)
+            except WorktreeError as e:
+                logger.warning("worktree を準備できないため共有ディレクトリで実行します: %s", e)
+
+        jobs = {n: (subtask, project_dir, sub_task_ids[n]) for n, subtask in enumerate(subtasks, 1)}
+        results = self._run_subtasks(jobs, phase_name, paths)
+        return [results[n] for n in sorted(results)]
+
+    def _dispatch_phase_in_worktrees(
+        self,
+        subtasks: list[Subtask],
+        project_dir: str,
+        sub_task_ids: dict[int, str],
+        phase_name: str,
+    ) -> list[dict[str, Any]]:
+        """各ワーカーの git worktree でサブタスクを並列実行し、変更を元の作業ツリーへマージする。
+
+        マージで競合したサブタスクは、マージ後の最新状態から1つずつ再実行する。
+        失敗したサブタスクの変更はマージせず、パッチとして残して結果に記録する（_keep_unapplied）。
+        """
+        pool = WorktreePool(project_dir)
+        base = pool.snapshot()
+        trees = {n: pool.checkout(self._worker_name(n), base) for n in range(1, len(subtasks) + 1)}
+        jobs = {
+            n: (subtask, str(pool.workdir(trees[n])), sub_task_ids[n])
+            for n, subtask in enumerate(subtasks, 1)
+        }
+        results = self._run_subtasks(jobs, phase_name)
+
+        conflicts: list[int] = []
+        for n in sorted(results):
+            if results[n].get("status") != "success":
+                _keep_unapplied(pool, trees[n], base, results[n], self._worker_name(n), sub_task_ids[n])
+            elif not _try_merge(pool, trees[n], base):
+                conflicts.append(n)
+
+        for n in conflicts:
+            worker_name = self._worker_name(n)
+            rerun_id = f"{sub_task_ids[n]}-rerun"
+            logger.warning("%s の変更が競合したため最新の状態から再実行します", worker_name)
+            try:
+                base = pool.snapshot()
+                tree = pool.checkout(worker_name, base)
+            except WorktreeError as e:
+                results[n] = ResultMessage(
+                    task_id=rerun_id, from_agent=worker_name, status="error",
+                    output=str(e), summary="再実行用の worktree を準備できませんでした",
+                ).to_dict()
+                continue
+            result = self._dispatch_with_retry(n, subtasks[n - 1], str(pool.workdir(tree)), rerun_id)
+            if result.get("status") == "success" and not _try_merge(pool, tree, base):
+                result = ResultMessage(
+                    task_id=rerun_id,
+                    from_agent=worker_name,
+                    status="error",
+                    output=result.get("payload", {}).get("output", ""),
+                    summary="変更を作業ツリーにマージできませんでした（競合）",
+                ).to_dict()
+            if result.get("status") != "success":
+                _keep_unapplied(pool, tree, base, result, worker_name, rerun_id)
+            results[n] = result
+
+        return [results[n] for n in sorted(results)]
+
     def handle_task(self, msg: dict[str, Any]) -> dict[str, Any]:
+        task_id = msg.get("id", "unknown")
+        payload = msg.get("payload", {})
+        started = time.monotonic()
+        started_at = time.time()
+        task_fields = {
+            "task_id": task_id,
+            "instruction": payload.get("instruction", ""),
+            "project_dir": payload.get("project_dir", self.project_dir),
+            "started": started_at,
+        }
+        if self._history is not None:
+            self._history.record_task(**task_fields, status="running")
+        metrics.TASKS_IN_PROGRESS.inc(agent=self.name)
+        # _run_task が例外を投げても running のまま残さず、error として記録・書き出す
+        result: dict[str, Any] = {"status": "error", "payload": {}}
+        try:
+            with tracing.start_trace(task_id):
+                with tracing.span("manager.handle_task", task=task_id) as attrs:
+                    attrs["status"] = "error"
+                    result = self._run_task(msg)
+                    attrs["status"] = result.get("status")
+        finally:
+            metrics.TASKS_IN_PROGRESS.dec(agent=self.name)
+            self._finish_task(task_id, task_fields, result, time.monotonic() - started)
+        return result
+
+    def _finish_task(
+        self, task_id: str, task_fields: dict[str, Any], result: dict[str, Any], duration: float,
+    ) -> None:
+        """タスクの終了をメトリクス・履歴・トレースに記録する。"""
+        metrics.TASKS.inc(status=str(result.get("status")))
+        metrics.TASK_DURATION.observe(duration)
+        if self._history is not None:
+            result_payload = result.get("payload", {})
+            self._history.record_task(
+                **task_fields,
+                status=result.get("status"),
+                finished=task_fields["started"] + duration,
+                duration=duration,
+                summary=result_payload.get("summary"),
+                output=result_payload.get("output"),
+                usage=result_payload.get("usage"),
+                resources=result_payload.get("resources"),
+            )
+        trace = tracing.export(task_id)
+        if trace is not None:
+            logger.info("トレースを書き出しました: %s", trace)
+
+    def _run_task(self, msg: dict[str, Any]) -> dict[str, Any]:
         task_id = msg.get("id", "unknown")
         self.current_task_id = task_id
         payload = msg.get("payload", {})
@@ -285,9 +609,33 @@ class YadoranManager(BaseAgent):
         task_summary = summarize_for_bubble(instruction, BUBBLE_TASK_MAX_LENGTH)
         self.bubble(theme.manager_task_bubble.format(summary=task_summary), "claude")
 
-        phases = self.decompose_task(instruction, project_dir)
+        self.current_detail = "タスク分解"
+        # リポジトリ概要はタスク分解と並行して作り、分解の待ち時間に隠す
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.name}-context-bundle") as bundler:
+            bundle = bundler.submit(tracing.wrap(build_bundle), project_dir) if get_context_bundle() else None
+            phases, decompose_result = self._decompose(instruction, project_dir, run_id=f"{task_id}-decompose")
+            bundle_path = bundle.result() if bundle is not None else None
+        bundle_note = (
+            f"## リポジトリ概要\n{bundle_path} にファイル一覧・Python モジュールの主要シンボル・"
+            "README 等の抜粋をまとめてある。ディレクトリを探索する前にまず読むこと。"
+            if bundle_path is not None else ""
+        )
 
         all_results: list[dict[str, Any]] = []
+        usage_by_phase: dict[str, list[dict[str, Any]]] = {}
+        if decompose_result is not None:
+            self.last_backend = decompose_result.backend or self.last_backend
+        if decompose_result is not None and decompose_result.usage is not None:
+            usage_by_phase["decompose"] = [{
+                "usage": decompose_result.usage.to_dict(),
+                "backend": decompose_result.backend,
+                "resources": decompose_result.resources.to_dict() if decompose_result.resources else None,
+            }]
+        # 後続フェーズに前フェーズまでの変更を伝えるため、開始時の作業ツリーを記録する
+        baseline = None
+        if len(phases) > 1 and get_manifest_max_bytes() > 0:
+            with tracing.span("manager.capture_tree"):
+                baseline = capture(project_dir)
         for i, phase in enumerate(phases):
             phase_name = phase.get("name", f"phase{i}")
             subtask_count = len(phase.get("subtasks", []))
@@ -302,15 +650,35 @@ class YadoranManager(BaseAgent):
                 "claude", 3000,
             )
             logger.info("フェーズ開始: %s (%d タスク)", phase_name, subtask_count)
-
-            phase_results = self._dispatch_phase(phase, project_dir, task_id, i)
+            self.current_detail = f"{phase_name} ({i + 1}/{len(phases)})"
+
+            manifest = ""
+            if i > 0 and baseline is not None:
+                with tracing.span("manager.change_manifest"):
+                    manifest = build_manifest(project_dir, baseline)
+            context = "\n\n".join(part for part in (bundle_note, manifest) if part)
+            self._phase_name = phase_name
+            phase_started_at = time.time()
+            phase_started = time.monotonic()
+            phase_results = self._dispatch_phase(phase, project_dir, task_id, i, context)
+            phase_duration = time.monotonic() - phase_started
+            metrics.PHASE_DURATION.observe(phase_duration, phase=phase_name)
             all_results.extend(phase_results)
+            usage_by_phase.setdefault(phase_name, []).extend(r.get("payload", {}) for r in phase_results)
 
             phase_success = all(r.get("status") == "success" for r in phase_results)
             if not phase_success:
                 logger.warning("フェーズ %s で一部失敗", phase_name)
+            if self._history is not None:
+                self._history.record_phase(
+                    task_id=task_id, idx=i, name=phase_name,
+                    status="success" if phase_success else "partial_error",
+                    subtasks=len(phase_results), started=phase_started_at, duration=phase_duration,
+                )
+        self._phase_name = None
 
-        overall_status, combined_summary, combined_output = _aggregate_results(all_results)
+        with tracing.span("manager.aggregate"):
+            overall_status, combined_summary, combined_output = _aggregate_results(all_results)
 
         result_summary = summarize_for_bubble(combined_summary, BUBBLE_RESULT_MAX_LENGTH)
         if overall_status == "success":
@@ -326,8 +694,17 @@ class YadoranManager(BaseAgent):
             status=overall_status,
             output=combined_output,
             summary=combined_summary,
+            usage=_summarize_usage(usage_by_phase),
+            resources=_summarize_resources(usage_by_phase),
         ).to_dict()
 
+    def stop(self) -> None:
+        super().stop()
+        self.claude_runner.cancel()
+
+    def activity(self) -> dict[str, Any]:
+        return {**super().activity(), "role": "manager", "queue": int(metrics.SUBTASKS_WAITING.value())}
+
     def handle_status(self, msg: dict[str, Any]) -> dict[str, Any]:
         workers: dict[str, str] = {}
         for i in range(1, self.yadon_count + 1):
@@ -352,4 +729,7 @@ class YadoranManager(BaseAgent):
             state=state,
             current_task=self.current_task_id,
             workers=workers,
+            breakers=breaker_snapshot(),
+            concurrency=limiter_snapshot(),
+            leases=self._leases.snapshot(),
         ).to_dict()
@@ -18,6 +18,7 @@ from yadon_agents.domain.formatting import summarize_for_bubble
 from yadon_agents.domain.messages import ResultMessage
 from yadon_agents.domain.ports.llm_port import LLMRunnerPort
 from yadon_agents.infra import protocol as proto
+from yadon_agents.infra import tracing
 from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
 from yadon_agents.themes import get_theme
 
@@ -32,18 +33,27 @@ class YadonWorker(BaseAgent):
         number: int,
         project_dir: str | None = None,
         claude_runner: LLMRunnerPort | None = None,
+        socket_prefix: str | None = None,
     ):
         self.number = number
         self.claude_runner = claude_runner or SubprocessClaudeRunner(worker_number=self.number)
         theme = get_theme()
         name = f"{theme.agent_role_worker}-{number}"
-        sock_path = proto.agent_socket_path(name, prefix=theme.socket_prefix)
+        sock_path = proto.agent_socket_path(name, prefix=socket_prefix or theme.socket_prefix)
         if project_dir is None:
             project_dir = str(PROJECT_ROOT)
         self._theme = theme
         super().__init__(name=name, sock_path=sock_path, project_dir=project_dir)
 
     def handle_task(self, msg: dict[str, Any]) -> dict[str, Any]:
+        payload = msg.get("payload", {})
+        with tracing.use_context(payload.get("trace")):
+            with tracing.span("worker.handle_task", worker=self.name, task=msg.get("id")) as attrs:
+                result = self._run_task(msg)
+                attrs["status"] = result.get("status")
+        return result
+
+    def _run_task(self, msg: dict[str, Any]) -> dict[str, Any]:
         task_id = msg.get("id", "unknown")
         self.current_task_id = task_id
         payload = msg.get("payload", {})
@@ -62,9 +72,19 @@ class YadonWorker(BaseAgent):
 
         task_summary = summarize_for_bubble(instruction, BUBBLE_TASK_MAX_LENGTH)
         self.bubble(theme.worker_task_bubble.format(summary=task_summary), "claude")
+        self.current_detail = task_summary
 
-        output, returncode = self.claude_runner.run(prompt=prompt, model_tier="worker", cwd=project_dir)
-        status = "success" if returncode == 0 else "error"
+        run_result = self.claude_runner.run_detailed(
+            prompt=prompt, model_tier="worker", cwd=project_dir, run_id=task_id,
+        )
+        output = run_result.output
+        self.last_backend = run_result.backend or self.last_backend
+        if run_result.returncode == 0:
+            status = "success"
+        elif run_result.stalled:
+            status = "stalled"
+        else:
+            status = "error"
         summary = output.strip()[:SUMMARY_MAX_LENGTH] if output.strip() else "(出力なし)"
 
         result_summary = summarize_for_bubble(summary, BUBBLE_RESULT_MAX_LENGTH)
@@ -81,4 +101,13 @@ class YadonWorker(BaseAgent):
             status=status,
             output=output,
             summary=summary,
+            output_path=run_result.output_path,
+            backend=run_result.backend,
+            usage=run_result.usage.to_dict() if run_result.usage else None,
+            resources=run_result.resources.to_dict() if run_result.resources else None,
         ).to_dict()
+
+    def stop(self) -> None:
+        super().stop()
+        # 実行中のLLMプロセスがあればプロセスグループごと停止する
+        self.claude_runner.cancel()
@@ -0,0 +1,371 @@
+"""yadon bench — ヤドラン/ヤドンのパイプラインの負荷試験
+
+GUI を使わずに、疑似LLMランナーを持つヤドラン1体とヤドン N体をこのプロセス内の
+スレッドで起動し（ソケットは通常のデーモンと衝突しない専用のプレフィックス）、
+タスクを投入して次を計測する。
+
+- スループット（完了タスク数 / 経過秒）
+- エンドツーエンド・タスク分解・フェーズ別のレイテンシ（p50 / p95 / p99）
+- LLM 以外のオーバーヘッド（エンドツーエンドから、クリティカルパス上の LLM 時間
+  = タスク分解 + 各フェーズで最も長い LLM 呼び出し の合計を引いたもの）
+
+フェーズ・LLM 時間はタスクのトレース（infra/tracing.py）から集計する。
+投入方式は closed（同時 N クライアントが完了を待って次を投入）と
+open（ポアソン到着で一定レートで投入）。結果は JSON で保存し、コミット間で比較できる。
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import math
+import os
+import random
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from yadon_agents import PROJECT_ROOT
+from yadon_agents.agent.base import BaseAgent
+from yadon_agents.agent.manager import YadoranManager
+from yadon_agents.agent.worker import YadonWorker
+from yadon_agents.domain.messages import TaskMessage, generate_task_id
+from yadon_agents.domain.ports.llm_port import LLMRunnerPort
+from yadon_agents.infra import protocol as proto
+from yadon_agents.infra import tracing
+from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.infra.process import log_dir
+from yadon_agents.infra.simulated_llm import SimulatedLLMRunner
+from yadon_agents.themes import get_theme
+
+__all__ = ["BenchConfig", "percentiles", "run_bench", "main"]
+
+logger = logging.getLogger(__name__)
+
+RUNNERS = ("inprocess", "subprocess")
+_TASK_TIMEOUT = 3600.0
+_STARTUP_TIMEOUT = 10.0
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    """負荷試験の条件"""
+    tasks: int = 20
+    workers: int = 3
+    mode: str = "closed"
+    """closed: concurrency クライアントが完了を待って次を投入 / open: rate 件/秒のポアソン到着"""
+    concurrency: int = 1
+    rate: float = 1.0
+    runner: str = "inprocess"
+    """inprocess: プロセス内の SimulatedLLMRunner / subprocess: LLM_BACKEND=simulated でサブプロセス起動 /
+    module:Class: 引数なしで生成できる任意の LLMRunnerPort 実装"""
+    latency: str | None = None
+    """疑似LLMの遅延分布（YADON_SIM_LATENCY）。None なら環境変数・既定値"""
+    failure_rate: float = 0.0
+    seed: int = 0
+    instructions: tuple[str, ...] = field(default_factory=tuple)
+    """投入するタスク指示（順に繰り返す）。空なら連番の合成タスク"""
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """p50 / p95 / p99 / 平均 / 最大（線形補間）を返す。"""
+    if not values:
+        return {}
+    data = sorted(values)
+
+    def pct(q: float) -> float:
+        pos = (len(data) - 1) * q
+        lo, hi = math.floor(pos), math.ceil(pos)
+        return data[lo] + (data[hi] - data[lo]) * (pos - lo)
+
+    return {
+        "p50": round(pct(0.50), 4),
+        "p95": round(pct(0.95), 4),
+        "p99": round(pct(0.99), 4),
+        "mean": round(statistics.fmean(data), 4),
+        "max": round(data[-1], 4),
+        "count": len(data),
+    }
+
+
+@contextmanager
+def _env(values: dict[str, str]) -> Iterator[None]:
+    saved = {k: os.environ.get(k) for k in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, old in saved.items():
+            if old is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = old
+
+
+def _make_runner(kind: str, worker_number: int | None) -> LLMRunnerPort:
+    if kind == "inprocess":
+        return SimulatedLLMRunner()
+    if kind == "subprocess":
+        return SubprocessClaudeRunner(worker_number=worker_number)
+    module_name, _, attr = kind.partition(":")
+    if not attr:
+        raise ValueError(f"ランナーの指定が不正です: {kind!r}（{' / '.join(RUNNERS)} / module:Class）")
+    runner = getattr(importlib.import_module(module_name), attr)()
+    if not isinstance(runner, LLMRunnerPort):
+        raise ValueError(f"{kind} は LLMRunnerPort ではありません")
+    return runner
+
+
+def _git_commit() -> str | None:
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return proc.stdout.strip() or None
+
+
+def _task_breakdown(task_id: str) -> dict[str, Any]:
+    """トレースからタスク分解・フェーズ別の所要時間とクリティカルパス上の LLM 時間を求める。"""
+    path = tracing.trace_path(task_id)
+    try:
+        records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+    except (OSError, json.JSONDecodeError):
+        return {}
+    by_id = {r["span_id"]: r for r in records}
+
+    def phase_of(record: dict[str, Any]) -> str | None:
+        parent = by_id.get(record.get("parent_id") or "")
+        while parent is not None:
+            if parent["name"] == "manager.dispatch_phase":
+                return str(parent.get("attrs", {}).get("phase"))
+            if parent["name"] == "manager.decompose":
+                return "decompose"
+            parent = by_id.get(parent.get("parent_id") or "")
+        return None
+
+    decompose = sum(r["duration"] for r in records if r["name"] == "manager.decompose")
+    phases: dict[str, float] = {}
+    for r in records:
+        if r["name"] == "manager.dispatch_phase":
+            name = str(r.get("attrs", {}).get("phase"))
+            phases[name] = phases.get(name, 0.0) + r["duration"]
+    # フェーズ内のサブタスクは並列なので、クリティカルパスには各フェーズで最長の LLM 呼び出しが乗る
+    llm_by_phase: dict[str, float] = {}
+    for r in records:
+        if r["name"] == "llm.run":
+            phase = phase_of(r)
+            if phase is not None:
+                llm_by_phase[phase] = max(llm_by_phase.get(phase, 0.0), r["duration"])
+    return {
+        "decompose": decompose,
+        "phases": phases,
+        "llm_critical": sum(llm_by_phase.values()),
+    }
+
+
+class _Swarm:
+    """ベンチ用にスレッドで起動したヤドラン1体とヤドン N体"""
+
+    def __init__(self, config: BenchConfig, project_dir: str):
+        theme = get_theme()
+        self.prefix = f"{theme.socket_prefix}-bench-{os.getpid()}"
+        shared = _make_runner(config.runner, None) if config.runner == "inprocess" else None
+        self.agents: list[BaseAgent] = [
+            YadonWorker(
+                n, project_dir, claude_runner=shared or _make_runner(config.runner, n), socket_prefix=self.prefix,
+            )
+            for n in range(1, config.workers + 1)
+        ]
+        self.manager = YadoranManager(
+            project_dir, claude_runner=shared or _make_runner(config.runner, None), socket_prefix=self.prefix,
+        )
+        self.agents.append(self.manager)
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for agent in self.agents:
+            thread = threading.Thread(target=agent.serve_forever, name=f"bench-{agent.name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        deadline = time.monotonic() + _STARTUP_TIMEOUT
+        while not all(Path(a.sock_path).exists() for a in self.agents):
+            if time.monotonic() > deadline:
+                raise RuntimeError("ベンチ用エージェントが起動しません")
+            time.sleep(0.02)
+
+    def stop(self) -> None:
+        for agent in self.agents:
+            agent.stop()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+
+def _submit(manager_sock: str, instruction: str, project_dir: str) -> dict[str, Any]:
+    task_id = generate_task_id()
+    msg = TaskMessage(from_agent="bench", instruction=instruction, project_dir=project_dir, task_id=task_id)
+    started = time.monotonic()
+    submitted_at = time.time()
+    try:
+        response = proto.send_message(manager_sock, msg.to_dict(), timeout=_TASK_TIMEOUT)
+        status = str(response.get("status", "unknown"))
+    except Exception as e:
+        logger.error("ベンチタスク送信失敗: %s", e)
+        status = "send_error"
+    return {
+        "task_id": task_id,
+        "submitted_at": submitted_at,
+        "end_to_end": time.monotonic() - started,
+        "status": status,
+    }
+
+
+def run_bench(
+    config: BenchConfig,
+    progress: Callable[[int, int], None] | None = None,
+) -> dict[str, Any]:
+    """config の条件で負荷試験を行い、結果の辞書を返す。"""
+    if config.mode not in ("closed", "open"):
+        raise ValueError(f"投入方式が不正です: {config.mode!r}（closed / open）")
+    env = {
+        "YADON_COUNT": str(config.workers),
+        "YADON_SIM_SEED": str(config.seed),
+        "YADON_SIM_FAILURE_RATE": str(config.failure_rate),
+        "YADON_TRACE": "1",
+        # ベンチのタスクはタスク履歴に残さない
+        "YADON_HISTORY": "0",
+    }
+    if config.latency:
+        env["YADON_SIM_LATENCY"] = config.latency
+    if config.runner == "subprocess":
+        env["LLM_BACKEND"] = "simulated"
+
+    instructions = config.instructions or tuple(f"ベンチタスク{i + 1}: 機能を追加する" for i in range(config.tasks))
+    queue = [instructions[i % len(instructions)] for i in range(config.tasks)]
+    results: list[dict[str, Any]] = []
+    lock = threading.Lock()
+
+    with _env(env), tempfile.TemporaryDirectory(prefix="yadon-bench-") as project_dir:
+        swarm = _Swarm(config, project_dir)
+        swarm.start()
+        manager_sock = swarm.manager.sock_path
+
+        def record(result: dict[str, Any]) -> None:
+            with lock:
+                results.append(result)
+                done = len(results)
+            if progress is not None:
+                progress(done, config.tasks)
+
+        started = time.monotonic()
+        try:
+            if config.mode == "closed":
+                def client() -> None:
+                    while True:
+                        with lock:
+                            if not queue:
+                                return
+                            instruction = queue.pop(0)
+                        record(_submit(manager_sock, instruction, project_dir))
+
+                clients = [threading.Thread(target=client) for _ in range(max(config.concurrency, 1))]
+            else:
+                rng = random.Random(config.seed)
+                clients = []
+                delay = 0.0
+                for instruction in queue:
+                    clients.append(threading.Timer(
+                        delay, lambda ins=instruction: record(_submit(manager_sock, ins, project_dir)),
+                    ))
+                    delay += rng.expovariate(config.rate) if config.rate > 0 else 0.0
+            for thread in clients:
+                thread.start()
+            for thread in clients:
+                thread.join()
+            elapsed = time.monotonic() - started
+        finally:
+            swarm.stop()
+
+        for result in results:
+            result.update(_task_breakdown(result["task_id"]))
+
+    return _report(config, results, elapsed)
+
+
+def _report(config: BenchConfig, results: list[dict[str, Any]], elapsed: float) -> dict[str, Any]:
+    succeeded = [r for r in results if r["status"] == "success"]
+    phase_names = sorted({name for r in results for name in r.get("phases", {})})
+    traced = [r for r in results if "llm_critical" in r]
+    return {
+        "config": asdict(config),
+        "commit": _git_commit(),
+        "started_at": min((r["submitted_at"] for r in results), default=time.time()),
+        "elapsed_s": round(elapsed, 4),
+        "completed": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "throughput_tasks_per_s": round(len(results) / elapsed, 4) if elapsed > 0 else 0.0,
+        "latency_s": {
+            "end_to_end": percentiles([r["end_to_end"] for r in results]),
+            "decompose": percentiles([r["decompose"] for r in traced]),
+            "phases": {name: percentiles([r["phases"][name] for r in results if name in r.get("phases", {})])
+                       for name in phase_names},
+            "llm_critical": percentiles([r["llm_critical"] for r in traced]),
+            "overhead": percentiles([max(r["end_to_end"] - r["llm_critical"], 0.0) for r in traced]),
+        },
+        "tasks": sorted(results, key=lambda r: r["submitted_at"]),
+    }
+
+
+def format_summary(report: dict[str, Any]) -> str:
+    """結果の要約を表形式の文字列にする。"""
+    cfg = report["config"]
+    lines = [
+        f"条件: workers={cfg['workers']} mode={cfg['mode']} "
+        + (f"concurrency={cfg['concurrency']}" if cfg["mode"] == "closed" else f"rate={cfg['rate']}/s")
+        + f" runner={cfg['runner']} latency={cfg['latency'] or '既定'}",
+        f"完了: {report['completed']}件（成功 {report['succeeded']} / 失敗 {report['failed']}）"
+        f" {report['elapsed_s']:.2f}秒  スループット {report['throughput_tasks_per_s']:.3f} タスク/秒",
+        "",
+        f"{'区間':<16}{'p50':>10}{'p95':>10}{'p99':>10}{'平均':>10}",
+    ]
+    latency = report["latency_s"]
+    rows = [("end_to_end", latency["end_to_end"]), ("decompose", latency["decompose"])]
+    rows += [(f"phase:{name}", stats) for name, stats in latency["phases"].items()]
+    rows += [("llm_critical", latency["llm_critical"]), ("overhead", latency["overhead"])]
+    for name, stats in rows:
+        if stats:
+            lines.append(
+                f"{name:<16}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['p99']:>10.3f}{stats['mean']:>10.3f}"
+            )
+    return "\n".join(lines)
+
+
+def main(config: BenchConfig, output: str | None = None) -> Path:
+    """負荷試験を実行して要約を表示し、結果 JSON のパスを返す。"""
+    def progress(done: int, total: int) -> None:
+        print(f"\r  {done}/{total} タスク完了", end="", flush=True)
+
+    report = run_bench(config, progress=progress)
+    print()
+    print(format_summary(report))
+
+    if output:
+        path = Path(output)
+    else:
+        bench_dir = log_dir() / "bench"
+        bench_dir.mkdir(exist_ok=True)
+        path = bench_dir / f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n結果: {path}")
+    return path
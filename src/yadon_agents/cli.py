@@ -4,6 +4,11 @@
 使用法:
     yadon start [work_dir]  -- 全エージェント起動
     yadon stop              -- 全エージェント停止
+    yadon top               -- 状態をターミナルに表示し続ける
+    yadon history           -- タスク履歴の一覧
+    yadon show <task-id>    -- 過去のタスクの結果
+    yadon bench             -- 疑似LLMでの負荷試験
+    yadon bench-startup     -- CLI とデーモンの起動時間のベンチマーク
 """
 
 from __future__ import annotations
@@ -21,38 +26,38 @@ from pathlib import Path
 
 from yadon_agents import PROJECT_ROOT
 from yadon_agents.config.agent import (
-    SOCKET_WAIT_INTERVAL,
+    SOCKET_STATUS_TIMEOUT,
     SOCKET_WAIT_TIMEOUT,
+    STARTUP_BENCH_RUNS,
+    STARTUP_BENCH_THRESHOLD,
+    get_top_interval,
     get_yadon_count,
 )
-from yadon_agents.config.llm import get_backend_name
-from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.entry import cmd_internal_say, cmd_internal_send, cmd_internal_status
 from yadon_agents.infra.process import log_dir
 from yadon_agents.infra.protocol import (
+    SOCKET_DIR,
     agent_socket_path,
     pet_socket_path,
     send_message,
 )
+from yadon_agents.infra.readiness import READY_FD_ENV, wait_ready
 from yadon_agents.themes import get_theme
 
 logger = logging.getLogger(__name__)
 
 
-def _wait_sockets(names: list[str], prefix: str = "yadon", timeout: int = SOCKET_WAIT_TIMEOUT) -> bool:
-    """ソケットファイルの作成を待つ。"""
-    from yadon_agents.infra.protocol import agent_socket_path
-    iterations = int(timeout / SOCKET_WAIT_INTERVAL)
-    for _ in range(iterations):
-        if all(Path(agent_socket_path(n, prefix=prefix)).exists() for n in names):
-            return True
-        time.sleep(SOCKET_WAIT_INTERVAL)
-    return False
-
-
 def _cleanup_sockets(prefix: str = "yadon") -> None:
-    """ソケットファイルを削除する。"""
-    tmp = Path("/tmp")
-    for pattern in [f"{prefix}-agent-*.sock", f"{prefix}-pet-*.sock"]:
+    """ソケットファイル（エージェント・ペット・メトリクス・状態ストリーム・制御）を削除する。"""
+    tmp = Path(SOCKET_DIR)
+    patterns = [
+        f"{prefix}-agent-*.sock",
+        f"{prefix}-pet-*.sock",
+        f"{prefix}-metrics.sock",
+        f"{prefix}-status.sock",
+        f"{prefix}-control.sock",
+    ]
+    for pattern in patterns:
         for sock in tmp.glob(pattern):
             try:
                 sock.unlink()
@@ -63,6 +68,8 @@ def _cleanup_sockets(prefix: str = "yadon") -> None:
 def cmd_start(work_dir: str, multi_llm: bool = False) -> None:
     """全エージェント起動（GUIは別プロセス）"""
     from yadon_agents.ascii_art import show_yadon_ascii
+    from yadon_agents.config.llm import get_backend_name
+    from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
 
     theme = get_theme()
     yadon_count = get_yadon_count()
@@ -112,28 +119,41 @@ def cmd_start(work_dir: str, multi_llm: bool = False) -> None:
     # GUIデーモンを別プロセスで起動
     print(f"\033[0;36mGUIデーモンを起動中...\033[0m")
     log_file = open(log_dir() / "gui_daemon.log", "a")
+    gui_env = os.environ.copy()
+    if multi_llm:
+        # 割り当てバックエンドが使えない場合は他のバックエンドへ切り替える
+        gui_env.setdefault("YADON_WORKER_FAILOVER", ",".join(backend_rotation))
+    # 全エージェントが接続を受け付け始めたらデーモンがパイプに通知する（infra/readiness.py）
+    ready_read, ready_write = os.pipe()
+    gui_env[READY_FD_ENV] = str(ready_write)
     try:
-        gui_process = subprocess.Popen(
-            [sys.executable, "-m", "yadon_agents.gui_daemon"],
-            stdout=subprocess.DEVNULL,
-            stderr=log_file,
-            start_new_session=True,  # 完全に独立したプロセスグループ
-            env=os.environ.copy(),
-        )
+        try:
+            gui_process = subprocess.Popen(
+                [sys.executable, "-m", "yadon_agents.gui_daemon"],
+                stdout=subprocess.DEVNULL,
+                stderr=log_file,
+                start_new_session=True,  # 完全に独立したプロセスグループ
+                env=gui_env,
+                pass_fds=(ready_write,),
+            )
+        except BaseException:
+            os.close(ready_read)
+            raise
+        finally:
+            # 書き込み側をデーモンだけが持つようにする（デーモンが終了すれば EOF になる）
+            os.close(ready_write)
         print(f"  GUI PID: {gui_process.pid}")
 
-        # ソケット待機
-        worker_role = theme.agent_role_worker
-        manager_role = theme.agent_role_manager
-        worker_names = [f"{worker_role}-{n}" for n in range(1, yadon_count + 1)]
-        all_agents = worker_names + [manager_role]
-
-        print(f"\033[0;36mエージェントソケット待機中...\033[0m", end="", flush=True)
-        if _wait_sockets(all_agents, prefix=prefix):
-            print(" OK")
+        print(f"\033[0;36mエージェント起動待機中...\033[0m", end="", flush=True)
+        ready = wait_ready(ready_read, SOCKET_WAIT_TIMEOUT)
+        if ready is not None and ready.get("status") == "ready":
+            print(f" OK ({ready['elapsed']:.2f}秒)")
+            print("   " + " / ".join(f"{name} {seconds:.2f}秒" for name, seconds in ready["agents"].items()))
         else:
             print()
             print(f"\033[1;33m!\033[0m 一部のエージェントソケットが作成されませんでした")
+            for name, error in (ready or {}).get("errors", {}).items():
+                print(f"   {name}: {error}")
 
         # --- コーディネーター起動 ---
         print()
@@ -244,7 +264,7 @@ def cmd_status(agent_name: str | None = None) -> None:
 
     try:
         print(f"ステータス確認中 ({', '.join(agents_to_check)})...", end="", flush=True)
-        response = send_message(sock_path, message, timeout=5)
+        response = send_message(sock_path, message, timeout=SOCKET_STATUS_TIMEOUT)
         print(" OK")
         print()
 
@@ -260,6 +280,38 @@ def cmd_status(agent_name: str | None = None) -> None:
             print(f"\n{theme.role_names.worker}:")
             for worker_id, status in sorted(workers.items()):
                 print(f"  {worker_id}: {status}")
+
+        # バックエンドのサーキットブレーカー・同時実行数を表示
+        breakers = response.get("breakers", {})
+        concurrency = response.get("concurrency", {})
+        if breakers or concurrency:
+            print("\nバックエンド:")
+            for backend in sorted(set(breakers) | set(concurrency)):
+                line = f"  {backend}:"
+                info = breakers.get(backend)
+                if info:
+                    line += (
+                        f" {info.get('state', 'unknown')}"
+                        f" (直近 {info.get('recent_calls', 0)}件中 エラー{info.get('recent_errors', 0)}"
+                        f" / タイムアウト{info.get('recent_timeouts', 0)})"
+                    )
+                    if "retry_in" in info:
+                        line += f" 再試行まで {info['retry_in']}秒"
+                slots = concurrency.get(backend)
+                if slots:
+                    line += (
+                        f" 同時実行 {slots.get('in_flight', 0)}/{slots.get('limit', 0)}"
+                        f" 待機 {slots.get('waiting', 0)}"
+                    )
+                print(line)
+
+        # 保持中のファイルリースを表示
+        leases = response.get("leases", {})
+        if leases:
+            print("\nファイルリース:")
+            for holder, lease in sorted(leases.items()):
+                paths = ", ".join(lease.get("paths", []))
+                print(f"  {holder}: {lease.get('task', '?')} {paths} ({lease.get('held_for', 0)}秒)")
     except socket.timeout:
         print()
         print(f"\033[1;31mタイムアウト\033[0m: ステータス確認がタイムアウトしました")
@@ -299,7 +351,7 @@ def cmd_say(number: int, message: str, bubble_type: str = "info", duration_ms: i
     try:
         print(f"吹き出し送信中 ({theme.role_names.worker}{number}へ)...", end="", flush=True)
         sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        sock.settimeout(5)
+        sock.settimeout(SOCKET_STATUS_TIMEOUT)
         sock.connect(sock_path)
         data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
         sock.sendall(data)
@@ -315,80 +367,204 @@ def cmd_say(number: int, message: str, bubble_type: str = "info", duration_ms: i
         sys.exit(1)
 
 
-def cmd_internal_send(instruction: str, project_dir: str | None = None) -> None:
-    """【内部用】タスク送信 (JSON形式出力)
+def cmd_top(interval: float | None = None, once: bool = False) -> None:
+    """GUIデーモンの状態ストリームを購読して、エージェントの状態を表示し続ける"""
+    from yadon_agents.infra.protocol import status_socket_path
+    from yadon_agents.top import run_top
 
-    cmd_send() の JSON出力バージョン。
-    エージェント間通信で結果をJSON形式で返す際に使用。
-    """
-    theme = get_theme()
-    manager_name = theme.agent_role_manager
-    prefix = theme.socket_prefix
-    sock_path = agent_socket_path(manager_name, prefix=prefix)
+    sock_path = status_socket_path(get_theme().socket_prefix)
+    if not Path(sock_path).exists():
+        print(f"\033[1;31mエラー\033[0m: 状態ストリームが見つかりません（デーモン未起動）: {sock_path}")
+        sys.exit(1)
+    try:
+        run_top(sock_path, interval or get_top_interval(), once=once or not sys.stdout.isatty())
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"\033[1;31mエラー\033[0m: {e}")
+        sys.exit(1)
 
-    result = {"success": False, "message": "", "data": None}
 
-    if not Path(sock_path).exists():
-        result["message"] = f"{manager_name}ソケットが見つかりません ({sock_path})"
-        print(json.dumps(result, ensure_ascii=False))
-        return
+def _parse_since(value: str) -> float:
+    """"30m" / "2h" / "7d" / 秒数 を現在からさかのぼった UNIX 時刻にする。"""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    text = value.strip().lower()
+    factor = units.get(text[-1:])
+    seconds = float(text[:-1]) * factor if factor else float(text)
+    return time.time() - seconds
 
-    message = {
-        "type": "task",
-        "payload": {
-            "instruction": instruction,
-        }
-    }
-    if project_dir:
-        message["payload"]["project_dir"] = project_dir
 
+def _usage_text(usage: dict[str, object] | None) -> str:
+    if not usage:
+        return "-"
+    tokens = int(usage.get("input_tokens", 0)) + int(usage.get("output_tokens", 0))  # type: ignore[arg-type]
+    cost = float(usage.get("cost_usd", 0.0))  # type: ignore[arg-type]
+    return f"{tokens}tok ${cost:.4f}" if cost else f"{tokens}tok"
+
+
+def cmd_history(limit: int = 20, status: str | None = None, since: str | None = None, as_json: bool = False) -> None:
+    """タスク履歴を新しい順に表示"""
+    from yadon_agents.infra.history import HistoryStore, history_file
+
+    path = history_file()
+    if path is None:
+        print("タスク履歴は無効です（YADON_HISTORY=0）")
+        return
     try:
-        response = send_message(sock_path, message, timeout=600)
-        result["success"] = response.get("status") == "success"
-        result["data"] = response
-        print(json.dumps(result, ensure_ascii=False))
-    except socket.timeout:
-        result["message"] = f"{manager_name}からの応答がありません（タイムアウト）"
-        print(json.dumps(result, ensure_ascii=False))
-    except Exception as e:
-        result["message"] = str(e)
-        print(json.dumps(result, ensure_ascii=False))
+        since_ts = _parse_since(since) if since else None
+    except ValueError:
+        print(f"\033[1;31mエラー\033[0m: --since の形式が不正です: {since}（例: 30m, 2h, 7d）")
+        sys.exit(1)
+    tasks = HistoryStore(path).recent(limit=limit, status=status, since=since_ts)
+    if as_json:
+        print(json.dumps(tasks, ensure_ascii=False, indent=2))
+        return
+    if not tasks:
+        print("タスク履歴はありません")
+        return
+    print(f"{'開始':<20}{'タスクID':<30}{'状態':<15}{'所要':>9}  {'使用量':<18}指示")
+    for task in tasks:
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(task["started"])) if task["started"] else "-"
+        duration = f"{task['duration']:.1f}s" if task["duration"] is not None else "-"
+        usage = (task.get("usage") or {}).get("total")
+        instruction = " ".join(str(task.get("instruction") or "").split())[:60]
+        print(
+            f"{started:<20}{task['task_id']:<30}{str(task['status']):<15}{duration:>9}  "
+            f"{_usage_text(usage):<18}{instruction}"
+        )
 
 
-def cmd_internal_status(agent_name: str | None = None) -> None:
-    """【内部用】ステータス確認 (JSON形式出力)
+def cmd_show(task_id: str, as_json: bool = False) -> None:
+    """過去のタスクのフェーズ・サブタスクと結果を表示"""
+    from yadon_agents.infra.history import HistoryStore, history_file
 
-    cmd_status() の JSON出力バージョン。
-    エージェント間通信で結果をJSON形式で返す際に使用。
-    """
-    theme = get_theme()
-    manager_name = theme.agent_role_manager
-    worker_role = theme.agent_role_worker
-    prefix = theme.socket_prefix
-    yadon_count = get_yadon_count()
+    path = history_file()
+    task = HistoryStore(path).task(task_id) if path is not None else None
+    if task is None:
+        print(f"\033[1;31mエラー\033[0m: タスクが見つかりません: {task_id}")
+        sys.exit(1)
+    if as_json:
+        print(json.dumps(task, ensure_ascii=False, indent=2))
+        return
 
-    result = {"success": False, "message": "", "data": None}
+    started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(task["started"])) if task["started"] else "-"
+    duration = f"{task['duration']:.1f}秒" if task["duration"] is not None else "-"
+    print(f"タスク: {task['task_id']}")
+    print(f"  状態: {task['status']}  開始: {started}  所要: {duration}")
+    print(f"  作業ディレクトリ: {task['project_dir']}")
+    print(f"  使用量: {_usage_text((task.get('usage') or {}).get('total'))}")
+    print(f"  指示: {task['instruction']}")
+    if task["phases"]:
+        print("\nフェーズ:")
+        for phase in task["phases"]:
+            print(f"  {phase['name']:<12}{phase['status']:<15}{phase['subtasks']}件  {phase['duration']:.1f}s")
+    if task["subtasks"]:
+        print("\nサブタスク:")
+        for sub in task["subtasks"]:
+            line = (
+                f"  {sub['subtask_id']}  {sub['worker']}  {sub['status']}  {sub['backend'] or '-'}"
+                f"  {sub['duration']:.1f}s  {_usage_text(sub.get('usage'))}"
+            )
+            if sub.get("output_path"):
+                line += f"  出力: {sub['output_path']}"
+            print(line)
+    if task.get("summary"):
+        print(f"\n概要:\n{task['summary']}")
+    if task.get("output"):
+        print(f"\n出力:\n{task['output']}")
+
+
+def cmd_bench(args: argparse.Namespace) -> None:
+    """疑似LLMランナーでエージェントを GUI なしで起動し、負荷試験を行う"""
+    from yadon_agents.bench import BenchConfig, main as bench_main
+
+    config = BenchConfig(
+        tasks=args.tasks,
+        workers=args.workers,
+        mode=args.mode,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        runner=args.runner,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+        instructions=tuple(args.instruction or ()),
+    )
+    try:
+        bench_main(config, output=args.output)
+    except (ValueError, RuntimeError, ImportError) as e:
+        print(f"\033[1;31mエラー\033[0m: {e}")
+        sys.exit(1)
 
-    if agent_name:
-        sock_path = agent_socket_path(agent_name, prefix=prefix)
-        agents_to_check = [agent_name]
-    else:
-        agents_to_check = [manager_name] + [f"{worker_role}-{n}" for n in range(1, yadon_count + 1)]
-        sock_path = agent_socket_path(manager_name, prefix=prefix)
 
-    message = {"type": "status"}
+def cmd_bench_startup(args: argparse.Namespace) -> None:
+    """CLI のサブコマンドとデーモンの起動時間を測り、ベースラインと比べる"""
+    from yadon_agents.startup_bench import StartupBenchConfig, main as startup_main
 
+    config = StartupBenchConfig(
+        runs=args.runs,
+        cases=tuple(args.case) if args.case else StartupBenchConfig.cases,
+        daemon=not args.no_daemon,
+        workers=args.workers,
+        threshold=args.threshold,
+    )
     try:
-        response = send_message(sock_path, message, timeout=5)
-        result["success"] = True
-        result["data"] = response
+        code = startup_main(config, output=args.output, baseline=args.baseline, save_baseline=args.save_baseline)
+    except (ValueError, RuntimeError, OSError, subprocess.TimeoutExpired) as e:
+        print(f"\033[1;31mエラー\033[0m: {e}")
+        sys.exit(1)
+    sys.exit(code)
+
+
+def _send_control(message: dict[str, object], timeout: float | None = 10) -> None:
+    """デーモンの制御ソケットにコマンドを送り、結果を JSON で出力する"""
+    from yadon_agents.infra.protocol import control_socket_path
+
+    sock_path = control_socket_path(get_theme().socket_prefix)
+    result = {"success": False, "message": "", "data": None}
+    if not Path(sock_path).exists():
+        result["message"] = f"制御ソケットが見つかりません ({sock_path})"
         print(json.dumps(result, ensure_ascii=False))
+        return
+    try:
+        response = send_message(sock_path, message, timeout=timeout)
+        result["success"] = response.get("type") != "error"
+        result["message"] = response.get("message", "")
+        result["data"] = response
     except socket.timeout:
-        result["message"] = "ステータス確認がタイムアウトしました"
-        print(json.dumps(result, ensure_ascii=False))
+        result["message"] = "制御コマンドの応答がありません（タイムアウト）"
     except Exception as e:
         result["message"] = str(e)
-        print(json.dumps(result, ensure_ascii=False))
+    print(json.dumps(result, ensure_ascii=False))
+
+
+def cmd_internal_profile(
+    agent: str, mode: str = "sample", seconds: float | None = None, tasks: int | None = None,
+    wait: bool = False, stop: bool = False,
+) -> None:
+    """【内部用】稼働中のエージェントのプロファイルを取る (JSON形式出力)
+
+    seconds 秒間または tasks 件のタスクの間だけ計測し、logs/profiles/ に書き出す。
+    """
+    if not stop and seconds is None and tasks is None:
+        seconds = 30.0
+    message: dict[str, object] = {
+        "type": "profile", "agent": agent, "mode": mode, "seconds": seconds, "tasks": tasks,
+        "wait": wait, "stop": stop,
+    }
+    _send_control(message, timeout=None if wait else 10)
+
+
+def cmd_internal_memory(
+    top: int | None = None, group: str = "lineno", start: int | None = None, stop: bool = False,
+) -> None:
+    """【内部用】デーモンのメモリのスナップショットを取り、前回との差分を出す (JSON形式出力)
+
+    start を指定すると tracemalloc をそのフレーム数で有効にしてから取る。
+    """
+    message: dict[str, object] = {"type": "memory", "top": top, "group": group, "start": start, "stop": stop}
+    # gc.get_objects() を数えるので、オブジェクトが多いと数秒かかる
+    _send_control(message, timeout=60)
 
 
 def cmd_internal_restart() -> None:
@@ -403,39 +579,6 @@ def cmd_internal_restart() -> None:
     print("再起動が完了しました")
 
 
-def cmd_internal_say(number: int, message: str, bubble_type: str = "info", duration_ms: int = 5000) -> None:
-    """【内部用】ペット吹き出し表示
-
-    ペット番号に吹き出しメッセージを送信。
-    """
-    theme = get_theme()
-    prefix = theme.socket_prefix
-    sock_path = pet_socket_path(str(number), prefix=prefix)
-
-    if not Path(sock_path).exists():
-        # ペット未起動時は静かに終了
-        return
-
-    payload = {
-        "text": message,
-        "type": bubble_type,
-        "duration": duration_ms,
-    }
-
-    try:
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        sock.settimeout(5)
-        sock.connect(sock_path)
-        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-        sock.sendall(data)
-        sock.close()
-    except (socket.timeout, FileNotFoundError, ConnectionRefusedError):
-        # ペット未起動時は静かに終了
-        pass
-    except Exception:
-        pass
-
-
 def main() -> None:
     theme = get_theme()
     parser = argparse.ArgumentParser(description=f"{theme.display_name} CLI")
@@ -466,6 +609,53 @@ def main() -> None:
     say_parser.add_argument("--type", default="info", help="吹き出しタイプ（デフォルト: info）")
     say_parser.add_argument("--duration", type=int, default=5000, help="表示時間（ミリ秒、デフォルト: 5000）")
 
+    # top コマンド
+    top_parser = subparsers.add_parser("top", help="状態をターミナルに表示し続ける（GUIなしの環境向け）")
+    top_parser.add_argument("--interval", type=float, help="更新間隔（秒、デフォルト: YADON_TOP_INTERVAL または 1）")
+    top_parser.add_argument("--once", action="store_true", help="1画面分を表示して終了")
+
+    # history コマンド
+    history_parser = subparsers.add_parser("history", help="タスク履歴の一覧")
+    history_parser.add_argument("--limit", type=int, default=20, help="表示件数（デフォルト: 20）")
+    history_parser.add_argument("--status", help="状態で絞り込む（success / partial_error / running）")
+    history_parser.add_argument("--since", help="この期間内に開始したタスクだけ（例: 30m, 2h, 7d）")
+    history_parser.add_argument("--json", action="store_true", help="JSONで出力")
+
+    # show コマンド
+    show_parser = subparsers.add_parser("show", help="過去のタスクの結果を表示")
+    show_parser.add_argument("task_id", help="タスクID（一意なら前方一致でよい）")
+    show_parser.add_argument("--json", action="store_true", help="JSONで出力")
+
+    # bench コマンド
+    bench_parser = subparsers.add_parser("bench", help="疑似LLMでの負荷試験（GUIなし）")
+    bench_parser.add_argument("--tasks", type=int, default=20, help="投入するタスク数（デフォルト: 20）")
+    bench_parser.add_argument("--workers", type=int, default=3, help="ヤドンの数（デフォルト: 3）")
+    bench_parser.add_argument("--mode", choices=("closed", "open"), default="closed",
+                              help="closed: 完了を待って次を投入 / open: 一定レートで投入（デフォルト: closed）")
+    bench_parser.add_argument("--concurrency", type=int, default=1, help="closed の同時クライアント数（デフォルト: 1）")
+    bench_parser.add_argument("--rate", type=float, default=1.0, help="open の平均投入レート（件/秒、デフォルト: 1.0）")
+    bench_parser.add_argument("--runner", default="inprocess",
+                              help="inprocess / subprocess / module:Class（デフォルト: inprocess）")
+    bench_parser.add_argument("--latency", help="疑似LLMの遅延分布（例: fixed:0.5, lognormal:1.0,0.5）")
+    bench_parser.add_argument("--failure-rate", type=float, default=0.0, help="疑似LLMの失敗率（デフォルト: 0）")
+    bench_parser.add_argument("--seed", type=int, default=0, help="乱数シード（デフォルト: 0）")
+    bench_parser.add_argument("--instruction", action="append", help="投入するタスク指示（複数指定で順に繰り返す）")
+    bench_parser.add_argument("--output", help="結果JSONの保存先（デフォルト: logs/bench/bench-<日時>.json）")
+
+    # bench-startup コマンド
+    startup_parser = subparsers.add_parser("bench-startup", help="CLI とデーモンの起動時間のベンチマーク")
+    startup_parser.add_argument("--runs", type=int, default=STARTUP_BENCH_RUNS,
+                                help=f"サブコマンドごとの計測回数（デフォルト: {STARTUP_BENCH_RUNS}）")
+    startup_parser.add_argument("--case", action="append", choices=("_send", "_status", "_say", "history"),
+                                help="計測するサブコマンド（複数指定可、デフォルト: すべて）")
+    startup_parser.add_argument("--no-daemon", action="store_true", help="デーモンの起動時間を測らない")
+    startup_parser.add_argument("--workers", type=int, default=3, help="デーモンのヤドンの数（デフォルト: 3）")
+    startup_parser.add_argument("--threshold", type=float, default=STARTUP_BENCH_THRESHOLD,
+                                help=f"回帰とみなす遅くなった割合（デフォルト: {STARTUP_BENCH_THRESHOLD}）")
+    startup_parser.add_argument("--baseline", help="ベースラインのパス（デフォルト: logs/bench/startup-baseline.json）")
+    startup_parser.add_argument("--save-baseline", action="store_true", help="結果をベースラインとして保存する")
+    startup_parser.add_argument("--output", help="結果JSONの保存先（デフォルト: logs/bench/startup-<日時>.json）")
+
     # 【内部用】_send コマンド
     _send_parser = subparsers.add_parser("_send", help="【内部用】タスク送信 (JSON出力)")
     _send_parser.add_argument("instruction", help="実行するタスク指示")
@@ -475,6 +665,25 @@ def main() -> None:
     _status_parser = subparsers.add_parser("_status", help="【内部用】ステータス確認 (JSON出力)")
     _status_parser.add_argument("agent_name", nargs="?", help="エージェント名（未指定時は全エージェント）")
 
+    # 【内部用】_profile コマンド
+    _profile_parser = subparsers.add_parser("_profile", help="【内部用】エージェントのプロファイル (JSON出力)")
+    _profile_parser.add_argument("agent", help="エージェント名（all で全スレッド）")
+    _profile_parser.add_argument("--mode", choices=("sample", "cprofile"), default="sample",
+                                 help="sample: スタックのサンプリング / cprofile: タスク処理を cProfile（デフォルト: sample）")
+    _profile_parser.add_argument("--seconds", type=float, help="計測する秒数（--tasks も未指定なら 30）")
+    _profile_parser.add_argument("--tasks", type=int, help="計測するタスク数")
+    _profile_parser.add_argument("--wait", action="store_true", help="計測が終わるまで待つ")
+    _profile_parser.add_argument("--stop", action="store_true", help="計測中のプロファイルを終えて書き出す")
+
+    # 【内部用】_memory コマンド
+    _memory_parser = subparsers.add_parser("_memory", help="【内部用】デーモンのメモリ診断 (JSON出力)")
+    _memory_parser.add_argument("--top", type=int, help="表示する確保箇所の数（デフォルト: 20）")
+    _memory_parser.add_argument("--group", choices=("lineno", "traceback", "filename"), default="lineno",
+                                help="確保箇所の集計単位（デフォルト: lineno）")
+    _memory_parser.add_argument("--start", type=int, metavar="FRAMES",
+                                help="tracemalloc を FRAMES 段のトレースバックで有効にしてから取る")
+    _memory_parser.add_argument("--stop", action="store_true", help="tracemalloc を止める")
+
     # 【内部用】_restart コマンド
     subparsers.add_parser("_restart", help="【内部用】デーモン再起動")
 
@@ -509,10 +718,26 @@ def main() -> None:
         cmd_restart(work_dir, multi_llm=multi_llm)
     elif args.command == "say":
         cmd_say(args.number, args.message, bubble_type=args.type, duration_ms=args.duration)
+    elif args.command == "top":
+        cmd_top(interval=args.interval, once=args.once)
+    elif args.command == "history":
+        cmd_history(limit=args.limit, status=args.status, since=args.since, as_json=args.json)
+    elif args.command == "show":
+        cmd_show(args.task_id, as_json=args.json)
+    elif args.command == "bench":
+        cmd_bench(args)
+    elif args.command == "bench-startup":
+        cmd_bench_startup(args)
     elif args.command == "_send":
         cmd_internal_send(args.instruction, project_dir=args.project_dir)
     elif args.command == "_status":
         cmd_internal_status(agent_name=args.agent_name)
+    elif args.command == "_profile":
+        cmd_internal_profile(
+            args.agent, mode=args.mode, seconds=args.seconds, tasks=args.tasks, wait=args.wait, stop=args.stop,
+        )
+    elif args.command == "_memory":
+        cmd_internal_memory(top=args.top, group=args.group, start=args.start, stop=args.stop)
     elif args.command == "_restart":
         cmd_internal_restart()
     elif args.command == "_say":
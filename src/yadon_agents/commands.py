@@ -86,6 +86,10 @@ def check_status(agent_name: str | None = None) -> dict[str, Any]:
                     "yadon-1": "idle",
                     "yadon-2": "busy",
                     ...
+                },
+                "breakers": {
+                    "claude": {"state": "closed" | "open" | "half-open", ...},
+                    ...
                 }
             }
 
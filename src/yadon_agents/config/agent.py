@@ -7,32 +7,516 @@ themes/ に移動済み。後方互換のため get_theme() 経由のラッパ
 from __future__ import annotations
 
 import os
+from dataclasses import dataclass
+
+# ソケットのタイムアウト・バッファは高速経路（entry.py）と共有するため config.socket に置く
+from yadon_agents.config.socket import (  # noqa: F401
+    PET_SOCKET_MAX_MESSAGE,
+    PET_SOCKET_RECV_BUFFER,
+    SOCKET_ACCEPT_TIMEOUT,
+    SOCKET_CONNECTION_TIMEOUT,
+    SOCKET_DISPATCH_TIMEOUT,
+    SOCKET_LISTEN_BACKLOG,
+    SOCKET_RECV_BUFFER,
+    SOCKET_SEND_TIMEOUT,
+    SOCKET_STATUS_TIMEOUT,
+)
 
 # --- タイムアウト (秒) ---
 CLAUDE_DEFAULT_TIMEOUT = 600
 CLAUDE_DECOMPOSE_TIMEOUT = 120
-SOCKET_SEND_TIMEOUT = 300.0
-SOCKET_DISPATCH_TIMEOUT = 600
-SOCKET_STATUS_TIMEOUT = 5
-SOCKET_CONNECTION_TIMEOUT = 600
-SOCKET_ACCEPT_TIMEOUT = 1.0
-
-# --- ソケット設定 ---
-SOCKET_LISTEN_BACKLOG = 5
-SOCKET_RECV_BUFFER = 65536
-PET_SOCKET_RECV_BUFFER = 4096
-PET_SOCKET_MAX_MESSAGE = 65536
 
 # --- CLI設定 ---
 PROCESS_STOP_RETRIES = 20
 PROCESS_STOP_INTERVAL = 0.5
 SOCKET_WAIT_TIMEOUT = 15
-SOCKET_WAIT_INTERVAL = 0.5
+DAEMON_READY_TIMEOUT = 10.0
+STARTUP_BENCH_RUNS = 10
+STARTUP_BENCH_THRESHOLD = 0.2
+STARTUP_BENCH_MIN_DELTA_MS = 5.0
+STARTUP_BENCH_DAEMON_TIMEOUT = 30.0
+STARTUP_BENCH_TOP_IMPORTS = 15
 
 # --- 出力制限 ---
 SUMMARY_MAX_LENGTH = 200
 BUBBLE_TASK_MAX_LENGTH = 80
 BUBBLE_RESULT_MAX_LENGTH = 60
+OUTPUT_CAPTURE_MAX_BYTES = 64 * 1024
+OUTPUT_SPILL_KEEP = 200
+CHANGE_MANIFEST_MAX_BYTES = 8 * 1024
+CHANGE_MANIFEST_HUNK_LINES = 40
+CHANGE_MANIFEST_SCAN_FILES = 20000
+CONTEXT_BUNDLE_TREE_FILES = 400
+CONTEXT_BUNDLE_PY_MODULES = 300
+CONTEXT_BUNDLE_DOC_BYTES = 3000
+CONTEXT_BUNDLE_KEEP = 50
+TRACE_KEEP_TASKS = 200
+TOP_INTERVAL = 1.0
+TOP_RATE_WINDOW = 60.0
+HISTORY_BATCH_SIZE = 200
+HISTORY_BATCH_WAIT = 0.2
+HISTORY_QUEUE_MAX = 10000
+HISTORY_OUTPUT_MAX_CHARS = 4000
+PROFILE_SAMPLE_INTERVAL = 0.005
+PROFILE_MAX_SECONDS = 3600.0
+PROFILE_TOP_FUNCTIONS = 40
+MEMORY_INTERVAL = 60.0
+MEMORY_TOP_SITES = 20
+MEMORY_TOP_TYPES = 15
+
+# --- サブプロセス管理 ---
+PROCESS_KILL_GRACE = 2.0
+DEFAULT_WORKER_NICE = 10
+DEFAULT_WORKER_IOPRIO = "be:7"
+IOPRIO_CLASSES = {"rt": 1, "be": 2, "idle": 3}
+STALL_TIMEOUT = 300
+STALL_RETRIES = 1
+GIT_TIMEOUT = 60
+WORKTREE_PATCH_KEEP = 100
+LEASE_POLL_INTERVAL = 0.5
+
+
+@dataclass(frozen=True)
+class ProcessLimits:
+    """LLMサブプロセスに適用する資源制限（tier別）。None の項目は制限しない。"""
+
+    address_space_mb: int | None = None
+    """仮想アドレス空間の上限（MB, RLIMIT_AS）"""
+
+    cpu_seconds: int | None = None
+    """CPU時間の上限（秒, RLIMIT_CPU）"""
+
+    open_files: int | None = None
+    """オープンファイル数の上限（RLIMIT_NOFILE）"""
+
+    nice: int = 0
+    """nice 値（0 は変更なし）"""
+
+    cpus: frozenset[int] | None = None
+    """CPUアフィニティ（Linux のみ）"""
+
+    ioprio: tuple[int, int] | None = None
+    """I/O優先度 (クラス, レベル)（Linux のみ。クラスは IOPRIO_CLASSES の値）"""
+
+
+def _env_int(name: str) -> int | None:
+    raw = os.environ.get(name, "")
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def _env_float(name: str) -> float | None:
+    raw = os.environ.get(name, "")
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def parse_cpu_list(raw: str) -> frozenset[int] | None:
+    """"0-3,6" 形式のCPUリストを解析する。不正または空なら None。"""
+    cpus: set[int] = set()
+    try:
+        for part in raw.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part:
+                start, end = part.split("-", 1)
+                cpus.update(range(int(start), int(end) + 1))
+            else:
+                cpus.add(int(part))
+    except ValueError:
+        return None
+    if not cpus or min(cpus) < 0:
+        return None
+    return frozenset(cpus)
+
+
+def parse_ioprio(raw: str) -> tuple[int, int] | None:
+    """"idle" / "be:7" / "rt:0" 形式のI/O優先度を解析する。不正なら None。"""
+    name, _, level_raw = raw.strip().lower().partition(":")
+    io_class = IOPRIO_CLASSES.get(name)
+    if io_class is None:
+        return None
+    if io_class == IOPRIO_CLASSES["idle"]:
+        return (io_class, 0)
+    try:
+        level = int(level_raw) if level_raw else 4
+    except ValueError:
+        return None
+    if not 0 <= level <= 7:
+        return None
+    return (io_class, level)
+
+
+def get_daemon_cpus() -> frozenset[int] | None:
+    """GUIデーモン（Qt・エージェントスレッド・マネージャー）用に予約するCPU（YADON_DAEMON_CPUS）。"""
+    return parse_cpu_list(os.environ.get("YADON_DAEMON_CPUS", ""))
+
+
+def get_process_limits(tier: str) -> ProcessLimits:
+    """tier別のサブプロセス資源制限を環境変数から取得する。
+
+    YADON_{TIER}_RLIMIT_AS (MB), YADON_{TIER}_RLIMIT_CPU (秒),
+    YADON_{TIER}_RLIMIT_NOFILE, YADON_{TIER}_NICE, YADON_{TIER}_CPUS,
+    YADON_{TIER}_IOPRIO を参照する。
+    未設定の項目は tier 接頭辞なしの YADON_RLIMIT_* / YADON_NICE 等にフォールバックする。
+    ワーカーの nice / I/O優先度の既定値は DEFAULT_WORKER_NICE / DEFAULT_WORKER_IOPRIO
+    （GUIデーモンを優先させるため）。YADON_DAEMON_CPUS が設定されていれば、
+    ワーカーの既定CPUは予約CPU以外の全CPUになる。
+
+    Args:
+        tier: "coordinator", "manager", "worker" のいずれか
+    """
+    t = tier.upper()
+
+    def lookup(key: str) -> int | None:
+        value = _env_int(f"YADON_{t}_{key}")
+        if value is None:
+            value = _env_int(f"YADON_{key}")
+        return value
+
+    def lookup_raw(key: str) -> str:
+        return os.environ.get(f"YADON_{t}_{key}") or os.environ.get(f"YADON_{key}", "")
+
+    nice = lookup("NICE")
+    if nice is None:
+        nice = DEFAULT_WORKER_NICE if tier == "worker" else 0
+
+    cpus = parse_cpu_list(lookup_raw("CPUS"))
+    if cpus is None and tier == "worker":
+        reserved = get_daemon_cpus()
+        if reserved is not None:
+            cpus = frozenset(range(os.cpu_count() or 1)) - reserved or None
+
+    ioprio_raw = lookup_raw("IOPRIO")
+    if not ioprio_raw and tier == "worker":
+        ioprio_raw = DEFAULT_WORKER_IOPRIO
+    return ProcessLimits(
+        address_space_mb=lookup("RLIMIT_AS"),
+        cpu_seconds=lookup("RLIMIT_CPU"),
+        open_files=lookup("RLIMIT_NOFILE"),
+        nice=nice,
+        cpus=cpus,
+        ioprio=parse_ioprio(ioprio_raw) if ioprio_raw else None,
+    )
+
+
+def get_output_capture_limit() -> int:
+    """LLM出力をメモリに保持する上限（バイト、ストリームごと）を取得する。
+
+    環境変数 YADON_OUTPUT_MAX_BYTES で上書きできる。超過分は logs/outputs/ に書き出される。
+    """
+    value = _env_int("YADON_OUTPUT_MAX_BYTES")
+    if value is None or value <= 0:
+        return OUTPUT_CAPTURE_MAX_BYTES
+    return value
+
+
+def get_manifest_max_bytes() -> int:
+    """後続フェーズに渡す変更マニフェストの上限（バイト）を取得する。
+
+    環境変数 YADON_MANIFEST_BYTES で上書きでき、0 ならマニフェストを作らない。
+    """
+    value = _env_int("YADON_MANIFEST_BYTES")
+    if value is None or value < 0:
+        return CHANGE_MANIFEST_MAX_BYTES
+    return value
+
+
+def get_context_bundle() -> bool:
+    """タスクごとにリポジトリ概要（コンテキストバンドル）を作ってサブタスクに渡すか（YADON_CONTEXT_BUNDLE、既定で有効）。"""
+    return os.environ.get("YADON_CONTEXT_BUNDLE", "1").lower() in ("1", "true", "yes", "on")
+
+
+def get_tracing() -> bool:
+    """タスクのトレースを logs/traces/ に記録するか（YADON_TRACE、既定で有効）。"""
+    return os.environ.get("YADON_TRACE", "1").lower() in ("1", "true", "yes", "on")
+
+
+def get_history_path() -> str | None:
+    """タスク履歴の SQLite ファイルのパスを取得する（YADON_HISTORY）。
+
+    未設定なら None（既定の logs/history.sqlite3 を使う）、`0` / `off` なら空文字列（記録しない）。
+    """
+    raw = os.environ.get("YADON_HISTORY")
+    if raw is None or not raw.strip():
+        return None
+    return "" if raw.strip().lower() in ("0", "false", "no", "off") else raw.strip()
+
+
+def get_tracemalloc_frames() -> int:
+    """デーモン起動時から tracemalloc で記録するトレースバックの深さ（YADON_TRACEMALLOC、既定 0 = 無効）。"""
+    value = _env_int("YADON_TRACEMALLOC")
+    return value if value is not None and value > 0 else 0
+
+
+def get_memory_interval() -> float:
+    """RSS・オブジェクト数のゲージを更新する間隔（秒）を取得する（YADON_MEMORY_INTERVAL、既定 60 秒、0 で無効）。"""
+    value = _env_float("YADON_MEMORY_INTERVAL")
+    if value is None or value < 0:
+        return MEMORY_INTERVAL
+    return value
+
+
+def get_top_interval() -> float:
+    """yadon top の更新間隔（秒）を取得する（YADON_TOP_INTERVAL、既定 1 秒）。"""
+    value = _env_float("YADON_TOP_INTERVAL")
+    return value if value is not None and value > 0 else TOP_INTERVAL
+
+
+def get_metrics_socket() -> str | None:
+    """メトリクスを公開する Unixソケットのパスを取得する（YADON_METRICS_SOCKET）。
+
+    未設定なら None（既定のパスを使う）、`0` / `off` なら空文字列（Unixソケットでは公開しない）。
+    """
+    raw = os.environ.get("YADON_METRICS_SOCKET")
+    if raw is None or not raw.strip():
+        return None
+    return "" if raw.strip().lower() in ("0", "false", "no", "off") else raw.strip()
+
+
+def get_metrics_port() -> int | None:
+    """メトリクスを公開する localhost の TCP ポートを取得する（YADON_METRICS_PORT、未設定なら公開しない）。"""
+    value = _env_int("YADON_METRICS_PORT")
+    return value if value is not None and 0 < value < 65536 else None
+
+
+def get_stall_timeout() -> float | None:
+    """LLM出力が途絶えてから停止するまでの秒数を取得する。
+
+    環境変数 YADON_STALL_TIMEOUT で上書きでき、0 なら監視しない。
+    """
+    value = _env_float("YADON_STALL_TIMEOUT")
+    if value is None:
+        return float(STALL_TIMEOUT)
+    return value if value > 0 else None
+
+
+def get_state_isolation() -> bool:
+    """LLMサブプロセスにワーカーごとの HOME / TMPDIR / キャッシュを与えるか（YADON_ISOLATE_STATE）。"""
+    return os.environ.get("YADON_ISOLATE_STATE", "").lower() in ("1", "true", "yes", "on")
+
+
+def get_worktree_isolation() -> bool:
+    """並列サブタスクをワーカーごとの git worktree で実行するか（YADON_WORKTREES）。"""
+    return os.environ.get("YADON_WORKTREES", "").lower() in ("1", "true", "yes", "on")
+
+
+def get_state_share_paths() -> tuple[str, ...]:
+    """分離した HOME に追加で共有する HOME 相対パス（YADON_ISOLATE_SHARE、カンマ区切り）。"""
+    raw = os.environ.get("YADON_ISOLATE_SHARE", "")
+    return tuple(p.strip().strip("/") for p in raw.split(",") if p.strip().strip("/"))
+
+
+def get_stall_retries() -> int:
+    """停滞（stalled）したサブタスクをヤドランが再配分する回数を取得する（YADON_STALL_RETRIES）。"""
+    value = _env_int("YADON_STALL_RETRIES")
+    return value if value is not None and value >= 0 else STALL_RETRIES
+
+
+# --- サーキットブレーカー ---
+BREAKER_WINDOW = 20
+BREAKER_MIN_CALLS = 3
+BREAKER_FAILURE_RATIO = 0.5
+BREAKER_OPEN_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class BreakerSettings:
+    """バックエンドごとのサーキットブレーカー設定"""
+
+    window: int = BREAKER_WINDOW
+    """失敗率を計算する直近の呼び出し数"""
+
+    min_calls: int = BREAKER_MIN_CALLS
+    """遮断判定を行う最小呼び出し数"""
+
+    failure_ratio: float = BREAKER_FAILURE_RATIO
+    """この失敗率（エラー＋タイムアウト）以上で遮断する"""
+
+    open_seconds: float = BREAKER_OPEN_SECONDS
+    """遮断してから試行（half-open）に移るまでの秒数"""
+
+
+def get_breaker_settings() -> BreakerSettings:
+    """サーキットブレーカー設定を環境変数から取得する。
+
+    YADON_BREAKER_WINDOW, YADON_BREAKER_MIN_CALLS,
+    YADON_BREAKER_FAILURE_RATIO, YADON_BREAKER_OPEN_SECONDS を参照する。
+    """
+    window = _env_int("YADON_BREAKER_WINDOW")
+    min_calls = _env_int("YADON_BREAKER_MIN_CALLS")
+    ratio = _env_float("YADON_BREAKER_FAILURE_RATIO")
+    open_seconds = _env_float("YADON_BREAKER_OPEN_SECONDS")
+    return BreakerSettings(
+        window=window if window and window > 0 else BREAKER_WINDOW,
+        min_calls=min_calls if min_calls and min_calls > 0 else BREAKER_MIN_CALLS,
+        failure_ratio=ratio if ratio is not None and 0 < ratio <= 1 else BREAKER_FAILURE_RATIO,
+        open_seconds=open_seconds if open_seconds is not None and open_seconds >= 0 else BREAKER_OPEN_SECONDS,
+    )
+
+
+# --- 同時実行数制御（AIMD） ---
+CONCURRENCY_INITIAL = 4
+CONCURRENCY_MIN = 1
+CONCURRENCY_MAX = 16
+CONCURRENCY_DECREASE_FACTOR = 0.5
+
+
+@dataclass(frozen=True)
+class ConcurrencySettings:
+    """バックエンドごとの適応的同時実行数制御の設定"""
+
+    initial: int = CONCURRENCY_INITIAL
+    """初期の同時実行数上限"""
+
+    minimum: int = CONCURRENCY_MIN
+    maximum: int = CONCURRENCY_MAX
+
+    decrease_factor: float = CONCURRENCY_DECREASE_FACTOR
+    """レート制限・タイムアウト検出時に上限へ掛ける係数"""
+
+
+def get_concurrency_settings(backend: str) -> ConcurrencySettings:
+    """バックエンドの同時実行数制御設定を環境変数から取得する。
+
+    YADON_{BACKEND}_CONCURRENCY_{INITIAL,MIN,MAX} → YADON_CONCURRENCY_{INITIAL,MIN,MAX} の順に参照する
+    （BACKEND は大文字、"-" は "_"。例: YADON_CLAUDE_OPUS_CONCURRENCY_MAX）。
+    減少係数は YADON_CONCURRENCY_DECREASE（0〜1）。
+    初期値の既定は CONCURRENCY_INITIAL とワーカー数の大きいほう（全ワーカーが同じバックエンドでも
+    最初から並列に実行できる）。
+
+    Args:
+        backend: バックエンド名（例: "claude", "gemini"）
+    """
+    b = backend.upper().replace("-", "_")
+
+    def lookup(key: str, default: int) -> int:
+        value = _env_int(f"YADON_{b}_CONCURRENCY_{key}")
+        if value is None:
+            value = _env_int(f"YADON_CONCURRENCY_{key}")
+        return value if value is not None and value > 0 else default
+
+    minimum = lookup("MIN", CONCURRENCY_MIN)
+    maximum = max(lookup("MAX", CONCURRENCY_MAX), minimum)
+    initial = min(max(lookup("INITIAL", max(CONCURRENCY_INITIAL, get_yadon_count())), minimum), maximum)
+    factor = _env_float("YADON_CONCURRENCY_DECREASE")
+    return ConcurrencySettings(
+        initial=initial,
+        minimum=minimum,
+        maximum=maximum,
+        decrease_factor=factor if factor is not None and 0 < factor < 1 else CONCURRENCY_DECREASE_FACTOR,
+    )
+
+
+# --- リクエスト枠（プロセス間共有のトークンバケット） ---
+QUOTA_POLICIES = ("wait", "fail")
+
+
+@dataclass(frozen=True)
+class QuotaSettings:
+    """バックエンド×tier ごとのリクエスト枠設定"""
+
+    rate_per_minute: float | None = None
+    """1分あたりの補充数（None なら制限なし）"""
+
+    burst: int = 1
+    """バケット容量（連続して使える最大数）"""
+
+    policy: str = "wait"
+    """枠がないときの動作: "wait"（補充を待つ） / "fail"（即座に失敗）"""
+
+
+def get_quota_settings(backend: str, tier: str) -> QuotaSettings:
+    """リクエスト枠の設定を環境変数から取得する。
+
+    補充レートは YADON_{BACKEND}_{TIER}_QUOTA_RPM → YADON_{BACKEND}_QUOTA_RPM → YADON_QUOTA_RPM、
+    容量は同様に *_QUOTA_BURST（既定はレートと同じ＝1分ぶん）を参照する
+    （BACKEND は大文字、"-" は "_"）。動作は YADON_QUOTA_POLICY（wait / fail）。
+    レートが未設定なら制限しない。
+
+    Args:
+        backend: バックエンド名（例: "claude"）
+        tier: "coordinator", "manager", "worker" のいずれか
+    """
+    b = backend.upper().replace("-", "_")
+    t = tier.upper()
+
+    def lookup(key: str) -> float | None:
+        for name in (f"YADON_{b}_{t}_{key}", f"YADON_{b}_{key}", f"YADON_{key}"):
+            value = _env_float(name)
+            if value is not None and value > 0:
+                return value
+        return None
+
+    rate = lookup("QUOTA_RPM")
+    burst = lookup("QUOTA_BURST")
+    policy = os.environ.get("YADON_QUOTA_POLICY", "wait").lower()
+    return QuotaSettings(
+        rate_per_minute=rate,
+        burst=max(int(burst if burst is not None else (rate or 1)), 1),
+        policy=policy if policy in QUOTA_POLICIES else "wait",
+    )
+
+
+# --- シミュレーションバックエンド ---
+SIM_DEFAULT_LATENCY = "uniform:0.05,0.2"
+SIM_DEFAULT_OUTPUT_BYTES = 512
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """simulated バックエンドの挙動設定"""
+
+    latency: str
+    """応答遅延の分布（"fixed:秒" / "uniform:最小,最大" / "lognormal:中央値,σ" / "exp:平均"）"""
+
+    failure_rate: float
+    """失敗（リターンコード1）を返す確率（0.0〜1.0）"""
+
+    output_bytes: int
+    """ワーカー応答のおおよそのサイズ（バイト）"""
+
+    seed: int
+    """乱数シード（同じシード・同じプロンプトなら同じ応答を返す）"""
+
+    stall_rate: float = 0.0
+    """何も出力せずに停止し続ける（ハングを模す）確率（0.0〜1.0）"""
+
+
+def get_simulation_config(tier: str) -> SimulationConfig:
+    """simulated バックエンドの設定を環境変数から取得する。
+
+    YADON_SIM_LATENCY, YADON_SIM_FAILURE_RATE, YADON_SIM_STALL_RATE,
+    YADON_SIM_OUTPUT_BYTES, YADON_SIM_SEED を参照する。
+    遅延分布は YADON_SIM_{TIER}_LATENCY で tier 別に上書きできる。
+
+    Args:
+        tier: "coordinator", "manager", "worker" のいずれか
+    """
+    latency = (
+        os.environ.get(f"YADON_SIM_{tier.upper()}_LATENCY")
+        or os.environ.get("YADON_SIM_LATENCY")
+        or SIM_DEFAULT_LATENCY
+    )
+    failure_rate = _env_float("YADON_SIM_FAILURE_RATE") or 0.0
+    stall_rate = _env_float("YADON_SIM_STALL_RATE") or 0.0
+    output_bytes = _env_int("YADON_SIM_OUTPUT_BYTES")
+    return SimulationConfig(
+        latency=latency,
+        failure_rate=min(max(failure_rate, 0.0), 1.0),
+        output_bytes=max(output_bytes if output_bytes is not None else SIM_DEFAULT_OUTPUT_BYTES, 0),
+        seed=_env_int("YADON_SIM_SEED") or 0,
+        stall_rate=min(max(stall_rate, 0.0), 1.0),
+    )
 
 
 # --- 後方互換ラッパー (get_theme() 経由) ---
@@ -1,4 +1,4 @@
-"""LLM バックエンド設定（Claude、Gemini、Copilot、OpenCode）
+"""LLM バックエンド設定（Claude、Gemini、Copilot、OpenCode、Simulated）
 
 LLM バックエンド（Claude CLI、Gemini CLI、Copilot CLI等）の設定を一元管理。
 tier（coordinator/manager/worker）ごとのモデル指定、コマンド形式、フラグを管理。
@@ -7,6 +7,7 @@ tier（coordinator/manager/worker）ごとのモデル指定、コマンド形
 from __future__ import annotations
 
 import os
+import sys
 from dataclasses import dataclass
 from typing import Any
 
@@ -30,7 +31,7 @@ class LLMBackendConfig:
     """LLMバックエンド設定"""
 
     name: str
-    """バックエンド名（claude/gemini/copilot/opencode）"""
+    """バックエンド名（claude/gemini/copilot/opencode/simulated）"""
 
     command: str
     """CLI実行コマンド（例: claude, gemini, copilot等）"""
@@ -51,6 +52,30 @@ class LLMBackendConfig:
     - "subcommand_stdin": サブコマンド + 標準入力（opencode）
     """
 
+    launcher_args: tuple[str, ...] = ()
+    """command の直後に常に付ける引数（例: python の "-m モジュール名"）"""
+
+    stream_output_format: str | None = None
+    """実行中に進捗を逐次出力する構造化出力形式（例: claude の "stream-json"）。
+    停滞監視が有効なときは usage_format の代わりにこの形式を要求する。
+    最終行は usage_format と同じ形式の結果オブジェクトであること。"""
+
+    text_streams: bool = False
+    """テキスト出力を生成しながら逐次書き出すか（停滞監視の対象にできるか）"""
+
+    usage_format: str | None = None
+    """構造化出力（--output-format json）の形式。使用量の解析に使う:
+    - "claude": claude -p の result オブジェクト
+    - "gemini": gemini の {"response", "stats"} オブジェクト
+    - None: 構造化出力に非対応（テキストのまま扱う）
+    """
+
+    shared_home_paths: tuple[str, ...] = ()
+    """状態ディレクトリ分離時に実 HOME へのシンボリックリンクで共有するパス（認証情報・ユーザー設定）"""
+
+    copied_home_paths: tuple[str, ...] = ()
+    """状態ディレクトリ分離時に初回だけコピーするパス（CLI が頻繁に書き換える状態ファイル）"""
+
 
 # --- バックエンド設定 ---
 
@@ -65,6 +90,16 @@ BACKEND_CONFIGS: dict[str, LLMBackendConfig] = {
         ),
         flags={"use_pipe": True},
         batch_subcommand=None,
+        stream_output_format="stream-json",
+        usage_format="claude",
+        shared_home_paths=(
+            ".claude/.credentials.json",
+            ".claude/settings.json",
+            ".claude/CLAUDE.md",
+            ".claude/agents",
+            ".claude/commands",
+        ),
+        copied_home_paths=(".claude.json",),
     ),
     "gemini": LLMBackendConfig(
         name="gemini",
@@ -77,6 +112,13 @@ BACKEND_CONFIGS: dict[str, LLMBackendConfig] = {
         flags={"use_pipe": True},
         batch_subcommand=None,
         batch_prompt_style="arg",
+        usage_format="gemini",
+        shared_home_paths=(
+            ".gemini/oauth_creds.json",
+            ".gemini/google_accounts.json",
+            ".gemini/settings.json",
+            ".gemini/GEMINI.md",
+        ),
     ),
     "copilot": LLMBackendConfig(
         name="copilot",
@@ -88,6 +130,9 @@ BACKEND_CONFIGS: dict[str, LLMBackendConfig] = {
         ),
         flags={"use_pipe": True},
         batch_subcommand=None,
+        text_streams=True,
+        shared_home_paths=(".config/github-copilot",),
+        copied_home_paths=(".copilot/config.json",),
     ),
     "opencode": LLMBackendConfig(
         name="opencode",
@@ -100,6 +145,8 @@ BACKEND_CONFIGS: dict[str, LLMBackendConfig] = {
         flags={"use_pipe": True},
         batch_subcommand="run -q",
         batch_prompt_style="subcommand_stdin",
+        text_streams=True,
+        shared_home_paths=(".local/share/opencode/auth.json", ".config/opencode"),
     ),
     "claude-opus": LLMBackendConfig(
         name="claude-opus",
@@ -111,6 +158,31 @@ BACKEND_CONFIGS: dict[str, LLMBackendConfig] = {
         ),
         flags={"use_pipe": True},
         batch_subcommand=None,
+        stream_output_format="stream-json",
+        usage_format="claude",
+        shared_home_paths=(
+            ".claude/.credentials.json",
+            ".claude/settings.json",
+            ".claude/CLAUDE.md",
+            ".claude/agents",
+            ".claude/commands",
+        ),
+        copied_home_paths=(".claude.json",),
+    ),
+    # ネットワーク不要の疑似バックエンド（負荷試験用、infra/simulated_llm.py）
+    "simulated": LLMBackendConfig(
+        name="simulated",
+        command=sys.executable,
+        models=LLMModelConfig(
+            coordinator="sim-coordinator",
+            manager="sim-manager",
+            worker="sim-worker",
+        ),
+        flags={"use_pipe": True},
+        batch_subcommand=None,
+        launcher_args=("-m", "yadon_agents.infra.simulated_llm"),
+        stream_output_format="stream-json",
+        usage_format="claude",
     ),
 }
 
@@ -152,7 +224,19 @@ def get_model_for_tier(tier: str) -> str:
     Raises:
         ValueError: tier が無効な場合
     """
-    config = get_backend_config()
+    return get_model_for_backend(get_backend_config(), tier)
+
+
+def get_model_for_backend(config: LLMBackendConfig, tier: str) -> str:
+    """指定バックエンドの tier 別モデル名を取得。
+
+    Args:
+        config: バックエンド設定
+        tier: "coordinator", "manager", "worker" のいずれか
+
+    Raises:
+        ValueError: tier が無効な場合
+    """
     models = config.models
 
     if tier == "coordinator":
@@ -203,3 +287,41 @@ def get_worker_backend_config(worker_number: int) -> LLMBackendConfig:
     """
     backend_name = get_worker_backend_name(worker_number)
     return BACKEND_CONFIGS[backend_name]
+
+
+def get_failover_chain(tier: str, worker_number: int | None = None) -> list[str]:
+    """tier（またはワーカー）のフェイルオーバー順のバックエンド名リストを取得。
+
+    先頭は通常のバックエンド（ワーカーは YADON_{N}_BACKEND、それ以外は LLM_BACKEND）。
+    続けて YADON_{N}_FAILOVER → YADON_{TIER}_FAILOVER → YADON_FAILOVER の順で
+    最初に設定されているカンマ区切りのリストを追加する。
+    未知のバックエンド名と重複は除外する。未設定なら先頭の1件のみ。
+
+    Args:
+        tier: "coordinator", "manager", "worker" のいずれか
+        worker_number: ワーカー番号（ワーカー固有設定を参照する場合）
+
+    Returns:
+        バックエンド名のリスト（例: ["claude", "gemini"]）
+    """
+    if worker_number is not None:
+        primary = get_worker_backend_name(worker_number)
+    else:
+        primary = get_backend_name()
+
+    env_vars = [f"YADON_{tier.upper()}_FAILOVER", "YADON_FAILOVER"]
+    if worker_number is not None:
+        env_vars.insert(0, f"YADON_{worker_number}_FAILOVER")
+
+    raw = ""
+    for env_var in env_vars:
+        raw = os.environ.get(env_var, "")
+        if raw:
+            break
+
+    chain = [primary]
+    for name in raw.split(","):
+        name = name.strip().lower()
+        if name in BACKEND_CONFIGS and name not in chain:
+            chain.append(name)
+    return chain
@@ -0,0 +1,18 @@
+"""ソケット通信のタイムアウト・バッファサイズ
+
+yadon _send / _status / _say の高速経路（entry.py）とデーモン側（protocol.py）が同じ値を使うため、
+何も import しないモジュールに置く。config.agent からも再エクスポートしている。
+"""
+
+# --- タイムアウト (秒) ---
+SOCKET_SEND_TIMEOUT = 300.0
+SOCKET_DISPATCH_TIMEOUT = 600
+SOCKET_STATUS_TIMEOUT = 5
+SOCKET_CONNECTION_TIMEOUT = 600
+SOCKET_ACCEPT_TIMEOUT = 1.0
+
+# --- ソケット設定 ---
+SOCKET_LISTEN_BACKLOG = 5
+SOCKET_RECV_BUFFER = 65536
+PET_SOCKET_RECV_BUFFER = 4096
+PET_SOCKET_MAX_MESSAGE = 65536
@@ -28,7 +28,11 @@ __all__ = [
 # ただしリテラルで構築する分には問題ない。
 
 
-class TaskPayload(TypedDict):
+class _TaskPayloadOptional(TypedDict, total=False):
+    trace: dict[str, str]
+
+
+class TaskPayload(_TaskPayloadOptional):
     instruction: str
     project_dir: str
 
@@ -39,7 +43,14 @@ class TaskMessageDict(TypedDict):
     payload: TaskPayload
 
 
-class ResultPayload(TypedDict):
+class _ResultPayloadOptional(TypedDict, total=False):
+    output_path: str
+    backend: str
+    usage: dict[str, object]
+    resources: dict[str, object]
+
+
+class ResultPayload(_ResultPayloadOptional):
     output: str
     summary: str
 
@@ -60,6 +71,9 @@ class StatusResponseDict(TypedDict, total=False):
     state: str
     current_task: str | None
     workers: dict[str, str]
+    breakers: dict[str, dict[str, object]]
+    concurrency: dict[str, dict[str, object]]
+    leases: dict[str, dict[str, object]]
 
 
 # --- dataclass: メッセージ構築 ---
@@ -79,16 +93,21 @@ class TaskMessage:
     instruction: str
     project_dir: str
     task_id: str = field(default_factory=generate_task_id)
+    trace: dict[str, str] | None = None
+    """トレース文脈（trace_id と親スパンID）"""
 
     def to_dict(self) -> dict[str, object]:
+        payload: dict[str, object] = {
+            "instruction": self.instruction,
+            "project_dir": self.project_dir,
+        }
+        if self.trace is not None:
+            payload["trace"] = self.trace
         return {
             "type": "task",
             "id": self.task_id,
             "from": self.from_agent,
-            "payload": {
-                "instruction": self.instruction,
-                "project_dir": self.project_dir,
-            },
+            "payload": payload,
         }
 
 
@@ -100,17 +119,34 @@ class ResultMessage:
     status: str
     output: str
     summary: str
+    output_path: str | None = None
+    """全出力のスピルファイル（output が抜粋の場合のみ）"""
+    backend: str | None = None
+    """実行したLLMバックエンド（ワーカーの結果のみ）"""
+    usage: dict[str, object] | None = None
+    """トークン使用量（ワーカーは LLMUsage.to_dict()、マネージャーはフェーズ別集計）"""
+    resources: dict[str, object] | None = None
+    """LLMサブプロセスの資源使用量（ワーカーは ResourceUsage.to_dict()、マネージャーはフェーズ別集計）"""
 
     def to_dict(self) -> dict[str, object]:
+        payload: dict[str, object] = {
+            "output": self.output,
+            "summary": self.summary,
+        }
+        if self.output_path is not None:
+            payload["output_path"] = self.output_path
+        if self.backend is not None:
+            payload["backend"] = self.backend
+        if self.usage is not None:
+            payload["usage"] = self.usage
+        if self.resources is not None:
+            payload["resources"] = self.resources
         return {
             "type": "result",
             "id": self.task_id,
             "from": self.from_agent,
             "status": self.status,
-            "payload": {
-                "output": self.output,
-                "summary": self.summary,
-            },
+            "payload": payload,
         }
 
 
@@ -133,6 +169,12 @@ class StatusResponse:
     state: str
     current_task: str | None = None
     workers: dict[str, str] | None = None
+    breakers: dict[str, dict[str, object]] | None = None
+    """バックエンド別サーキットブレーカーの状態"""
+    concurrency: dict[str, dict[str, object]] | None = None
+    """バックエンド別の同時実行数（上限・実行中・待機中）"""
+    leases: dict[str, dict[str, object]] | None = None
+    """ワーカー別に保持しているファイルリース"""
 
     def to_dict(self) -> dict[str, object]:
         result: dict[str, object] = {
@@ -143,4 +185,10 @@ class StatusResponse:
         }
         if self.workers is not None:
             result["workers"] = self.workers
+        if self.breakers is not None:
+            result["breakers"] = self.breakers
+        if self.concurrency is not None:
+            result["concurrency"] = self.concurrency
+        if self.leases is not None:
+            result["leases"] = self.leases
         return result
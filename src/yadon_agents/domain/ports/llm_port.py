@@ -12,6 +12,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 
 from yadon_agents.config.agent import CLAUDE_DEFAULT_TIMEOUT
+from yadon_agents.domain.run_result import LLMRunResult
 
 __all__ = ["LLMRunnerPort"]
 
@@ -52,6 +53,39 @@ class LLMRunnerPort(ABC):
             RuntimeError: LLM実行に失敗した場合
         """
 
+    def run_detailed(
+        self,
+        prompt: str,
+        model_tier: str,
+        cwd: str | None = None,
+        timeout: float = CLAUDE_DEFAULT_TIMEOUT,
+        output_format: str | None = None,
+        run_id: str | None = None,
+    ) -> LLMRunResult:
+        """LLMプロンプトを実行し、出力以外のメタ情報も含めた結果を返す。
+
+        デフォルト実装は run() の結果を LLMRunResult に包むだけ。
+
+        Args:
+            prompt, model_tier, cwd, timeout, output_format: run() と同じ
+            run_id: 実行の識別子（スピルファイル名等に使用）。通常はタスクID
+
+        Returns:
+            LLMRunResult
+        """
+        output, returncode = self.run(
+            prompt=prompt,
+            model_tier=model_tier,
+            cwd=cwd,
+            timeout=timeout,
+            output_format=output_format,
+        )
+        return LLMRunResult(
+            output=output,
+            returncode=returncode,
+            output_bytes=len(output.encode("utf-8")),
+        )
+
     @abstractmethod
     def build_interactive_command(
         self,
@@ -79,3 +113,10 @@ class LLMRunnerPort(ABC):
             ValueError: model_tierが不正な場合
             FileNotFoundError: system_prompt_pathが存在しない場合
         """
+
+    def cancel(self) -> None:
+        """実行中のLLM呼び出しを中断する。
+
+        デフォルト実装は何もしない。サブプロセスを扱う実装は
+        プロセスグループごと停止するようにオーバーライドする。
+        """
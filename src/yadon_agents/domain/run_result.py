@@ -0,0 +1,150 @@
+"""LLM実行結果の型定義"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass, fields
+
+__all__ = ["LLMUsage", "ResourceUsage", "LLMRunResult", "sum_usage", "sum_resources"]
+
+
+@dataclass(frozen=True)
+class LLMUsage:
+    """LLM呼び出しのトークン使用量・コスト・所要時間（加算可能）
+
+    トークン数はバックエンドが構造化出力で報告した場合のみ埋まる。
+    報告のなかった呼び出しは unreported_calls に計上される。
+    """
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    cost_usd: float = 0.0
+    duration_ms: int = 0
+    """ランナーが計測した実時間（ミリ秒）"""
+    api_duration_ms: int = 0
+    """バックエンドが報告したAPI待ち時間（ミリ秒）"""
+    calls: int = 1
+    unreported_calls: int = 0
+
+    def __add__(self, other: LLMUsage) -> LLMUsage:
+        return LLMUsage(**{
+            f.name: getattr(self, f.name) + getattr(other, f.name) for f in fields(self)
+        })
+
+    def to_dict(self) -> dict[str, object]:
+        d = asdict(self)
+        d["cost_usd"] = round(self.cost_usd, 6)
+        return d
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object]) -> LLMUsage:
+        """to_dict() の出力から復元する（未知のキーは無視）。"""
+        kwargs = {}
+        for f in fields(cls):
+            if f.name in data:
+                value = data[f.name]
+                kwargs[f.name] = float(value) if f.name == "cost_usd" else int(value)  # type: ignore[arg-type]
+        return cls(**kwargs)
+
+
+def sum_usage(items: Iterable[LLMUsage]) -> LLMUsage:
+    """複数の LLMUsage を合算する（空なら calls=0 の LLMUsage）。"""
+    total = LLMUsage(calls=0)
+    for item in items:
+        total = total + item
+    return total
+
+
+@dataclass(frozen=True)
+class ResourceUsage:
+    """LLMサブプロセスの資源使用量（wait4 の rusage と実時間、加算可能）
+
+    rusage には子プロセスが回収した子孫（CLI が起動したツール等）の分も含まれる。
+    加算時、max_rss_kb だけは合計ではなく最大値をとる。
+    """
+
+    wall_ms: int = 0
+    user_cpu_ms: int = 0
+    sys_cpu_ms: int = 0
+    max_rss_kb: int = 0
+    voluntary_switches: int = 0
+    """自発的コンテキストスイッチ（I/O・パイプ待ち）"""
+    involuntary_switches: int = 0
+    """非自発的コンテキストスイッチ（CPU の奪い合い）"""
+    block_input: int = 0
+    block_output: int = 0
+    runs: int = 1
+
+    @property
+    def cpu_ms(self) -> int:
+        return self.user_cpu_ms + self.sys_cpu_ms
+
+    @property
+    def cpu_ratio(self) -> float:
+        """CPU時間 / 実時間。0 に近ければLLM待ち、1 以上ならローカルでCPUを消費している"""
+        return self.cpu_ms / self.wall_ms if self.wall_ms else 0.0
+
+    def __add__(self, other: ResourceUsage) -> ResourceUsage:
+        return ResourceUsage(**{
+            f.name: (
+                max(getattr(self, f.name), getattr(other, f.name))
+                if f.name == "max_rss_kb"
+                else getattr(self, f.name) + getattr(other, f.name)
+            )
+            for f in fields(self)
+        })
+
+    def to_dict(self) -> dict[str, object]:
+        d: dict[str, object] = asdict(self)
+        d["cpu_ratio"] = round(self.cpu_ratio, 3)
+        return d
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object]) -> ResourceUsage:
+        """to_dict() の出力から復元する（未知のキーは無視）。"""
+        return cls(**{f.name: int(data[f.name]) for f in fields(cls) if f.name in data})  # type: ignore[arg-type]
+
+
+def sum_resources(items: Iterable[ResourceUsage]) -> ResourceUsage:
+    """複数の ResourceUsage を合算する（空なら runs=0 の ResourceUsage）。"""
+    total = ResourceUsage(runs=0)
+    for item in items:
+        total = total + item
+    return total
+
+
+@dataclass(frozen=True)
+class LLMRunResult:
+    """LLM 1回分の実行結果（LLMRunnerPort.run_detailed() の戻り値）"""
+
+    output: str
+    """出力テキスト。大きい場合は先頭・末尾の抜粋"""
+
+    returncode: int
+    """リターンコード（0 は成功）"""
+
+    output_bytes: int = 0
+    """切り詰め前の出力サイズ（バイト）"""
+
+    output_path: str | None = None
+    """全出力を書き出したファイル（切り詰めが発生した場合のみ）"""
+
+    usage: LLMUsage | None = None
+    """トークン使用量・所要時間"""
+
+    backend: str | None = None
+    """実行したバックエンド名"""
+
+    model: str | None = None
+    """実行したモデル名"""
+
+    queue_ms: int = 0
+    """同時実行枠の確保を待った時間（ミリ秒）"""
+
+    stalled: bool = False
+    """出力が途絶えたため停止した（再試行の対象）"""
+
+    resources: ResourceUsage | None = None
+    """サブプロセスの資源使用量（POSIX でプロセスを起動した場合のみ）"""
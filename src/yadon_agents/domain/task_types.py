@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
+import posixpath
+import re
 from typing import TypedDict
 
 __all__ = [
     "Subtask",
     "Phase",
+    "infer_paths",
+    "subtask_paths",
 ]
 
 
-class Subtask(TypedDict):
+class _SubtaskOptional(TypedDict, total=False):
+    paths: list[str]
+    """サブタスクが変更するファイル・ディレクトリ（プロジェクトからの相対パス）"""
+
+
+class Subtask(_SubtaskOptional):
     """ヤドンに配分される個別サブタスク"""
     instruction: str
 
@@ -19,3 +28,53 @@ class Phase(TypedDict):
     """タスク分解の1フェーズ（implement / docs / review）"""
     name: str
     subtasks: list[Subtask]
+
+
+# 指示文中のパスらしき語（"src/foo/" や "bar.py"）。日本語に隣接していても切り出せるよう ASCII に限定する
+_PATH_RE = re.compile(
+    r"(?<![A-Za-z0-9_./:-])"
+    r"((?:[A-Za-z0-9_.-]+/)+[A-Za-z0-9_.-]*|[A-Za-z0-9_-][A-Za-z0-9_.-]*\.[A-Za-z][A-Za-z0-9]{0,7})"
+    r"(?![A-Za-z0-9_/-])"
+)
+_NOT_PATHS = {"e.g", "i.e", "etc", "vs"}
+# `/` を含まない語は、この拡張子で終わるときだけファイル名とみなす（config.agent や os.path を除くため）
+_FILE_EXTENSIONS = frozenset({
+    "py", "pyi", "pyx", "ipynb", "md", "rst", "txt", "toml", "cfg", "ini", "yaml", "yml", "json", "jsonl",
+    "lock", "env", "sh", "bash", "zsh", "ps1", "bat", "js", "mjs", "cjs", "ts", "tsx", "jsx", "vue", "svelte",
+    "css", "scss", "html", "htm", "xml", "svg", "png", "jpg", "gif", "csv", "tsv", "sql", "proto",
+    "c", "h", "cc", "cpp", "hpp", "rs", "go", "java", "kt", "swift", "rb", "php", "lua",
+})
+
+
+def _normalize(path: str) -> str | None:
+    path = path.strip().rstrip(".")
+    if not path or "://" in path:
+        return None
+    normalized = posixpath.normpath(path.replace("\\", "/")).lstrip("/")
+    if normalized in (".", "") or normalized.startswith("../") or normalized.lower() in _NOT_PATHS:
+        return None
+    return normalized
+
+
+def infer_paths(text: str) -> frozenset[str]:
+    """指示文に現れるファイル・ディレクトリのパスを推定する。
+
+    `/` を含む語か、既知の拡張子で終わる語だけを拾う（モジュール名・属性参照はパスとみなさない）。
+    """
+    found = set()
+    for match in _PATH_RE.finditer(text):
+        token = match.group(1)
+        if "/" not in token and token.rstrip(".").rsplit(".", 1)[-1].lower() not in _FILE_EXTENSIONS:
+            continue
+        normalized = _normalize(token)
+        if normalized is not None:
+            found.add(normalized)
+    return frozenset(found)
+
+
+def subtask_paths(subtask: Subtask) -> frozenset[str]:
+    """サブタスクが触るパスを返す。paths の宣言があればそれを、なければ指示文から推定する。"""
+    declared = subtask.get("paths")
+    if isinstance(declared, list) and declared:
+        return frozenset(p for p in (_normalize(str(d)) for d in declared) if p is not None)
+    return infer_paths(subtask.get("instruction", ""))
@@ -0,0 +1,176 @@
+"""yadon コマンドの入口（[project.scripts] yadon）
+
+コーディネーターの LLM はツール呼び出しのたびに yadon _send / _status / _say を新しいプロセスで
+実行するため、処理（ソケット往復1回）よりインポートを含む起動時間のほうが長かった。
+この3つは json・socket・ソケットパスと送受信（infra/socket_io.py）だけで済むので、ここで argparse・
+テーマの全体・ランナー・GUI を読み込まずに処理する。それ以外のサブコマンドと、ここで解釈できない引数（--help 等）は cli.main() に渡す。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+
+from yadon_agents.config.socket import SOCKET_CONNECTION_TIMEOUT, SOCKET_STATUS_TIMEOUT
+from yadon_agents.infra.socket_io import send_message
+from yadon_agents.infra.socket_paths import agent_socket_path, pet_socket_path
+from yadon_agents.themes import theme_identity
+
+__all__ = ["cmd_internal_send", "cmd_internal_status", "cmd_internal_say", "main"]
+
+
+def _print_result(result: dict[str, object]) -> None:
+    print(json.dumps(result, ensure_ascii=False))
+
+
+def cmd_internal_send(instruction: str, project_dir: str | None = None) -> None:
+    """【内部用】タスク送信 (JSON形式出力)
+
+    cmd_send() の JSON出力バージョン。
+    エージェント間通信で結果をJSON形式で返す際に使用。
+    """
+    prefix, manager_name = theme_identity()
+    sock_path = agent_socket_path(manager_name, prefix=prefix)
+
+    result: dict[str, object] = {"success": False, "message": "", "data": None}
+
+    if not os.path.exists(sock_path):
+        result["message"] = f"{manager_name}ソケットが見つかりません ({sock_path})"
+        _print_result(result)
+        return
+
+    payload: dict[str, object] = {"instruction": instruction}
+    if project_dir:
+        payload["project_dir"] = project_dir
+
+    try:
+        message = {"type": "task", "payload": payload}
+        response = send_message(sock_path, message, timeout=SOCKET_CONNECTION_TIMEOUT)
+        result["success"] = response.get("status") == "success"
+        result["data"] = response
+    except socket.timeout:
+        result["message"] = f"{manager_name}からの応答がありません（タイムアウト）"
+    except Exception as e:
+        result["message"] = str(e)
+    _print_result(result)
+
+
+def cmd_internal_status(agent_name: str | None = None) -> None:
+    """【内部用】ステータス確認 (JSON形式出力)
+
+    cmd_status() の JSON出力バージョン。agent_name を省略するとヤドランに照会する
+    （ヤドランがワーカーの状態もまとめて返す）。
+    """
+    prefix, manager_name = theme_identity()
+    sock_path = agent_socket_path(agent_name or manager_name, prefix=prefix)
+
+    result: dict[str, object] = {"success": False, "message": "", "data": None}
+
+    try:
+        response = send_message(sock_path, {"type": "status"}, timeout=SOCKET_STATUS_TIMEOUT)
+        result["success"] = True
+        result["data"] = response
+    except socket.timeout:
+        result["message"] = "ステータス確認がタイムアウトしました"
+    except Exception as e:
+        result["message"] = str(e)
+    _print_result(result)
+
+
+def cmd_internal_say(number: int, message: str, bubble_type: str = "info", duration_ms: int = 5000) -> None:
+    """【内部用】ペット吹き出し表示
+
+    ペット番号に吹き出しメッセージを送信。
+    """
+    prefix, _ = theme_identity()
+    sock_path = pet_socket_path(str(number), prefix=prefix)
+
+    if not os.path.exists(sock_path):
+        # ペット未起動時は静かに終了
+        return
+
+    payload = {
+        "text": message,
+        "type": bubble_type,
+        "duration": duration_ms,
+    }
+
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(SOCKET_STATUS_TIMEOUT)
+        sock.connect(sock_path)
+        sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        sock.close()
+    except Exception:
+        # ペット未起動時は静かに終了
+        pass
+
+
+def _parse(
+    args: list[str], names: tuple[str, ...], required: int, options: dict[str, str],
+) -> dict[str, str] | None:
+    """位置引数 names（先頭 required 個は必須）と値を取るオプションを解釈する。解釈できなければ None。"""
+    values: dict[str, str] = {}
+    positional: list[str] = []
+    rest = iter(args)
+    for arg in rest:
+        if arg.startswith("-") and arg != "-":
+            flag, eq, value = arg.partition("=")
+            if flag not in options:
+                return None
+            if not eq:
+                next_value = next(rest, None)
+                if next_value is None:
+                    return None
+                value = next_value
+            values[options[flag]] = value
+        else:
+            positional.append(arg)
+    if not required <= len(positional) <= len(names):
+        return None
+    values.update(zip(names, positional))
+    return values
+
+
+def _fast_send(args: list[str]) -> bool:
+    values = _parse(args, ("instruction",), 1, {"--project-dir": "project_dir"})
+    if values is None:
+        return False
+    cmd_internal_send(values["instruction"], project_dir=values.get("project_dir"))
+    return True
+
+
+def _fast_status(args: list[str]) -> bool:
+    values = _parse(args, ("agent_name",), 0, {})
+    if values is None:
+        return False
+    cmd_internal_status(values.get("agent_name"))
+    return True
+
+
+def _fast_say(args: list[str]) -> bool:
+    values = _parse(args, ("number", "message"), 2, {"--type": "type", "--duration": "duration"})
+    if values is None:
+        return False
+    try:
+        number = int(values["number"])
+        duration = int(values.get("duration", 5000))
+    except ValueError:
+        return False
+    cmd_internal_say(number, values["message"], bubble_type=values.get("type", "info"), duration_ms=duration)
+    return True
+
+
+_FAST_COMMANDS = {"_send": _fast_send, "_status": _fast_status, "_say": _fast_say}
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    fast = _FAST_COMMANDS.get(args[0]) if args else None
+    if fast is not None and fast(args[1:]):
+        return
+    from yadon_agents.cli import main as cli_main
+
+    cli_main()
@@ -4,7 +4,9 @@
 from __future__ import annotations
 
 import random
+import signal
 import sys
+import time
 from pathlib import Path
 
 from PyQt6.QtWidgets import QApplication
@@ -14,21 +16,40 @@ from PyQt6.QtGui import QCursor
 from yadon_agents import PROJECT_ROOT
 from yadon_agents.agent.manager import YadoranManager
 from yadon_agents.agent.worker import YadonWorker
-from yadon_agents.config.agent import get_yadon_count, get_yadon_variant
+from yadon_agents.config.agent import get_tracemalloc_frames, get_yadon_count, get_yadon_variant
 from yadon_agents.config.ui import WINDOW_WIDTH, WINDOW_HEIGHT
 from yadon_agents.gui.agent_thread import AgentThread
 from yadon_agents.gui.yadon_pet import YadonPet
 from yadon_agents.gui.yadoran_pet import YadoranPet
+from yadon_agents.infra import memory, profiler
+from yadon_agents.infra.control import start_control_server
+from yadon_agents.infra.metrics import start_metrics_server
+from yadon_agents.infra.process import apply_daemon_affinity
 from yadon_agents.infra.protocol import pet_socket_path
+from yadon_agents.infra.readiness import notify_when_ready
+from yadon_agents.infra.status_stream import start_status_stream
 from yadon_agents.themes import get_theme
 
 
 def main() -> None:
     """GUIデーモンのメイン"""
+    started = time.monotonic()
     theme = get_theme()
     yadon_count = get_yadon_count()
     prefix = theme.socket_prefix
 
+    # 起動時からの確保を追えるよう、エージェントを作る前に tracemalloc を有効にする（opt-in）
+    tracemalloc_frames = get_tracemalloc_frames()
+    if tracemalloc_frames:
+        memory.start_tracing(tracemalloc_frames)
+
+    # Qt やエージェントのスレッドを作る前に予約CPUへ固定する（子スレッドが引き継ぐ）
+    apply_daemon_affinity()
+
+    # 同じホストの全ヤドン群を Prometheus から取得できるようメトリクスを公開する
+    metrics_server = start_metrics_server(prefix)
+    memory_monitor = memory.start_memory_monitor()
+
     # QApplication作成（フォーカス奪取を防ぐ設定）
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
@@ -37,6 +58,8 @@ def main() -> None:
     sig_timer = QTimer()
     sig_timer.timeout.connect(lambda: None)
     sig_timer.start(500)
+    # yadon stop（SIGTERM）でもイベントループを抜け、下の stop() でソケットを片付ける
+    signal.signal(signal.SIGTERM, lambda signum, frame: app.quit())
 
     screen_obj = QApplication.screenAt(QCursor.pos()) or QApplication.primaryScreen()
     screen = screen_obj.geometry()
@@ -44,10 +67,12 @@ def main() -> None:
     spacing = 10
 
     pets: list[YadonPet | YadoranPet] = []
+    agents: list[YadonWorker | YadoranManager] = []
 
     # ワーカー 1-N 構築
     for n in range(1, yadon_count + 1):
         worker = YadonWorker(n, str(PROJECT_ROOT))
+        agents.append(worker)
         agent_thread = AgentThread(worker)
         variant = get_yadon_variant(n)
 
@@ -65,6 +90,7 @@ def main() -> None:
 
     # マネージャー構築
     manager = YadoranManager(str(PROJECT_ROOT))
+    agents.insert(0, manager)
     manager_agent_thread = AgentThread(manager)
 
     manager_pet = YadoranPet(
@@ -77,6 +103,19 @@ def main() -> None:
     manager_pet.move(x_pos, y_pos)
     pets.append(manager_pet)
 
+    # yadon top 向けにエージェントの状態を購読型で公開する
+    status_stream = start_status_stream(agents, prefix)
+    # 運用コマンド（yadon _profile / _memory）を制御ソケットで受け付ける
+    control_server = start_control_server(
+        {
+            "profile": profiler.control_handler([agent.name for agent in agents]),
+            "memory": memory.control_handler(),
+        },
+        prefix,
+    )
+    # yadon start に全エージェントの accept 開始（エージェント別の所要時間つき）を知らせる
+    notify_when_ready(agents, started)
+
     def _show_welcome():
         for pet in pets:
             if isinstance(pet, YadoranPet):
@@ -87,7 +126,16 @@ def main() -> None:
     QTimer.singleShot(0, _show_welcome)
 
     # Qtイベントループ
-    sys.exit(app.exec())
+    status = app.exec()
+    if control_server is not None:
+        control_server.stop()
+    if status_stream is not None:
+        status_stream.stop()
+    if memory_monitor is not None:
+        memory_monitor.stop()
+    if metrics_server is not None:
+        metrics_server.stop()
+    sys.exit(status)
 
 
 if __name__ == "__main__":
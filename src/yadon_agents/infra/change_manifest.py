@@ -0,0 +1,175 @@
+"""フェーズ間の変更マニフェスト
+
+docs / review フェーズのワーカーは分解時の指示文しか受け取らないため、
+implement フェーズで何が変わったかを調べるだけで LLM のターンとトークンを消費する。
+ヤドランはタスク開始時の作業ツリーの状態を記録しておき、後続フェーズの開始時に
+それ以降の変更（ファイル一覧・増減行数・切り詰めた差分）をまとめてサブタスクの指示に添える。
+
+- git 作業ツリーではスナップショットコミット同士の差分を使う（未コミット・未追跡を含む）
+- それ以外では mtime とサイズの走査で追加・変更・削除されたファイルだけを挙げる
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+from yadon_agents.config.agent import (
+    CHANGE_MANIFEST_HUNK_LINES,
+    CHANGE_MANIFEST_SCAN_FILES,
+    get_manifest_max_bytes,
+)
+from yadon_agents.infra.worktree import WorktreeError, diff, is_git_repo, snapshot
+
+__all__ = ["TreeState", "scan_files", "capture", "build_manifest"]
+
+logger = logging.getLogger(__name__)
+
+# 走査しないディレクトリ（依存物・キャッシュ）
+SKIP_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox",
+})
+
+
+@dataclass(frozen=True)
+class TreeState:
+    """ある時点の作業ツリーの状態"""
+    commit: str | None = None
+    """git 作業ツリーのスナップショットコミット"""
+    files: Mapping[str, tuple[int, int]] | None = None
+    """git 以外: 相対パス -> (mtime_ns, サイズ)"""
+
+
+@dataclass(frozen=True)
+class _Change:
+    status: str
+    path: str
+    added: int | None = None
+    deleted: int | None = None
+
+    def line(self) -> str:
+        if self.added is None or self.deleted is None:
+            return f"- {self.status} {self.path}"
+        return f"- {self.status} {self.path} (+{self.added} -{self.deleted})"
+
+
+def scan_files(root: Path, limit: int = CHANGE_MANIFEST_SCAN_FILES) -> dict[str, tuple[int, int]] | None:
+    """root 以下のファイルの相対パス -> (mtime_ns, サイズ) を返す。limit 件を超えれば None。"""
+    files: dict[str, tuple[int, int]] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            try:
+                st = os.stat(full, follow_symlinks=False)
+            except OSError:
+                continue
+            files[os.path.relpath(full, root)] = (st.st_mtime_ns, st.st_size)
+            if len(files) > limit:
+                logger.info("ファイルが多すぎるため走査を打ち切ります: %s", root)
+                return None
+    return files
+
+
+def capture(project_dir: str | Path) -> TreeState | None:
+    """作業ツリーの現在の状態を記録する。記録できなければ None を返す。"""
+    try:
+        if is_git_repo(project_dir):
+            return TreeState(commit=snapshot(project_dir))
+        files = scan_files(Path(project_dir))
+    except (WorktreeError, OSError) as e:
+        logger.warning("作業ツリーの状態を記録できません: %s", e)
+        return None
+    return TreeState(files=files) if files is not None else None
+
+
+def _git_changes(project_dir: str | Path, base: str, head: str) -> list[_Change]:
+    status_fields = diff(project_dir, base, head, "--relative", "--no-renames", "--name-status", "-z").split("\0")
+    statuses = dict(zip(status_fields[1::2], status_fields[0::2]))
+    changes = []
+    for record in diff(project_dir, base, head, "--relative", "--no-renames", "--numstat", "-z").split("\0"):
+        if not record:
+            continue
+        added, deleted, path = record.split("\t", 2)
+        changes.append(_Change(
+            statuses.get(path, "M"),
+            path,
+            int(added) if added.isdigit() else None,
+            int(deleted) if deleted.isdigit() else None,
+        ))
+    return changes
+
+
+def _scan_changes(before: Mapping[str, tuple[int, int]], after: Mapping[str, tuple[int, int]]) -> list[_Change]:
+    changes = []
+    for path in sorted(set(before) | set(after)):
+        if path not in before:
+            changes.append(_Change("A", path))
+        elif path not in after:
+            changes.append(_Change("D", path))
+        elif before[path] != after[path]:
+            changes.append(_Change("M", path))
+    return changes
+
+
+def _excerpt(patch: str) -> str:
+    """ファイルごとに先頭 CHANGE_MANIFEST_HUNK_LINES 行だけ残した差分を返す。"""
+    parts: list[str] = []
+    for chunk in ("\n" + patch).split("\ndiff --git ")[1:]:
+        lines = ("diff --git " + chunk).splitlines()
+        if len(lines) > CHANGE_MANIFEST_HUNK_LINES:
+            omitted = len(lines) - CHANGE_MANIFEST_HUNK_LINES
+            lines = lines[:CHANGE_MANIFEST_HUNK_LINES] + [f"... ({omitted}行省略)"]
+        parts.append("\n".join(lines))
+    return "\n".join(parts)
+
+
+def _truncate(text: str, max_bytes: int) -> str:
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    return data[:max_bytes].decode("utf-8", errors="ignore").rsplit("\n", 1)[0] + "\n... (以下省略)"
+
+
+def build_manifest(
+    project_dir: str | Path,
+    before: TreeState,
+    after: TreeState | None = None,
+    max_bytes: int | None = None,
+) -> str:
+    """before から after（None なら現在）までの変更マニフェストを返す。変更がなければ空文字列。"""
+    max_bytes = get_manifest_max_bytes() if max_bytes is None else max_bytes
+    if max_bytes <= 0:
+        return ""
+    after = after or capture(project_dir)
+    if after is None:
+        return ""
+
+    excerpt = ""
+    try:
+        if before.commit and after.commit:
+            if before.commit == after.commit:
+                return ""
+            changes = _git_changes(project_dir, before.commit, after.commit)
+            excerpt = _excerpt(diff(project_dir, before.commit, after.commit, "--relative", "--no-renames", "-U2"))
+        elif before.files is not None and after.files is not None:
+            changes = _scan_changes(before.files, after.files)
+        else:
+            return ""
+    except WorktreeError as e:
+        logger.warning("変更マニフェストを作れません: %s", e)
+        return ""
+    if not changes:
+        return ""
+
+    header = f"## これまでのフェーズによる変更（{len(changes)}ファイル）\n"
+    listing = _truncate("\n".join(c.line() for c in changes), max_bytes)
+    manifest = header + listing
+    remaining = max_bytes - len(manifest.encode("utf-8"))
+    if excerpt and remaining > 200:
+        manifest += "\n\n### 差分（抜粋）\n```diff\n" + _truncate(excerpt, remaining - 40) + "\n```"
+    return manifest
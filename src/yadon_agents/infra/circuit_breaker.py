@@ -0,0 +1,164 @@
+"""バックエンドごとのサーキットブレーカー
+
+直近の呼び出し結果（成功・エラー・タイムアウト）を記録し、失敗率が閾値を超えた
+バックエンドを一定時間遮断（open）する。遮断時間が過ぎると1回だけ試行を許可し
+（half-open）、成功すれば復帰（closed）、失敗すれば再び遮断する。
+
+ブレーカーはプロセス全体で共有される（GUIデーモン内の全エージェントが同じ状態を見る）。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from yadon_agents.config.agent import BreakerSettings, get_breaker_settings
+
+__all__ = [
+    "CLOSED",
+    "OPEN",
+    "HALF_OPEN",
+    "CircuitBreaker",
+    "get_breaker",
+    "breaker_snapshot",
+    "reset_breakers",
+]
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+_OUTCOMES = ("success", "error", "timeout")
+
+
+class CircuitBreaker:
+    """1バックエンド分のサーキットブレーカー（スレッドセーフ）"""
+
+    def __init__(
+        self,
+        name: str,
+        settings: BreakerSettings | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.settings = settings or BreakerSettings()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window: deque[str] = deque(maxlen=self.settings.window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._totals = dict.fromkeys(_OUTCOMES, 0)
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.settings.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """呼び出してよいかを返す。half-open では1件の試行だけを許可する。"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def release(self) -> None:
+        """結果を記録せずに試行を終える（実行前に打ち切られた場合）。"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record(self, outcome: str) -> None:
+        """呼び出し結果を記録する。
+
+        Args:
+            outcome: "success" / "error" / "timeout"
+        """
+        if outcome not in _OUTCOMES:
+            raise ValueError(f"不明な結果: {outcome!r}")
+        with self._lock:
+            self._totals[outcome] += 1
+            self._window.append(outcome)
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if outcome == "success":
+                    self._state = CLOSED
+                    self._window.clear()
+                else:
+                    self._open()
+                return
+            if self._state == CLOSED and outcome != "success" and self._should_open():
+                self._open()
+
+    def _should_open(self) -> bool:
+        calls = len(self._window)
+        if calls < self.settings.min_calls:
+            return False
+        failures = sum(1 for o in self._window if o != "success")
+        return failures / calls >= self.settings.failure_ratio
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+
+    def snapshot(self) -> dict[str, Any]:
+        """ステータス表示用の状態を返す。"""
+        with self._lock:
+            self._maybe_half_open()
+            calls = len(self._window)
+            errors = sum(1 for o in self._window if o == "error")
+            timeouts = sum(1 for o in self._window if o == "timeout")
+            snap: dict[str, Any] = {
+                "state": self._state,
+                "recent_calls": calls,
+                "recent_errors": errors,
+                "recent_timeouts": timeouts,
+                "failure_ratio": round((errors + timeouts) / calls, 3) if calls else 0.0,
+                "rejected": self._rejected,
+                **{f"total_{k}": v for k, v in self._totals.items()},
+            }
+            if self._state == OPEN:
+                remaining = self.settings.open_seconds - (self._clock() - self._opened_at)
+                snap["retry_in"] = round(max(remaining, 0.0), 1)
+            return snap
+
+
+_registry: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """バックエンド名に対応するプロセス共有のブレーカーを返す（なければ作成）。"""
+    with _registry_lock:
+        breaker = _registry.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, get_breaker_settings())
+            _registry[name] = breaker
+        return breaker
+
+
+def breaker_snapshot() -> dict[str, dict[str, Any]]:
+    """使用されたことのある全ブレーカーの状態を返す。"""
+    with _registry_lock:
+        breakers = list(_registry.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+
+def reset_breakers() -> None:
+    """全ブレーカーを破棄する（テスト用）。"""
+    with _registry_lock:
+        _registry.clear()
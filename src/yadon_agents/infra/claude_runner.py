@@ -9,22 +9,66 @@ from __future__ import annotations
 
 import logging
 import subprocess
+import threading
+import time
+import uuid
+from dataclasses import replace
 from pathlib import Path
 
-from yadon_agents.config.agent import CLAUDE_DEFAULT_TIMEOUT
-from yadon_agents.config.llm import get_backend_config, get_model_for_tier, get_worker_backend_config
+from yadon_agents.config.agent import (
+    CLAUDE_DEFAULT_TIMEOUT,
+    OUTPUT_SPILL_KEEP,
+    get_output_capture_limit,
+    get_process_limits,
+    get_quota_settings,
+    get_stall_timeout,
+    get_state_isolation,
+)
+from yadon_agents.config.llm import (
+    BACKEND_CONFIGS,
+    LLMBackendConfig,
+    get_backend_config,
+    get_failover_chain,
+    get_model_for_backend,
+    get_model_for_tier,
+)
 from yadon_agents.domain.ports.llm_port import LLMRunnerPort
+from yadon_agents.domain.run_result import LLMRunResult, LLMUsage, sum_resources, sum_usage
+from yadon_agents.infra import metrics, tracing
+from yadon_agents.infra.circuit_breaker import OPEN, get_breaker
+from yadon_agents.infra.concurrency import NEUTRAL, OVERLOAD, SUCCESS, get_limiter, is_rate_limited
+from yadon_agents.infra.filenames import prune_oldest, safe_filename
+from yadon_agents.infra.process import ProcessStalled, kill_process_group, log_dir, run_process
+from yadon_agents.infra.quota import get_quota_ledger
+from yadon_agents.infra.state_dir import isolated_env
+from yadon_agents.infra.usage import StructuredOutputDecoder, append_usage_record
 
 __all__ = ["SubprocessClaudeRunner", "run_claude"]
 
 logger = logging.getLogger(__name__)
 
 
+def _spill_path(run_id: str | None) -> Path:
+    """run_id に対応するスピルファイルのパスを返す。"""
+    d = log_dir() / "outputs"
+    d.mkdir(exist_ok=True)
+    if not run_id:
+        run_id = f"run-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    return d / f"{safe_filename(run_id)}.log"
+
+
 class SubprocessClaudeRunner(LLMRunnerPort):
     """subprocess経由でLLM CLIを実行するアダプター。
 
     BACKEND_CONFIGS に基づいて複数のLLMバックエンドを支援。
     バックエンド固有のコマンドフラグやモデル名を動的に構築する。
+    各実行は専用のプロセスグループで起動され、tier別の資源制限が適用される。
+    失敗したバックエンドはフェイルオーバー順の次のバックエンドで再実行する。
+    バックエンドごとの同時実行数は AIMD リミッターで制御し、枠が空くまで待たせる。
+    リクエストレートはプロセス間共有のトークンバケット（infra/quota.py）で制限できる。
+    出力が一定時間途絶えた実行は停滞（stalled）として停止する。
+    YADON_ISOLATE_STATE が有効なら、ワーカーごとに分離した HOME / TMPDIR で CLI を起動する。
+    大きな出力は上限までメモリに保持し、全量は logs/outputs/ に書き出す。
     """
 
     def __init__(self, worker_number: int | None = None):
@@ -34,6 +78,18 @@ class SubprocessClaudeRunner(LLMRunnerPort):
             worker_number: ワーカー番号（ワーカー固有のバックエンド設定を使用する場合）
         """
         self.worker_number = worker_number
+        self._active: set[subprocess.Popen] = set()
+        self._active_lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """実行中の全LLMプロセスをプロセスグループごと停止し、同時実行枠の待機も打ち切る。"""
+        self._cancelled.set()
+        with self._active_lock:
+            procs = list(self._active)
+        for proc in procs:
+            logger.info("LLMプロセスをキャンセル: pid=%d", proc.pid)
+            kill_process_group(proc)
 
     def run(
         self,
@@ -55,15 +111,313 @@ class SubprocessClaudeRunner(LLMRunnerPort):
         Returns:
             (出力テキスト, リターンコード)
         """
-        # バックエンド設定を取得（ワーカー番号が指定されている場合はワーカー固有設定を使用）
-        if self.worker_number is not None:
-            backend_config = get_worker_backend_config(self.worker_number)
+        result = self.run_detailed(
+            prompt=prompt,
+            model_tier=model_tier,
+            cwd=cwd,
+            timeout=timeout,
+            output_format=output_format,
+        )
+        return result.output, result.returncode
+
+    @tracing.traced("llm.run")
+    def run_detailed(
+        self,
+        prompt: str,
+        model_tier: str,
+        cwd: str | None = None,
+        timeout: float = CLAUDE_DEFAULT_TIMEOUT,
+        output_format: str | None = None,
+        run_id: str | None = None,
+    ) -> LLMRunResult:
+        """LLMプロンプトを実行し、出力サイズやスピルファイルを含む結果を返す。
+
+        get_failover_chain() の順にバックエンドを試し、サーキットブレーカーが
+        遮断中のバックエンドは飛ばす。失敗（エラー・タイムアウト）した場合は
+        次のバックエンドで再実行する。返す結果は最後に実行したバックエンドのもので、
+        使用量は全試行の合計になる。
+
+        timeout は全試行を合わせた上限。呼び出し側（ヤドランの送信待ち）は timeout で
+        打ち切るので、各試行には残り時間を未実行のバックエンドと等分した時間だけを与え、
+        主バックエンドがタイムアウトしても後続のバックエンドが期限内に実行できるようにする。
+
+        出力は get_output_capture_limit() バイトまでメモリに保持し、
+        超過した場合は全量を logs/outputs/<run_id>.log に書き出して抜粋を返す。
+        構造化出力に対応したバックエンドでは使用量を解析して結果に付与し、
+        呼び出しごとに使用量台帳へ記録する。
+        """
+        deadline = time.monotonic() + timeout
+        chain = get_failover_chain(model_tier, self.worker_number)
+        tracing.annotate(tier=model_tier, run_id=run_id)
+        attempts: list[LLMRunResult] = []
+        skipped: list[str] = []
+
+        for i, name in enumerate(chain):
+            breaker = get_breaker(name)
+            if not breaker.allow():
+                logger.warning("%s は遮断中のためスキップ (tier=%s)", name, model_tier)
+                skipped.append(name)
+                continue
+
+            # 遮断中のスキップは時間を使わないので、最初の試行には timeout をそのまま与える
+            remaining = deadline - time.monotonic() if attempts else timeout
+            if remaining <= 0:
+                breaker.release()
+                logger.warning("%d秒の期限に達したため %s 以降は実行しません", int(timeout), name)
+                skipped.append(name)
+                break
+            # 遮断中でない後続のバックエンドにも同じだけの時間を残す
+            pending = 1 + sum(1 for later in chain[i + 1:] if get_breaker(later).state != OPEN)
+            budget = remaining / pending
+
+            attempt_id = run_id if not attempts or run_id is None else f"{run_id}.{name}"
+            started = time.monotonic()
+            with tracing.span("llm.attempt", backend=name) as attrs:
+                result, outcome = self._run_backend(
+                    BACKEND_CONFIGS[name], prompt, model_tier, cwd, budget, output_format, attempt_id,
+                )
+                attrs.update(outcome=outcome, returncode=result.returncode)
+            metrics.LLM_RUN_DURATION.observe(
+                time.monotonic() - started, backend=name, tier=model_tier, outcome=outcome,
+            )
+            if outcome == "rejected":
+                # ローカルの枠不足はバックエンドの健全性とは無関係なので記録しない
+                breaker.release()
+            else:
+                breaker.record("timeout" if outcome == "stalled" else outcome)
+            attempts.append(result)
+            if outcome == "success":
+                break
+            if i + 1 < len(chain):
+                logger.warning(
+                    "%s が失敗 (%s, rc=%d)、次のバックエンドに切り替えます", name, outcome, result.returncode,
+                )
+
+        if not attempts:
+            return LLMRunResult(
+                output=f"実行エラー: 全バックエンドが遮断中です ({', '.join(skipped)})",
+                returncode=1,
+                backend=chain[0],
+            )
+
+        final = attempts[-1]
+        if len(attempts) > 1:
+            resources = [a.resources for a in attempts if a.resources is not None]
+            final = replace(
+                final,
+                usage=sum_usage(a.usage for a in attempts if a.usage is not None),
+                resources=sum_resources(resources) if resources else None,
+            )
+        return final
+
+    def _run_backend(
+        self,
+        backend_config: LLMBackendConfig,
+        prompt: str,
+        model_tier: str,
+        cwd: str | None,
+        timeout: float,
+        output_format: str | None,
+        run_id: str | None,
+    ) -> tuple[LLMRunResult, str]:
+        """1つのバックエンドで1回実行する。
+
+        Returns:
+            (実行結果, 結果の種別 "success" / "error" / "timeout" / "stalled" / "rejected")
+            "rejected" は実行枠を確保できずにプロセスを起動しなかったことを表す
+        """
+        model = get_model_for_backend(backend_config, model_tier)
+
+        # 形式指定がなければ、対応バックエンドでは使用量取得のため構造化出力を要求する。
+        # 読みながら本文を取り出す（decoder）ので、保持上限とスピルファイルの対象は本文になる。
+        # 逐次出力される stream 形式を優先し、停滞監視は出力が逐次書き出される形式のときだけ有効にする
+        stall_timeout = get_stall_timeout()
+        decoder: StructuredOutputDecoder | None = None
+        if output_format is None and backend_config.usage_format is not None:
+            stream = backend_config.stream_output_format is not None
+            requested_format: str | None = backend_config.stream_output_format if stream else "json"
+            decoder = StructuredOutputDecoder(
+                backend_config.usage_format, stream=stream, max_pending=get_output_capture_limit(),
+            )
+            if not stream:
+                stall_timeout = None
         else:
-            backend_config = get_backend_config()
-        model = get_model_for_tier(model_tier)
+            requested_format = output_format
+            if not (backend_config.text_streams and output_format in (None, "text")):
+                stall_timeout = None
+        cmd, use_stdin = self._build_batch_command(backend_config, model, prompt, requested_format)
 
-        # コマンドを構築
-        cmd = [backend_config.command]
+        logger.info(
+            "%s batch 実行中 (tier=%s, model=%s, style=%s): %s...",
+            backend_config.name,
+            model_tier,
+            model,
+            backend_config.batch_prompt_style,
+            prompt[:80],
+        )
+
+        started: list[subprocess.Popen] = []
+
+        def on_start(proc: subprocess.Popen) -> None:
+            started.append(proc)
+            with self._active_lock:
+                self._active.add(proc)
+
+        # リクエスト枠・同時実行枠の待ちと実行を合わせて timeout 以内に収める
+        queued_at = time.monotonic()
+        deadline = queued_at + timeout
+
+        # プロセス間共有のリクエスト枠を消費する（設定がある場合のみ）
+        quota = get_quota_settings(backend_config.name, model_tier)
+        if quota.rate_per_minute is not None and not get_quota_ledger().acquire(
+            f"{backend_config.name}:{model_tier}", quota,
+            timeout=timeout, should_abort=self._cancelled.is_set,
+        ):
+            return LLMRunResult(
+                output=f"実行エラー: {backend_config.name} のリクエスト枠が不足しています (policy={quota.policy})",
+                returncode=1,
+                backend=backend_config.name,
+                model=model,
+                queue_ms=int((time.monotonic() - queued_at) * 1000),
+            ), "rejected"
+
+        # バックエンドの同時実行枠を確保する（空きがなければ待つ）
+        limiter = get_limiter(backend_config.name)
+        ticket = limiter.acquire(
+            timeout=max(deadline - time.monotonic(), 0.0), should_abort=self._cancelled.is_set,
+        )
+        queue_ms = int((time.monotonic() - queued_at) * 1000)
+        if ticket is None:
+            reason = "キャンセル" if self._cancelled.is_set() else f"{int(timeout)}秒待機"
+            return LLMRunResult(
+                output=f"実行エラー: {backend_config.name} の同時実行枠を確保できませんでした ({reason})",
+                returncode=1,
+                backend=backend_config.name,
+                model=model,
+                queue_ms=queue_ms,
+            ), "rejected"
+        if queue_ms >= 1000:
+            logger.info("%s の実行枠を %.1f 秒待機", backend_config.name, queue_ms / 1000)
+
+        signal = NEUTRAL
+        started_at = time.monotonic()
+        run_timeout = max(deadline - started_at, 0.0)
+        spill_path = _spill_path(run_id)
+        try:
+            result = run_process(
+                cmd,
+                input=prompt if use_stdin else None,
+                cwd=cwd,
+                timeout=run_timeout,
+                env=self._process_env(model_tier),
+                limits=get_process_limits(model_tier),
+                on_start=on_start,
+                max_capture=get_output_capture_limit(),
+                spill_path=spill_path,
+                stall_timeout=stall_timeout,
+                stdout_decoder=decoder,
+            )
+            usage = decoder.usage if decoder is not None else None
+            run_result = LLMRunResult(
+                output=result.stdout + result.stderr,
+                returncode=result.returncode,
+                output_bytes=result.output_bytes,
+                output_path=result.output_path,
+                resources=result.resources,
+            )
+            if result.returncode == 0:
+                outcome, signal = "success", SUCCESS
+            else:
+                outcome = "error"
+                # LLM の回答本文は「quota」「429」等に触れていても過負荷とは限らないので見ない
+                if is_rate_limited(result.stderr):
+                    signal = OVERLOAD
+        except ProcessStalled as e:
+            message = f"停滞: 出力が {int(e.idle)} 秒途絶えたため停止しました"
+            partial = (e.output or "") + (e.stderr or "")
+            if partial:
+                message = f"{message}\n{partial}"
+            usage = None
+            run_result = LLMRunResult(output=message, returncode=1, stalled=True, resources=e.resources)
+            outcome = "stalled"
+        except subprocess.TimeoutExpired as e:
+            message = f"タイムアウト ({round(run_timeout / 60)}分)"
+            partial = (e.output or "") + (e.stderr or "")
+            if isinstance(partial, str) and partial:
+                message = f"{message}\n{partial}"
+            usage = None
+            run_result = LLMRunResult(
+                output=message, returncode=1, resources=getattr(e, "resources", None),
+            )
+            outcome, signal = "timeout", OVERLOAD
+        except Exception as e:
+            usage = None
+            run_result = LLMRunResult(output=f"実行エラー: {e}", returncode=1)
+            outcome = "error"
+        finally:
+            with self._active_lock:
+                self._active.difference_update(started)
+            limiter.release(ticket, signal)
+        # スピルファイルが残ったとき（上限超過・中断）だけ古いものを間引く。毎回の glob を避ける
+        if spill_path.exists():
+            prune_oldest(spill_path.parent, "*.log", OUTPUT_SPILL_KEEP)
+
+        duration_ms = int((time.monotonic() - started_at) * 1000)
+        if usage is None:
+            usage = LLMUsage(duration_ms=duration_ms, unreported_calls=1)
+        else:
+            usage = replace(usage, duration_ms=duration_ms)
+        run_result = replace(
+            run_result, usage=usage, backend=backend_config.name, model=model, queue_ms=queue_ms,
+        )
+        self._record_usage(run_result, model_tier, run_id)
+        return run_result, outcome
+
+    def _process_env(self, model_tier: str) -> dict[str, str] | None:
+        """LLMサブプロセスの環境変数を返す。状態ディレクトリを分離しない場合は None（継承）。"""
+        if not get_state_isolation():
+            return None
+        name = f"worker-{self.worker_number}" if self.worker_number is not None else model_tier
+        try:
+            return isolated_env(name)
+        except OSError as e:
+            logger.warning("状態ディレクトリを準備できないため共有の HOME で実行します (%s): %s", name, e)
+            return None
+
+    def _record_usage(self, result: LLMRunResult, model_tier: str, run_id: str | None) -> None:
+        """使用量台帳に1呼び出し分のレコードを追記する。"""
+        usage = result.usage or LLMUsage()
+        append_usage_record({
+            "run_id": run_id,
+            "tier": model_tier,
+            "worker": self.worker_number,
+            "backend": result.backend,
+            "model": result.model,
+            "returncode": result.returncode,
+            "duration_ms": usage.duration_ms,
+            "api_duration_ms": usage.api_duration_ms,
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "cache_read_tokens": usage.cache_read_tokens,
+            "cache_creation_tokens": usage.cache_creation_tokens,
+            "cost_usd": round(usage.cost_usd, 6),
+            "reported": usage.unreported_calls == 0,
+            "resources": result.resources.to_dict() if result.resources else None,
+        })
+
+    @staticmethod
+    def _build_batch_command(
+        backend_config: LLMBackendConfig,
+        model: str,
+        prompt: str,
+        output_format: str | None,
+    ) -> tuple[list[str], bool]:
+        """バッチ実行用のコマンドを構築する。
+
+        Returns:
+            (コマンドライン引数リスト, プロンプトを標準入力で渡すか)
+        """
+        cmd = [backend_config.command, *backend_config.launcher_args]
 
         # バッチサブコマンドを追加（複数トークンの場合は分割）
         if backend_config.batch_subcommand:
@@ -90,6 +444,9 @@ class SubprocessClaudeRunner(LLMRunnerPort):
         # 出力形式が指定された場合のみフラグを追加
         if output_format:
             cmd.extend(["--output-format", output_format])
+            # claude -p の stream-json は --verbose が必須
+            if output_format == "stream-json" and backend_config.command == "claude":
+                cmd.append("--verbose")
 
         # バックエンド固有フラグを追加（--dangerously-skip-permissions等）
         # Claude専用フラグ
@@ -100,29 +457,7 @@ class SubprocessClaudeRunner(LLMRunnerPort):
         if backend_config.command == "gemini":
             cmd.append("--yolo")
 
-        logger.info(
-            "%s batch 実行中 (tier=%s, model=%s, style=%s): %s...",
-            backend_config.command,
-            model_tier,
-            model,
-            style,
-            prompt[:80],
-        )
-
-        try:
-            result = subprocess.run(
-                cmd,
-                input=prompt if use_stdin else None,
-                cwd=cwd,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-            )
-            return result.stdout + result.stderr, result.returncode
-        except subprocess.TimeoutExpired:
-            return f"タイムアウト ({int(timeout) // 60}分)", 1
-        except Exception as e:
-            return f"実行エラー: {e}", 1
+        return cmd, use_stdin
 
     def build_interactive_command(
         self,
@@ -146,7 +481,7 @@ class SubprocessClaudeRunner(LLMRunnerPort):
         model = get_model_for_tier(model_tier)
 
         # 基本コマンドを構築
-        cmd = [backend_config.command, "--model", model]
+        cmd = [backend_config.command, *backend_config.launcher_args, "--model", model]
 
         # システムプロンプトが指定された場合
         if system_prompt_path:
@@ -0,0 +1,163 @@
+"""バックエンドごとの適応的同時実行数制御（AIMD）
+
+成功するたびに同時実行数の上限を加算的に増やし（上限 L のとき 1/L ずつ、
+つまり L 件成功するごとに +1）、レート制限やタイムアウトを検出したら
+乗算的に減らす。上限に達している間は呼び出しを失敗させずに待たせる。
+
+リミッターはプロセス全体で共有される（GUIデーモン内の全ワーカーが同じ枠を使う）。
+同じ過負荷で同時に失敗した複数の呼び出しが上限を何度も削らないよう、
+前回の削減より後に開始した呼び出しの信号だけで削減する。
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from yadon_agents.config.agent import ConcurrencySettings, get_concurrency_settings
+
+__all__ = [
+    "SUCCESS",
+    "OVERLOAD",
+    "NEUTRAL",
+    "AdaptiveLimiter",
+    "is_rate_limited",
+    "get_limiter",
+    "limiter_snapshot",
+    "reset_limiters",
+]
+
+SUCCESS = "success"
+OVERLOAD = "overload"
+NEUTRAL = "neutral"
+
+_RATE_LIMIT_RE = re.compile(
+    r"\b429\b|\b529\b|rate[ _-]?limit|too many requests|quota|resource[ _]exhausted|overloaded",
+    re.IGNORECASE,
+)
+
+_WAIT_SLICE = 0.5
+
+
+def is_rate_limited(output: str) -> bool:
+    """失敗した呼び出しの出力がレート制限・過負荷を示しているかを判定する。"""
+    return bool(_RATE_LIMIT_RE.search(output))
+
+
+class AdaptiveLimiter:
+    """1バックエンド分の AIMD 同時実行数リミッター（スレッドセーフ）"""
+
+    def __init__(
+        self,
+        name: str,
+        settings: ConcurrencySettings | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.settings = settings or ConcurrencySettings()
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._limit = float(self.settings.initial)
+        self._in_flight = 0
+        self._waiting = 0
+        self._last_decrease = float("-inf")
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        with self._cond:
+            return self._slots()
+
+    def _slots(self) -> int:
+        return max(int(math.floor(self._limit)), self.settings.minimum)
+
+    def acquire(
+        self,
+        timeout: float | None = None,
+        should_abort: Callable[[], bool] | None = None,
+    ) -> float | None:
+        """実行枠を1つ確保する。空きがなければ待つ。
+
+        Args:
+            timeout: 最大待ち時間（秒）。None なら無期限
+            should_abort: 待機中に True を返したら諦める（キャンセル用）
+
+        Returns:
+            release() に渡すチケット（確保時刻）。確保できなければ None
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            self._waiting += 1
+            try:
+                while self._in_flight >= self._slots():
+                    if should_abort is not None and should_abort():
+                        return None
+                    wait = _WAIT_SLICE
+                    if deadline is not None:
+                        remaining = deadline - self._clock()
+                        if remaining <= 0:
+                            return None
+                        wait = min(wait, remaining)
+                    self._cond.wait(wait)
+                self._in_flight += 1
+                return self._clock()
+            finally:
+                self._waiting -= 1
+
+    def release(self, ticket: float, signal: str) -> None:
+        """実行枠を返却し、結果に応じて上限を調整する。
+
+        Args:
+            ticket: acquire() が返したチケット
+            signal: SUCCESS（加算増） / OVERLOAD（乗算減） / NEUTRAL（変更なし）
+        """
+        with self._cond:
+            self._in_flight = max(self._in_flight - 1, 0)
+            if signal == SUCCESS:
+                self._limit = min(self._limit + 1.0 / max(self._limit, 1.0), float(self.settings.maximum))
+            elif signal == OVERLOAD and ticket > self._last_decrease:
+                self._limit = max(self._limit * self.settings.decrease_factor, float(self.settings.minimum))
+                self._last_decrease = self._clock()
+                self._decreases += 1
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict[str, Any]:
+        """ステータス表示用の状態を返す。"""
+        with self._cond:
+            return {
+                "limit": self._slots(),
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "decreases": self._decreases,
+            }
+
+
+_registry: dict[str, AdaptiveLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> AdaptiveLimiter:
+    """バックエンド名に対応するプロセス共有のリミッターを返す（なければ作成）。"""
+    with _registry_lock:
+        limiter = _registry.get(name)
+        if limiter is None:
+            limiter = AdaptiveLimiter(name, get_concurrency_settings(name))
+            _registry[name] = limiter
+        return limiter
+
+
+def limiter_snapshot() -> dict[str, dict[str, Any]]:
+    """使用されたことのある全リミッターの状態を返す。"""
+    with _registry_lock:
+        limiters = list(_registry.values())
+    return {lim.name: lim.snapshot() for lim in limiters}
+
+
+def reset_limiters() -> None:
+    """全リミッターを破棄する（テスト用）。"""
+    with _registry_lock:
+        _registry.clear()
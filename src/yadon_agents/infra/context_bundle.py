@@ -0,0 +1,171 @@
+"""タスクごとのリポジトリ概要（コンテキストバンドル）
+
+大きなリポジトリでは、各ワーカーが最初の数ターンをディレクトリの一覧やキーファイルの
+読み込みに費やす。ヤドランはタスクごとに1回だけ次の内容をまとめたファイルを作り、
+全サブタスクの指示からそのファイルを参照させる。
+
+- ファイル一覧とサイズ（多すぎればディレクトリ単位の集計）
+- Python モジュールごとのトップレベルのクラス・関数・定数
+- README / CLAUDE.md 等の抜粋
+
+git 作業ツリーでは作業ツリーの内容（未コミットを含む）のツリー ID をキーにキャッシュし、
+変更がなければ前回のファイルを再利用する。書き出し先は logs/context/。
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import logging
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+from yadon_agents.config.agent import (
+    CONTEXT_BUNDLE_DOC_BYTES,
+    CONTEXT_BUNDLE_KEEP,
+    CONTEXT_BUNDLE_PY_MODULES,
+    CONTEXT_BUNDLE_TREE_FILES,
+)
+from yadon_agents.infra import tracing
+from yadon_agents.infra.change_manifest import scan_files
+from yadon_agents.infra.filenames import prune_oldest
+from yadon_agents.infra.process import log_dir
+from yadon_agents.infra.worktree import WorktreeError, is_git_repo, list_tree, tree_id
+
+__all__ = ["build_bundle"]
+
+logger = logging.getLogger(__name__)
+
+_DOC_FILES = ("README.md", "README.rst", "README.txt", "README", "CLAUDE.md", "AGENTS.md")
+_PY_MAX_BYTES = 256 * 1024
+
+
+def _cache_dir() -> Path:
+    d = log_dir() / "context"
+    d.mkdir(exist_ok=True)
+    return d
+
+
+def _format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size}B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f}KB"
+    return f"{size / (1024 * 1024):.1f}MB"
+
+
+def _file_tree(files: list[tuple[str, int]]) -> list[str]:
+    if len(files) <= CONTEXT_BUNDLE_TREE_FILES:
+        return [f"{path} ({_format_size(size)})" for path, size in files]
+    # 多すぎる場合は2階層までのディレクトリ単位で件数と合計サイズを示す
+    groups: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    for path, size in files:
+        parts = path.split("/")
+        key = "/".join(parts[:2]) + "/" if len(parts) > 2 else (parts[0] + "/" if len(parts) == 2 else path)
+        groups[key][0] += 1
+        groups[key][1] += size
+    return [
+        f"{key} ({count}件, {_format_size(total)})" if key.endswith("/") else f"{key} ({_format_size(total)})"
+        for key, (count, total) in sorted(groups.items())
+    ]
+
+
+def _symbols(path: Path) -> list[str]:
+    """モジュールのトップレベルの公開クラス・関数・定数名を返す。"""
+    try:
+        if path.stat().st_size > _PY_MAX_BYTES:
+            return []
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return []
+    names: list[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            names.append(f"class {node.name}")
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            names.append(f"def {node.name}()")
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names.extend(t.id for t in targets if isinstance(t, ast.Name) and t.id.isupper())
+    return [n for n in names if not n.split(" ")[-1].startswith("_")]
+
+
+def _python_symbols(project: Path, files: list[tuple[str, int]]) -> list[str]:
+    modules = sorted(
+        (path for path, _ in files if path.endswith(".py")),
+        key=lambda p: ("test" in p.split("/")[0] or "/test" in p, p),
+    )
+    lines: list[str] = []
+    for rel in modules[:CONTEXT_BUNDLE_PY_MODULES]:
+        symbols = _symbols(project / rel)
+        if symbols:
+            lines.append(f"- {rel}: {', '.join(symbols)}")
+    if len(modules) > CONTEXT_BUNDLE_PY_MODULES:
+        lines.append(f"- ... 他{len(modules) - CONTEXT_BUNDLE_PY_MODULES}モジュール")
+    return lines
+
+
+def _doc_excerpts(project: Path) -> list[str]:
+    sections: list[str] = []
+    for name in _DOC_FILES:
+        path = project / name
+        if not path.is_file():
+            continue
+        try:
+            with path.open("rb") as f:
+                data = f.read(CONTEXT_BUNDLE_DOC_BYTES + 1)
+        except OSError:
+            continue
+        text = data[:CONTEXT_BUNDLE_DOC_BYTES].decode("utf-8", errors="ignore")
+        if len(data) > CONTEXT_BUNDLE_DOC_BYTES:
+            text = text.rsplit("\n", 1)[0] + "\n...（以下省略）"
+        sections.append(f"## {name}（抜粋）\n\n{text.strip()}")
+    return sections
+
+
+def _render(project: Path, files: list[tuple[str, int]], tree: str | None) -> str:
+    origin = f"git ツリー {tree[:12]} 時点" if tree else "生成時点"
+    parts = [
+        f"# リポジトリ概要\n\n作業ディレクトリ: {project}\n（{origin}。ヤドランがタスクごとに自動生成）",
+        f"## ファイル一覧（{len(files)}件）\n\n" + "\n".join(_file_tree(files)),
+    ]
+    symbols = _python_symbols(project, files)
+    if symbols:
+        parts.append("## Python モジュールの主要シンボル\n\n" + "\n".join(symbols))
+    parts.extend(_doc_excerpts(project))
+    return "\n\n".join(parts) + "\n"
+
+
+@tracing.traced("context.bundle")
+def build_bundle(project_dir: str | Path) -> Path | None:
+    """project_dir のリポジトリ概要ファイルを作って（キャッシュがあれば再利用して）パスを返す。
+
+    作れない場合は None を返す（タスクの実行は妨げない）。
+    """
+    project = Path(project_dir).resolve()
+    try:
+        tree: str | None = None
+        if is_git_repo(project):
+            tree = tree_id(project)
+            files = list_tree(project, tree)
+        else:
+            scanned = scan_files(project)
+            if scanned is None:
+                return None
+            files = sorted((path.replace(os.sep, "/"), size) for path, (_, size) in scanned.items())
+        key = hashlib.sha256(f"{project}\0{tree or ''}".encode()).hexdigest()[:16]
+        cache = _cache_dir()
+        path = cache / f"{key}.md"
+        if tree and path.exists():
+            logger.info("リポジトリ概要のキャッシュを使用: %s", path)
+            return path
+        tmp = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp.write_text(_render(project, files, tree), encoding="utf-8")
+        os.replace(tmp, path)
+        prune_oldest(cache, "*.md", CONTEXT_BUNDLE_KEEP)
+        return path
+    except (WorktreeError, OSError) as e:
+        logger.warning("リポジトリ概要を作れません: %s", e)
+        return None
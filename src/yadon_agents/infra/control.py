@@ -0,0 +1,89 @@
+"""デーモンの制御ソケット（プロファイル・メモリ診断などの運用コマンド）
+
+エージェントのソケットは1接続ずつ処理するため、タスク実行中のエージェントには
+制御メッセージが届かない。GUIデーモンは別の Unixソケットで制御コマンドを受け付け、
+type ごとに登録したハンドラーを呼んで応答を返す（JSON over Unix socket、protocol.py と同じ形式）。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import socket
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from yadon_agents.infra import protocol as proto
+
+__all__ = ["ControlHandler", "ControlServer", "start_control_server"]
+
+logger = logging.getLogger(__name__)
+
+ControlHandler = Callable[[dict[str, Any]], dict[str, Any]]
+
+
+class ControlServer:
+    """制御コマンドを受け付けるサーバー（デーモンスレッド）"""
+
+    def __init__(self, socket_path: str, handlers: dict[str, ControlHandler]):
+        self.socket_path = socket_path
+        self.handlers = dict(handlers)
+        self._server: socket.socket | None = None
+        self._running = False
+
+    def start(self) -> None:
+        self._server = proto.create_server_socket(self.socket_path)
+        self._running = True
+        threading.Thread(target=self._serve, args=(self._server,), name="control", daemon=True).start()
+
+    def _serve(self, server: socket.socket) -> None:
+        while self._running:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._respond, args=(conn,), name="control-request", daemon=True).start()
+
+    def _respond(self, conn: socket.socket) -> None:
+        try:
+            conn.settimeout(5.0)
+            msg = proto.receive_message(conn)
+            msg_type = str(msg.get("type", ""))
+            handler = self.handlers.get(msg_type)
+            if handler is None:
+                response = {"type": "error", "message": f"不明な制御コマンド: {msg_type}"}
+            else:
+                conn.settimeout(None)
+                try:
+                    response = handler(msg)
+                except (ValueError, KeyError) as e:
+                    response = {"type": "error", "message": str(e)}
+            proto.send_response(conn, response)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug("制御コマンドの処理に失敗: %s", e)
+        finally:
+            conn.close()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._server is not None:
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server.close()
+            self._server = None
+        proto.cleanup_socket(self.socket_path)
+
+
+def start_control_server(handlers: dict[str, ControlHandler], prefix: str = "yadon") -> ControlServer | None:
+    """制御ソケットを公開する。起動に失敗してもデーモンは止めない。"""
+    server = ControlServer(proto.control_socket_path(prefix), handlers)
+    try:
+        server.start()
+    except OSError as e:
+        logger.warning("制御ソケットを起動できません: %s", e)
+        server.stop()
+        return None
+    return server
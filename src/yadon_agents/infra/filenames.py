@@ -0,0 +1,44 @@
+"""ログ・キャッシュのファイル名の整形と世代管理
+
+タスク ID・run_id はソケットのメッセージからそのまま届くため、`/` や `..` を含むと
+ログディレクトリの外に書き込めてしまう。ファイル名に使う前に safe_filename() を通す。
+タスクごとに増えるファイル（スピル・トレース・パッチ・リポジトリ概要）は prune_oldest() で間引く。
+
+tracing.py からも使うため、process.py 等の infra モジュールは import しない。
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+__all__ = ["safe_filename", "prune_oldest"]
+
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w.-]")
+
+
+def safe_filename(name: str) -> str:
+    """英数字・`_`・`.`・`-` 以外を `_` に置き換える。`.` だけの名前（`.` / `..`）も `_` にする。"""
+    safe = _UNSAFE_FILENAME_RE.sub("_", name)
+    if not safe.strip("."):
+        safe = safe.replace(".", "_") or "_"
+    return safe
+
+
+def prune_oldest(directory: Path, pattern: str, keep: int) -> list[Path]:
+    """directory の pattern に一致するファイルを新しい順に keep 個だけ残し、削除したパスを返す。"""
+    entries = []
+    for path in directory.glob(pattern):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue  # 別プロセスが先に消した
+    entries.sort(reverse=True)
+    removed = []
+    for _, old in entries[keep:]:
+        try:
+            old.unlink()
+        except OSError:
+            continue
+        removed.append(old)
+    return removed
@@ -0,0 +1,315 @@
+"""タスク履歴ストア（SQLite）
+
+_send が結果を表示すると結果は残らないため、ヤドランはタスク・フェーズ・サブタスクごとの
+所要時間・状態・バックエンド・使用量・出力を SQLite に記録する。
+yadon history / yadon show はここから読む。
+
+- タスクの出力は先頭 HISTORY_OUTPUT_MAX_CHARS 文字の抜粋だけを残す（全文はサブタスクの
+  output_path が指すスピルファイルにある）。常駐するデーモンで DB が際限なく大きくならないようにする
+- 書き込みはキューに積むだけで、専用のライタースレッドがまとめて1トランザクションで書く
+  （タスク処理の経路でディスク I/O を待たない）。キューが溢れたら記録を捨てる
+- WAL モードなので、デーモンが書いている間も CLI から読める
+- 既定の保存先は logs/history.sqlite3（YADON_HISTORY でパスを変更、`0` で無効）
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from yadon_agents.config.agent import (
+    HISTORY_BATCH_SIZE,
+    HISTORY_BATCH_WAIT,
+    HISTORY_OUTPUT_MAX_CHARS,
+    HISTORY_QUEUE_MAX,
+    get_history_path,
+)
+from yadon_agents.infra.process import log_dir
+
+__all__ = ["HistoryStore", "history_file", "get_history", "reset_history"]
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    instruction TEXT,
+    project_dir TEXT,
+    status TEXT,
+    started REAL,
+    finished REAL,
+    duration REAL,
+    summary TEXT,
+    output TEXT,
+    usage TEXT,
+    resources TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_started ON tasks (started);
+CREATE INDEX IF NOT EXISTS tasks_status_started ON tasks (status, started);
+CREATE TABLE IF NOT EXISTS phases (
+    task_id TEXT,
+    idx INTEGER,
+    name TEXT,
+    status TEXT,
+    subtasks INTEGER,
+    started REAL,
+    duration REAL,
+    PRIMARY KEY (task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS subtasks (
+    subtask_id TEXT PRIMARY KEY,
+    task_id TEXT,
+    phase TEXT,
+    worker TEXT,
+    status TEXT,
+    backend TEXT,
+    started REAL,
+    duration REAL,
+    summary TEXT,
+    output_path TEXT,
+    usage TEXT,
+    resources TEXT
+);
+CREATE INDEX IF NOT EXISTS subtasks_task ON subtasks (task_id, started);
+CREATE INDEX IF NOT EXISTS subtasks_worker ON subtasks (worker, started);
+"""
+
+_COLUMNS = {
+    "tasks": ("task_id", "instruction", "project_dir", "status", "started", "finished", "duration",
+              "summary", "output", "usage", "resources"),
+    "phases": ("task_id", "idx", "name", "status", "subtasks", "started", "duration"),
+    "subtasks": ("subtask_id", "task_id", "phase", "worker", "status", "backend", "started", "duration",
+                 "summary", "output_path", "usage", "resources"),
+}
+_JSON_COLUMNS = ("usage", "resources")
+_STOP = object()
+
+
+def _connect(path: Path, read_only: bool = False) -> sqlite3.Connection:
+    if read_only:
+        conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", timeout=10.0, uri=True)
+    else:
+        conn = sqlite3.connect(str(path), timeout=10.0)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _row(table: str, fields: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple(
+        json.dumps(fields[c], ensure_ascii=False) if c in _JSON_COLUMNS and fields.get(c) is not None
+        else fields.get(c)
+        for c in _COLUMNS[table]
+    )
+
+
+def _excerpt(text: str | None) -> str | None:
+    if text is None or len(text) <= HISTORY_OUTPUT_MAX_CHARS:
+        return text
+    omitted = len(text) - HISTORY_OUTPUT_MAX_CHARS
+    return f"{text[:HISTORY_OUTPUT_MAX_CHARS]}\n…（{omitted}文字省略。全文は各サブタスクの出力ファイルを参照）"
+
+
+def _decode(row: sqlite3.Row) -> dict[str, Any]:
+    data = dict(row)
+    for column in _JSON_COLUMNS:
+        if data.get(column):
+            data[column] = json.loads(data[column])
+    return data
+
+
+class HistoryStore:
+    """タスク履歴の SQLite ストア。record_* はキューに積むだけで、ライタースレッドが書く。"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=HISTORY_QUEUE_MAX)
+        self._writer: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    # --- 書き込み（キュー経由） ---
+
+    def _put(self, table: str, fields: dict[str, Any]) -> None:
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+                self._writer.start()
+        try:
+            self._queue.put_nowait((table, _row(table, fields)))
+        except queue.Full:
+            logger.warning("タスク履歴の書き込みが追いつかないため記録を捨てます: %s", fields.get("task_id"))
+
+    def record_task(self, **fields: Any) -> None:
+        """タスクを記録する（同じ task_id は上書き）。出力は抜粋にして保存する。"""
+        if fields.get("output") is not None:
+            fields["output"] = _excerpt(fields["output"])
+        self._put("tasks", fields)
+
+    def record_phase(self, **fields: Any) -> None:
+        """フェーズを記録する（task_id と idx で上書き）。"""
+        self._put("phases", fields)
+
+    def record_subtask(self, **fields: Any) -> None:
+        """サブタスク（ワーカーへの1回の送信）を記録する。"""
+        self._put("subtasks", fields)
+
+    def flush(self) -> None:
+        """キューに積んだ記録がすべて書かれるまで待つ。"""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """残りを書いてライタースレッドを止める。"""
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join(timeout=10)
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._schema_ready = True
+
+    def _write_loop(self) -> None:
+        conn: sqlite3.Connection | None = None
+        while True:
+            batch = [self._queue.get()]
+            # 少し待って同時期の記録をまとめ、1トランザクションで書く
+            try:
+                while len(batch) < HISTORY_BATCH_SIZE and batch[-1] is not _STOP:
+                    batch.append(self._queue.get(timeout=HISTORY_BATCH_WAIT))
+            except queue.Empty:
+                pass
+            rows = [item for item in batch if item is not _STOP]
+            try:
+                if rows:
+                    if conn is None:
+                        self.path.parent.mkdir(parents=True, exist_ok=True)
+                        conn = _connect(self.path)
+                        conn.execute("PRAGMA synchronous=NORMAL")
+                        self._ensure_schema(conn)
+                    with conn:
+                        for table, values in rows:
+                            placeholders = ", ".join("?" * len(values))
+                            conn.execute(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", values)
+            except sqlite3.Error as e:
+                logger.warning("タスク履歴を書き込めません: %s", e)
+                if conn is not None:
+                    conn.close()
+                conn = None
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(rows) < len(batch):
+                if conn is not None:
+                    conn.close()
+                return
+
+    # --- 読み出し ---
+
+    def _read(self) -> sqlite3.Connection | None:
+        # 読み出しは読み取り専用で開き、PRAGMA やスキーマ作成はライターに任せる
+        if not self.path.exists():
+            return None
+        try:
+            return _connect(self.path, read_only=True)
+        except sqlite3.Error as e:
+            logger.warning("タスク履歴を開けません: %s", e)
+            return None
+
+    def recent(self, limit: int = 20, status: str | None = None, since: float | None = None) -> list[dict[str, Any]]:
+        """新しい順にタスクを返す（status・開始時刻で絞り込める）。"""
+        conn = self._read()
+        if conn is None:
+            return []
+        where, params = [], []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if since is not None:
+            where.append("started >= ?")
+            params.append(since)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        try:
+            rows = conn.execute(
+                f"SELECT task_id, instruction, status, started, duration, summary, usage FROM tasks {clause} "
+                "ORDER BY started DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            # ライターがまだスキーマを作っていない
+            logger.debug("タスク履歴を読めません: %s", e)
+            return []
+        finally:
+            conn.close()
+        return [_decode(r) for r in rows]
+
+    def task(self, task_id: str) -> dict[str, Any] | None:
+        """task_id（一意な前方一致でもよい）のタスクをフェーズ・サブタスク付きで返す。"""
+        conn = self._read()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+            if row is None:
+                matches = conn.execute(
+                    "SELECT * FROM tasks WHERE task_id >= ? AND task_id < ? LIMIT 2",
+                    (task_id, task_id + "\uffff"),
+                ).fetchall()
+                if len(matches) != 1:
+                    return None
+                row = matches[0]
+            task = _decode(row)
+            task["phases"] = [
+                dict(r) for r in conn.execute("SELECT * FROM phases WHERE task_id = ? ORDER BY idx", (task["task_id"],))
+            ]
+            task["subtasks"] = [
+                _decode(r) for r in conn.execute(
+                    "SELECT * FROM subtasks WHERE task_id = ? ORDER BY started", (task["task_id"],),
+                )
+            ]
+        except sqlite3.OperationalError as e:
+            logger.debug("タスク履歴を読めません: %s", e)
+            return None
+        finally:
+            conn.close()
+        return task
+
+
+_stores: dict[Path, HistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def history_file() -> Path | None:
+    """タスク履歴のファイルのパスを返す（無効なら None）。"""
+    path = get_history_path()
+    if path is None:
+        return log_dir() / "history.sqlite3"
+    return Path(path) if path else None
+
+
+def get_history() -> HistoryStore | None:
+    """現在の設定のストアを返す（プロセス内で共有、無効なら None）。"""
+    path = history_file()
+    if path is None:
+        return None
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = HistoryStore(path)
+        return store
+
+
+def reset_history() -> None:
+    """共有ストアのライタースレッドを止めて破棄する（テスト用）。"""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
@@ -0,0 +1,74 @@
+"""ファイルリース — 同じパスを触るサブタスクの同時実行を防ぐ
+
+ヤドランは各サブタスクが触るパス（宣言、または指示文からの推定）のリースを取得してから
+ワーカーに配分し、完了時に解放する。リースが重なる（同じパス、または一方が他方の
+ディレクトリ配下）サブタスクは、先行するサブタスクの完了まで待たされる。
+パスが分からないサブタスクはリースを取らない（従来どおり並列に実行する）。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any
+
+__all__ = ["paths_overlap", "schedule_order", "LeaseTable"]
+
+
+def _overlaps(a: str, b: str) -> bool:
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
+
+
+def paths_overlap(a: frozenset[str], b: frozenset[str]) -> bool:
+    """2つのパス集合に重なり（同一パス、または親子関係）があるかを返す。"""
+    return any(_overlaps(x, y) for x in a for y in b)
+
+
+def schedule_order(paths: Mapping[int, frozenset[str]]) -> list[int]:
+    """同時に実行できるサブタスクが最も多くなるよう、実行順を並べ替える。
+
+    競合の少ないサブタスクから貪欲に独立集合を作り、それを先頭に、残りを後ろに並べる。
+    先頭の集合は最初から並列に走り、残りは競合相手の完了を待つ。
+    """
+    keys = sorted(paths)
+    conflicts = {
+        k: sum(1 for other in keys if other != k and paths_overlap(paths[k], paths[other])) for k in keys
+    }
+    candidates = sorted(keys, key=lambda k: (conflicts[k], k))
+    first: list[int] = []
+    for k in candidates:
+        if all(not paths_overlap(paths[k], paths[j]) for j in first):
+            first.append(k)
+    return first + [k for k in candidates if k not in first]
+
+
+class LeaseTable:
+    """保持者（ワーカー名）ごとのパスリース（スレッドセーフ）"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._leases: dict[str, tuple[str, frozenset[str], float]] = {}
+
+    def try_acquire(self, holder: str, task_id: str, paths: frozenset[str]) -> bool:
+        """他の保持者のリースと重ならなければ取得して True を返す。"""
+        with self._lock:
+            for other, (_, held, _) in self._leases.items():
+                if other != holder and paths_overlap(paths, held):
+                    return False
+            if paths:
+                self._leases[holder] = (task_id, paths, time.time())
+            return True
+
+    def release(self, holder: str) -> None:
+        with self._lock:
+            self._leases.pop(holder, None)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """ステータス表示用の現在のリースを返す。"""
+        now = time.time()
+        with self._lock:
+            return {
+                holder: {"task": task_id, "paths": sorted(paths), "held_for": round(now - since, 1)}
+                for holder, (task_id, paths, since) in self._leases.items()
+            }
@@ -0,0 +1,246 @@
+"""デーモンのメモリ診断（RSS・オブジェクト数の計測と tracemalloc の差分）
+
+GUIデーモンは何日も動き続けるため、タスクをまたいで溜まるもの（結果・スレッド・吹き出し・ソケット）を
+再起動せずに追えるようにする。
+
+- 定期計測: MemoryMonitor が一定間隔（YADON_MEMORY_INTERVAL）で RSS・スレッド数・ファイル記述子数・
+  GC が追跡しているオブジェクト数をメトリクスのゲージに書く
+- "memory" 制御コマンド: 型ごとのオブジェクト数と、tracemalloc が有効なら確保箇所ごとのメモリの
+  スナップショットを取り、前回のスナップショットからの増分が大きい順に返す。
+  tracemalloc は YADON_TRACEMALLOC=<フレーム数> で起動時から、または制御コマンドで途中から有効にする
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+from yadon_agents.config.agent import MEMORY_TOP_SITES, MEMORY_TOP_TYPES, get_memory_interval
+from yadon_agents.infra import metrics
+
+__all__ = [
+    "GROUPS", "rss_bytes", "open_fds", "sample", "update_gauges", "MemoryMonitor", "start_memory_monitor",
+    "start_tracing", "stop_tracing", "take", "control_handler",
+]
+
+logger = logging.getLogger(__name__)
+
+GROUPS = ("lineno", "traceback", "filename")
+
+# 計測そのものやインポート機構の確保はノイズになるので除く
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_lock = threading.Lock()
+_previous: tracemalloc.Snapshot | None = None
+_previous_types: Counter[str] | None = None
+
+
+def rss_bytes() -> int | None:
+    """現在の RSS（バイト）。/proc がなければ最大 RSS で代用する。"""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss は Linux では KB、macOS ではバイト
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(max_rss if sys.platform == "darwin" else max_rss * 1024)
+
+
+def open_fds() -> int | None:
+    """開いているファイル記述子の数（数えられなければ None）。"""
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
+
+
+def sample() -> dict[str, Any]:
+    """RSS・スレッド数・ファイル記述子数・GC 追跡オブジェクト数・tracemalloc の確保量をまとめる。"""
+    traced = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+    return {
+        "rss_bytes": rss_bytes(),
+        "threads": threading.active_count(),
+        "open_fds": open_fds(),
+        "gc_objects": len(gc.get_objects()),
+        "tracemalloc_bytes": traced[0] if traced else None,
+        "tracemalloc_peak_bytes": traced[1] if traced else None,
+    }
+
+
+def update_gauges() -> dict[str, Any]:
+    """sample() の値をメトリクスのゲージに書き、その値を返す。"""
+    values = sample()
+    for gauge, key in (
+        (metrics.PROCESS_RSS_BYTES, "rss_bytes"),
+        (metrics.PROCESS_THREADS, "threads"),
+        (metrics.PROCESS_OPEN_FDS, "open_fds"),
+        (metrics.GC_OBJECTS, "gc_objects"),
+        (metrics.TRACEMALLOC_BYTES, "tracemalloc_bytes"),
+    ):
+        if values[key] is not None:
+            gauge.set(values[key])
+    return values
+
+
+class MemoryMonitor:
+    """一定間隔で update_gauges() を呼ぶデーモンスレッド"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="memory-monitor", daemon=True)
+        self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                update_gauges()
+            except Exception as e:
+                logger.debug("メモリの計測に失敗: %s", e)
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+def start_memory_monitor() -> MemoryMonitor | None:
+    """設定された間隔でメモリの定期計測を始める（間隔が 0 なら None）。"""
+    interval = get_memory_interval()
+    if interval <= 0:
+        return None
+    monitor = MemoryMonitor(interval)
+    monitor.start()
+    return monitor
+
+
+def start_tracing(frames: int) -> bool:
+    """tracemalloc をトレースバック frames 段で有効にする（既に有効なら False）。"""
+    global _previous
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start(max(frames, 1))
+    with _lock:
+        _previous = None
+    logger.info("tracemalloc を有効にしました（%d フレーム）", max(frames, 1))
+    return True
+
+
+def stop_tracing() -> bool:
+    """tracemalloc を止めて前回のスナップショットを捨てる（有効でなければ False）。"""
+    global _previous
+    if not tracemalloc.is_tracing():
+        return False
+    tracemalloc.stop()
+    with _lock:
+        _previous = None
+    return True
+
+
+def _type_name(obj: object) -> str:
+    cls = type(obj)
+    module = cls.__module__
+    return cls.__qualname__ if module == "builtins" else f"{module}.{cls.__qualname__}"
+
+
+def _type_counts() -> Counter[str]:
+    return Counter(_type_name(obj) for obj in gc.get_objects())
+
+
+def _site(stat: tracemalloc.Statistic | tracemalloc.StatisticDiff, group: str) -> dict[str, Any]:
+    # Traceback は古いフレームから順に並ぶので、確保した箇所は末尾
+    frame = stat.traceback[-1]
+    site: dict[str, Any] = {
+        "site": frame.filename if group == "filename" else f"{frame.filename}:{frame.lineno}",
+        "size": stat.size,
+        "count": stat.count,
+        "size_diff": getattr(stat, "size_diff", None),
+        "count_diff": getattr(stat, "count_diff", None),
+    }
+    if group == "traceback":
+        site["traceback"] = stat.traceback.format()
+    return site
+
+
+def take(top: int = MEMORY_TOP_SITES, group: str = "lineno", types: int = MEMORY_TOP_TYPES) -> dict[str, Any]:
+    """スナップショットを取り、前回からの増分が大きい確保箇所と型を返す。
+
+    初回（baseline=True）は増分の代わりに現在の大きい順。tracemalloc が無効なら確保箇所は空で、
+    型ごとのオブジェクト数だけを比べる。
+    """
+    global _previous, _previous_types
+    if group not in GROUPS:
+        raise ValueError(f"集計の単位が不正です: {group}（{' / '.join(GROUPS)}）")
+    with _lock:
+        gc.collect()
+        counts = _type_counts()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS) if tracemalloc.is_tracing() else None
+        previous, previous_types = _previous, _previous_types
+        _previous, _previous_types = snapshot, counts
+    sites: list[dict[str, Any]] = []
+    if snapshot is not None:
+        stats = snapshot.compare_to(previous, group) if previous is not None else snapshot.statistics(group)
+        sites = [_site(stat, group) for stat in stats[:top]]
+    if previous_types is None:
+        growth = [{"type": name, "count": count, "count_diff": None} for name, count in counts.most_common(types)]
+    else:
+        diffs = sorted(
+            ((name, counts.get(name, 0) - previous_types.get(name, 0)) for name in set(counts) | set(previous_types)),
+            key=lambda item: -abs(item[1]),
+        )
+        growth = [
+            {"type": name, "count": counts.get(name, 0), "count_diff": diff}
+            for name, diff in diffs[:types] if diff
+        ]
+    return {
+        "type": "memory",
+        "tracing": snapshot is not None,
+        "baseline": previous_types is None or (snapshot is not None and previous is None),
+        "group": group,
+        "sites": sites,
+        "types": growth,
+        **update_gauges(),
+    }
+
+
+def control_handler() -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """制御ソケットの "memory" コマンドのハンドラーを返す。
+
+    {"start": フレーム数, "stop", "top", "group"} を受け取り、take() の結果を返す。
+    """
+    def handle(msg: dict[str, Any]) -> dict[str, Any]:
+        if msg.get("stop"):
+            return {"type": "memory", "stopped": stop_tracing(), **update_gauges()}
+        if msg.get("start"):
+            start_tracing(int(msg["start"]))
+        top = msg.get("top")
+        return take(
+            top=int(top) if top is not None else MEMORY_TOP_SITES,
+            group=str(msg.get("group") or "lineno"),
+        )
+    return handle
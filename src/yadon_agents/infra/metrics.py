@@ -0,0 +1,420 @@
+"""メトリクス（カウンター・ゲージ・ヒストグラム）と Prometheus 形式での公開
+
+GUIデーモン内の全エージェントが同じプロセス共有のレジストリに記録し、
+デーモンは Unixソケット（既定 /tmp/<prefix>-metrics.sock）と、指定があれば
+localhost の TCP ポートで Prometheus テキスト形式（version 0.0.4）を返す。
+HTTP/1.0 で応答するため、`curl --unix-socket /tmp/yadon-metrics.sock http://localhost/metrics`
+や Prometheus / node exporter からそのまま取得できる。
+
+バックエンドの同時実行数やサーキットブレーカーのように既に状態を持つものは、
+取得時に集めるコレクター（register_collector）で公開する。
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import socket
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+
+from yadon_agents.config.agent import get_metrics_port, get_metrics_socket
+from yadon_agents.infra import protocol as proto
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "REGISTRY",
+    "Family",
+    "register_collector",
+    "render",
+    "MetricsServer",
+    "start_metrics_server",
+]
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+LabelKey = tuple[str, ...]
+
+_INF_LABEL = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: ラベルが一致しません: {sorted(labels)} != {sorted(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """単調増加するカウンター"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> dict[LabelKey, float]:
+        """ラベル値の組 -> 値 を返す。"""
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """増減する現在値"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> dict[LabelKey, float]:
+        """ラベル値の組 -> 値 を返す。"""
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items
+        ]
+
+
+@dataclass
+class _HistogramState:
+    counts: list[int]
+    total: float = 0.0
+    count: int = 0
+
+
+class Histogram(_Metric):
+    """累積バケットのヒストグラム"""
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DURATION_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._states: dict[LabelKey, _HistogramState] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _HistogramState(counts=[0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state.counts[i] += 1
+            state.total += value
+            state.count += 1
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            state = self._states.get(self._key(labels))
+            return state.count if state else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, _HistogramState(list(s.counts), s.total, s.count)) for k, s in self._states.items())
+        lines = self._header()
+        for key, state in items:
+            for bound, n in zip(self.buckets, state.counts):
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {n}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, _INF_LABEL)} {state.count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state.total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state.count}")
+        return lines
+
+
+@dataclass(frozen=True)
+class Family:
+    """コレクターが返すメトリクス1種類分（ゲージまたはカウンター）"""
+    name: str
+    help: str
+    kind: str
+    samples: list[tuple[dict[str, str], float]] = field(default_factory=list)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.samples:
+            lines.append(f"{self.name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return lines
+
+
+Collector = Callable[[], Iterable[Family]]
+
+
+class Registry:
+    """メトリクスとコレクターの登録先（スレッドセーフ）"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DURATION_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))  # type: ignore[return-value]
+
+    def register_collector(self, collector: Collector) -> None:
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus テキスト形式で全メトリクスを返す。"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                for family in collector():
+                    lines.extend(family.render())
+            except Exception as e:
+                logger.warning("メトリクスの収集に失敗: %s", e)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def register_collector(collector: Collector) -> None:
+    REGISTRY.register_collector(collector)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# --- メトリクス定義 ---
+
+TASKS = REGISTRY.counter("yadon_tasks_total", "ヤドランが完了したタスク数", ["status"])
+TASKS_IN_PROGRESS = REGISTRY.gauge("yadon_tasks_in_progress", "実行中のタスク数（エージェント別）", ["agent"])
+TASK_DURATION = REGISTRY.histogram("yadon_task_duration_seconds", "タスク全体の所要時間")
+PHASE_DURATION = REGISTRY.histogram("yadon_phase_duration_seconds", "フェーズの所要時間", ["phase"])
+SUBTASKS = REGISTRY.counter("yadon_subtasks_total", "ワーカーに配分したサブタスク数", ["worker", "status"])
+SUBTASKS_WAITING = REGISTRY.gauge("yadon_subtasks_waiting", "ファイルリース待ちのサブタスク数")
+DISPATCH_ERRORS = REGISTRY.counter("yadon_dispatch_errors_total", "ワーカーへの送信失敗数", ["worker"])
+LLM_RUN_DURATION = REGISTRY.histogram(
+    "yadon_llm_run_duration_seconds", "LLM 呼び出し1回（バックエンドごとの試行）の所要時間",
+    ["backend", "tier", "outcome"],
+)
+SOCKET_CONNECTIONS = REGISTRY.counter(
+    "yadon_socket_connections_total", "エージェントソケットが受け付けた接続数", ["agent", "type"],
+)
+SOCKET_CONNECTIONS_ACTIVE = REGISTRY.gauge(
+    "yadon_socket_connections_active", "処理中のエージェントソケット接続数", ["agent"],
+)
+PROCESS_RSS_BYTES = REGISTRY.gauge("yadon_process_rss_bytes", "デーモンの常駐メモリ（RSS）")
+PROCESS_THREADS = REGISTRY.gauge("yadon_process_threads", "デーモンのスレッド数")
+PROCESS_OPEN_FDS = REGISTRY.gauge("yadon_process_open_fds", "デーモンが開いているファイル記述子の数")
+GC_OBJECTS = REGISTRY.gauge("yadon_gc_objects", "GC が追跡しているオブジェクト数")
+TRACEMALLOC_BYTES = REGISTRY.gauge("yadon_tracemalloc_bytes", "tracemalloc が追跡している確保済みメモリ")
+
+
+def _backend_families() -> Iterable[Family]:
+    from yadon_agents.infra.circuit_breaker import breaker_snapshot
+    from yadon_agents.infra.concurrency import limiter_snapshot
+
+    limiters = limiter_snapshot()
+    for key, help in (
+        ("limit", "バックエンドの同時実行数の上限"),
+        ("in_flight", "バックエンドで実行中の LLM 呼び出し数"),
+        ("waiting", "バックエンドの同時実行枠を待っている呼び出し数"),
+    ):
+        name = "yadon_backend_concurrency_limit" if key == "limit" else f"yadon_backend_{key}"
+        yield Family(name, help, "gauge", [({"backend": b}, s.get(key, 0)) for b, s in sorted(limiters.items())])
+    breakers = breaker_snapshot()
+    yield Family(
+        "yadon_backend_breaker_open", "サーキットブレーカーが遮断中なら 1", "gauge",
+        [({"backend": b}, 1.0 if s.get("state") == "open" else 0.0) for b, s in sorted(breakers.items())],
+    )
+
+
+register_collector(_backend_families)
+
+
+# --- 公開サーバー ---
+
+
+class MetricsServer:
+    """Unixソケット・TCP で Prometheus テキスト形式を返すサーバー（デーモンスレッド）"""
+
+    def __init__(self, socket_path: str | None = None, port: int | None = None):
+        self.socket_path = socket_path
+        self.port = port
+        self._sockets: list[socket.socket] = []
+        self._running = False
+
+    def start(self) -> None:
+        if self.socket_path and hasattr(socket, "AF_UNIX"):
+            self._sockets.append(proto.create_server_socket(self.socket_path))
+        if self.port:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind(("127.0.0.1", self.port))
+                sock.listen(16)
+            except OSError:
+                sock.close()
+                raise
+            self.port = sock.getsockname()[1]
+            self._sockets.append(sock)
+        self._running = True
+        for sock in self._sockets:
+            threading.Thread(target=self._serve, args=(sock,), name="metrics", daemon=True).start()
+
+    def _serve(self, server: socket.socket) -> None:
+        while self._running:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._respond, args=(conn,), daemon=True).start()
+
+    def _respond(self, conn: socket.socket) -> None:
+        try:
+            conn.settimeout(5.0)
+            request = b""
+            while b"\r\n\r\n" not in request and b"\n\n" not in request and len(request) < 8192:
+                chunk = conn.recv(1024)
+                if not chunk:
+                    break
+                request += chunk
+            body = render().encode("utf-8")
+            conn.sendall(
+                b"HTTP/1.0 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+        except OSError as e:
+            logger.debug("メトリクスの応答に失敗: %s", e)
+        finally:
+            conn.close()
+
+    def stop(self) -> None:
+        self._running = False
+        for sock in self._sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        self._sockets.clear()
+        if self.socket_path:
+            proto.cleanup_socket(self.socket_path)
+
+
+def start_metrics_server(prefix: str = "yadon") -> MetricsServer | None:
+    """設定に従ってメトリクスサーバーを起動する（無効なら None）。起動に失敗してもデーモンは止めない。"""
+    path = get_metrics_socket()
+    if path is None:
+        path = proto.metrics_socket_path(prefix)
+    server = MetricsServer(path or None, get_metrics_port())
+    if not server.socket_path and not server.port:
+        return None
+    try:
+        server.start()
+    except OSError as e:
+        logger.warning("メトリクスサーバーを起動できません: %s", e)
+        server.stop()
+        return None
+    endpoints = [server.socket_path] if server.socket_path else []
+    if server.port:
+        endpoints.append(f"127.0.0.1:{server.port}")
+    logger.info("メトリクス公開: %s", ", ".join(endpoints))
+    return server
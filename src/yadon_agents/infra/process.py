@@ -1,12 +1,56 @@
-"""プロセス管理 — ログディレクトリ"""
+"""プロセス管理 — ログディレクトリ、LLMサブプロセスの起動と終了
+
+LLM CLI は自身の子プロセス（テストランナー、言語サーバー、node ワーカー等）を
+生成する。直下の子だけを kill すると孫プロセスが孤児として残るため、
+run_process() は各実行を専用のセッション（プロセスグループ）で起動し、
+タイムアウト・キャンセル・終了時にグループごと停止する。
+出力は先頭・末尾のみメモリに保持し、全量はスピルファイルへ書き出せる。
+stdout_decoder を渡すと、構造化出力を読みながら変換した結果（本文）を保持・スピルする。
+stall_timeout を指定すると、出力が途絶えたまま一定時間経過した実行も停止する。
+POSIX では子プロセスを wait4() で回収し、実行ごとの資源使用量（rusage）を記録する。
+nice・CPU アフィニティ・I/O 優先度（後の2つは Linux のみ）は起動直後に親から設定し、
+preexec_fn は明示的に設定された rlimit にだけ使う（マルチスレッドからの fork 後に任意のコードを動かさない）。
+"""
 
 from __future__ import annotations
 
+import functools
+import logging
+import os
+import platform
+import signal
+import subprocess
+import sys
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
 
 from yadon_agents import PROJECT_ROOT
+from yadon_agents.config.agent import PROCESS_KILL_GRACE, ProcessLimits, get_daemon_cpus
+from yadon_agents.domain.run_result import ResourceUsage
+from yadon_agents.infra import tracing
+
+__all__ = [
+    "log_dir",
+    "ProcessResult",
+    "ProcessTimeout",
+    "ProcessStalled",
+    "OutputDecoder",
+    "run_process",
+    "kill_process_group",
+    "apply_daemon_affinity",
+]
+
+logger = logging.getLogger(__name__)
 
-__all__ = ["log_dir"]
+_IS_POSIX = os.name == "posix"
+_READ_CHUNK = 65536
+_WAIT_SLICE = 1.0
 
 
 def log_dir() -> Path:
@@ -14,3 +58,560 @@ def log_dir() -> Path:
     d = PROJECT_ROOT / "logs"
     d.mkdir(exist_ok=True)
     return d
+
+
+@dataclass(frozen=True)
+class ProcessResult:
+    """run_process() の実行結果"""
+    stdout: str
+    stderr: str
+    returncode: int
+    output_bytes: int = 0
+    """stdout + stderr の総バイト数（切り詰め前）"""
+    output_path: str | None = None
+    """全出力のスピルファイル（切り詰めが発生した場合のみ）"""
+    resources: ResourceUsage | None = None
+    """資源使用量（POSIX のみ）"""
+
+
+class ProcessTimeout(subprocess.TimeoutExpired):
+    """タイムアウトで停止した（停止までの資源使用量を保持する）"""
+
+    def __init__(
+        self,
+        cmd: Sequence[str],
+        timeout: float,
+        output: str | None = None,
+        stderr: str | None = None,
+        resources: ResourceUsage | None = None,
+    ):
+        super().__init__(list(cmd), timeout, output=output, stderr=stderr)
+        self.resources = resources
+
+
+class ProcessStalled(ProcessTimeout):
+    """出力が stall_timeout 秒以上途絶えたため停止した"""
+
+    def __init__(
+        self,
+        cmd: Sequence[str],
+        idle: float,
+        output: str | None = None,
+        stderr: str | None = None,
+        resources: ResourceUsage | None = None,
+    ):
+        super().__init__(cmd, idle, output=output, stderr=stderr, resources=resources)
+        self.idle = idle
+
+    def __str__(self) -> str:
+        return f"Command '{self.cmd}' stalled: no output for {self.idle:.0f} seconds"
+
+
+class _Progress:
+    """最後に出力を受け取った時刻（パイプ読み取りスレッドが更新する）"""
+
+    def __init__(self) -> None:
+        self.last = time.monotonic()
+
+    def touch(self) -> None:
+        self.last = time.monotonic()
+
+
+class _Reaper:
+    """専用スレッドで wait4() を呼んで子プロセスを回収し、終了コードと rusage を記録する。
+
+    Popen.wait() は rusage を返さないため、回収は必ずこのスレッドで行い、
+    proc.returncode もここで設定する（POSIX専用）。
+    """
+
+    def __init__(self, proc: subprocess.Popen, started_at: float):
+        self.proc = proc
+        self.started_at = started_at
+        self.ended_at: float | None = None
+        self.rusage: object | None = None
+        self._done = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self) -> None:
+        try:
+            _, status, self.rusage = os.wait4(self.proc.pid, 0)
+            self.proc.returncode = os.waitstatus_to_exitcode(status)
+        except ChildProcessError:
+            # 他で回収済み（returncode は Popen 側に任せる）
+            pass
+        except OSError as e:
+            logger.debug("wait4 に失敗: %s", e)
+        finally:
+            self.ended_at = time.monotonic()
+            self._done.set()
+
+    def wait(self, timeout: float | None) -> bool:
+        return self._done.wait(timeout)
+
+    def resources(self) -> ResourceUsage | None:
+        ru = self.rusage
+        if ru is None or self.ended_at is None:
+            return None
+        # ru_maxrss は Linux では KB、macOS ではバイト
+        max_rss = ru.ru_maxrss // 1024 if sys.platform == "darwin" else ru.ru_maxrss  # type: ignore[attr-defined]
+        return ResourceUsage(
+            wall_ms=int((self.ended_at - self.started_at) * 1000),
+            user_cpu_ms=int(ru.ru_utime * 1000),  # type: ignore[attr-defined]
+            sys_cpu_ms=int(ru.ru_stime * 1000),  # type: ignore[attr-defined]
+            max_rss_kb=int(max_rss),
+            voluntary_switches=ru.ru_nvcsw,  # type: ignore[attr-defined]
+            involuntary_switches=ru.ru_nivcsw,  # type: ignore[attr-defined]
+            block_input=ru.ru_inblock,  # type: ignore[attr-defined]
+            block_output=ru.ru_oublock,  # type: ignore[attr-defined]
+        )
+
+
+_reapers: weakref.WeakKeyDictionary[subprocess.Popen, _Reaper] = weakref.WeakKeyDictionary()
+
+
+def _wait_exit(proc: subprocess.Popen, timeout: float | None) -> bool:
+    """プロセスの終了を最大 timeout 秒待つ。終了したら True。"""
+    reaper = _reapers.get(proc)
+    if reaper is not None:
+        return reaper.wait(timeout)
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return False
+    return True
+
+
+# ioprio_set(2) のシステムコール番号（glibc にラッパーがないため直接呼ぶ）
+_IOPRIO_SET_SYSCALL = {
+    "x86_64": 251,
+    "i386": 289,
+    "i686": 289,
+    "aarch64": 30,
+    "riscv64": 30,
+    "armv7l": 314,
+    "ppc64le": 273,
+    "s390x": 282,
+}
+_IOPRIO_WHO_PGRP = 2
+_IOPRIO_CLASS_SHIFT = 13
+
+
+@functools.lru_cache(maxsize=1)
+def _ioprio_setter() -> Callable[[int, int, int], None] | None:
+    """プロセスグループのI/O優先度を設定する関数を返す（Linux 以外・未知のアーキテクチャでは None）。"""
+    if not sys.platform.startswith("linux"):
+        return None
+    number = _IOPRIO_SET_SYSCALL.get(platform.machine())
+    if number is None:
+        logger.debug("I/O優先度の設定に未対応のアーキテクチャ: %s", platform.machine())
+        return None
+    try:
+        import ctypes
+
+        syscall = ctypes.CDLL(None, use_errno=True).syscall
+    except (OSError, AttributeError):
+        return None
+
+    def set_ioprio(pgid: int, io_class: int, level: int) -> None:
+        if syscall(number, _IOPRIO_WHO_PGRP, pgid, (io_class << _IOPRIO_CLASS_SHIFT) | level) != 0:
+            raise OSError(ctypes.get_errno(), "ioprio_set に失敗")
+
+    return set_ioprio
+
+
+def apply_daemon_affinity() -> None:
+    """YADON_DAEMON_CPUS が設定されていれば、現在のプロセスを予約CPUに固定する。
+
+    スレッド生成前（GUIデーモンの起動直後）に呼ぶこと。以降のスレッドと、
+    CPU指定のない子プロセスはこの設定を引き継ぐ。
+    """
+    cpus = get_daemon_cpus()
+    if cpus is None or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        os.sched_setaffinity(0, cpus)
+        logger.info("GUIデーモンをCPU %s に固定しました", ",".join(map(str, sorted(cpus))))
+    except OSError as e:
+        logger.warning("GUIデーモンのCPU固定に失敗: %s", e)
+
+
+def _make_preexec(limits: ProcessLimits | None) -> Callable[[], None] | None:
+    """子プロセス側で setrlimit を適用する preexec_fn を構築する（rlimit の設定がなければ None）。
+
+    preexec_fn はマルチスレッドのプロセス（GUIデーモン）から fork した子でデッドロックし得るため、
+    子でしか設定できない rlimit が明示的に設定された場合だけ使う。nice / CPUアフィニティ / I/O優先度は
+    起動後に親から _apply_scheduling() で設定する。
+    fork 後の子プロセスで実行されるため、ロックを取る処理（logging等）は行わない。
+    """
+    if limits is None or not _IS_POSIX:
+        return None
+
+    import resource
+
+    rlimits: list[tuple[int, int]] = []
+    if limits.address_space_mb is not None:
+        rlimits.append((resource.RLIMIT_AS, limits.address_space_mb * 1024 * 1024))
+    if limits.cpu_seconds is not None:
+        rlimits.append((resource.RLIMIT_CPU, limits.cpu_seconds))
+    if limits.open_files is not None:
+        rlimits.append((resource.RLIMIT_NOFILE, limits.open_files))
+    if not rlimits:
+        return None
+
+    def preexec() -> None:
+        for res, value in rlimits:
+            try:
+                _, hard = resource.getrlimit(res)
+                if hard != resource.RLIM_INFINITY:
+                    value = min(value, hard)
+                resource.setrlimit(res, (value, hard))
+            except (ValueError, OSError):
+                pass
+
+    return preexec
+
+
+def _apply_scheduling(pid: int, limits: ProcessLimits | None) -> None:
+    """起動した子プロセスに親から nice / CPUアフィニティ / I/O優先度を適用する。
+
+    子はセッションリーダー（pgid == pid）なので、nice と I/O優先度はプロセスグループ単位で設定し、
+    既に起動した孫プロセスにも適用する。run_process() は標準入力への書き込みより前に呼ぶので、
+    プロンプトを読んでから動き出す CLI には確実に効く。
+    """
+    if limits is None or not _IS_POSIX:
+        return
+    if limits.nice:
+        try:
+            # os.nice() と同じく親の nice 値からの相対値にする
+            base = os.getpriority(os.PRIO_PROCESS, 0)
+            os.setpriority(os.PRIO_PGRP, pid, min(base + limits.nice, 19))
+        except OSError as e:
+            logger.debug("nice の設定に失敗 (pid=%d): %s", pid, e)
+    if limits.cpus is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(pid, limits.cpus)
+        except OSError as e:
+            logger.debug("CPUアフィニティの設定に失敗 (pid=%d): %s", pid, e)
+    if limits.ioprio is not None:
+        set_ioprio = _ioprio_setter()
+        if set_ioprio is not None:
+            try:
+                set_ioprio(pid, *limits.ioprio)
+            except OSError as e:
+                logger.debug("I/O優先度の設定に失敗 (pid=%d): %s", pid, e)
+
+
+def kill_process_group(proc: subprocess.Popen, grace: float = PROCESS_KILL_GRACE) -> None:
+    """プロセスグループ全体を停止する（SIGTERM → grace秒後 SIGKILL）。
+
+    run_process() で起動したプロセスはセッションリーダーなので pgid == pid。
+    POSIX 以外では直下の子のみ kill する。
+    """
+    if not _IS_POSIX:
+        try:
+            proc.kill()
+        except OSError:
+            pass
+        return
+
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        return
+    _wait_exit(proc, grace)
+    try:
+        # リーダー終了後もグループに残った孫プロセスを確実に停止する
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _reap_group(proc: subprocess.Popen) -> None:
+    """正常終了後にグループ内に残った孤児プロセスを停止する。"""
+    if not _IS_POSIX:
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class _BoundedBuffer:
+    """先頭と末尾だけをメモリに保持する出力バッファ。
+
+    limit が None の場合は全量を保持する。
+    """
+
+    def __init__(self, limit: int | None):
+        self._limit = limit
+        self._head_limit = limit // 2 if limit is not None else 0
+        self._tail_limit = limit - self._head_limit if limit is not None else 0
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def write(self, data: bytes) -> None:
+        self.total += len(data)
+        if self._limit is None:
+            self.head += data
+            return
+        room = self._head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            overflow = len(self.tail) - self._tail_limit
+            if overflow > 0:
+                del self.tail[:overflow]
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > len(self.head) + len(self.tail)
+
+    def text(self, spill_path: str | None = None) -> str:
+        head = self.head.decode("utf-8", errors="replace")
+        tail = self.tail.decode("utf-8", errors="replace")
+        if not self.truncated:
+            return head + tail
+        omitted = self.total - len(self.head) - len(self.tail)
+        where = f" — 全出力: {spill_path}" if spill_path else ""
+        return f"{head}\n... [{omitted} バイト省略{where}] ...\n{tail}"
+
+
+class OutputDecoder(ABC):
+    """読み取った出力を変換する（構造化出力から本文を取り出す等）"""
+
+    @abstractmethod
+    def feed(self, chunk: bytes) -> bytes:
+        """読み取った chunk を渡し、変換後の出力を返す。"""
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        """EOF で残りを変換して返す。"""
+
+
+def _pump(
+    stream: BinaryIO,
+    buffer: _BoundedBuffer,
+    spill: BinaryIO | None,
+    spill_lock: threading.Lock,
+    progress: _Progress,
+    decoder: OutputDecoder | None = None,
+) -> None:
+    """パイプを EOF まで読み、（decoder があれば変換して）バッファとスピルファイルに書き込む。"""
+
+    def write(data: bytes) -> None:
+        if not data:
+            return
+        buffer.write(data)
+        if spill is not None:
+            with spill_lock:
+                spill.write(data)
+
+    fd = stream.fileno()
+    while True:
+        try:
+            chunk = os.read(fd, _READ_CHUNK)
+        except OSError:
+            break
+        if not chunk:
+            break
+        # 停滞監視は変換前の出力で判断する（途中のイベントも進捗）
+        progress.touch()
+        write(decoder.feed(chunk) if decoder is not None else chunk)
+    if decoder is not None:
+        write(decoder.flush())
+
+
+def _feed(stream: BinaryIO, data: bytes) -> None:
+    """標準入力に書き込んで閉じる（子が読まなくてもデッドロックしないよう別スレッドで実行）。"""
+    try:
+        stream.write(data)
+    except (BrokenPipeError, OSError):
+        pass
+    finally:
+        try:
+            stream.close()
+        except OSError:
+            pass
+
+
+def _wait(
+    proc: subprocess.Popen,
+    timeout: float | None,
+    stall_timeout: float | None,
+    progress: _Progress,
+) -> str | None:
+    """プロセスの終了を待つ。
+
+    Returns:
+        None（終了）/ "timeout"（経過時間超過）/ "stalled"（出力の途絶）
+    """
+    if stall_timeout is None:
+        return None if _wait_exit(proc, timeout) else "timeout"
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        now = time.monotonic()
+        if deadline is not None and now >= deadline:
+            return "timeout"
+        if now - progress.last >= stall_timeout:
+            return "stalled"
+        step = _WAIT_SLICE
+        if deadline is not None:
+            step = min(step, deadline - now)
+        if _wait_exit(proc, step):
+            return None
+
+
+def run_process(
+    cmd: Sequence[str],
+    *,
+    input: str | None = None,
+    cwd: str | None = None,
+    timeout: float | None = None,
+    env: dict[str, str] | None = None,
+    limits: ProcessLimits | None = None,
+    on_start: Callable[[subprocess.Popen], None] | None = None,
+    max_capture: int | None = None,
+    spill_path: Path | None = None,
+    stall_timeout: float | None = None,
+    stdout_decoder: OutputDecoder | None = None,
+) -> ProcessResult:
+    """コマンドを専用プロセスグループで実行し、出力を取得する。
+
+    subprocess.run と同様にタイムアウト時は subprocess.TimeoutExpired を送出するが、
+    送出前にプロセスグループ全体を停止する。
+
+    max_capture を指定すると、stdout/stderr それぞれ先頭と末尾の計 max_capture バイトだけを
+    メモリに保持する。spill_path を指定すると全出力を到着順にファイルへ書き出し、
+    切り詰めが発生しなかった場合はファイルを削除する。
+
+    Args:
+        cmd: コマンドライン引数
+        input: 標準入力に渡す文字列（None なら標準入力を閉じる）
+        cwd: 作業ディレクトリ
+        timeout: タイムアウト（秒）
+        env: 環境変数（None なら親プロセスを継承）
+        limits: 資源制限（setrlimit / nice）
+        on_start: 起動直後に Popen を受け取るコールバック（キャンセル用の登録等）
+        max_capture: ストリームごとのメモリ保持上限（バイト）。None なら無制限
+        spill_path: 全出力の書き出し先
+        stall_timeout: 出力が途絶えてから停止するまでの秒数。None なら監視しない
+        stdout_decoder: stdout の変換。保持上限・スピル・output_bytes は変換後の出力が対象
+
+    Raises:
+        ProcessStalled: 出力が stall_timeout 秒以上途絶えた場合
+        ProcessTimeout: タイムアウトした場合（output/stderr に抜粋、resources に資源使用量を格納）
+        OSError: コマンドの起動に失敗した場合
+    """
+    popen_kwargs: dict[str, object] = {
+        "stdin": subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.PIPE,
+        "cwd": cwd,
+        "env": env,
+    }
+    if _IS_POSIX:
+        popen_kwargs["start_new_session"] = True
+        preexec = _make_preexec(limits)
+        if preexec is not None:
+            popen_kwargs["preexec_fn"] = preexec
+    elif sys.platform == "win32":
+        popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+
+    spill: BinaryIO | None = None
+    if spill_path is not None:
+        spill_path.parent.mkdir(parents=True, exist_ok=True)
+        spill = open(spill_path, "wb")
+
+    started_at = time.monotonic()
+    try:
+        with tracing.span("process.spawn", program=os.path.basename(cmd[0])):
+            proc = subprocess.Popen(list(cmd), **popen_kwargs)  # type: ignore[call-overload]
+    except BaseException:
+        if spill is not None:
+            spill.close()
+            spill_path.unlink(missing_ok=True)  # type: ignore[union-attr]
+        raise
+    _apply_scheduling(proc.pid, limits)
+    reaper: _Reaper | None = None
+    if _IS_POSIX:
+        reaper = _Reaper(proc, started_at)
+        _reapers[proc] = reaper
+    if on_start is not None:
+        on_start(proc)
+
+    out_buf = _BoundedBuffer(max_capture)
+    err_buf = _BoundedBuffer(max_capture)
+    spill_lock = threading.Lock()
+    progress = _Progress()
+    threads = [
+        threading.Thread(
+            target=_pump, args=(proc.stdout, out_buf, spill, spill_lock, progress, stdout_decoder), daemon=True,
+        ),
+        threading.Thread(target=_pump, args=(proc.stderr, err_buf, spill, spill_lock, progress), daemon=True),
+    ]
+    if input is not None:
+        threads.append(threading.Thread(target=_feed, args=(proc.stdin, input.encode("utf-8")), daemon=True))
+    for t in threads:
+        t.start()
+
+    interrupted: str | None = None
+    try:
+        interrupted = _wait(proc, timeout, stall_timeout, progress)
+        if interrupted == "timeout":
+            logger.warning("タイムアウト: プロセスグループ %d を停止します", proc.pid)
+            kill_process_group(proc)
+        elif interrupted == "stalled":
+            logger.warning(
+                "出力が %.0f 秒途絶えたため停止します: プロセスグループ %d",
+                time.monotonic() - progress.last, proc.pid,
+            )
+            kill_process_group(proc)
+    except BaseException:
+        kill_process_group(proc)
+        raise
+    finally:
+        _reap_group(proc)
+        for t in threads:
+            # setsid した孫がパイプを保持している場合は待ち続けない
+            t.join(timeout=PROCESS_KILL_GRACE if interrupted else None)
+        for stream in (proc.stdout, proc.stderr):
+            try:
+                stream.close()  # type: ignore[union-attr]
+            except OSError:
+                pass
+        if spill is not None:
+            spill.close()
+
+    resources: ResourceUsage | None = None
+    if reaper is not None:
+        # 停止させた場合も SIGKILL 済みなので短時間で回収できる
+        reaper.wait(PROCESS_KILL_GRACE if interrupted else None)
+        resources = reaper.resources()
+
+    truncated = out_buf.truncated or err_buf.truncated
+    kept_path: str | None = None
+    if spill_path is not None:
+        if truncated or interrupted:
+            kept_path = str(spill_path)
+        else:
+            spill_path.unlink(missing_ok=True)
+
+    stdout = out_buf.text(kept_path)
+    stderr = err_buf.text(kept_path)
+    if interrupted == "stalled":
+        raise ProcessStalled(cmd, stall_timeout or 0, output=stdout, stderr=stderr, resources=resources)
+    if interrupted == "timeout":
+        raise ProcessTimeout(cmd, timeout or 0, output=stdout, stderr=stderr, resources=resources)
+
+    return ProcessResult(
+        stdout=stdout,
+        stderr=stderr,
+        returncode=proc.returncode,
+        output_bytes=out_buf.total + err_buf.total,
+        output_path=kept_path,
+        resources=resources,
+    )
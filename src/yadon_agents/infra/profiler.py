@@ -0,0 +1,235 @@
+"""稼働中のエージェントのオンデマンド・プロファイル
+
+デーモンを止めずに、指定したエージェントを N 秒間または N タスクの間だけプロファイルする。
+
+- sample: 別スレッドが一定間隔で sys._current_frames() を読み、そのエージェントのスレッド
+  （名前が「<エージェント名>-」で始まる接続・配分スレッド、"all" なら全スレッド）のスタックを数える。
+  結果は collapsed-stack 形式（flamegraph.pl / speedscope で開ける）
+- cprofile: そのエージェントのタスク処理（handle_task）を cProfile で計測し、pstats と上位関数の一覧を書く
+
+結果は logs/profiles/ に書き出す。プロファイル中でなければ run_task() は辞書を1回引くだけ。
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Any, TypeVar
+
+from yadon_agents.config.agent import PROFILE_MAX_SECONDS, PROFILE_SAMPLE_INTERVAL, PROFILE_TOP_FUNCTIONS
+from yadon_agents.infra.process import log_dir
+
+__all__ = ["MODES", "start", "stop", "wait", "active", "run_task", "control_handler"]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MODES = ("sample", "cprofile")
+ALL_AGENTS = "all"
+
+
+def _profile_dir() -> Path:
+    d = log_dir() / "profiles"
+    d.mkdir(exist_ok=True)
+    return d
+
+
+@dataclass
+class _Session:
+    agent: str
+    mode: str
+    files: list[str]
+    tasks_left: int | None = None
+    profile: cProfile.Profile | None = None
+    sampler: threading.Thread | None = None
+    samples: Counter[str] = field(default_factory=Counter)
+    running: int = 0
+    """cprofile で計測中のタスク数"""
+    stopping: bool = False
+    finished: bool = False
+    done: threading.Event = field(default_factory=threading.Event)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_sessions: dict[str, _Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _collapse(frame: FrameType | None, thread_name: str) -> str:
+    names: list[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+        frame = frame.f_back
+    # 先頭をスレッド名にして、接続・配分スレッドごとに分けて見られるようにする
+    return ";".join([thread_name.rsplit("_", 1)[0], *reversed(names)])
+
+
+def _sample_loop(session: _Session, interval: float) -> None:
+    own = threading.get_ident()
+    prefix = f"{session.agent}-"
+    while not session.stopping:
+        time.sleep(interval)
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            name = names.get(ident, "")
+            if ident == own or (session.agent != ALL_AGENTS and not name.startswith(prefix)):
+                continue
+            session.samples[_collapse(frame, name or str(ident))] += 1
+
+
+def _write(session: _Session) -> None:
+    try:
+        if session.mode == "sample":
+            lines = [f"{stack} {count}" for stack, count in sorted(session.samples.items())]
+            Path(session.files[0]).write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+        elif session.profile is not None:
+            session.profile.dump_stats(session.files[0])
+            text = io.StringIO()
+            stats = pstats.Stats(session.profile, stream=text)
+            stats.sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+            Path(session.files[1]).write_text(text.getvalue(), encoding="utf-8")
+        logger.info("プロファイルを書き出しました: %s", ", ".join(session.files))
+    except (OSError, TypeError) as e:
+        logger.warning("プロファイルを書き出せません: %s", e)
+
+
+def _finish(session: _Session) -> None:
+    with session.lock:
+        if session.finished:
+            return
+        session.stopping = True
+        # cprofile で計測中のタスクがあれば、その完了時に書き出す
+        if session.running:
+            return
+        session.finished = True
+    if session.sampler is not None and session.sampler is not threading.current_thread():
+        session.sampler.join()
+    _write(session)
+    with _sessions_lock:
+        if _sessions.get(session.agent) is session:
+            del _sessions[session.agent]
+    session.done.set()
+
+
+def start(
+    agent: str,
+    mode: str = "sample",
+    seconds: float | None = None,
+    tasks: int | None = None,
+    interval: float = PROFILE_SAMPLE_INTERVAL,
+) -> list[str]:
+    """agent のプロファイルを始め、書き出すファイルのパスを返す。
+
+    seconds 秒経つか tasks 件のタスクを処理したら終わる（どちらも未指定なら ValueError）。
+    """
+    if mode not in MODES:
+        raise ValueError(f"プロファイルの種類が不正です: {mode}（{' / '.join(MODES)}）")
+    if seconds is None and tasks is None:
+        raise ValueError("seconds か tasks を指定してください")
+    if mode == "cprofile" and agent == ALL_AGENTS:
+        raise ValueError("cprofile はエージェントを1つ指定してください")
+    stem = _profile_dir() / f"{agent}-{time.strftime('%Y%m%d-%H%M%S')}-{mode}"
+    files = [f"{stem}.collapsed"] if mode == "sample" else [f"{stem}.pstats", f"{stem}.txt"]
+    session = _Session(agent=agent, mode=mode, files=files, tasks_left=tasks)
+    if mode == "cprofile":
+        session.profile = cProfile.Profile()
+    with _sessions_lock:
+        if agent in _sessions:
+            raise ValueError(f"{agent} はプロファイル中です")
+        if mode == "cprofile" and any(s.profile is not None for s in _sessions.values()):
+            # Python 3.12 以降の cProfile はプロセスで同時に1つしか有効にできない
+            raise ValueError("cprofile は同時に1つのエージェントしか計測できません")
+        _sessions[agent] = session
+    if mode == "sample":
+        session.sampler = threading.Thread(
+            target=_sample_loop, args=(session, interval), name="profiler-sampler", daemon=True,
+        )
+        session.sampler.start()
+    limit = min(seconds, PROFILE_MAX_SECONDS) if seconds is not None else PROFILE_MAX_SECONDS
+    timer = threading.Timer(limit, _finish, args=(session,))
+    timer.daemon = True
+    timer.start()
+    logger.info("プロファイル開始: %s (%s, %s秒 / %sタスク)", agent, mode, seconds, tasks)
+    return files
+
+
+def stop(agent: str) -> bool:
+    """agent のプロファイルを終えて書き出す。プロファイル中でなければ False。"""
+    session = _sessions.get(agent)
+    if session is None:
+        return False
+    _finish(session)
+    return True
+
+
+def wait(agent: str, timeout: float | None = None) -> bool:
+    """agent のプロファイルが終わるまで待つ。"""
+    session = _sessions.get(agent)
+    return True if session is None else session.done.wait(timeout)
+
+
+def active(agent: str) -> bool:
+    return agent in _sessions
+
+
+def run_task(agent: str, fn: Callable[[Any], T], msg: Any) -> T:
+    """agent のタスク処理 fn(msg) を呼ぶ（プロファイル中なら計測・件数を数える）。"""
+    session = _sessions.get(agent) or _sessions.get(ALL_AGENTS)
+    if session is None:
+        return fn(msg)
+    with session.lock:
+        measure = session.profile is not None and not session.stopping
+        if measure:
+            session.running += 1
+    try:
+        if measure:
+            assert session.profile is not None
+            return session.profile.runcall(fn, msg)
+        return fn(msg)
+    finally:
+        with session.lock:
+            if measure:
+                session.running -= 1
+            if session.tasks_left is not None:
+                session.tasks_left -= 1
+                if session.tasks_left <= 0:
+                    session.stopping = True
+            finish = session.stopping and not session.running
+        if finish:
+            _finish(session)
+
+
+def control_handler(agent_names: list[str]) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """制御ソケットの "profile" コマンドのハンドラーを返す。
+
+    {"agent", "mode", "seconds", "tasks", "wait", "stop"} を受け取り、書き出すファイルを返す。
+    """
+    def handle(msg: dict[str, Any]) -> dict[str, Any]:
+        agent = str(msg.get("agent") or ALL_AGENTS)
+        if agent != ALL_AGENTS and agent not in agent_names:
+            raise ValueError(f"不明なエージェント: {agent}（{', '.join(agent_names)} / {ALL_AGENTS}）")
+        if msg.get("stop"):
+            return {"type": "profile", "agent": agent, "stopped": stop(agent)}
+        seconds = msg.get("seconds")
+        tasks = msg.get("tasks")
+        files = start(
+            agent,
+            mode=str(msg.get("mode") or "sample"),
+            seconds=float(seconds) if seconds is not None else None,
+            tasks=int(tasks) if tasks is not None else None,
+        )
+        finished = wait(agent) if msg.get("wait") else False
+        return {"type": "profile", "agent": agent, "files": files, "finished": finished}
+    return handle
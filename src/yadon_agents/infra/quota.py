@@ -0,0 +1,158 @@
+"""プロセス間で共有するリクエスト枠（トークンバケット）台帳
+
+同じマシン上の複数のヤドン群やコーディネーターが同じアカウントを使うため、
+バックエンド×tier ごとのトークンバケットを1つのJSONファイルに保存し、
+fcntl のファイルロックで排他しながら全プロセスで共有する。
+1回のLLM呼び出しでトークンを1つ消費し、設定したレートで補充される。
+
+fcntl が使えない環境（Windows）では制限しない。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+from yadon_agents.config.agent import QuotaSettings
+from yadon_agents.infra.protocol import SOCKET_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+__all__ = ["QuotaLedger", "ledger_file", "get_quota_ledger"]
+
+logger = logging.getLogger(__name__)
+
+_WAIT_SLICE = 0.5
+
+
+def ledger_file() -> Path:
+    """台帳ファイルのパスを返す（YADON_QUOTA_FILE で上書き可能）。"""
+    override = os.environ.get("YADON_QUOTA_FILE")
+    if override:
+        return Path(override)
+    return Path(SOCKET_DIR) / "yadon-quota.json"
+
+
+class QuotaLedger:
+    """ファイルに保存されたトークンバケットの集合"""
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+
+    @property
+    def enabled(self) -> bool:
+        return fcntl is not None
+
+    @contextmanager
+    def _locked(self) -> Iterator[tuple[IO[str], dict[str, Any]]]:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "r+", encoding="utf-8") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                raw = f.read()
+                try:
+                    data = json.loads(raw) if raw.strip() else {}
+                except json.JSONDecodeError:
+                    logger.warning("リクエスト枠の台帳が壊れているため初期化します: %s", self.path)
+                    data = {}
+                if not isinstance(data, dict):
+                    data = {}
+                yield f, data
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _write(f: IO[str], data: dict[str, Any]) -> None:
+        f.seek(0)
+        f.truncate()
+        f.write(json.dumps(data, sort_keys=True))
+        f.flush()
+
+    def try_acquire(self, key: str, settings: QuotaSettings, cost: float = 1.0) -> float:
+        """トークンを消費する。
+
+        Returns:
+            0.0 なら消費済み。正の値なら消費できず、補充までのおおよその秒数
+        """
+        if settings.rate_per_minute is None or not self.enabled:
+            return 0.0
+        rate = settings.rate_per_minute / 60.0
+        capacity = float(settings.burst)
+        with self._locked() as (f, data):
+            now = self._clock()
+            bucket = data.get(key) or {}
+            tokens = float(bucket.get("tokens", capacity))
+            updated = float(bucket.get("updated", now))
+            tokens = min(capacity, tokens + max(now - updated, 0.0) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / rate
+            data[key] = {"tokens": tokens, "updated": now}
+            self._write(f, data)
+        return wait
+
+    def acquire(
+        self,
+        key: str,
+        settings: QuotaSettings,
+        timeout: float | None = None,
+        should_abort: Callable[[], bool] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> bool:
+        """トークンを1つ消費する。policy="wait" なら補充を待つ。
+
+        Args:
+            key: バケット名（"backend:tier"）
+            settings: 枠の設定
+            timeout: 最大待ち時間（秒）。None なら無期限
+            should_abort: 待機中に True を返したら諦める（キャンセル用）
+
+        Returns:
+            消費できたら True
+        """
+        waited = 0.0
+        while True:
+            try:
+                wait = self.try_acquire(key, settings)
+            except OSError as e:
+                # 台帳が使えない場合は制限しない（LLM呼び出しを止めない）
+                logger.warning("リクエスト枠の台帳にアクセスできません: %s", e)
+                return True
+            if wait <= 0:
+                return True
+            if settings.policy == "fail":
+                return False
+            if timeout is not None and waited + wait > timeout:
+                return False
+            if should_abort is not None and should_abort():
+                return False
+            step = min(wait, _WAIT_SLICE)
+            sleep(step)
+            waited += step
+
+    def snapshot(self) -> dict[str, Any]:
+        """全バケットの現在の状態を返す。"""
+        if not self.enabled or not self.path.exists():
+            return {}
+        try:
+            with self._locked() as (_, data):
+                return dict(data)
+        except OSError:
+            return {}
+
+
+def get_quota_ledger() -> QuotaLedger:
+    """現在の設定の台帳を返す。"""
+    return QuotaLedger(ledger_file())
@@ -0,0 +1,117 @@
+"""GUIデーモンの起動完了通知（sd_notify 風）
+
+yadon start はソケットファイルの有無を一定間隔で確かめていたが、ファイルがあっても接続を
+受け付けているとは限らず、待ち時間も間隔の分だけ長くなっていた。
+cmd_start はパイプを作って書き込み側をデーモンに継承させ（番号は YADON_READY_FD で渡す）、
+デーモンは全エージェントが accept を始めた時点（または失敗・タイムアウト）で1行の JSON を書いて閉じる。
+
+    {"status": "ready" | "failed" | "timeout", "elapsed": 秒, "agents": {名前: 秒}, "errors": {名前: 理由}}
+
+秒はデーモンの main() の開始から。デーモンが通知せずに終了すればパイプが EOF になるので、
+cmd_start はタイムアウトを待たずに気づける。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import select
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from yadon_agents.config.agent import DAEMON_READY_TIMEOUT
+
+__all__ = ["READY_FD_ENV", "readiness", "notify_when_ready", "wait_ready"]
+
+logger = logging.getLogger(__name__)
+
+READY_FD_ENV = "YADON_READY_FD"
+
+
+def _ready_fd() -> int | None:
+    # エージェントが起動する LLM のサブプロセスへ引き継がないよう、読んだら消す
+    raw = os.environ.pop(READY_FD_ENV, "")
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        logger.warning("%s が不正です: %s", READY_FD_ENV, raw)
+        return None
+
+
+def readiness(agents: Sequence[Any], started: float, timeout: float = DAEMON_READY_TIMEOUT) -> dict[str, Any]:
+    """全エージェントの起動処理が終わるまで（最大 timeout 秒）待ち、通知する内容を返す。
+
+    agents は BaseAgent（started / ready_at / startup_error を持つ）。started は time.monotonic() の値。
+    """
+    deadline = time.monotonic() + timeout
+    for agent in agents:
+        agent.started.wait(max(deadline - time.monotonic(), 0))
+    ready = {a.name: round(a.ready_at - started, 3) for a in agents if a.ready_at is not None}
+    errors = {a.name: a.startup_error for a in agents if a.startup_error}
+    for agent in agents:
+        if agent.name not in ready and agent.name not in errors:
+            errors[agent.name] = f"{timeout:g}秒以内に起動しませんでした"
+    if not errors:
+        status = "ready"
+    elif any(a.startup_error for a in agents):
+        status = "failed"
+    else:
+        status = "timeout"
+    return {
+        "status": status,
+        "elapsed": round(time.monotonic() - started, 3),
+        "agents": ready,
+        "errors": errors,
+    }
+
+
+def notify_when_ready(
+    agents: Sequence[Any], started: float, timeout: float = DAEMON_READY_TIMEOUT,
+) -> threading.Thread | None:
+    """YADON_READY_FD が渡されていれば、起動完了を待って通知するスレッドを始める（なければ None）。"""
+    fd = _ready_fd()
+    if fd is None:
+        return None
+
+    def _notify() -> None:
+        report = readiness(agents, started, timeout)
+        try:
+            os.write(fd, (json.dumps(report, ensure_ascii=False) + "\n").encode("utf-8"))
+        except OSError as e:
+            # yadon start が先に諦めて読み側を閉じていれば EPIPE になる
+            logger.debug("起動完了を通知できませんでした: %s", e)
+        finally:
+            os.close(fd)
+        logger.info("起動完了の通知: %s（%.2f秒）", report["status"], report["elapsed"])
+
+    thread = threading.Thread(target=_notify, name="ready-notify", daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_ready(fd: int, timeout: float) -> dict[str, Any] | None:
+    """パイプから通知を1行読んで返す。タイムアウト・EOF（通知せずに終了）なら None。fd は閉じる。"""
+    deadline = time.monotonic() + timeout
+    data = b""
+    try:
+        while b"\n" not in data:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                return None
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                return None
+            data += chunk
+    finally:
+        os.close(fd)
+    try:
+        return json.loads(data.split(b"\n", 1)[0].decode("utf-8"))
+    except ValueError:
+        logger.warning("起動完了の通知を解釈できません: %r", data[:200])
+        return None
@@ -0,0 +1,373 @@
+"""simulated バックエンド — ネットワーク不要の決定的な疑似LLM
+
+実際の claude / gemini CLI の代わりに、設定した遅延分布・失敗率・出力サイズで
+定型応答を返す。タスク分解プロンプトには分解JSONを、それ以外には
+ワーカー応答らしきテキストを返すため、ヤドラン/ヤドンのパイプライン全体を
+オフラインで負荷試験できる。
+
+2通りの使い方がある:
+- LLM_BACKEND=simulated: SubprocessClaudeRunner が
+  ``python -m yadon_agents.infra.simulated_llm -p ...`` を起動する（プロセス起動コスト込み）
+- SimulatedLLMRunner: LLMRunnerPort の実装としてプロセス内で直接使う
+
+応答は (シード, tier, プロンプト) から決定的に決まる。
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from yadon_agents.config.agent import (
+    CLAUDE_DEFAULT_TIMEOUT,
+    SimulationConfig,
+    get_simulation_config,
+    get_stall_timeout,
+)
+from yadon_agents.domain.ports.llm_port import LLMRunnerPort
+from yadon_agents.domain.run_result import LLMRunResult, LLMUsage
+from yadon_agents.infra import tracing
+
+__all__ = [
+    "SimulatedResponse",
+    "sample_latency",
+    "simulate",
+    "format_claude_json",
+    "SimulatedLLMRunner",
+    "main",
+]
+
+# 疑似コスト（USD / 100万トークン）
+_INPUT_COST_PER_MTOK = 1.0
+_OUTPUT_COST_PER_MTOK = 5.0
+
+_DECOMPOSE_MARKER = '"phases"'
+_MAX_SUBTASKS_RE = re.compile(r"最大(\d+)つ")
+_MODEL_TIER_RE = re.compile(r"^sim-(coordinator|manager|worker)$")
+
+_FILLER = "シミュレーション出力です。"
+
+# stream-json で進捗イベントを出す間隔（秒）と、ハング模擬時の待機時間
+_PROGRESS_INTERVAL = 1.0
+_STALL_SLEEP = 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class SimulatedResponse:
+    """疑似LLMの1回分の応答"""
+
+    text: str
+    returncode: int
+    latency: float
+    """応答までの遅延（秒）"""
+    usage: LLMUsage
+    stalls: bool = False
+    """応答せずに停止し続けるか（ハングの模擬）"""
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    """遅延分布の指定から遅延（秒）を1つ引く。
+
+    Args:
+        spec: "fixed:秒" / "uniform:最小,最大" / "lognormal:中央値,σ" / "exp:平均"
+        rng: 乱数生成器
+
+    Raises:
+        ValueError: 指定が不正な場合
+    """
+    kind, _, raw = spec.partition(":")
+    try:
+        params = [float(x) for x in raw.split(",")] if raw else []
+    except ValueError:
+        raise ValueError(f"遅延分布のパラメータが不正です: {spec!r}") from None
+
+    kind = kind.strip().lower()
+    if kind == "fixed" and len(params) == 1:
+        value = params[0]
+    elif kind == "uniform" and len(params) == 2:
+        value = rng.uniform(params[0], params[1])
+    elif kind == "lognormal" and len(params) == 2:
+        value = params[0] * math.exp(params[1] * rng.gauss(0.0, 1.0))
+    elif kind == "exp" and len(params) == 1:
+        value = rng.expovariate(1.0 / params[0]) if params[0] > 0 else 0.0
+    else:
+        raise ValueError(f"遅延分布の指定が不正です: {spec!r}")
+    return max(value, 0.0)
+
+
+def _rng_for(prompt: str, tier: str, seed: int) -> random.Random:
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return random.Random(f"{seed}:{tier}:{digest}")
+
+
+def _decompose_output(prompt: str, rng: random.Random) -> str:
+    """タスク分解プロンプトへの定型JSON応答を作る。"""
+    m = _MAX_SUBTASKS_RE.search(prompt)
+    max_subtasks = int(m.group(1)) if m else 1
+    n_implement = rng.randint(1, max(max_subtasks, 1))
+    tag = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    data = {
+        "phases": [
+            {
+                "name": "implement",
+                "subtasks": [
+                    {"instruction": f"[sim {tag}] 実装サブタスク{i + 1}"}
+                    for i in range(n_implement)
+                ],
+            },
+            {"name": "docs", "subtasks": [{"instruction": f"[sim {tag}] ドキュメント更新"}]},
+            {"name": "review", "subtasks": [{"instruction": f"[sim {tag}] レビュー"}]},
+        ],
+        "strategy": f"シミュレーション分解（implement {n_implement}件）",
+    }
+    return "```json\n" + json.dumps(data, ensure_ascii=False, indent=2) + "\n```"
+
+
+def _worker_output(prompt: str, size: int) -> str:
+    """ワーカー向けの定型応答を約 size バイトで作る。"""
+    last_line = prompt.strip().splitlines()[-1][:60] if prompt.strip() else ""
+    head = f"[simulated] 完了: {last_line}"
+    body_bytes = max(size - len(head.encode("utf-8")), 0)
+    unit = _FILLER.encode("utf-8")
+    repeat = body_bytes // len(unit)
+    body = "\n".join(_FILLER * 4 for _ in range(repeat // 4)) + _FILLER * (repeat % 4)
+    return f"{head}\n{body}".rstrip("\n")
+
+
+def simulate(prompt: str, tier: str, config: SimulationConfig | None = None) -> SimulatedResponse:
+    """プロンプトに対する疑似応答を決定的に生成する（待機はしない）。"""
+    config = config or get_simulation_config(tier)
+    rng = _rng_for(prompt, tier, config.seed)
+    latency = sample_latency(config.latency, rng)
+    failed = rng.random() < config.failure_rate
+    stalls = config.stall_rate > 0 and rng.random() < config.stall_rate
+
+    if failed:
+        text = "[simulated] 疑似エラー: バックエンドが失敗を返しました"
+        returncode = 1
+    elif _DECOMPOSE_MARKER in prompt:
+        text = _decompose_output(prompt, rng)
+        returncode = 0
+    else:
+        text = _worker_output(prompt, config.output_bytes)
+        returncode = 0
+
+    input_tokens = len(prompt.encode("utf-8")) // 4
+    output_tokens = len(text.encode("utf-8")) // 4
+    usage = LLMUsage(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cost_usd=(input_tokens * _INPUT_COST_PER_MTOK + output_tokens * _OUTPUT_COST_PER_MTOK) / 1_000_000,
+        api_duration_ms=int(latency * 1000),
+    )
+    return SimulatedResponse(text=text, returncode=returncode, latency=latency, usage=usage, stalls=stalls)
+
+
+def format_claude_json(response: SimulatedResponse) -> str:
+    """応答を claude -p --output-format json と同じ形の1行JSONにする。"""
+    data: dict[str, Any] = {
+        "type": "result",
+        "subtype": "success" if response.returncode == 0 else "error",
+        "is_error": response.returncode != 0,
+        "duration_ms": int(response.latency * 1000),
+        "duration_api_ms": response.usage.api_duration_ms,
+        "result": response.text,
+        "total_cost_usd": response.usage.cost_usd,
+        "usage": {
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens,
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+        },
+    }
+    return json.dumps(data, ensure_ascii=False)
+
+
+class SimulatedLLMRunner(LLMRunnerPort):
+    """プロセス内で疑似応答を返す LLMRunnerPort 実装。
+
+    サブプロセスを起動しないため、ヤドラン/ヤドンのオーバーヘッドだけを計測できる。
+    """
+
+    def __init__(self, config: SimulationConfig | None = None):
+        """初期化。
+
+        Args:
+            config: 設定（None なら呼び出しごとに環境変数から tier 別に取得）
+        """
+        self.config = config
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """待機中の全呼び出しを打ち切る。"""
+        self._cancelled.set()
+
+    def run(
+        self,
+        prompt: str,
+        model_tier: str,
+        cwd: str | None = None,
+        timeout: float = CLAUDE_DEFAULT_TIMEOUT,
+        output_format: str | None = None,
+    ) -> tuple[str, int]:
+        result = self.run_detailed(prompt, model_tier, cwd=cwd, timeout=timeout, output_format=output_format)
+        return result.output, result.returncode
+
+    @tracing.traced("llm.run")
+    def run_detailed(
+        self,
+        prompt: str,
+        model_tier: str,
+        cwd: str | None = None,
+        timeout: float = CLAUDE_DEFAULT_TIMEOUT,
+        output_format: str | None = None,
+        run_id: str | None = None,
+    ) -> LLMRunResult:
+        tracing.annotate(tier=model_tier, run_id=run_id, backend="simulated")
+        response = simulate(prompt, model_tier, self.config)
+        stall_timeout = get_stall_timeout()
+        latency = response.latency
+        if response.stalls:
+            latency = min(stall_timeout, timeout) if stall_timeout is not None else timeout
+        started_at = time.monotonic()
+        interrupted = self._cancelled.wait(min(latency, timeout))
+        duration_ms = int((time.monotonic() - started_at) * 1000)
+        stalled = False
+
+        if interrupted:
+            output, returncode = "実行エラー: キャンセルされました", 1
+        elif response.stalls and stall_timeout is not None and stall_timeout < timeout:
+            output, returncode = f"停滞: 出力が {int(stall_timeout)} 秒途絶えたため停止しました", 1
+            stalled = True
+        elif response.stalls or response.latency > timeout:
+            output, returncode = f"タイムアウト ({int(timeout) // 60}分)", 1
+        else:
+            output, returncode = response.text, response.returncode
+            if output_format == "json":
+                output = format_claude_json(response)
+
+        usage = LLMUsage(
+            input_tokens=response.usage.input_tokens,
+            output_tokens=response.usage.output_tokens,
+            cost_usd=response.usage.cost_usd,
+            duration_ms=duration_ms,
+            api_duration_ms=response.usage.api_duration_ms,
+        )
+        return LLMRunResult(
+            output=output,
+            returncode=returncode,
+            output_bytes=len(output.encode("utf-8")),
+            usage=usage,
+            backend="simulated",
+            model=f"sim-{model_tier}",
+            stalled=stalled,
+        )
+
+    def build_interactive_command(
+        self,
+        model_tier: str,
+        system_prompt_path: str | None = None,
+    ) -> list[str]:
+        """疑似LLMを対話モードで起動するコマンドを返す。"""
+        return [sys.executable, "-m", "yadon_agents.infra.simulated_llm", "--model", f"sim-{model_tier}"]
+
+
+def _emit(line: str) -> None:
+    print(line, flush=True)
+
+
+def _stream(response: SimulatedResponse, tier: str) -> None:
+    """claude の stream-json と同じく、進捗イベントを逐次出力し最後に結果を出力する。"""
+    _emit(json.dumps({"type": "system", "subtype": "init", "model": f"sim-{tier}"}))
+    deadline = time.monotonic() + response.latency
+    step = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(remaining, _PROGRESS_INTERVAL))
+        step += 1
+        _emit(json.dumps({
+            "type": "assistant",
+            "message": {"content": [{"type": "text", "text": f"[simulated] 作業中 ({step})"}]},
+        }, ensure_ascii=False))
+    if response.returncode == 0:
+        _emit(format_claude_json(response))
+
+
+def _tier_from_model(model: str | None) -> str:
+    m = _MODEL_TIER_RE.match(model or "")
+    return m.group(1) if m else "worker"
+
+
+def _interactive(tier: str) -> int:
+    """対話モード: 1行ごとに疑似応答を返す（コーディネーター起動用）。"""
+    print(f"[simulated] 対話モード (tier={tier})。Ctrl-D で終了します。")
+    while True:
+        try:
+            line = input("> ")
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return 0
+        if not line.strip():
+            continue
+        response = simulate(line, tier)
+        time.sleep(response.latency)
+        print(response.text)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """claude CLI 互換の最小インターフェース。
+
+    ``-p``（プロンプトは標準入力）または ``--prompt`` でバッチ実行し、
+    それ以外は対話モードになる。未知の引数は無視する。
+    ``--output-format`` は text / json / stream-json に対応する。
+    """
+    parser = argparse.ArgumentParser(prog="yadon-simulated-llm")
+    parser.add_argument("-p", "--print", dest="batch", action="store_true")
+    parser.add_argument("--prompt")
+    parser.add_argument("--model")
+    parser.add_argument("--output-format")
+    args, _ = parser.parse_known_args(argv)
+    tier = _tier_from_model(args.model)
+
+    if not args.batch and args.prompt is None:
+        return _interactive(tier)
+
+    prompt = args.prompt if args.prompt is not None else sys.stdin.read()
+    try:
+        response = simulate(prompt, tier)
+    except ValueError as e:
+        print(f"設定エラー: {e}", file=sys.stderr)
+        return 2
+
+    if response.stalls:
+        # 何も出力せずに止まり続ける（停滞監視かタイムアウトで停止される想定）
+        time.sleep(_STALL_SLEEP)
+        return 1
+    if args.output_format == "stream-json":
+        _stream(response, tier)
+    else:
+        time.sleep(response.latency)
+
+    if response.returncode != 0:
+        print(response.text, file=sys.stderr)
+    elif args.output_format == "json":
+        print(format_claude_json(response))
+    elif args.output_format != "stream-json":
+        print(response.text)
+    sys.stdout.flush()
+    return response.returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
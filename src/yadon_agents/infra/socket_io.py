@@ -0,0 +1,49 @@
+"""Unix ソケットでの JSON 送受信
+
+リクエスト送信後 shutdown(SHUT_WR) で EOF を通知し、レスポンスを EOF まで読む。
+yadon _send / _status の高速経路（entry.py）からも使うため、json・socket と config.socket 以外を
+import しない。protocol.py はここから再エクスポートする。
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+from typing import Any
+
+from yadon_agents.config.socket import SOCKET_RECV_BUFFER, SOCKET_SEND_TIMEOUT
+
+__all__ = ["send_message", "receive_message", "send_response"]
+
+
+def send_message(sock_path: str, message: dict[str, Any], timeout: float | None = SOCKET_SEND_TIMEOUT) -> dict[str, Any]:
+    """Unixソケットにメッセージを送信し、レスポンスを受信する。"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(sock_path)
+        data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+        sock.sendall(data)
+        sock.shutdown(socket.SHUT_WR)
+        return receive_message(sock)
+    finally:
+        sock.close()
+
+
+def receive_message(conn: socket.socket) -> dict[str, Any]:
+    """接続済みソケットからメッセージを受信する。"""
+    chunks = []
+    while True:
+        chunk = conn.recv(SOCKET_RECV_BUFFER)
+        if not chunk:
+            break
+        chunks.append(chunk)
+
+    data = b"".join(chunks)
+    return json.loads(data.decode("utf-8"))
+
+
+def send_response(conn: socket.socket, message: dict[str, Any]) -> None:
+    """接続済みソケットにレスポンスを送信する。"""
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    conn.sendall(data)
@@ -0,0 +1,56 @@
+"""ソケットパス
+
+yadon _send / _status / _say の高速経路（entry.py）からも使うため、os 以外を import しない
+（config・テーマを読み込まない）。protocol.py はここから再エクスポートする。
+"""
+
+from __future__ import annotations
+
+import os
+
+__all__ = [
+    "SOCKET_DIR",
+    "agent_socket_path",
+    "pet_socket_path",
+    "metrics_socket_path",
+    "status_socket_path",
+    "control_socket_path",
+]
+
+# ソケットを置くディレクトリ（YADON_SOCKET_DIR で変更できる。起動時に1回だけ読む）
+SOCKET_DIR = os.environ.get("YADON_SOCKET_DIR", "").strip().rstrip("/") or "/tmp"
+
+
+def agent_socket_path(name: str, prefix: str = "yadon") -> str:
+    """エージェントのソケットパスを返す。
+
+    Args:
+        name: "yadoran", "yadon-1", "yadon-2", etc.
+        prefix: ソケットファイル名のプレフィックス (デフォルト "yadon")
+    """
+    return f"{SOCKET_DIR}/{prefix}-agent-{name}.sock"
+
+
+def pet_socket_path(name: str, prefix: str = "yadon") -> str:
+    """ペットの吹き出しソケットパスを返す。
+
+    Args:
+        name: "yadoran", "1", "2", "3", "4"
+        prefix: ソケットファイル名のプレフィックス (デフォルト "yadon")
+    """
+    return f"{SOCKET_DIR}/{prefix}-pet-{name}.sock"
+
+
+def metrics_socket_path(prefix: str = "yadon") -> str:
+    """メトリクス（Prometheus テキスト形式）を公開するソケットのパスを返す。"""
+    return f"{SOCKET_DIR}/{prefix}-metrics.sock"
+
+
+def status_socket_path(prefix: str = "yadon") -> str:
+    """状態ストリーム（yadon top 用）のソケットのパスを返す。"""
+    return f"{SOCKET_DIR}/{prefix}-status.sock"
+
+
+def control_socket_path(prefix: str = "yadon") -> str:
+    """デーモンの制御コマンド（プロファイル等）を受け付けるソケットのパスを返す。"""
+    return f"{SOCKET_DIR}/{prefix}-control.sock"
@@ -0,0 +1,115 @@
+"""実行主体ごとに分離した LLM CLI の状態ディレクトリ
+
+並列に動く claude / gemini 等の CLI は同じ HOME 配下の設定・キャッシュ・ロックファイルを
+共有するため、ファイルロックで直列化したり、互いのセッション状態を壊したりする。
+YADON_ISOLATE_STATE を有効にすると、ランナーは実行主体（worker-N / manager 等）ごとに
+準備したディレクトリを HOME・TMPDIR・XDG_CACHE_HOME・XDG_STATE_HOME として渡す。
+
+- 置き場所は YADON_STATE_DIR。未設定なら tmpfs の /dev/shm（なければ一時ディレクトリ）
+- 認証情報・ユーザー設定は実 HOME へのシンボリックリンクで共有する
+- CLI が頻繁に書き換える状態ファイル（~/.claude.json 等）は初回だけコピーする
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from yadon_agents.config.agent import get_state_share_paths
+from yadon_agents.config.llm import BACKEND_CONFIGS
+
+__all__ = ["state_root", "prepare_state_dir", "isolated_env"]
+
+logger = logging.getLogger(__name__)
+
+_SHM = Path("/dev/shm")
+
+# バックエンドに関係なく共有するパス（git / ssh / gh の認証、macOS のキーチェーン）
+_COMMON_SHARED = (".gitconfig", ".config/git", ".ssh", ".config/gh", ".npmrc", "Library/Keychains")
+
+_SUBDIRS = ("home", "tmp", "cache", "state")
+
+
+def _user_tag() -> str:
+    if hasattr(os, "getuid"):
+        return str(os.getuid())
+    return os.environ.get("USERNAME", "user")
+
+
+def state_root() -> Path:
+    """全実行主体の状態ディレクトリの親を返す（YADON_STATE_DIR で上書き可能）。"""
+    override = os.environ.get("YADON_STATE_DIR")
+    if override:
+        return Path(override)
+    base = _SHM if _SHM.is_dir() and os.access(_SHM, os.W_OK) else Path(tempfile.gettempdir())
+    return base / f"yadon-state-{_user_tag()}"
+
+
+def _link(src: Path, dst: Path) -> None:
+    if not os.path.lexists(src) or os.path.lexists(dst):
+        return
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.symlink(src, dst)
+    except FileExistsError:
+        pass
+
+
+def _copy(src: Path, dst: Path) -> None:
+    if not src.is_file() or os.path.lexists(dst):
+        return
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dst)
+
+
+def prepare_state_dir(name: str, real_home: Path | None = None) -> Path:
+    """実行主体 name の状態ディレクトリを準備して返す（冪等）。
+
+    Args:
+        name: 実行主体名（"worker-1", "manager" 等）
+        real_home: 共有元の HOME（None なら現在の HOME）
+
+    Raises:
+        OSError: ディレクトリを作成できない場合
+    """
+    real_home = real_home or Path.home()
+    root = state_root() / name
+    for sub in _SUBDIRS:
+        (root / sub).mkdir(mode=0o700, parents=True, exist_ok=True)
+    home = root / "home"
+
+    shared = set(_COMMON_SHARED) | set(get_state_share_paths())
+    copied: set[str] = set()
+    for config in BACKEND_CONFIGS.values():
+        shared.update(config.shared_home_paths)
+        copied.update(config.copied_home_paths)
+
+    for rel in sorted(shared):
+        try:
+            _link(real_home / rel, home / rel)
+        except OSError as e:
+            logger.warning("状態ディレクトリへのリンクに失敗: %s: %s", rel, e)
+    for rel in sorted(copied):
+        try:
+            _copy(real_home / rel, home / rel)
+        except OSError as e:
+            logger.warning("状態ファイルのコピーに失敗: %s: %s", rel, e)
+    return root
+
+
+def isolated_env(name: str) -> dict[str, str]:
+    """実行主体 name 用に HOME・一時・キャッシュディレクトリを差し替えた環境変数を返す。"""
+    root = prepare_state_dir(name)
+    tmp = str(root / "tmp")
+    return {
+        **os.environ,
+        "HOME": str(root / "home"),
+        "TMPDIR": tmp,
+        "TMP": tmp,
+        "TEMP": tmp,
+        "XDG_CACHE_HOME": str(root / "cache"),
+        "XDG_STATE_HOME": str(root / "state"),
+    }
@@ -0,0 +1,133 @@
+"""状態ストリーム（yadon top 用の購読型ステータス）
+
+エージェントのソケットは1接続ずつ処理するため、タスク実行中の status 照会は
+タスク完了まで待たされ、ヤドランはワーカー全員に照会を中継する。
+GUIデーモンは別のソケットで状態ストリームを公開し、購読したクライアントへ
+エージェントの状態（プロセス内の属性）とメトリクスのカウンターを
+一定間隔で JSON Lines として送り続ける。ソケット往復は接続時の1回だけ。
+
+購読: {"type": "subscribe", "interval": 秒} を送って書き込み側を閉じ、以降は1行1スナップショットを読む。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import socket
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from yadon_agents.config.agent import SOCKET_RECV_BUFFER, TOP_INTERVAL
+from yadon_agents.infra import metrics
+from yadon_agents.infra import protocol as proto
+from yadon_agents.infra.circuit_breaker import breaker_snapshot
+from yadon_agents.infra.concurrency import limiter_snapshot
+
+__all__ = ["snapshot", "StatusStreamServer", "start_status_stream", "subscribe"]
+
+logger = logging.getLogger(__name__)
+
+_MIN_INTERVAL = 0.1
+
+
+def _by_label(samples: dict[tuple[str, ...], float]) -> dict[str, float]:
+    return {"/".join(key): value for key, value in sorted(samples.items())}
+
+
+def snapshot(agents: Iterable[Any]) -> dict[str, Any]:
+    """エージェント（activity() を持つ）の状態とメトリクスのカウンターをまとめる。"""
+    return {
+        "time": time.time(),
+        "agents": [agent.activity() for agent in agents],
+        "tasks": _by_label(metrics.TASKS.samples()),
+        "subtasks": _by_label(metrics.SUBTASKS.samples()),
+        "dispatch_errors": _by_label(metrics.DISPATCH_ERRORS.samples()),
+        "subtasks_waiting": metrics.SUBTASKS_WAITING.value(),
+        "concurrency": limiter_snapshot(),
+        "breakers": breaker_snapshot(),
+    }
+
+
+class StatusStreamServer:
+    """購読したクライアントへ状態のスナップショットを送り続けるサーバー（デーモンスレッド）"""
+
+    def __init__(self, socket_path: str, source: Callable[[], dict[str, Any]]):
+        self.socket_path = socket_path
+        self._source = source
+        self._server: socket.socket | None = None
+        self._running = False
+
+    def start(self) -> None:
+        self._server = proto.create_server_socket(self.socket_path)
+        self._running = True
+        threading.Thread(target=self._serve, args=(self._server,), name="status-stream", daemon=True).start()
+
+    def _serve(self, server: socket.socket) -> None:
+        while self._running:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._stream, args=(conn,), name="status-subscriber", daemon=True).start()
+
+    def _stream(self, conn: socket.socket) -> None:
+        try:
+            conn.settimeout(5.0)
+            request = proto.receive_message(conn)
+            interval = max(float(request.get("interval") or TOP_INTERVAL), _MIN_INTERVAL)
+            while self._running:
+                line = json.dumps(self._source(), ensure_ascii=False, default=str) + "\n"
+                conn.sendall(line.encode("utf-8"))
+                time.sleep(interval)
+        except (OSError, ValueError) as e:
+            logger.debug("状態ストリームの購読を終了: %s", e)
+        finally:
+            conn.close()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._server is not None:
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server.close()
+            self._server = None
+        proto.cleanup_socket(self.socket_path)
+
+
+def start_status_stream(agents: Iterable[Any], prefix: str = "yadon") -> StatusStreamServer | None:
+    """agents の状態ストリームを公開する。起動に失敗してもデーモンは止めない。"""
+    agent_list = list(agents)
+    server = StatusStreamServer(proto.status_socket_path(prefix), lambda: snapshot(agent_list))
+    try:
+        server.start()
+    except OSError as e:
+        logger.warning("状態ストリームを起動できません: %s", e)
+        server.stop()
+        return None
+    return server
+
+
+def subscribe(sock_path: str, interval: float = TOP_INTERVAL, timeout: float = 10.0) -> Iterator[dict[str, Any]]:
+    """状態ストリームを購読し、届いたスナップショットを順に返す（接続が切れたら終わる）。"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(max(timeout, interval * 3))
+    try:
+        sock.connect(sock_path)
+        sock.sendall(json.dumps({"type": "subscribe", "interval": interval}).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        buffer = b""
+        while True:
+            chunk = sock.recv(SOCKET_RECV_BUFFER)
+            if not chunk:
+                return
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if line.strip():
+                    yield json.loads(line.decode("utf-8"))
+    finally:
+        sock.close()
@@ -0,0 +1,204 @@
+"""タスク単位のトレース（スパン記録と Chrome trace 形式への書き出し）
+
+1タスクの所要時間が、タスク分解・ソケット送信・プロセス起動・LLM 実行・
+フェーズ間の待ち・集計のどこに費やされたかを調べるための軽量なスパン記録。
+
+- トレースの文脈（trace_id と親スパン）は contextvars で引き継ぐ。スレッドプールに
+  渡す処理は wrap() で包み、プロセス・ソケットをまたぐ場合は TaskMessage の
+  payload["trace"] に context() の値を載せ、受信側で use_context() する
+- 完了したスパンは logs/traces/<trace_id>.jsonl に1行ずつ追記する（別プロセスのワーカーも同じファイルに書く）
+- タスク完了時に export() で同じディレクトリに <trace_id>.trace.json（Chrome trace-event 形式）を書き出す。
+  chrome://tracing や https://ui.perfetto.dev で開ける
+
+トレースの文脈がないとき span() は何もしない。YADON_TRACE=0 で無効にできる。
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+from yadon_agents import PROJECT_ROOT
+from yadon_agents.config.agent import TRACE_KEEP_TASKS, get_tracing
+from yadon_agents.infra.filenames import prune_oldest, safe_filename
+
+__all__ = ["context", "use_context", "start_trace", "span", "traced", "annotate", "wrap", "trace_path", "export"]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class _TraceContext:
+    trace_id: str
+    span_id: str | None = None
+    attrs: dict[str, Any] | None = None
+    """実行中のスパンの属性（annotate() で追記する）"""
+
+
+_current: contextvars.ContextVar[_TraceContext | None] = contextvars.ContextVar("yadon_trace", default=None)
+_write_lock = threading.Lock()
+
+
+def _trace_dir() -> Path:
+    d = PROJECT_ROOT / "logs" / "traces"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def trace_path(trace_id: str) -> Path:
+    """トレースのスパンを追記する JSONL ファイルのパスを返す。
+
+    trace_id はソケットで受け取ったタスク ID なので、ファイル名に使えない文字は置き換える。
+    """
+    return _trace_dir() / f"{safe_filename(trace_id)}.jsonl"
+
+
+def context() -> dict[str, str] | None:
+    """現在のトレース文脈をメッセージに載せられる形で返す（トレース中でなければ None）。"""
+    ctx = _current.get()
+    if ctx is None:
+        return None
+    result = {"trace_id": ctx.trace_id}
+    if ctx.span_id is not None:
+        result["parent_id"] = ctx.span_id
+    return result
+
+
+@contextmanager
+def use_context(data: dict[str, Any] | None) -> Iterator[None]:
+    """メッセージで受け取ったトレース文脈（context() の値）の中で処理する。"""
+    if not data or not data.get("trace_id") or not get_tracing():
+        yield
+        return
+    token = _current.set(_TraceContext(str(data["trace_id"]), data.get("parent_id")))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def start_trace(trace_id: str) -> Iterator[None]:
+    """trace_id のトレースを新しく始める（YADON_TRACE=0 なら何もしない）。"""
+    with use_context({"trace_id": trace_id}):
+        yield
+
+
+def _record(record: dict[str, Any]) -> None:
+    try:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with _write_lock, open(trace_path(record["trace_id"]), "a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError as e:
+        logger.debug("スパンを記録できません: %s", e)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+    """name のスパンを記録する。yield した辞書に入れた値も属性として記録する。"""
+    parent = _current.get()
+    if parent is None:
+        yield attrs
+        return
+    span_id = uuid.uuid4().hex[:16]
+    token = _current.set(_TraceContext(parent.trace_id, span_id, attrs))
+    start = time.time()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        _record({
+            "trace_id": parent.trace_id,
+            "span_id": span_id,
+            "parent_id": parent.span_id,
+            "name": name,
+            "start": start,
+            "duration": time.time() - start,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "thread": threading.current_thread().name,
+            "attrs": attrs,
+        })
+
+
+def traced(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """関数呼び出しを name のスパンとして記録するデコレーター。"""
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def annotate(**attrs: Any) -> None:
+    """実行中のスパンに属性を追加する（トレース中でなければ何もしない）。"""
+    ctx = _current.get()
+    if ctx is not None and ctx.attrs is not None:
+        ctx.attrs.update(attrs)
+
+
+def wrap(fn: Callable[..., T]) -> Callable[..., T]:
+    """現在のトレース文脈を引き継いで fn を呼ぶ関数を返す（スレッドプールへの投入用）。"""
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.run(fn, *args, **kwargs)
+
+
+def _prune(directory: Path) -> None:
+    for old in prune_oldest(directory, "*.jsonl", TRACE_KEEP_TASKS):
+        old.with_suffix(".trace.json").unlink(missing_ok=True)
+
+
+def export(trace_id: str) -> Path | None:
+    """trace_id のスパンを Chrome trace-event 形式で書き出し、そのパスを返す。"""
+    source = trace_path(trace_id)
+    if not source.exists():
+        return None
+    try:
+        records = [json.loads(line) for line in source.read_text(encoding="utf-8").splitlines() if line.strip()]
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("トレースを読み込めません: %s", e)
+        return None
+
+    events: list[dict[str, Any]] = []
+    threads: dict[tuple[int, int], str] = {}
+    for r in sorted(records, key=lambda r: r["start"]):
+        threads[(r["pid"], r["tid"])] = r.get("thread", "")
+        events.append({
+            "name": r["name"],
+            "cat": r["name"].split(".", 1)[0],
+            "ph": "X",
+            "ts": round(r["start"] * 1_000_000),
+            "dur": round(r["duration"] * 1_000_000),
+            "pid": r["pid"],
+            "tid": r["tid"],
+            "args": {**r.get("attrs", {}), "span_id": r["span_id"], "parent_id": r.get("parent_id")},
+        })
+    for (pid, tid), thread_name in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+
+    target = source.with_suffix(".trace.json")
+    try:
+        target.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, ensure_ascii=False))
+        _prune(source.parent)
+    except OSError as e:
+        logger.warning("トレースを書き出せません: %s", e)
+        return None
+    return target
@@ -0,0 +1,204 @@
+"""LLM使用量の解析と使用量台帳
+
+バックエンドの構造化出力（JSON）から本文とトークン使用量を取り出し、
+呼び出しごとに1行のJSONレコードを logs/usage_ledger.jsonl に追記する。
+StructuredOutputDecoder はパイプから読みながら本文を取り出すので、出力の保持上限と
+スピルファイルには構造化出力（イベントのJSON）ではなく本文が入る。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from yadon_agents.domain.run_result import LLMUsage
+from yadon_agents.infra.process import OutputDecoder, log_dir
+
+__all__ = [
+    "parse_structured_output",
+    "StructuredOutputDecoder",
+    "ledger_path",
+    "append_usage_record",
+]
+
+logger = logging.getLogger(__name__)
+
+_ledger_lock = threading.Lock()
+
+
+def _load_json_object(stdout: str) -> dict[str, Any] | None:
+    """stdout 全体、または最後の非空行をJSONオブジェクトとして読む。"""
+    text = stdout.strip()
+    if not text:
+        return None
+    candidates = [text]
+    last_line = text.rsplit("\n", 1)[-1].strip()
+    if last_line != text:
+        candidates.append(last_line)
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def _int(value: object) -> int:
+    try:
+        return int(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return 0
+
+
+def _parse_claude(data: dict[str, Any]) -> tuple[str, LLMUsage] | None:
+    """claude -p --output-format json の result オブジェクトを解析する。"""
+    if "result" not in data and data.get("type") != "result":
+        return None
+    usage = data.get("usage") or {}
+    return str(data.get("result", "")), LLMUsage(
+        input_tokens=_int(usage.get("input_tokens")),
+        output_tokens=_int(usage.get("output_tokens")),
+        cache_read_tokens=_int(usage.get("cache_read_input_tokens")),
+        cache_creation_tokens=_int(usage.get("cache_creation_input_tokens")),
+        cost_usd=float(data.get("total_cost_usd") or data.get("cost_usd") or 0.0),
+        api_duration_ms=_int(data.get("duration_api_ms")),
+    )
+
+
+def _parse_gemini(data: dict[str, Any]) -> tuple[str, LLMUsage] | None:
+    """gemini --output-format json の {"response", "stats"} を解析する。"""
+    if "response" not in data:
+        return None
+    models = (data.get("stats") or {}).get("models") or {}
+    usage = LLMUsage()
+    for model_stats in models.values():
+        tokens = model_stats.get("tokens") or {}
+        api = model_stats.get("api") or {}
+        cached = _int(tokens.get("cached"))
+        usage = usage + LLMUsage(
+            input_tokens=max(_int(tokens.get("prompt")) - cached, 0),
+            output_tokens=_int(tokens.get("candidates")) + _int(tokens.get("thoughts")),
+            cache_read_tokens=cached,
+            api_duration_ms=_int(api.get("totalLatencyMs")),
+            calls=0,
+        )
+    return str(data.get("response") or ""), usage
+
+
+_PARSERS = {
+    "claude": _parse_claude,
+    "gemini": _parse_gemini,
+}
+
+
+def parse_structured_output(usage_format: str, stdout: str) -> tuple[str, LLMUsage] | None:
+    """構造化出力から (本文, 使用量) を取り出す。
+
+    出力が切り詰められていた場合や形式が想定外の場合は None を返し、
+    呼び出し側は生の出力をそのまま使う。
+
+    Args:
+        usage_format: LLMBackendConfig.usage_format（"claude", "gemini"）
+        stdout: CLIの標準出力
+    """
+    parser = _PARSERS.get(usage_format)
+    if parser is None:
+        return None
+    data = _load_json_object(stdout)
+    if data is None:
+        return None
+    return parser(data)
+
+
+class StructuredOutputDecoder(OutputDecoder):
+    """構造化出力を読みながら本文と使用量を取り出す（run_process() の stdout_decoder）。
+
+    stream=True（stream-json、1行1イベント）は行ごとに解析し、結果イベントの本文だけを返す。
+    途中のイベント（ツール呼び出し等）は捨てるので、保持するのは処理中の1行だけになる。
+    stream=False（1つの JSON 文書）は EOF まで溜めてから解析する。ただし溜めた量が max_pending を
+    超えたら解析をやめ、それまでの分と以降の出力をそのまま返す（使用量は不明になる）。
+    出力の保持上限（run_process() の max_capture）を文書の溜め込みで破らないようにするため。
+    解析できない出力（エラーメッセージ等）はそのまま返す。
+    """
+
+    def __init__(self, usage_format: str, stream: bool, max_pending: int | None = None):
+        self._parser = _PARSERS.get(usage_format)
+        self._stream = stream
+        self._max_pending = max_pending
+        self._passthrough = False
+        self._pending = bytearray()
+        self.usage: LLMUsage | None = None
+
+    def feed(self, chunk: bytes) -> bytes:
+        if self._passthrough:
+            return chunk
+        self._pending += chunk
+        if not self._stream:
+            if self._max_pending is None or len(self._pending) <= self._max_pending:
+                return b""
+            self._passthrough = True
+            rest = bytes(self._pending)
+            self._pending.clear()
+            return rest
+        if b"\n" not in chunk:
+            return b""
+        end = self._pending.rfind(b"\n") + 1
+        lines = bytes(self._pending[:end])
+        del self._pending[:end]
+        return b"".join(self._decode_line(line) for line in lines.splitlines(keepends=True))
+
+    def flush(self) -> bytes:
+        rest = bytes(self._pending)
+        self._pending.clear()
+        if not rest:
+            return b""
+        if self._stream:
+            return self._decode_line(rest)
+        parsed = self._parse(_load_json_object(rest.decode("utf-8", errors="replace")))
+        return parsed if parsed is not None else rest
+
+    def _decode_line(self, line: bytes) -> bytes:
+        stripped = line.strip()
+        if not stripped:
+            return b""
+        try:
+            data = json.loads(stripped)
+        except ValueError:
+            return line
+        if not isinstance(data, dict):
+            return line
+        if data.get("type") != "result":
+            return b""
+        parsed = self._parse(data)
+        return parsed if parsed is not None else b""
+
+    def _parse(self, data: dict[str, Any] | None) -> bytes | None:
+        if data is None or self._parser is None:
+            return None
+        parsed = self._parser(data)
+        if parsed is None:
+            return None
+        text, self.usage = parsed
+        return text.encode("utf-8")
+
+
+def ledger_path() -> Path:
+    """使用量台帳ファイルのパスを返す。"""
+    return log_dir() / "usage_ledger.jsonl"
+
+
+def append_usage_record(record: dict[str, Any]) -> None:
+    """使用量台帳に1レコードを追記する。書き込み失敗はLLM実行を妨げない。"""
+    record = {"ts": time.strftime("%Y-%m-%dT%H:%M:%S%z"), **record}
+    try:
+        line = json.dumps(record, ensure_ascii=False)
+        with _ledger_lock, open(ledger_path(), "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("使用量台帳への書き込みに失敗: %s", e)
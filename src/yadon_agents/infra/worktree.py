@@ -0,0 +1,192 @@
+"""ワーカーごとの git worktree による作業ディレクトリ分離
+
+全ワーカーが同じ project_dir で作業すると、並列なサブタスクが同じファイルを奪い合う。
+YADON_WORKTREES を有効にすると、ヤドランはフェーズごとに現在の作業ツリーの
+スナップショットコミットを作り、各ワーカーの worktree をそこへリセットしてから配分する。
+完了後は各 worktree の差分をパッチとして元の作業ツリーへ適用し、
+適用できなかった（競合した）サブタスクは最新の状態から1つずつ再実行する。
+
+worktree は <git共通ディレクトリ>/yadon-worktrees/<ワーカー名> に置き、タスク間で再利用する
+（reset --hard と clean -fd で戻すため、無視ファイルのビルドキャッシュは残る）。
+失敗・タイムアウトしたサブタスクの変更はマージせず、再利用で消える前に logs/patches/ へパッチとして残す。
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from yadon_agents.config.agent import GIT_TIMEOUT, WORKTREE_PATCH_KEEP
+from yadon_agents.infra.filenames import prune_oldest, safe_filename
+from yadon_agents.infra.process import log_dir
+
+__all__ = [
+    "WorktreeError", "is_git_repo", "tree_id", "snapshot", "list_tree", "diff", "apply_patch", "WorktreePool",
+]
+
+logger = logging.getLogger(__name__)
+
+# スナップショットコミットの作成者（ユーザーの git 設定に依存しないよう固定する）
+_SNAPSHOT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "yadon-agents",
+    "GIT_AUTHOR_EMAIL": "yadon-agents@localhost",
+    "GIT_COMMITTER_NAME": "yadon-agents",
+    "GIT_COMMITTER_EMAIL": "yadon-agents@localhost",
+}
+
+
+class WorktreeError(RuntimeError):
+    """git 操作に失敗した"""
+
+
+def _git(
+    args: list[str],
+    cwd: str | Path,
+    env: dict[str, str] | None = None,
+    input: str | None = None,
+) -> str:
+    try:
+        proc = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            env=env,
+            input=input,
+            capture_output=True,
+            encoding="utf-8",
+            errors="surrogateescape",
+            timeout=GIT_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise WorktreeError(f"git {args[0]} に失敗: {e}") from e
+    if proc.returncode != 0:
+        raise WorktreeError(f"git {' '.join(args[:2])} に失敗: {proc.stderr.strip()}")
+    return proc.stdout
+
+
+def is_git_repo(path: str | Path) -> bool:
+    """path が git 作業ツリー内かを返す。"""
+    try:
+        return _git(["rev-parse", "--is-inside-work-tree"], path).strip() == "true"
+    except WorktreeError:
+        return False
+
+
+def tree_id(path: str | Path) -> str:
+    """作業ツリーの現在の内容（未追跡ファイルを含み、無視ファイルは除く）のツリー ID を返す。
+
+    実際のインデックスは変更しない。インデックスの stat 情報を再利用するため
+    一時インデックスは実インデックスのコピーから作る。
+    """
+    index_path = Path(path, _git(["rev-parse", "--git-path", "index"], path).strip())
+    with tempfile.TemporaryDirectory(prefix="yadon-index-") as tmp:
+        tmp_index = Path(tmp) / "index"
+        if index_path.exists():
+            # mtime も保つ（新しい mtime だと同じ秒に書き換えたファイルを変更なしと誤認する）
+            shutil.copy2(index_path, tmp_index)
+        env = {**os.environ, "GIT_INDEX_FILE": str(tmp_index)}
+        _git(["add", "-A"], path, env=env)
+        return _git(["write-tree"], path, env=env).strip()
+
+
+def snapshot(path: str | Path) -> str:
+    """作業ツリーの現在の内容をコミットし、その ID を返す（HEAD・インデックス・ブランチは変更しない）。"""
+    tree = tree_id(path)
+    try:
+        head = _git(["rev-parse", "--verify", "-q", "HEAD"], path).strip()
+    except WorktreeError:
+        head = ""
+    parents = ["-p", head] if head else []
+    env = {**os.environ, **_SNAPSHOT_IDENTITY}
+    return _git(["commit-tree", tree, *parents, "-m", "yadon-agents snapshot"], path, env=env).strip()
+
+
+def list_tree(path: str | Path, tree: str) -> list[tuple[str, int]]:
+    """ツリーのうち path 配下のファイルを (path からの相対パス, サイズ) の一覧で返す。"""
+    files = []
+    for record in _git(["ls-tree", "-r", "-l", "-z", tree], path).split("\0"):
+        if not record:
+            continue
+        meta, name = record.split("\t", 1)
+        size = meta.split()[-1]
+        files.append((name, int(size) if size.isdigit() else 0))
+    return files
+
+
+def diff(path: str | Path, base: str, head: str, *options: str) -> str:
+    """2つのコミット間の差分を返す（options は git diff にそのまま渡す）。"""
+    return _git(["diff", "--no-color", *options, base, head], path)
+
+
+def apply_patch(path: str | Path, patch: str) -> bool:
+    """パッチを作業ツリーに適用する。競合して適用できなければ何も変更せず False を返す。"""
+    if not patch.strip():
+        return True
+    try:
+        _git(["apply", "--check", "--binary", "-"], path, input=patch)
+    except WorktreeError as e:
+        logger.info("パッチが競合しました: %s", e)
+        return False
+    _git(["apply", "--binary", "-"], path, input=patch)
+    return True
+
+
+class WorktreePool:
+    """1リポジトリ分のワーカー用 worktree 群"""
+
+    def __init__(self, project_dir: str | Path):
+        project = Path(project_dir)
+        self.repo = Path(_git(["rev-parse", "--show-toplevel"], project).strip())
+        self.prefix = _git(["rev-parse", "--show-prefix"], project).strip()
+        """project_dir のリポジトリルートからの相対パス（サブディレクトリで作業する場合）"""
+        common = Path(_git(["rev-parse", "--git-common-dir"], project).strip())
+        if not common.is_absolute():
+            common = project / common
+        self.root = common.resolve() / "yadon-worktrees"
+
+    def workdir(self, path: Path) -> Path:
+        """worktree 内で project_dir に相当するディレクトリを返す。"""
+        return path / self.prefix if self.prefix else path
+
+    def checkout(self, name: str, base: str) -> Path:
+        """name の worktree を base の内容にして返す（なければ作成、あれば再利用してリセット）。"""
+        path = self.root / name
+        if (path / ".git").exists():
+            try:
+                _git(["reset", "-q", "--hard", base], path)
+                _git(["clean", "-fdq"], path)
+                return path
+            except WorktreeError as e:
+                logger.warning("worktree を作り直します (%s): %s", name, e)
+        shutil.rmtree(path, ignore_errors=True)
+        _git(["worktree", "prune"], self.repo)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _git(["worktree", "add", "-q", "--detach", str(path), base], self.repo)
+        return path
+
+    def snapshot(self) -> str:
+        """元の作業ツリーのスナップショットコミットを作る。"""
+        return snapshot(self.repo)
+
+    def diff(self, path: Path, base: str) -> str:
+        """worktree で base から加えられた変更をバイナリ対応のパッチとして返す。"""
+        return diff(path, base, snapshot(path), "--binary")
+
+    def merge(self, path: Path, base: str) -> bool:
+        """worktree の変更を元の作業ツリーへ適用する。競合したら何も変更せず False を返す。"""
+        return apply_patch(self.repo, self.diff(path, base))
+
+    def save_patch(self, path: Path, base: str, name: str) -> Path | None:
+        """worktree の変更を logs/patches/<name>.patch に保存してパスを返す（変更がなければ None）。"""
+        patch = self.diff(path, base)
+        if not patch.strip():
+            return None
+        d = log_dir() / "patches"
+        d.mkdir(exist_ok=True)
+        dest = d / f"{safe_filename(name)}.patch"
+        dest.write_text(patch, encoding="utf-8", errors="surrogateescape")
+        prune_oldest(d, "*.patch", WORKTREE_PATCH_KEEP)
+        return dest
@@ -0,0 +1,378 @@
+"""yadon bench-startup — CLI と GUIデーモンの起動時間のベンチマーク
+
+コーディネーターの LLM は yadon _send / _status をツール呼び出しのたびに新しいプロセスで実行するため、
+ソケット往復そのものよりインポートを含む起動時間が効く。ここでは次を計測する。
+
+- CLI のサブコマンドごとのコールドスタート（毎回新しいインタープリター）:
+  プロセス起動から終了までの時間、最初のソケット書き込みまでの時間（偽のエージェント・ペットの
+  ソケットで受けて測る）、`-X importtime` によるインポート時間の内訳
+- GUIデーモンの起動から全エージェントが status に応答するまでの時間（エージェント別）
+
+ソケットは YADON_SOCKET_DIR で一時ディレクトリに分けるので、稼働中のデーモンとは衝突しない。
+結果は JSON（既定 logs/bench/）に保存し、ベースライン（--save-baseline で保存）と比べて
+しきい値を超えて遅くなった項目を回帰として報告する。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import yadon_agents
+from yadon_agents.bench import _git_commit, percentiles
+from yadon_agents.config.agent import (
+    STARTUP_BENCH_DAEMON_TIMEOUT,
+    STARTUP_BENCH_MIN_DELTA_MS,
+    STARTUP_BENCH_RUNS,
+    STARTUP_BENCH_THRESHOLD,
+    STARTUP_BENCH_TOP_IMPORTS,
+)
+from yadon_agents.domain.messages import StatusQuery
+from yadon_agents.infra import protocol as proto
+from yadon_agents.infra.process import log_dir
+from yadon_agents.themes import get_theme
+
+__all__ = [
+    "CASES", "StartupBenchConfig", "parse_importtime", "measure_cli", "measure_daemon", "run_startup_bench",
+    "compare", "format_summary", "main",
+]
+
+ENTRY_POINT = "yadon_agents.entry:main"
+"""pyproject.toml の [project.scripts] yadon と同じ入口"""
+DAEMON_MODULE = "yadon_agents.gui_daemon"
+CASES = ("_send", "_status", "_say", "history")
+_CASE_TIMEOUT = 60.0
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+@dataclass(frozen=True)
+class StartupBenchConfig:
+    """起動時間ベンチマークの条件"""
+    runs: int = STARTUP_BENCH_RUNS
+    """サブコマンドごとの計測回数（別に1回の予備実行と1回の -X importtime 実行を行う）"""
+    cases: tuple[str, ...] = CASES
+    daemon: bool = True
+    workers: int = 3
+    threshold: float = STARTUP_BENCH_THRESHOLD
+    """ベースラインよりこの割合を超えて遅くなったら回帰（STARTUP_BENCH_MIN_DELTA_MS 未満の差は無視）"""
+
+
+def parse_importtime(stderr: str, top: int = STARTUP_BENCH_TOP_IMPORTS) -> dict[str, Any]:
+    """`-X importtime` の出力から、インポート時間の合計・トップレベルのパッケージ別・自身の時間が長いモジュールを求める。"""
+    entries: list[tuple[str, int, int, int]] = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    packages: dict[str, int] = defaultdict(int)
+    for name, _, cumulative_us, depth in entries:
+        if depth == 0:
+            packages[name.split(".")[0]] += cumulative_us
+    slowest = sorted(entries, key=lambda e: -e[1])[:top]
+    return {
+        "total_ms": round(sum(e[1] for e in entries) / 1000, 3),
+        "modules": len(entries),
+        "packages": {name: round(us / 1000, 3) for name, us in sorted(packages.items(), key=lambda p: -p[1])[:top]},
+        "slowest": [
+            {"module": name, "self_ms": round(self_us / 1000, 3), "cumulative_ms": round(cum_us / 1000, 3)}
+            for name, self_us, cum_us, _ in slowest
+        ],
+        "loaded": sorted({e[0] for e in entries if e[0].startswith("yadon_agents")}),
+    }
+
+
+class _FakeSocket:
+    """エージェント・ペットのソケットの代わりに受け、最初のバイトが届いた時刻を記録する"""
+
+    def __init__(self, path: str, response: dict[str, Any] | None):
+        self.path = path
+        self.response = response
+        self.first_byte: float | None = None
+        self._server = proto.create_server_socket(path)
+        self._thread = threading.Thread(target=self._serve, name="startup-bench-socket", daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            try:
+                conn.settimeout(_CASE_TIMEOUT)
+                conn.recv(1, socket.MSG_PEEK)
+                if self.first_byte is None:
+                    self.first_byte = time.perf_counter()
+                proto.receive_message(conn)
+                if self.response is not None:
+                    proto.send_response(conn, self.response)
+            except (OSError, ValueError):
+                pass
+            finally:
+                conn.close()
+
+    def close(self) -> None:
+        try:
+            self._server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._server.close()
+        proto.cleanup_socket(self.path)
+
+
+def _socket_in(sock_dir: str, path: str) -> str:
+    """既定のソケットパスを sock_dir の下に置き換える。"""
+    return os.path.join(sock_dir, os.path.basename(path))
+
+
+def _case(name: str, sock_dir: str) -> tuple[list[str], str | None, dict[str, Any] | None]:
+    """サブコマンド name の (引数, 偽のソケットのパス, 応答) を返す。"""
+    theme = get_theme()
+    prefix = theme.socket_prefix
+    manager = _socket_in(sock_dir, proto.agent_socket_path(theme.agent_role_manager, prefix=prefix))
+    if name == "_send":
+        response = {"type": "result", "status": "success", "from": theme.agent_role_manager,
+                    "payload": {"summary": "startup bench", "output": ""}}
+        return ["_send", "startup bench"], manager, response
+    if name == "_status":
+        return ["_status"], manager, {"type": "status_response", "from": theme.agent_role_manager, "state": "idle"}
+    if name == "_say":
+        return ["_say", "1", "startup bench"], _socket_in(sock_dir, proto.pet_socket_path("1", prefix=prefix)), None
+    if name == "history":
+        return ["history", "--limit", "1"], None, None
+    raise ValueError(f"不明なサブコマンド: {name}（{' / '.join(CASES)}）")
+
+
+def _env(sock_dir: str, **extra: str) -> dict[str, str]:
+    env = os.environ.copy()
+    # インストールしていない作業ツリーでも、計測対象と同じソースを読み込ませる
+    src = str(Path(yadon_agents.__file__).resolve().parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (src, env.get("PYTHONPATH")) if p)
+    env["YADON_SOCKET_DIR"] = sock_dir
+    env["YADON_HISTORY"] = os.path.join(sock_dir, "history.sqlite3")
+    env.update(extra)
+    return env
+
+
+def _entry_command(args: list[str], importtime: bool = False) -> list[str]:
+    module, func = ENTRY_POINT.split(":")
+    return [sys.executable, *(["-X", "importtime"] if importtime else []), "-c",
+            f"from {module} import {func}; {func}()", *args]
+
+
+def measure_cli(name: str, runs: int = STARTUP_BENCH_RUNS) -> dict[str, Any]:
+    """サブコマンド name を runs 回起動し、終了までと最初のソケット書き込みまでの時間（ミリ秒）を測る。"""
+    with tempfile.TemporaryDirectory(prefix="yadon-startup-") as sock_dir:
+        args, sock_path, response = _case(name, sock_dir)
+        env = _env(sock_dir)
+        fake = _FakeSocket(sock_path, response) if sock_path else None
+        wall: list[float] = []
+        first_write: list[float] = []
+        try:
+            # 1回目は .pyc の生成などを含むので捨てる
+            for i in range(runs + 1):
+                if fake is not None:
+                    fake.first_byte = None
+                started = time.perf_counter()
+                proc = subprocess.run(
+                    _entry_command(args), env=env, capture_output=True, text=True, timeout=_CASE_TIMEOUT,
+                )
+                ended = time.perf_counter()
+                if proc.returncode != 0:
+                    raise RuntimeError(f"{name} が失敗しました（終了コード {proc.returncode}）: {proc.stderr[-500:]}")
+                if i == 0:
+                    continue
+                wall.append((ended - started) * 1000)
+                if fake is not None and fake.first_byte is not None:
+                    first_write.append((fake.first_byte - started) * 1000)
+            proc = subprocess.run(
+                _entry_command(args, importtime=True), env=env, capture_output=True, text=True,
+                timeout=_CASE_TIMEOUT,
+            )
+        finally:
+            if fake is not None:
+                fake.close()
+    return {
+        "args": args,
+        "wall_ms": percentiles(wall),
+        "first_write_ms": percentiles(first_write) if fake is not None else None,
+        "imports": parse_importtime(proc.stderr),
+    }
+
+
+def measure_daemon(workers: int = 3, timeout: float = STARTUP_BENCH_DAEMON_TIMEOUT) -> dict[str, Any]:
+    """GUIデーモンを起動し、各エージェントが status に応答するまでの時間（ミリ秒）を測る。"""
+    theme = get_theme()
+    prefix = theme.socket_prefix
+    names = [f"{theme.agent_role_worker}-{n}" for n in range(1, workers + 1)] + [theme.agent_role_manager]
+    with tempfile.TemporaryDirectory(prefix="yadon-startup-") as sock_dir:
+        env = _env(
+            sock_dir,
+            YADON_COUNT=str(workers),
+            LLM_BACKEND="simulated",
+            QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"),
+            YADON_HISTORY="0",
+            YADON_MEMORY_INTERVAL="0",
+        )
+        paths = {name: _socket_in(sock_dir, proto.agent_socket_path(name, prefix=prefix)) for name in names}
+        ready: dict[str, float] = {}
+        stderr_path = Path(sock_dir) / "daemon.log"
+        with open(stderr_path, "w", encoding="utf-8") as stderr:
+            started = time.perf_counter()
+            proc = subprocess.Popen(
+                [sys.executable, "-m", DAEMON_MODULE], env=env, stdout=subprocess.DEVNULL, stderr=stderr,
+                start_new_session=True,
+            )
+            try:
+                # ワーカーから順に確かめる（ヤドランの status はワーカーに照会する）
+                while len(ready) < len(names) and proc.poll() is None and time.perf_counter() - started < timeout:
+                    for name in names:
+                        if name in ready:
+                            continue
+                        try:
+                            proto.send_message(paths[name], StatusQuery(from_agent="startup-bench").to_dict(),
+                                               timeout=1.0)
+                        except (OSError, ValueError):
+                            break
+                        ready[name] = round((time.perf_counter() - started) * 1000, 3)
+                    else:
+                        continue
+                    time.sleep(0.01)
+            finally:
+                exited = proc.poll()
+                proc.terminate()
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+        result: dict[str, Any] = {
+            "workers": workers,
+            "ready_ms": max(ready.values()) if len(ready) == len(names) else None,
+            "agents": ready,
+        }
+        if result["ready_ms"] is None:
+            reason = f"デーモンが終了しました（終了コード {exited}）" if exited is not None else f"{timeout}秒以内に応答しません"
+            result["error"] = f"{reason}: {stderr_path.read_text(encoding='utf-8')[-500:].strip()}"
+    return result
+
+
+def run_startup_bench(config: StartupBenchConfig) -> dict[str, Any]:
+    """条件 config で計測し、結果をまとめる。"""
+    report: dict[str, Any] = {
+        "config": asdict(config),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "started_at": time.time(),
+        "cli": {name: measure_cli(name, config.runs) for name in config.cases},
+    }
+    if config.daemon:
+        report["daemon"] = measure_daemon(config.workers)
+    return report
+
+
+def _metrics(report: dict[str, Any]) -> dict[str, float]:
+    """回帰を判定する指標（ミリ秒）。"""
+    values: dict[str, float] = {}
+    for name, case in report.get("cli", {}).items():
+        values[f"{name}.wall_p50"] = case["wall_ms"].get("p50", 0.0)
+        if case.get("first_write_ms"):
+            values[f"{name}.first_write_p50"] = case["first_write_ms"]["p50"]
+        values[f"{name}.imports"] = case["imports"]["total_ms"]
+    ready = report.get("daemon", {}).get("ready_ms")
+    if ready is not None:
+        values["daemon.ready"] = ready
+    return values
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[dict[str, Any]]:
+    """ベースラインより threshold の割合を超えて遅くなった指標を返す。"""
+    current = _metrics(report)
+    regressions = []
+    for key, base in _metrics(baseline).items():
+        value = current.get(key)
+        if value is None or base <= 0:
+            continue
+        if value > base * (1 + threshold) and value - base >= STARTUP_BENCH_MIN_DELTA_MS:
+            regressions.append({"metric": key, "baseline_ms": base, "current_ms": value, "ratio": round(value / base, 3)})
+    return regressions
+
+
+def format_summary(report: dict[str, Any]) -> str:
+    """結果の要約を表形式の文字列にする。"""
+    lines = [
+        f"CLI コールドスタート（{report['config']['runs']}回、ミリ秒）",
+        f"{'サブコマンド':<12}{'終了 p50':>10}{'p95':>10}{'書込 p50':>10}{'import':>10}{'モジュール':>8}",
+    ]
+    for name, case in report["cli"].items():
+        first = case["first_write_ms"]
+        first_p50 = f"{first['p50']:.1f}" if first else "-"
+        lines.append(
+            f"{name:<12}{case['wall_ms'].get('p50', 0.0):>10.1f}{case['wall_ms'].get('p95', 0.0):>10.1f}"
+            f"{first_p50:>10}{case['imports']['total_ms']:>10.1f}{case['imports']['modules']:>8}"
+        )
+    heaviest = max(report["cli"].values(), key=lambda c: c["imports"]["total_ms"], default=None)
+    if heaviest is not None and heaviest["imports"]["packages"]:
+        lines.append("")
+        lines.append(f"インポート内訳（{' '.join(heaviest['args'][:1])}、トップレベルのパッケージ別）:")
+        for package, ms in list(heaviest["imports"]["packages"].items())[:8]:
+            lines.append(f"  {package:<28}{ms:>10.1f}")
+    daemon = report.get("daemon")
+    if daemon is not None:
+        lines.append("")
+        if daemon.get("ready_ms") is None:
+            lines.append(f"デーモン: 計測できません — {daemon.get('error', '')}")
+        else:
+            agents = " / ".join(f"{name} {ms:.0f}" for name, ms in daemon["agents"].items())
+            lines.append(f"デーモン: 全エージェント応答まで {daemon['ready_ms']:.0f}ms（{agents}）")
+    regressions = report.get("regressions")
+    if regressions is not None:
+        lines.append("")
+        if regressions:
+            lines.append(f"回帰（ベースライン比 +{report['config']['threshold'] * 100:.0f}% 超）:")
+            for r in regressions:
+                lines.append(f"  {r['metric']}: {r['baseline_ms']:.1f} -> {r['current_ms']:.1f}ms（x{r['ratio']}）")
+        else:
+            lines.append("回帰なし")
+    return "\n".join(lines)
+
+
+def baseline_path() -> Path:
+    return log_dir() / "bench" / "startup-baseline.json"
+
+
+def main(
+    config: StartupBenchConfig, output: str | None = None, baseline: str | None = None, save_baseline: bool = False,
+) -> int:
+    """計測して要約を表示し、回帰があれば 1 を返す。"""
+    report = run_startup_bench(config)
+    base_file = Path(baseline) if baseline else baseline_path()
+    if not save_baseline and base_file.exists():
+        report["baseline"] = str(base_file)
+        report["regressions"] = compare(report, json.loads(base_file.read_text(encoding="utf-8")), config.threshold)
+    print(format_summary(report))
+
+    if output:
+        path = Path(output)
+    else:
+        path = log_dir() / "bench" / f"startup-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n結果: {path}")
+    if save_baseline:
+        base_file.parent.mkdir(parents=True, exist_ok=True)
+        base_file.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"ベースライン: {base_file}")
+    return 1 if report.get("regressions") else 0
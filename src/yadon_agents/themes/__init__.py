@@ -8,11 +8,14 @@ from __future__ import annotations
 
 import importlib
 import os
-from typing import Callable
+from typing import TYPE_CHECKING
 
-from yadon_agents.domain.theme import ThemeConfig
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
-__all__ = ["get_theme", "get_worker_sprite_builder", "get_manager_sprite_builder"]
+    from yadon_agents.domain.theme import ThemeConfig
+
+__all__ = ["get_theme", "theme_identity", "get_worker_sprite_builder", "get_manager_sprite_builder"]
 
 _cached_theme: ThemeConfig | None = None
 
@@ -33,6 +36,22 @@ def get_theme() -> ThemeConfig:
     return _cached_theme
 
 
+def theme_identity() -> tuple[str, str]:
+    """(ソケットのプレフィックス, マネージャーのエージェント名) を返す。
+
+    テーマモジュールが SOCKET_PREFIX / AGENT_ROLE_MANAGER を定義していれば ThemeConfig を組み立てずに返す
+    （yadon _send 等の高速経路用）。定義していなければ get_theme() で求める。
+    """
+    if _cached_theme is None:
+        module = importlib.import_module(f"yadon_agents.themes.{os.environ.get('YADON_THEME', 'yadon')}")
+        prefix = getattr(module, "SOCKET_PREFIX", None)
+        manager = getattr(module, "AGENT_ROLE_MANAGER", None)
+        if prefix and manager:
+            return prefix, manager
+    theme = get_theme()
+    return theme.socket_prefix, theme.agent_role_manager
+
+
 def _reset_cache() -> None:
     """テスト用: キャッシュをリセットする。"""
     global _cached_theme
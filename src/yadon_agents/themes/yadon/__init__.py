@@ -5,20 +5,29 @@
 
 from __future__ import annotations
 
-from yadon_agents.domain.theme import (
-    RoleNames,
-    ThemeConfig,
-    WorkerCountConfig,
-    YarukiSwitchConfig,
-)
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from yadon_agents.domain.theme import ThemeConfig
+
+# ThemeConfig を組み立てずに読めるソケット名の構成要素（yadon _send 等の高速経路用）
+SOCKET_PREFIX = "yadon"
+AGENT_ROLE_MANAGER = "yadoran"
 
 
 def build_theme() -> ThemeConfig:
     """ヤドンテーマの ThemeConfig を構築する。"""
+    from yadon_agents.domain.theme import (
+        RoleNames,
+        ThemeConfig,
+        WorkerCountConfig,
+        YarukiSwitchConfig,
+    )
+
     return ThemeConfig(
         name="yadon",
         display_name="ヤドン・エージェント",
-        socket_prefix="yadon",
+        socket_prefix=SOCKET_PREFIX,
         role_names=RoleNames(
             coordinator="ヤドキング",
             manager="ヤドラン",
@@ -123,7 +132,7 @@ def build_theme() -> ThemeConfig:
         instructions_manager="yadoran.md",
         instructions_worker="yadon.md",
         agent_role_coordinator="yadoking",
-        agent_role_manager="yadoran",
+        agent_role_manager=AGENT_ROLE_MANAGER,
         agent_role_worker="yadon",
         worker_task_bubble="やるやぁん「{summary}」",
         worker_success_bubble="できたやぁん「{summary}」",
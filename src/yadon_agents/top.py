@@ -0,0 +1,177 @@
+"""yadon top — ヤドン群の状態をターミナルに表示し続けるダッシュボード
+
+GUIデーモンの状態ストリーム（infra/status_stream.py）を購読し、届いたスナップショットごとに
+エージェントの状態・実行中のタスクとサブタスク・経過時間・バックエンド・待ち数と、
+直近のスループット・エラー率を curses で描き直す。端末でなければ1画面分を表示して終わる。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from yadon_agents.config.agent import TOP_RATE_WINDOW
+from yadon_agents.infra.status_stream import subscribe
+
+__all__ = ["RateTracker", "render", "run_top"]
+
+
+def _totals(snapshot: dict[str, Any]) -> dict[str, tuple[float, float]]:
+    """エージェント名 -> (完了数, 失敗数)。ヤドランはタスク、ヤドンはサブタスクで数える。"""
+    totals: dict[str, tuple[float, float]] = {}
+    tasks = snapshot.get("tasks", {})
+    done = sum(tasks.values())
+    totals["__tasks__"] = (done, done - tasks.get("success", 0.0))
+    for key, count in snapshot.get("subtasks", {}).items():
+        worker, _, status = key.rpartition("/")
+        ok, failed = totals.get(worker, (0.0, 0.0))
+        totals[worker] = (ok + count, failed + (0.0 if status == "success" else count))
+    return totals
+
+
+class RateTracker:
+    """スナップショットのカウンターの差分から直近 window 秒のスループットとエラー率を求める"""
+
+    def __init__(self, window: float = TOP_RATE_WINDOW):
+        self.window = window
+        self._history: deque[tuple[float, dict[str, tuple[float, float]]]] = deque()
+
+    def update(self, snapshot: dict[str, Any]) -> None:
+        now = float(snapshot.get("time", time.time()))
+        self._history.append((now, _totals(snapshot)))
+        while len(self._history) > 2 and now - self._history[1][0] >= self.window:
+            self._history.popleft()
+
+    def rate(self, key: str) -> tuple[float, float | None]:
+        """key（エージェント名 / "__tasks__"）の (1分あたりの完了数, エラー率 or None) を返す。"""
+        if len(self._history) < 2:
+            return 0.0, None
+        (t0, first), (t1, last) = self._history[0], self._history[-1]
+        done0, failed0 = first.get(key, (0.0, 0.0))
+        done1, failed1 = last.get(key, (0.0, 0.0))
+        done = done1 - done0
+        per_minute = done * 60.0 / (t1 - t0) if t1 > t0 else 0.0
+        return per_minute, ((failed1 - failed0) / done if done > 0 else None)
+
+
+def _elapsed(started: float | None, now: float) -> str:
+    if not started:
+        return "-"
+    seconds = max(now - started, 0.0)
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    return f"{int(seconds // 60)}m{int(seconds % 60):02d}s"
+
+
+def _percent(ratio: float | None) -> str:
+    return "-" if ratio is None else f"{ratio * 100:.0f}%"
+
+
+def render(snapshot: dict[str, Any], rates: RateTracker, interval: float) -> list[str]:
+    """スナップショット1つ分の画面を行のリストにする。"""
+    now = float(snapshot.get("time", time.time()))
+    concurrency = snapshot.get("concurrency", {})
+    breakers = snapshot.get("breakers", {})
+    task_rate, task_errors = rates.rate("__tasks__")
+    lines = [
+        f"yadon top — {time.strftime('%H:%M:%S', time.localtime(now))}  更新 {interval:g}秒  q で終了",
+        f"タスク: 完了 {int(sum(snapshot.get('tasks', {}).values()))}件  "
+        f"直近 {task_rate:.1f}件/分  エラー率 {_percent(task_errors)}  "
+        f"リース待ち {int(snapshot.get('subtasks_waiting', 0))}",
+        "",
+        f"{'AGENT':<12}{'STATE':<9}{'ELAPSED':>9}  {'BACKEND':<10}{'QUEUE':>6}{'/分':>7}{'ERR':>6}  TASK / DETAIL",
+    ]
+    for agent in snapshot.get("agents", []):
+        name = str(agent.get("name", "?"))
+        backend = agent.get("backend") or "-"
+        if agent.get("role") == "manager":
+            # ヤドラン: 待ち数はリース待ちのサブタスク、スループットはタスク単位
+            queue = int(agent.get("queue", 0))
+            per_minute, errors = task_rate, task_errors
+        else:
+            queue = int(concurrency.get(backend, {}).get("waiting", 0))
+            per_minute, errors = rates.rate(name)
+        task = " ".join(str(part) for part in (agent.get("current_task"), agent.get("detail")) if part)
+        lines.append(
+            f"{name:<12}{str(agent.get('state', '?')):<9}{_elapsed(agent.get('started'), now):>9}  "
+            f"{backend:<10}{queue:>6}{per_minute:>7.1f}{_percent(errors):>6}  {task}"
+        )
+    if breakers or concurrency:
+        lines += ["", "バックエンド:"]
+        for backend in sorted(set(breakers) | set(concurrency)):
+            info = breakers.get(backend, {})
+            slots = concurrency.get(backend, {})
+            line = f"  {backend}: {info.get('state', '-')}"
+            if slots:
+                line += f"  同時実行 {slots.get('in_flight', 0)}/{slots.get('limit', 0)} 待機 {slots.get('waiting', 0)}"
+            lines.append(line)
+    errors_by_worker = snapshot.get("dispatch_errors", {})
+    if errors_by_worker:
+        lines.append("")
+        lines.append("送信失敗: " + ", ".join(f"{w} {int(n)}" for w, n in sorted(errors_by_worker.items())))
+    return lines
+
+
+def _curses_main(sock_path: str, interval: float) -> None:
+    import curses
+
+    latest: list[dict[str, Any] | None] = [None]
+    closed = threading.Event()
+    updated = threading.Event()
+
+    def reader() -> None:
+        try:
+            for snapshot in subscribe(sock_path, interval):
+                latest[0] = snapshot
+                updated.set()
+        except (OSError, ValueError):
+            pass
+        finally:
+            closed.set()
+            updated.set()
+
+    threading.Thread(target=reader, name="top-reader", daemon=True).start()
+    rates = RateTracker()
+
+    def loop(screen: Any) -> None:
+        curses.curs_set(0)
+        screen.timeout(100)
+        while True:
+            if screen.getch() in (ord("q"), ord("Q"), 27):
+                return
+            if not updated.is_set():
+                continue
+            updated.clear()
+            snapshot = latest[0]
+            if closed.is_set():
+                return
+            if snapshot is None:
+                continue
+            rates.update(snapshot)
+            height, width = screen.getmaxyx()
+            screen.erase()
+            for row, line in enumerate(render(snapshot, rates, interval)[:height]):
+                try:
+                    screen.addnstr(row, 0, line, max(width - 1, 0))
+                except curses.error:
+                    # 全角文字が右端にかかると描画できないことがある
+                    pass
+            screen.refresh()
+
+    curses.wrapper(loop)
+    if closed.is_set():
+        print("状態ストリームの接続が切れました")
+
+
+def run_top(sock_path: str, interval: float, once: bool = False) -> None:
+    """状態ストリームを購読して表示する。once なら1画面分を表示して終わる。"""
+    if not once:
+        _curses_main(sock_path, interval)
+        return
+    rates = RateTracker()
+    for snapshot in subscribe(sock_path, interval):
+        rates.update(snapshot)
+        print("\n".join(render(snapshot, rates, interval)))
+        return
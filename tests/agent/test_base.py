@@ -6,6 +6,8 @@ import socket
 import threading
 from typing import Any
 
+import pytest
+
 from yadon_agents.agent.base import BaseAgent
 from yadon_agents.infra.protocol import create_server_socket, send_message
 
@@ -118,3 +120,63 @@ class TestHandleConnection:
 
         assert result["type"] == "error"
         assert "不明なメッセージタイプ" in result["message"]
+
+    def test_unknown_types_share_one_metric_label(self, sock_dir):
+        """未知のメッセージタイプは other にまとめ、クライアントの値でラベルを増やさないこと"""
+        from yadon_agents.infra import metrics
+
+        sock_path = os.path.join(sock_dir, "t.sock")
+        agent = FakeAgent(sock_path)
+        before = metrics.SOCKET_CONNECTIONS.value(agent="fake-agent", type="other")
+
+        for msg_type in ("x-1", "x-2", ["list"]):
+            _run_agent_one_request(agent, {"type": msg_type})
+
+        assert metrics.SOCKET_CONNECTIONS.value(agent="fake-agent", type="other") == before + 3
+        assert metrics.SOCKET_CONNECTIONS.value(agent="fake-agent", type="x-1") == 0
+
+    def test_activity_tracks_current_task(self, sock_dir):
+        """activity() が実行中のタスク・開始時刻・説明を返し、タスク終了で消えること"""
+        agent = FakeAgent(os.path.join(sock_dir, "t.sock"))
+        agent.running = True
+        assert agent.activity()["state"] == "idle"
+
+        agent.current_task_id = "task-1"
+        agent.current_detail = "implement (1/3)"
+        activity = agent.activity()
+        assert activity["state"] == "busy"
+        assert activity["current_task"] == "task-1"
+        assert activity["detail"] == "implement (1/3)"
+        assert activity["started"] is not None
+
+        agent.current_task_id = None
+        activity = agent.activity()
+        assert activity["started"] is None
+        assert activity["detail"] is None
+
+
+class TestServeForeverReadiness:
+    def test_started_after_listen(self, sock_dir):
+        """ソケットを listen したら started を立て、その時刻を ready_at に記録すること"""
+        sock_path = os.path.join(sock_dir, "t.sock")
+        agent = FakeAgent(sock_path)
+        thread = threading.Thread(target=agent.serve_forever, daemon=True)
+        thread.start()
+        try:
+            assert agent.started.wait(5)
+            assert agent.ready_at is not None
+            assert agent.startup_error is None
+            # started の時点で接続を受け付けられる
+            assert send_message(sock_path, {"type": "status", "from": "test"}, timeout=5.0)["type"] == "status_response"
+        finally:
+            agent.stop()
+            thread.join(timeout=5)
+
+    def test_startup_error(self, sock_dir):
+        """ソケットを作れなければ理由を startup_error に入れて started を立てること"""
+        agent = FakeAgent(os.path.join(sock_dir, "missing", "t.sock"))
+        with pytest.raises(OSError):
+            agent.serve_forever()
+        assert agent.started.is_set()
+        assert agent.ready_at is None
+        assert agent.startup_error
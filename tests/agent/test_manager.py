@@ -12,6 +12,8 @@ from yadon_agents.agent.manager import (
     YadoranManager,
     _aggregate_results,
     _extract_json,
+    _summarize_resources,
+    _summarize_usage,
 )
 from yadon_agents.domain.ports.llm_port import LLMRunnerPort
 
@@ -341,3 +343,102 @@ class TestEdgeCases:
         result = _extract_json(output)
         assert result["key"] == "value"
         assert result["nested"]["array"] == [1, 2, 3]
+
+
+class TestSummarizeUsage:
+    """_summarize_usage() のテスト"""
+
+    def test_aggregates_by_phase_and_backend(self):
+        """フェーズ別・バックエンド別・合計が集計されること"""
+        summary = _summarize_usage({
+            "decompose": [{"usage": {"input_tokens": 100, "calls": 1}, "backend": "claude"}],
+            "implement": [
+                {"usage": {"input_tokens": 10, "output_tokens": 5, "calls": 1}, "backend": "claude"},
+                {"usage": {"input_tokens": 20, "output_tokens": 7, "calls": 1}, "backend": "gemini"},
+            ],
+            "review": [{"summary": "使用量なし"}],
+        })
+
+        assert summary["total"]["input_tokens"] == 130
+        assert summary["total"]["calls"] == 3
+        assert summary["phases"]["implement"]["output_tokens"] == 12
+        assert summary["phases"]["review"]["calls"] == 0
+        assert summary["backends"]["claude"]["input_tokens"] == 110
+        assert summary["backends"]["gemini"]["calls"] == 1
+
+    def test_handle_task_reports_usage(self, sock_dir):
+        """handle_task() の結果ペイロードに使用量の集計が含まれること"""
+        output = json.dumps({"phases": [{"name": "implement", "subtasks": [{"instruction": "x"}]}]})
+        manager = YadoranManager(project_dir=sock_dir, claude_runner=FakeClaudeRunner(output=output))
+        worker_result = {
+            "type": "result", "from": "yadon-1", "status": "success",
+            "payload": {"output": "ok", "summary": "ok", "backend": "gemini",
+                        "usage": {"input_tokens": 42, "calls": 1}},
+        }
+
+        from unittest.mock import patch
+        with patch.object(manager, "dispatch_to_yadon", return_value=worker_result):
+            result = manager.handle_task({"id": "t1", "payload": {"instruction": "x", "project_dir": sock_dir}})
+
+        usage = result["payload"]["usage"]
+        assert usage["phases"]["implement"]["input_tokens"] == 42
+        assert usage["backends"]["gemini"]["input_tokens"] == 42
+
+    def test_handle_task_records_error_when_run_raises(self, sock_dir):
+        """_run_task が例外を投げても履歴は error で上書きされ、メトリクスとトレースも記録されること"""
+        from unittest.mock import patch
+
+        from yadon_agents.infra import metrics
+
+        manager = YadoranManager(project_dir=sock_dir, claude_runner=FakeClaudeRunner())
+        manager._history = MagicMock()
+        before = metrics.TASKS.value(status="error")
+
+        with patch.object(manager, "_run_task", side_effect=RuntimeError("boom")), \
+                patch("yadon_agents.agent.manager.tracing.export") as export:
+            with pytest.raises(RuntimeError):
+                manager.handle_task({"id": "t-err", "payload": {"instruction": "x", "project_dir": sock_dir}})
+
+        statuses = [c.kwargs["status"] for c in manager._history.record_task.call_args_list]
+        assert statuses == ["running", "error"]
+        assert metrics.TASKS.value(status="error") == before + 1
+        export.assert_called_once_with("t-err")
+
+
+class TestSummarizeResources:
+    """_summarize_resources() のテスト"""
+
+    def test_aggregates_by_phase(self):
+        """フェーズ別・合計と、並列実行時のRSS合計が集計されること"""
+        summary = _summarize_resources({
+            "decompose": [{"resources": {"wall_ms": 1000, "user_cpu_ms": 50, "max_rss_kb": 100_000}}],
+            "implement": [
+                {"resources": {"wall_ms": 5000, "user_cpu_ms": 3000, "max_rss_kb": 400_000}},
+                {"resources": {"wall_ms": 4000, "sys_cpu_ms": 1000, "max_rss_kb": 300_000}},
+            ],
+            "review": [{"summary": "資源使用量なし"}],
+        })
+
+        assert summary["total"]["runs"] == 3
+        assert summary["total"]["wall_ms"] == 10_000
+        assert summary["total"]["max_rss_kb"] == 400_000
+        assert summary["phases"]["implement"]["cpu_ratio"] == pytest.approx(4000 / 9000, abs=0.001)
+        assert summary["phases"]["implement"]["parallel_rss_kb"] == 700_000
+        assert summary["peak_parallel_rss_kb"] == 700_000
+        assert "review" not in summary["phases"]
+
+    def test_none_without_resources(self):
+        assert _summarize_resources({"implement": [{"summary": "x"}]}) is None
+
+
+def test_handle_status_includes_breakers(sock_dir):
+    """handle_status() にバックエンドのブレーカー状態が含まれること"""
+    from yadon_agents.infra.circuit_breaker import get_breaker
+
+    get_breaker("gemini").record("error")
+    manager = YadoranManager(project_dir=sock_dir, claude_runner=FakeClaudeRunner())
+
+    status = manager.handle_status({"type": "status"})
+
+    assert status["breakers"]["gemini"]["recent_errors"] == 1
+    assert "concurrency" in status
@@ -7,6 +7,9 @@ dispatch() の正常系・エラー系、複数フェーズ実行フロー。
 from __future__ import annotations
 
 import json
+import shutil
+import subprocess
+from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
 
@@ -293,6 +296,45 @@ class TestDispatchPhase:
         assert len(results) == manager.yadon_count
         assert call_count[0] == manager.yadon_count
 
+    def test_dispatch_phase_serializes_overlapping_paths(self, sock_dir: str) -> None:
+        """同じパスを触るサブタスクは同時に実行されず、他は並列に実行されること"""
+        import threading
+        import time
+
+        manager = YadoranManager(project_dir=sock_dir, claude_runner=FakeClaudeRunner())
+        lock = threading.Lock()
+        active: set[str] = set()
+        overlaps: list[set[str]] = []
+
+        def mock_dispatch(yadon_number: int, subtask: Any, project_dir: str, sub_task_id: str) -> dict[str, Any]:
+            with lock:
+                active.add(subtask["instruction"])
+                overlaps.append(set(active))
+            time.sleep(0.1)
+            with lock:
+                active.discard(subtask["instruction"])
+            return ResultMessage(
+                task_id=sub_task_id, from_agent=f"yadon-{yadon_number}", status="success", output="", summary="完了",
+            ).to_dict()
+
+        with patch.object(manager, "dispatch_to_yadon", side_effect=mock_dispatch), \
+                patch("yadon_agents.agent.manager.LEASE_POLL_INTERVAL", 0.01):
+            phase = {
+                "name": "implement",
+                "subtasks": [
+                    {"instruction": "A", "paths": ["src/cli.py"]},
+                    {"instruction": "B", "paths": ["src"]},
+                    {"instruction": "C", "paths": ["docs"]},
+                ],
+            }
+            results = manager._dispatch_phase(phase, sock_dir, "task-003", 0)
+
+        assert [r["status"] for r in results] == ["success"] * 3
+        assert [r["from"] for r in results] == ["yadon-1", "yadon-2", "yadon-3"]
+        assert not any({"A", "B"} <= seen for seen in overlaps)
+        assert any({"A", "C"} <= seen for seen in overlaps)
+        assert manager._leases.snapshot() == {}
+
     def test_dispatch_phase_empty_subtasks(self, sock_dir: str) -> None:
         """サブタスクが空の場合"""
         fake_runner = FakeClaudeRunner()
@@ -306,6 +348,46 @@ class TestDispatchPhase:
 
         assert len(results) == 0
 
+    def test_dispatch_phase_retries_stalled(self, sock_dir: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        """停滞したサブタスクは YADON_STALL_RETRIES 回まで別IDで再送されること"""
+        monkeypatch.setenv("YADON_STALL_RETRIES", "2")
+        manager = YadoranManager(project_dir=sock_dir, claude_runner=FakeClaudeRunner())
+        sent_ids: list[str] = []
+
+        def mock_dispatch(yadon_number: int, subtask: Any, project_dir: str, sub_task_id: str) -> dict[str, Any]:
+            sent_ids.append(sub_task_id)
+            status = "success" if sub_task_id.endswith("retry2") else "stalled"
+            return ResultMessage(
+                task_id=sub_task_id, from_agent=f"yadon-{yadon_number}",
+                status=status, output="", summary="",
+            ).to_dict()
+
+        with patch.object(manager, "dispatch_to_yadon", side_effect=mock_dispatch):
+            phase = {"name": "implement", "subtasks": [{"instruction": "タスク"}]}
+            results = manager._dispatch_phase(phase, sock_dir, "task-004", 0)
+
+        assert sent_ids == [
+            "task-004-implement-sub1",
+            "task-004-implement-sub1-retry1",
+            "task-004-implement-sub1-retry2",
+        ]
+        assert results[0]["status"] == "success"
+
+    def test_dispatch_phase_stalled_after_retries(self, sock_dir: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        """再送しても停滞し続けた場合は stalled のまま返ること"""
+        monkeypatch.setenv("YADON_STALL_RETRIES", "1")
+        manager = YadoranManager(project_dir=sock_dir, claude_runner=FakeClaudeRunner())
+        stalled = ResultMessage(
+            task_id="x", from_agent="yadon-1", status="stalled", output="", summary="",
+        ).to_dict()
+
+        with patch.object(manager, "dispatch_to_yadon", return_value=stalled) as mock_dispatch:
+            phase = {"name": "implement", "subtasks": [{"instruction": "タスク"}]}
+            results = manager._dispatch_phase(phase, sock_dir, "task-005", 0)
+
+        assert mock_dispatch.call_count == 2
+        assert results[0]["status"] == "stalled"
+
 
 class TestHandleStatus:
     """handle_status() のテスト"""
@@ -359,6 +441,17 @@ class TestHandleStatus:
             assert worker_status == "unreachable"
 
 
+    def test_handle_status_includes_leases(self, sock_dir: str) -> None:
+        """保持中のファイルリースがステータスに含まれること"""
+        manager = YadoranManager(project_dir=sock_dir, claude_runner=FakeClaudeRunner())
+        manager._leases.try_acquire("yadon-1", "task-1-sub1", frozenset({"src/a.py"}))
+
+        with patch("yadon_agents.agent.manager.Path.exists", return_value=False):
+            result = manager.handle_status({})
+
+        assert result["leases"]["yadon-1"]["paths"] == ["src/a.py"]
+
+
 class TestDecomposeTaskEdgeCases:
     """decompose_task() のエッジケーステスト"""
 
@@ -415,6 +508,246 @@ class TestDecomposeTaskEdgeCases:
         assert phases[0].get("subtasks", []) == []
 
 
+class TestChangeManifest:
+    """後続フェーズへの変更マニフェストの受け渡し"""
+
+    def setup_method(self) -> None:
+        _reset_cache()
+
+    def test_later_phase_receives_manifest(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """docs フェーズの指示に implement フェーズで変わったファイルが添えられること"""
+        monkeypatch.setenv("YADON_CONTEXT_BUNDLE", "0")
+        json_output = json.dumps({
+            "phases": [
+                {"name": "implement", "subtasks": [{"instruction": "実装"}]},
+                {"name": "docs", "subtasks": [{"instruction": "ドキュメント更新"}]},
+            ],
+            "strategy": "2フェーズ",
+        })
+        manager = YadoranManager(project_dir=str(tmp_path), claude_runner=FakeClaudeRunner(output=json_output))
+        instructions: list[str] = []
+
+        def mock_dispatch(yadon_number: int, subtask: Any, project_dir: str, sub_task_id: str) -> dict[str, Any]:
+            instructions.append(subtask["instruction"])
+            if subtask["instruction"] == "実装":
+                Path(project_dir, "feature.py").write_text("def f(): ...\n")
+            return ResultMessage(
+                task_id=sub_task_id, from_agent=f"yadon-{yadon_number}", status="success", output="", summary="完了",
+            ).to_dict()
+
+        with patch.object(manager, "dispatch_to_yadon", side_effect=mock_dispatch):
+            manager.handle_task({
+                "id": "task-manifest",
+                "from": "test",
+                "payload": {"instruction": "機能追加", "project_dir": str(tmp_path)},
+            })
+
+        assert instructions[0] == "実装"
+        assert instructions[1].startswith("ドキュメント更新\n\n## これまでのフェーズによる変更")
+        assert "- A feature.py" in instructions[1]
+
+
+    def test_subtasks_reference_context_bundle(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """全サブタスクの指示がタスク分解と並行して作ったリポジトリ概要を参照すること"""
+        monkeypatch.setenv("YADON_MANIFEST_BYTES", "0")
+        (tmp_path / "README.md").write_text("# サンプル\n")
+        json_output = json.dumps({
+            "phases": [
+                {"name": "implement", "subtasks": [{"instruction": "実装1"}, {"instruction": "実装2"}]},
+                {"name": "review", "subtasks": [{"instruction": "レビュー"}]},
+            ],
+            "strategy": "2フェーズ",
+        })
+        manager = YadoranManager(project_dir=str(tmp_path), claude_runner=FakeClaudeRunner(output=json_output))
+        instructions: list[str] = []
+
+        def mock_dispatch(yadon_number: int, subtask: Any, project_dir: str, sub_task_id: str) -> dict[str, Any]:
+            instructions.append(subtask["instruction"])
+            return ResultMessage(
+                task_id=sub_task_id, from_agent=f"yadon-{yadon_number}", status="success", output="", summary="完了",
+            ).to_dict()
+
+        bundle = tmp_path.parent / "bundle.md"
+        bundle.write_text("# リポジトリ概要\n")
+        with patch.object(manager, "dispatch_to_yadon", side_effect=mock_dispatch), \
+                patch("yadon_agents.agent.manager.build_bundle", return_value=bundle) as build:
+            manager.handle_task({
+                "id": "task-bundle",
+                "from": "test",
+                "payload": {"instruction": "機能追加", "project_dir": str(tmp_path)},
+            })
+
+        build.assert_called_once_with(str(tmp_path))
+        assert len(instructions) == 3
+        assert all(f"## リポジトリ概要\n{bundle} に" in text for text in instructions)
+
+
+class TestTracing:
+    """ヤドラン → ヤドンのタスクトレース"""
+
+    def setup_method(self) -> None:
+        _reset_cache()
+
+    def test_task_trace_spans_manager_and_worker(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """1タスクのスパンがヤドランからヤドンまで親子関係でつながり、Chrome trace として書き出されること"""
+        from yadon_agents.agent.worker import YadonWorker
+        from yadon_agents.infra import tracing
+
+        monkeypatch.setattr(tracing, "_trace_dir", lambda: tmp_path)
+        monkeypatch.setenv("YADON_CONTEXT_BUNDLE", "0")
+        json_output = json.dumps({
+            "phases": [{"name": "implement", "subtasks": [{"instruction": "実装"}]}],
+            "strategy": "単純",
+        })
+        manager = YadoranManager(project_dir=str(tmp_path), claude_runner=FakeClaudeRunner(output=json_output))
+        worker = YadonWorker(number=1, project_dir=str(tmp_path), claude_runner=FakeClaudeRunner(output="完了"))
+
+        with patch(
+            "yadon_agents.agent.manager.proto.send_message",
+            side_effect=lambda path, msg, timeout: worker.handle_task(msg),
+        ):
+            result = manager.handle_task({
+                "id": "task-trace",
+                "from": "test",
+                "payload": {"instruction": "機能追加", "project_dir": str(tmp_path)},
+            })
+
+        assert result["status"] == "success"
+        lines = (tmp_path / "task-trace.jsonl").read_text(encoding="utf-8").splitlines()
+        spans = {r["name"]: r for r in map(json.loads, lines)}
+        assert {"manager.handle_task", "manager.decompose", "manager.dispatch_phase",
+                "manager.dispatch", "worker.handle_task", "manager.aggregate"} <= set(spans)
+        assert spans["manager.dispatch_phase"]["attrs"]["phase"] == "implement"
+        assert spans["worker.handle_task"]["parent_id"] == spans["manager.dispatch"]["span_id"]
+        assert spans["manager.handle_task"]["attrs"]["status"] == "success"
+        assert (tmp_path / "task-trace.trace.json").exists()
+
+
+class TestMetrics:
+    """ヤドランのメトリクス記録"""
+
+    def setup_method(self) -> None:
+        _reset_cache()
+
+    def test_task_and_dispatch_metrics(self, sock_dir: str) -> None:
+        """タスク・フェーズ・サブタスク・送信失敗がメトリクスに記録されること"""
+        from yadon_agents.infra import metrics
+
+        json_output = json.dumps({
+            "phases": [{"name": "implement", "subtasks": [{"instruction": "A"}, {"instruction": "B"}]}],
+            "strategy": "並列",
+        })
+        manager = YadoranManager(project_dir=sock_dir, claude_runner=FakeClaudeRunner(output=json_output))
+        before = {
+            "tasks": metrics.TASKS.value(status="partial_error"),
+            "ok": metrics.SUBTASKS.value(worker="yadon-1", status="success"),
+            "errors": metrics.DISPATCH_ERRORS.value(worker="yadon-2"),
+            "phases": metrics.PHASE_DURATION.count(phase="implement"),
+        }
+
+        def send(path: str, msg: dict[str, Any], timeout: float) -> dict[str, Any]:
+            if "yadon-2" in path:
+                raise ConnectionRefusedError()
+            return ResultMessage(
+                task_id=msg["id"], from_agent="yadon-1", status="success", output="", summary="完了",
+            ).to_dict()
+
+        with patch("yadon_agents.agent.manager.proto.send_message", side_effect=send):
+            manager.handle_task({
+                "id": "task-metrics",
+                "from": "test",
+                "payload": {"instruction": "x", "project_dir": sock_dir},
+            })
+
+        assert metrics.TASKS.value(status="partial_error") == before["tasks"] + 1
+        assert metrics.SUBTASKS.value(worker="yadon-1", status="success") == before["ok"] + 1
+        assert metrics.DISPATCH_ERRORS.value(worker="yadon-2") == before["errors"] + 1
+        assert metrics.PHASE_DURATION.count(phase="implement") == before["phases"] + 1
+        assert metrics.TASKS_IN_PROGRESS.value(agent=manager.name) == 0
+
+
+class TestHistory:
+    """タスク履歴の記録"""
+
+    def test_records_task_phases_and_subtasks(self, sock_dir: str) -> None:
+        """タスク・フェーズ・送信ごとのサブタスクが履歴に記録されること"""
+        from yadon_agents.infra.history import get_history
+
+        json_output = json.dumps({
+            "phases": [
+                {"name": "implement", "subtasks": [{"instruction": "A"}, {"instruction": "B"}]},
+                {"name": "review", "subtasks": [{"instruction": "C"}]},
+            ],
+            "strategy": "並列",
+        })
+        manager = YadoranManager(project_dir=sock_dir, claude_runner=FakeClaudeRunner(output=json_output))
+
+        def send(path: str, msg: dict[str, Any], timeout: float) -> dict[str, Any]:
+            return ResultMessage(
+                task_id=msg["id"], from_agent="yadon-1", status="success", output="out", summary="完了",
+                backend="claude", output_path="/logs/outputs/sub.txt",
+            ).to_dict()
+
+        with patch("yadon_agents.agent.manager.proto.send_message", side_effect=send):
+            manager.handle_task({
+                "id": "task-history",
+                "from": "test",
+                "payload": {"instruction": "履歴を残す", "project_dir": sock_dir},
+            })
+
+        store = get_history()
+        assert store is not None
+        store.flush()
+        task = store.task("task-history")
+        assert task is not None
+        assert task["status"] == "success"
+        assert task["instruction"] == "履歴を残す"
+        assert task["duration"] >= 0
+        assert "out" in task["output"]
+        assert [(p["name"], p["subtasks"]) for p in task["phases"]] == [("implement", 2), ("review", 1)]
+        subtasks = {s["subtask_id"]: s for s in task["subtasks"]}
+        assert set(subtasks) == {
+            "task-history-implement-sub1", "task-history-implement-sub2", "task-history-review-sub1",
+        }
+        assert subtasks["task-history-review-sub1"]["phase"] == "review"
+        assert subtasks["task-history-review-sub1"]["backend"] == "claude"
+        assert subtasks["task-history-review-sub1"]["output_path"] == "/logs/outputs/sub.txt"
+
+
+class TestActivity:
+    """yadon top 向けの activity()"""
+
+    def test_detail_follows_phase(self, sock_dir: str) -> None:
+        """実行中はフェーズと配分状況を示し、タスク完了で idle に戻ること"""
+        json_output = json.dumps({
+            "phases": [{"name": "implement", "subtasks": [{"instruction": "A"}]}],
+            "strategy": "単一",
+        })
+        manager = YadoranManager(project_dir=sock_dir, claude_runner=FakeClaudeRunner(output=json_output))
+        manager.running = True
+        seen: list[dict[str, Any]] = []
+
+        def send(path: str, msg: dict[str, Any], timeout: float) -> dict[str, Any]:
+            seen.append(manager.activity())
+            return ResultMessage(
+                task_id=msg["id"], from_agent="yadon-1", status="success", output="", summary="完了",
+            ).to_dict()
+
+        with patch("yadon_agents.agent.manager.proto.send_message", side_effect=send):
+            manager.handle_task({
+                "id": "task-activity",
+                "from": "test",
+                "payload": {"instruction": "x", "project_dir": sock_dir},
+            })
+
+        assert seen[0]["role"] == "manager"
+        assert seen[0]["state"] == "busy"
+        assert seen[0]["current_task"] == "task-activity"
+        assert seen[0]["detail"].startswith("implement")
+        assert manager.activity()["state"] == "idle"
+        assert manager.activity()["detail"] is None
+
+
 class TestBubbleNotifications:
     """吹き出し通知のテスト"""
 
@@ -455,3 +788,105 @@ class TestBubbleNotifications:
 
         # 吹き出しが複数回呼ばれる（タスク受信、フェーズ開始、完了）
         assert len(bubble_calls) >= 3
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git が必要")
+class TestWorktreeDispatch:
+    """YADON_WORKTREES 有効時の worktree 分離とマージ"""
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        monkeypatch.setenv("YADON_WORKTREES", "1")
+        path = tmp_path / "repo"
+        path.mkdir()
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+        subprocess.run([*git, "init", "-q"], cwd=path, check=True)
+        (path / "a.txt").write_text("one\ntwo\n")
+        subprocess.run([*git, "add", "-A"], cwd=path, check=True)
+        subprocess.run([*git, "commit", "-q", "-m", "init"], cwd=path, check=True)
+        return path
+
+    def _ok(self, n: int, sub_task_id: str) -> dict[str, Any]:
+        return ResultMessage(
+            task_id=sub_task_id, from_agent=f"yadon-{n}", status="success", output="ok", summary="ok",
+        ).to_dict()
+
+    def test_parallel_edits_are_merged(self, repo: Path) -> None:
+        """ワーカーごとの worktree で実行され、変更が元の作業ツリーに取り込まれること"""
+        manager = YadoranManager(project_dir=str(repo), claude_runner=FakeClaudeRunner())
+        dirs: list[str] = []
+
+        def mock_dispatch(yadon_number: int, subtask: Any, project_dir: str, sub_task_id: str) -> dict[str, Any]:
+            dirs.append(project_dir)
+            Path(project_dir, f"w{yadon_number}.txt").write_text(subtask["instruction"])
+            return self._ok(yadon_number, sub_task_id)
+
+        with patch.object(manager, "dispatch_to_yadon", side_effect=mock_dispatch):
+            phase = {"name": "implement", "subtasks": [{"instruction": "A"}, {"instruction": "B"}]}
+            results = manager._dispatch_phase(phase, str(repo), "task-wt", 0)
+
+        assert [r["status"] for r in results] == ["success", "success"]
+        assert str(repo) not in dirs
+        assert len(set(dirs)) == 2
+        assert (repo / "w1.txt").read_text() == "A"
+        assert (repo / "w2.txt").read_text() == "B"
+
+    def test_conflicting_subtask_is_rerun(self, repo: Path) -> None:
+        """競合したサブタスクはマージ後の状態から再実行されること"""
+        manager = YadoranManager(project_dir=str(repo), claude_runner=FakeClaudeRunner())
+        calls: list[str] = []
+
+        def mock_dispatch(yadon_number: int, subtask: Any, project_dir: str, sub_task_id: str) -> dict[str, Any]:
+            calls.append(sub_task_id)
+            target = Path(project_dir, "a.txt")
+            lines = target.read_text().splitlines()
+            lines[1] = f"{lines[1]}+{subtask['instruction']}"
+            target.write_text("\n".join(lines) + "\n")
+            return self._ok(yadon_number, sub_task_id)
+
+        with patch.object(manager, "dispatch_to_yadon", side_effect=mock_dispatch):
+            phase = {"name": "implement", "subtasks": [{"instruction": "A"}, {"instruction": "B"}]}
+            results = manager._dispatch_phase(phase, str(repo), "task-wt", 0)
+
+        assert [r["status"] for r in results] == ["success", "success"]
+        assert calls[-1] == "task-wt-implement-sub2-rerun"
+        assert (repo / "a.txt").read_text() == "one\ntwo+A+B\n"
+
+    def test_failed_subtask_changes_are_kept_as_patch(
+        self, repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """失敗したサブタスクの変更はマージせずパッチとして残し、結果に記録すること"""
+        from yadon_agents.infra import worktree
+
+        monkeypatch.setattr(worktree, "log_dir", lambda: tmp_path / "logs")
+        (tmp_path / "logs").mkdir()
+        manager = YadoranManager(project_dir=str(repo), claude_runner=FakeClaudeRunner())
+
+        def mock_dispatch(yadon_number: int, subtask: Any, project_dir: str, sub_task_id: str) -> dict[str, Any]:
+            Path(project_dir, f"w{yadon_number}.txt").write_text(subtask["instruction"])
+            if yadon_number == 2:
+                return ResultMessage(
+                    task_id=sub_task_id, from_agent="yadon-2", status="error", output="", summary="タイムアウト",
+                ).to_dict()
+            return self._ok(yadon_number, sub_task_id)
+
+        with patch.object(manager, "dispatch_to_yadon", side_effect=mock_dispatch):
+            phase = {"name": "implement", "subtasks": [{"instruction": "A"}, {"instruction": "B"}]}
+            results = manager._dispatch_phase(phase, str(repo), "task-wt", 0)
+
+        assert (repo / "w1.txt").exists()
+        assert not (repo / "w2.txt").exists()
+        payload = results[1]["payload"]
+        saved = Path(payload["unapplied_changes"])
+        assert saved == tmp_path / "logs" / "patches" / "task-wt-implement-sub2.patch"
+        assert "w2.txt" in saved.read_text()
+        assert "適用していません" in payload["summary"]
+        assert "unapplied_changes" not in results[0]["payload"]
+
+    def test_single_subtask_runs_in_place(self, repo: Path) -> None:
+        manager = YadoranManager(project_dir=str(repo), claude_runner=FakeClaudeRunner())
+
+        with patch.object(manager, "dispatch_to_yadon", return_value=self._ok(1, "x")) as mock_dispatch:
+            manager._dispatch_phase({"name": "docs", "subtasks": [{"instruction": "A"}]}, str(repo), "t", 1)
+
+        assert mock_dispatch.call_args[0][2] == str(repo)
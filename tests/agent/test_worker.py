@@ -8,6 +8,7 @@ import pytest
 
 from yadon_agents.agent.worker import YadonWorker
 from yadon_agents.domain.ports.llm_port import LLMRunnerPort
+from yadon_agents.domain.run_result import LLMRunResult, ResourceUsage
 from yadon_agents.themes import _reset_cache
 
 
@@ -192,6 +193,30 @@ class TestYadonWorker:
 
         assert result["id"] == "my-unique-task-id-12345"
 
+    def test_handle_task_carries_output_path(self, sock_dir):
+        """スピルされた出力のパスが結果ペイロードに含まれること"""
+
+        class SpillingRunner(FakeClaudeRunner):
+            def run_detailed(self, prompt, model_tier, cwd=None, timeout=600, output_format=None, run_id=None):
+                self.last_run_kwargs = {"run_id": run_id}
+                return LLMRunResult(
+                    output="head ... tail", returncode=0,
+                    output_bytes=10_000_000, output_path=f"/logs/outputs/{run_id}.log",
+                )
+
+        fake_runner = SpillingRunner()
+        worker = YadonWorker(number=1, project_dir=sock_dir, claude_runner=fake_runner)
+
+        result = worker.handle_task({
+            "id": "task-big",
+            "from": "test",
+            "payload": {"instruction": "大量出力", "project_dir": sock_dir},
+        })
+
+        assert fake_runner.last_run_kwargs["run_id"] == "task-big"
+        assert result["payload"]["output"] == "head ... tail"
+        assert result["payload"]["output_path"] == "/logs/outputs/task-big.log"
+
 
 class TestEdgeCases:
     """エッジケースのテスト"""
@@ -326,3 +351,41 @@ class TestEdgeCases:
         })
 
         assert result["status"] == "error"
+
+    def test_handle_task_stalled(self, sock_dir):
+        """出力停滞で打ち切られた場合は status=stalled となること"""
+
+        class StalledRunner(FakeClaudeRunner):
+            def run_detailed(self, prompt, model_tier, cwd=None, timeout=600, output_format=None, run_id=None):
+                return LLMRunResult(output="停滞: 出力が 300 秒途絶えたため停止しました", returncode=1, stalled=True)
+
+        worker = YadonWorker(number=1, project_dir=sock_dir, claude_runner=StalledRunner())
+
+        result = worker.handle_task({
+            "id": "task-stall",
+            "from": "test",
+            "payload": {"instruction": "停滞テスト", "project_dir": sock_dir},
+        })
+
+        assert result["status"] == "stalled"
+
+    def test_handle_task_carries_resources(self, sock_dir):
+        """LLMサブプロセスの資源使用量が結果ペイロードに含まれること"""
+
+        class MeasuredRunner(FakeClaudeRunner):
+            def run_detailed(self, prompt, model_tier, cwd=None, timeout=600, output_format=None, run_id=None):
+                return LLMRunResult(
+                    output="done", returncode=0,
+                    resources=ResourceUsage(wall_ms=2000, user_cpu_ms=500, max_rss_kb=1024),
+                )
+
+        worker = YadonWorker(number=1, project_dir=sock_dir, claude_runner=MeasuredRunner())
+
+        result = worker.handle_task({
+            "id": "task-ru",
+            "from": "test",
+            "payload": {"instruction": "計測", "project_dir": sock_dir},
+        })
+
+        assert result["payload"]["resources"]["user_cpu_ms"] == 500
+        assert result["payload"]["resources"]["cpu_ratio"] == 0.25
@@ -0,0 +1,107 @@
+"""bench.py（yadon bench）のテスト
+
+疑似LLMの遅延を短く固定して、実際にヤドラン+ヤドンをスレッドで起動して計測する。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from yadon_agents.bench import BenchConfig, format_summary, percentiles, run_bench
+
+
+class TestPercentiles:
+    """percentiles() のテスト"""
+
+    def test_linear_interpolation(self) -> None:
+        """線形補間でパーセンタイルを求めること"""
+        stats = percentiles([float(v) for v in range(1, 101)])
+        assert stats["p50"] == pytest.approx(50.5)
+        assert stats["p95"] == pytest.approx(95.05)
+        assert stats["p99"] == pytest.approx(99.01)
+        assert stats["mean"] == pytest.approx(50.5)
+        assert stats["max"] == 100.0
+        assert stats["count"] == 100
+
+    def test_single_and_empty(self) -> None:
+        """1件ならその値、空なら空辞書を返すこと"""
+        assert percentiles([2.0])["p99"] == 2.0
+        assert percentiles([]) == {}
+
+
+class TestRunBench:
+    """run_bench() のテスト"""
+
+    def test_closed_loop_report(self) -> None:
+        """closed で全タスクが完了し、フェーズ別と LLM 以外のオーバーヘッドを集計すること"""
+        report = run_bench(BenchConfig(tasks=3, workers=2, concurrency=2, latency="fixed:0.02"))
+
+        assert report["completed"] == 3
+        assert report["succeeded"] == 3
+        assert report["throughput_tasks_per_s"] > 0
+        latency = report["latency_s"]
+        assert latency["end_to_end"]["count"] == 3
+        assert set(latency["phases"]) >= {"implement", "review"}
+        # 分解 + implement/docs/review の各フェーズで少なくとも1回ずつ LLM を呼ぶ
+        assert latency["llm_critical"]["p50"] >= 0.02 * 4
+        assert latency["overhead"]["p50"] >= 0
+        for task in report["tasks"]:
+            assert task["end_to_end"] >= task["llm_critical"]
+
+    def test_open_loop(self) -> None:
+        """open でも指定数のタスクを投入して完了すること"""
+        report = run_bench(BenchConfig(tasks=3, workers=1, mode="open", rate=50.0, latency="fixed:0.01"))
+
+        assert report["completed"] == 3
+        assert report["config"]["mode"] == "open"
+
+    def test_environment_restored(self) -> None:
+        """実行中に設定した環境変数を元に戻すこと"""
+        with patch.dict(os.environ, {"YADON_COUNT": "7"}):
+            os.environ.pop("YADON_SIM_LATENCY", None)
+            run_bench(BenchConfig(tasks=1, workers=1, latency="fixed:0.01"))
+            assert os.environ["YADON_COUNT"] == "7"
+            assert "YADON_SIM_LATENCY" not in os.environ
+
+    def test_invalid_mode(self) -> None:
+        """未知の投入方式は ValueError"""
+        with pytest.raises(ValueError):
+            run_bench(BenchConfig(tasks=1, mode="burst"))
+
+    def test_invalid_runner(self) -> None:
+        """module:Class 形式でないランナー指定は ValueError"""
+        with pytest.raises(ValueError):
+            run_bench(BenchConfig(tasks=1, runner="nonexistent"))
+
+
+class TestBenchCli:
+    """yadon bench コマンドのテスト"""
+
+    def test_writes_json(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """結果 JSON を --output に保存し、要約を表示すること"""
+        from yadon_agents.cli import main
+
+        output = tmp_path / "result.json"
+        argv = ["yadon", "bench", "--tasks", "2", "--workers", "1", "--latency", "fixed:0.01", "--output", str(output)]
+        with patch.object(sys, "argv", argv):
+            main()
+
+        report = json.loads(output.read_text(encoding="utf-8"))
+        assert report["completed"] == 2
+        assert len(report["tasks"]) == 2
+        out = capsys.readouterr().out
+        assert "スループット" in out
+        assert "overhead" in out
+
+    def test_format_summary(self) -> None:
+        """要約に区間ごとの行が含まれること"""
+        report = run_bench(BenchConfig(tasks=1, workers=1, latency="fixed:0.01"))
+        summary = format_summary(report)
+        assert "end_to_end" in summary
+        assert "phase:implement" in summary
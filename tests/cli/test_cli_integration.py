@@ -19,6 +19,16 @@ from unittest.mock import MagicMock, call, patch
 import pytest
 
 
+def _ready(status: str | None = "ready", errors: dict[str, str] | None = None) -> Any:
+    """wait_ready の代わり（読み側のパイプを閉じて、デーモンの通知を返す。None はタイムアウト）"""
+    def wait(fd: int, timeout: float) -> dict[str, Any] | None:
+        os.close(fd)
+        if status is None:
+            return None
+        return {"status": status, "elapsed": 0.42, "agents": {"yadon-1": 0.4, "yadoran": 0.42}, "errors": errors or {}}
+    return wait
+
+
 class TestCmdStart:
     """cmd_start() のテスト"""
 
@@ -36,7 +46,7 @@ class TestCmdStart:
 
         with patch("yadon_agents.cli.subprocess.Popen", return_value=mock_popen) as popen_mock:
             with patch("yadon_agents.cli.subprocess.run", return_value=mock_subprocess_run):
-                with patch("yadon_agents.cli._wait_sockets", return_value=True):
+                with patch("yadon_agents.cli.wait_ready", side_effect=_ready()):
                     with patch("yadon_agents.cli.cmd_stop"):
                         with patch("yadon_agents.cli._cleanup_sockets"):
                             with patch("yadon_agents.ascii_art.show_yadon_ascii"):
@@ -50,6 +60,9 @@ class TestCmdStart:
         call_args = popen_mock.call_args
         # python -m yadon_agents.gui_daemon を呼び出している
         assert "yadon_agents.gui_daemon" in " ".join(call_args[0][0])
+        # 起動完了通知のパイプの書き込み側を継承させる
+        ready_fd = int(call_args[1]["env"]["YADON_READY_FD"])
+        assert call_args[1]["pass_fds"] == (ready_fd,)
 
     def test_cmd_start_multi_llm_sets_env_vars(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         """マルチLLMモードで YADON_N_BACKEND 環境変数が設定されること"""
@@ -74,7 +87,7 @@ class TestCmdStart:
 
         with patch("yadon_agents.cli.subprocess.Popen", side_effect=capture_popen):
             with patch("yadon_agents.cli.subprocess.run", return_value=mock_subprocess_run):
-                with patch("yadon_agents.cli._wait_sockets", return_value=True):
+                with patch("yadon_agents.cli.wait_ready", side_effect=_ready()):
                     with patch("yadon_agents.cli.cmd_stop"):
                         with patch("yadon_agents.cli._cleanup_sockets"):
                             with patch("yadon_agents.ascii_art.show_yadon_ascii"):
@@ -89,6 +102,8 @@ class TestCmdStart:
         # ローテーション確認
         assert captured_env.get("YADON_1_BACKEND") == "copilot"
         assert captured_env.get("YADON_2_BACKEND") == "gemini"
+        # 既定のフェイルオーバー順がデーモンに渡されること
+        assert captured_env.get("YADON_WORKER_FAILOVER") == "copilot,gemini,claude-opus,opencode"
 
     def test_cmd_start_preserves_explicit_env_vars(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         """明示的な YADON_N_BACKEND 環境変数が保持されること"""
@@ -115,7 +130,7 @@ class TestCmdStart:
 
         with patch("yadon_agents.cli.subprocess.Popen", side_effect=capture_popen):
             with patch("yadon_agents.cli.subprocess.run", return_value=mock_subprocess_run):
-                with patch("yadon_agents.cli._wait_sockets", return_value=True):
+                with patch("yadon_agents.cli.wait_ready", side_effect=_ready()):
                     with patch("yadon_agents.cli.cmd_stop"):
                         with patch("yadon_agents.cli._cleanup_sockets"):
                             with patch("yadon_agents.ascii_art.show_yadon_ascii"):
@@ -145,7 +160,7 @@ class TestCmdStart:
 
         with patch("yadon_agents.cli.subprocess.Popen", return_value=mock_popen):
             with patch("yadon_agents.cli.subprocess.run", return_value=mock_subprocess_run):
-                with patch("yadon_agents.cli._wait_sockets", return_value=True):
+                with patch("yadon_agents.cli.wait_ready", side_effect=_ready()):
                     with patch("yadon_agents.cli.cmd_stop"):
                         with patch("yadon_agents.cli._cleanup_sockets"):
                             with patch("yadon_agents.ascii_art.show_yadon_ascii"):
@@ -172,7 +187,7 @@ class TestCmdStart:
 
         with patch("yadon_agents.cli.subprocess.Popen", return_value=mock_popen):
             with patch("yadon_agents.cli.subprocess.run", return_value=mock_subprocess_run):
-                with patch("yadon_agents.cli._wait_sockets", return_value=False):  # タイムアウト
+                with patch("yadon_agents.cli.wait_ready", side_effect=_ready(None)):  # タイムアウト
                     with patch("yadon_agents.cli.cmd_stop"):
                         with patch("yadon_agents.cli._cleanup_sockets"):
                             with patch("yadon_agents.ascii_art.show_yadon_ascii"):
@@ -184,6 +199,45 @@ class TestCmdStart:
         captured = capsys.readouterr()
         assert "エージェントソケットが作成されませんでした" in captured.out
 
+    def test_cmd_start_reports_ready_timings(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """起動完了の通知を受けたら所要時間とエージェント別の時間を表示すること"""
+        from yadon_agents.cli import cmd_start
+
+        with patch("yadon_agents.cli.subprocess.Popen", return_value=MagicMock(pid=12345)):
+            with patch("yadon_agents.cli.subprocess.run", return_value=MagicMock(returncode=0)):
+                with patch("yadon_agents.cli.wait_ready", side_effect=_ready()):
+                    with patch("yadon_agents.cli.cmd_stop"):
+                        with patch("yadon_agents.cli._cleanup_sockets"):
+                            with patch("yadon_agents.ascii_art.show_yadon_ascii"):
+                                with patch("yadon_agents.cli.log_dir", return_value=tmp_path):
+                                    with patch("builtins.open", MagicMock()):
+                                        with patch("sys.exit"):
+                                            cmd_start(str(tmp_path), multi_llm=False)
+
+        out = capsys.readouterr().out
+        assert "OK (0.42秒)" in out
+        assert "yadon-1 0.40秒 / yadoran 0.42秒" in out
+
+    def test_cmd_start_reports_agent_errors(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """起動に失敗したエージェントと理由を表示すること"""
+        from yadon_agents.cli import cmd_start
+
+        wait = _ready("failed", {"yadon-2": "Address already in use"})
+        with patch("yadon_agents.cli.subprocess.Popen", return_value=MagicMock(pid=12345)):
+            with patch("yadon_agents.cli.subprocess.run", return_value=MagicMock(returncode=0)):
+                with patch("yadon_agents.cli.wait_ready", side_effect=wait):
+                    with patch("yadon_agents.cli.cmd_stop"):
+                        with patch("yadon_agents.cli._cleanup_sockets"):
+                            with patch("yadon_agents.ascii_art.show_yadon_ascii"):
+                                with patch("yadon_agents.cli.log_dir", return_value=tmp_path):
+                                    with patch("builtins.open", MagicMock()):
+                                        with patch("sys.exit"):
+                                            cmd_start(str(tmp_path), multi_llm=False)
+
+        out = capsys.readouterr().out
+        assert "エージェントソケットが作成されませんでした" in out
+        assert "yadon-2: Address already in use" in out
+
     def test_cmd_start_keyboard_interrupt(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         """KeyboardInterrupt で正常に終了すること"""
         from yadon_agents.cli import cmd_start
@@ -199,7 +253,7 @@ class TestCmdStart:
 
         with patch("yadon_agents.cli.subprocess.Popen", return_value=mock_popen):
             with patch("yadon_agents.cli.subprocess.run", side_effect=raise_keyboard_interrupt):
-                with patch("yadon_agents.cli._wait_sockets", return_value=True):
+                with patch("yadon_agents.cli.wait_ready", side_effect=_ready()):
                     with patch("yadon_agents.cli.cmd_stop"):
                         with patch("yadon_agents.cli._cleanup_sockets"):
                             with patch("yadon_agents.ascii_art.show_yadon_ascii"):
@@ -314,6 +368,30 @@ class TestCmdStatus:
         captured = capsys.readouterr()
         assert "現在のタスク: task-20260204-120000-abcd" in captured.out
 
+    def test_cmd_status_with_breakers(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """バックエンドのブレーカー状態が表示されること"""
+        from yadon_agents.cli import cmd_status
+
+        mock_response = {
+            "type": "status_response",
+            "from": "yadoran",
+            "state": "idle",
+            "current_task": None,
+            "breakers": {
+                "gemini": {"state": "open", "recent_calls": 4, "recent_errors": 3, "recent_timeouts": 1, "retry_in": 42.0},
+                "claude": {"state": "closed", "recent_calls": 2, "recent_errors": 0, "recent_timeouts": 0},
+            },
+            "concurrency": {"claude": {"limit": 5, "in_flight": 2, "waiting": 1}},
+        }
+
+        with patch("yadon_agents.cli.send_message", return_value=mock_response):
+            cmd_status()
+
+        out = capsys.readouterr().out
+        assert "バックエンド:" in out
+        assert "claude: closed (直近 2件中 エラー0 / タイムアウト0) 同時実行 2/5 待機 1" in out
+        assert "gemini: open (直近 4件中 エラー3 / タイムアウト1) 再試行まで 42.0秒" in out
+
 
 class TestCmdSay:
     """cmd_say() のテスト"""
@@ -373,7 +451,7 @@ class TestCmdInternalSend:
         """ソケットが存在しない場合にJSONエラーが出力されること"""
         from yadon_agents.cli import cmd_internal_send
 
-        with patch("yadon_agents.cli.agent_socket_path", return_value=str(tmp_path / "nonexistent.sock")):
+        with patch("yadon_agents.entry.agent_socket_path", return_value=str(tmp_path / "nonexistent.sock")):
             cmd_internal_send("テストタスク")
 
         captured = capsys.readouterr()
@@ -394,8 +472,8 @@ class TestCmdInternalSend:
             "payload": {"output": "完了"},
         }
 
-        with patch("yadon_agents.cli.agent_socket_path", return_value=str(sock_file)):
-            with patch("yadon_agents.cli.send_message", return_value=mock_response):
+        with patch("yadon_agents.entry.agent_socket_path", return_value=str(sock_file)):
+            with patch("yadon_agents.entry.send_message", return_value=mock_response):
                 cmd_internal_send("テストタスク")
 
         captured = capsys.readouterr()
@@ -410,8 +488,8 @@ class TestCmdInternalSend:
         sock_file = tmp_path / "test.sock"
         sock_file.touch()
 
-        with patch("yadon_agents.cli.agent_socket_path", return_value=str(sock_file)):
-            with patch("yadon_agents.cli.send_message", side_effect=socket.timeout("timed out")):
+        with patch("yadon_agents.entry.agent_socket_path", return_value=str(sock_file)):
+            with patch("yadon_agents.entry.send_message", side_effect=socket.timeout("timed out")):
                 cmd_internal_send("テストタスク")
 
         captured = capsys.readouterr()
@@ -433,7 +511,7 @@ class TestCmdInternalStatus:
             "workers": {"yadon-1": "idle"},
         }
 
-        with patch("yadon_agents.cli.send_message", return_value=mock_response):
+        with patch("yadon_agents.entry.send_message", return_value=mock_response):
             cmd_internal_status()
 
         captured = capsys.readouterr()
@@ -445,7 +523,7 @@ class TestCmdInternalStatus:
         """タイムアウト時にJSON形式でエラーが出力されること"""
         from yadon_agents.cli import cmd_internal_status
 
-        with patch("yadon_agents.cli.send_message", side_effect=socket.timeout("timed out")):
+        with patch("yadon_agents.entry.send_message", side_effect=socket.timeout("timed out")):
             cmd_internal_status()
 
         captured = capsys.readouterr()
@@ -461,7 +539,7 @@ class TestCmdInternalSay:
         """ソケットが存在しない場合に静かに終了すること"""
         from yadon_agents.cli import cmd_internal_say
 
-        with patch("yadon_agents.cli.pet_socket_path", return_value=str(tmp_path / "nonexistent.sock")):
+        with patch("yadon_agents.entry.pet_socket_path", return_value=str(tmp_path / "nonexistent.sock")):
             # エラーにならないこと
             cmd_internal_say(1, "テストメッセージ")
 
@@ -475,8 +553,8 @@ class TestCmdInternalSay:
         mock_sock = MagicMock()
         mock_sock.connect.side_effect = ConnectionRefusedError("connection refused")
 
-        with patch("yadon_agents.cli.pet_socket_path", return_value=str(sock_file)):
-            with patch("yadon_agents.cli.socket.socket", return_value=mock_sock):
+        with patch("yadon_agents.entry.pet_socket_path", return_value=str(sock_file)):
+            with patch("yadon_agents.entry.socket.socket", return_value=mock_sock):
                 # エラーにならないこと
                 cmd_internal_say(1, "テストメッセージ")
 
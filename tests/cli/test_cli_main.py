@@ -1,6 +1,5 @@
 """cli.py のメイン関数・ヘルパー関数のテスト
 
-_wait_sockets() のタイムアウト動作、
 _cleanup_sockets() のソケット削除、
 get_multi_llm_backends() のバックエンド割り当てロジック、
 コマンドライン引数パースのテスト。
@@ -10,7 +9,6 @@ from __future__ import annotations
 
 import os
 import tempfile
-import time
 from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
@@ -19,90 +17,9 @@ import pytest
 
 from yadon_agents.cli import (
     _cleanup_sockets,
-    _wait_sockets,
 )
 
 
-class TestWaitSockets:
-    """_wait_sockets() のテスト"""
-
-    def test_wait_sockets_all_exist(self, tmp_path: Path) -> None:
-        """全てのソケットが存在する場合、True を返す"""
-        # ソケットファイルを作成
-        sock1 = tmp_path / "yadon-agent-yadon-1.sock"
-        sock2 = tmp_path / "yadon-agent-yadon-2.sock"
-        sock1.touch()
-        sock2.touch()
-
-        # _wait_sockets内部でimportされるagent_socket_pathをモック
-        with patch("yadon_agents.infra.protocol.agent_socket_path") as mock_path:
-            # パスをモック
-            def path_factory(name: str, prefix: str = "yadon") -> str:
-                return str(tmp_path / f"{prefix}-agent-{name}.sock")
-            mock_path.side_effect = path_factory
-
-            result = _wait_sockets(["yadon-1", "yadon-2"], prefix="yadon", timeout=1)
-
-            assert result is True
-
-    def test_wait_sockets_timeout(self, tmp_path: Path) -> None:
-        """ソケットが存在しない場合、タイムアウトして False を返す"""
-        with patch("yadon_agents.infra.protocol.agent_socket_path") as mock_path:
-            # 存在しないパスを返す
-            mock_path.return_value = str(tmp_path / "nonexistent.sock")
-
-            start = time.time()
-            result = _wait_sockets(["yadon-1"], prefix="yadon", timeout=1)
-            elapsed = time.time() - start
-
-            assert result is False
-            # タイムアウトが約1秒であることを確認
-            assert elapsed >= 0.9
-            assert elapsed < 2.0
-
-    def test_wait_sockets_partial_exist(self, tmp_path: Path) -> None:
-        """一部のソケットのみ存在する場合、False を返す"""
-        sock1 = tmp_path / "yadon-agent-yadon-1.sock"
-        sock1.touch()
-        # yadon-2.sock は作成しない
-
-        with patch("yadon_agents.infra.protocol.agent_socket_path") as mock_path:
-            def path_factory(name: str, prefix: str = "yadon") -> str:
-                return str(tmp_path / f"{prefix}-agent-{name}.sock")
-            mock_path.side_effect = path_factory
-
-            result = _wait_sockets(["yadon-1", "yadon-2"], prefix="yadon", timeout=1)
-
-            assert result is False
-
-    def test_wait_sockets_empty_list(self, tmp_path: Path) -> None:
-        """空のリストの場合、True を返す"""
-        result = _wait_sockets([], prefix="yadon", timeout=1)
-
-        assert result is True
-
-    def test_wait_sockets_created_during_wait(self, tmp_path: Path) -> None:
-        """待機中にソケットが作成された場合、True を返す"""
-        sock_path = tmp_path / "yadon-agent-yadon-1.sock"
-
-        def create_socket_after_delay() -> None:
-            time.sleep(0.3)
-            sock_path.touch()
-
-        import threading
-        thread = threading.Thread(target=create_socket_after_delay)
-
-        # _wait_sockets内部でimportされるagent_socket_pathをモック
-        with patch("yadon_agents.infra.protocol.agent_socket_path") as mock_path:
-            mock_path.return_value = str(sock_path)
-
-            thread.start()
-            result = _wait_sockets(["yadon-1"], prefix="yadon", timeout=2)
-            thread.join()
-
-            assert result is True
-
-
 class TestCleanupSockets:
     """_cleanup_sockets() のテスト"""
 
@@ -431,3 +348,15 @@ class TestInternalCommands:
                     bubble_type="info",
                     duration_ms=5000
                 )
+
+    def test_cleanup_sockets_removes_daemon_service_sockets(self, tmp_path: Path) -> None:
+        """メトリクス・状態ストリーム・制御ソケットも削除し、他のプレフィックスは残すこと"""
+        names = ["yadon-metrics.sock", "yadon-status.sock", "yadon-control.sock", "yadon-agent-yadoran.sock"]
+        for name in names:
+            (tmp_path / name).touch()
+        (tmp_path / "other-metrics.sock").touch()
+
+        with patch("yadon_agents.cli.SOCKET_DIR", str(tmp_path)):
+            _cleanup_sockets(prefix="yadon")
+
+        assert [p.name for p in tmp_path.iterdir()] == ["other-metrics.sock"]
@@ -0,0 +1,106 @@
+"""entry.py（yadon の入口と内部用サブコマンドの高速経路）のテスト"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+import yadon_agents
+from yadon_agents import entry
+from yadon_agents.infra.control import ControlServer
+
+
+class TestParse:
+    """_parse() のテスト"""
+
+    def test_positional_and_options(self) -> None:
+        values = entry._parse(["hello", "--project-dir", "/work"], ("instruction",), 1, {"--project-dir": "project_dir"})
+        assert values == {"instruction": "hello", "project_dir": "/work"}
+
+    def test_option_with_equals(self) -> None:
+        values = entry._parse(["--type=error", "1", "msg"], ("number", "message"), 2, {"--type": "type"})
+        assert values == {"number": "1", "message": "msg", "type": "error"}
+
+    def test_optional_positional(self) -> None:
+        assert entry._parse([], ("agent_name",), 0, {}) == {}
+
+    @pytest.mark.parametrize("args", [["--help"], [], ["a", "b"], ["a", "--project-dir"]])
+    def test_unparsable(self, args: list[str]) -> None:
+        """解釈できない引数は None（cli.main() に任せる）"""
+        assert entry._parse(args, ("instruction",), 1, {"--project-dir": "project_dir"}) is None
+
+
+class TestMain:
+    """main() の振り分けのテスト"""
+
+    def test_fast_path(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """_status は高速経路で処理し、cli.main() を呼ばないこと"""
+        monkeypatch.setattr(sys, "argv", ["yadon", "_status", "yadon-1"])
+        with patch.object(entry, "cmd_internal_status") as status, patch("yadon_agents.cli.main") as cli_main:
+            entry.main()
+        status.assert_called_once_with("yadon-1")
+        cli_main.assert_not_called()
+
+    def test_say_arguments(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(sys, "argv", ["yadon", "_say", "2", "やぁん", "--type", "error", "--duration", "100"])
+        with patch.object(entry, "cmd_internal_say") as say:
+            entry.main()
+        say.assert_called_once_with(2, "やぁん", bubble_type="error", duration_ms=100)
+
+    @pytest.mark.parametrize("argv", [["_say", "x", "msg"], ["_send", "--help"], ["start"], []])
+    def test_fallback_to_cli(self, monkeypatch: pytest.MonkeyPatch, argv: list[str]) -> None:
+        """それ以外と解釈できない引数は cli.main() に渡すこと"""
+        monkeypatch.setattr(sys, "argv", ["yadon", *argv])
+        with patch("yadon_agents.cli.main") as cli_main:
+            entry.main()
+        cli_main.assert_called_once_with()
+
+    def test_fast_path_imports(self, sock_dir: str) -> None:
+        """高速経路ではテーマの全体・ランナー・argparse・cli を読み込まないこと"""
+        src = str(Path(yadon_agents.__file__).resolve().parents[1])
+        env = {**os.environ, "PYTHONPATH": src, "YADON_SOCKET_DIR": sock_dir}
+        code = (
+            "import json, sys; from yadon_agents.entry import main; main(); "
+            "print(json.dumps(sorted(m for m in sys.modules if m.startswith('yadon_agents') or m in ('argparse', 'typing'))))"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", code, "_status"], env=env, capture_output=True, text=True, timeout=30, check=True,
+        )
+        status, modules = proc.stdout.strip().splitlines()
+        assert json.loads(status)["success"] is False
+        assert json.loads(modules) == [
+            "typing", "yadon_agents", "yadon_agents.config", "yadon_agents.config.socket", "yadon_agents.entry",
+            "yadon_agents.infra", "yadon_agents.infra.socket_io", "yadon_agents.infra.socket_paths",
+            "yadon_agents.themes", "yadon_agents.themes.yadon",
+        ]
+
+
+class TestSendMessage:
+    """send_message() が protocol.py と同じ実装で送受信すること"""
+
+    def test_roundtrip(self, sock_dir: str) -> None:
+        path = os.path.join(sock_dir, "agent.sock")
+        received: list[dict[str, Any]] = []
+        server = ControlServer(path, {"status": lambda msg: received.append(msg) or {"state": "idle"}})
+        server.start()
+        try:
+            assert entry.send_message(path, {"type": "status"}, timeout=5) == {"state": "idle"}
+        finally:
+            server.stop()
+        assert received == [{"type": "status"}]
+
+    def test_shared_with_protocol(self) -> None:
+        """高速経路とデーモン側が同じ送受信処理とタイムアウトを使うこと"""
+        from yadon_agents.config import agent
+        from yadon_agents.infra import protocol
+
+        assert entry.send_message is protocol.send_message
+        assert entry.SOCKET_STATUS_TIMEOUT == agent.SOCKET_STATUS_TIMEOUT
+        assert entry.SOCKET_CONNECTION_TIMEOUT == agent.SOCKET_CONNECTION_TIMEOUT
@@ -0,0 +1,78 @@
+"""yadon history / yadon show のテスト"""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from yadon_agents.cli import cmd_history, cmd_show
+from yadon_agents.infra.history import get_history
+
+
+@pytest.fixture
+def recorded() -> None:
+    store = get_history()
+    assert store is not None
+    now = time.time()
+    for i, status in enumerate(("success", "partial_error")):
+        store.record_task(
+            task_id=f"task-cli-{i}", instruction=f"指示{i}", project_dir="/work", status=status,
+            started=now - 10 + i, finished=now - 5 + i, duration=5.0, summary=f"概要{i}", output=f"出力{i}",
+            usage={"total": {"input_tokens": 100, "output_tokens": 20, "cost_usd": 0.5}},
+        )
+    store.record_phase(task_id="task-cli-1", idx=0, name="implement", status="partial_error",
+                       subtasks=1, started=now - 9, duration=3.0)
+    store.record_subtask(subtask_id="task-cli-1-implement-sub1", task_id="task-cli-1", phase="implement",
+                         worker="yadon-1", status="error", backend="claude", started=now - 9, duration=3.0,
+                         summary="失敗", output_path="/logs/outputs/a.txt")
+    store.flush()
+
+
+class TestCmdHistory:
+    def test_lists_newest_first(self, recorded: None, capsys: pytest.CaptureFixture[str]) -> None:
+        """新しい順に状態・所要時間・使用量・指示を表示すること"""
+        cmd_history()
+        lines = capsys.readouterr().out.splitlines()
+
+        assert "task-cli-1" in lines[1] and "partial_error" in lines[1]
+        assert "task-cli-0" in lines[2] and "120tok $0.5000" in lines[2]
+
+    def test_filters_and_json(self, recorded: None, capsys: pytest.CaptureFixture[str]) -> None:
+        """--status で絞り込み、--json で出力できること"""
+        cmd_history(status="success", since="1h", as_json=True)
+        tasks = json.loads(capsys.readouterr().out)
+
+        assert [t["task_id"] for t in tasks] == ["task-cli-0"]
+
+    def test_invalid_since(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """--since の形式が不正なら終了コード 1"""
+        with pytest.raises(SystemExit) as exc:
+            cmd_history(since="yesterday")
+        assert exc.value.code == 1
+
+    def test_empty(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """履歴がなければその旨を表示すること"""
+        cmd_history()
+        assert "タスク履歴はありません" in capsys.readouterr().out
+
+
+class TestCmdShow:
+    def test_shows_phases_subtasks_and_output(self, recorded: None, capsys: pytest.CaptureFixture[str]) -> None:
+        """前方一致で引き、フェーズ・サブタスク・出力の参照と結果を表示すること"""
+        cmd_show("task-cli-1")
+        out = capsys.readouterr().out
+
+        assert "状態: partial_error" in out
+        assert "implement" in out
+        assert "task-cli-1-implement-sub1  yadon-1  error  claude" in out
+        assert "出力: /logs/outputs/a.txt" in out
+        assert "出力1" in out
+
+    def test_not_found(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """見つからなければ終了コード 1"""
+        with pytest.raises(SystemExit) as exc:
+            cmd_show("task-none")
+        assert exc.value.code == 1
+        assert "見つかりません" in capsys.readouterr().out
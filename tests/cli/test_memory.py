@@ -0,0 +1,37 @@
+"""yadon _memory のテスト"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from yadon_agents.cli import cmd_internal_memory
+from yadon_agents.infra.control import ControlServer
+
+
+class TestCmdInternalMemory:
+    def test_sends_memory_command(self, sock_dir: str, capsys: pytest.CaptureFixture[str]) -> None:
+        """制御ソケットに memory コマンドを送り、結果を JSON で出力すること"""
+        path = os.path.join(sock_dir, "control.sock")
+        received: list[dict[str, Any]] = []
+
+        def handle(msg: dict[str, Any]) -> dict[str, Any]:
+            received.append(msg)
+            return {"type": "memory", "tracing": True, "sites": [{"site": "a.py:1", "size_diff": 10}]}
+
+        server = ControlServer(path, {"memory": handle})
+        server.start()
+        try:
+            with patch("yadon_agents.infra.protocol.control_socket_path", return_value=path):
+                cmd_internal_memory(top=5, group="traceback", start=10)
+        finally:
+            server.stop()
+
+        result = json.loads(capsys.readouterr().out)
+        assert result["success"] is True
+        assert result["data"]["sites"][0]["site"] == "a.py:1"
+        assert received[0] == {"type": "memory", "top": 5, "group": "traceback", "start": 10, "stop": False}
@@ -0,0 +1,63 @@
+"""yadon _profile のテスト"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from yadon_agents.cli import cmd_internal_profile
+from yadon_agents.infra.control import ControlServer
+
+
+class TestCmdInternalProfile:
+    def test_sends_profile_command(self, sock_dir: str, capsys: pytest.CaptureFixture[str]) -> None:
+        """制御ソケットに profile コマンドを送り、結果を JSON で出力すること"""
+        path = os.path.join(sock_dir, "control.sock")
+        received: list[dict[str, Any]] = []
+
+        def handle(msg: dict[str, Any]) -> dict[str, Any]:
+            received.append(msg)
+            return {"type": "profile", "agent": msg["agent"], "files": ["/logs/profiles/x.pstats"]}
+
+        server = ControlServer(path, {"profile": handle})
+        server.start()
+        try:
+            with patch("yadon_agents.infra.protocol.control_socket_path", return_value=path):
+                cmd_internal_profile("yadon-1", mode="cprofile", tasks=3)
+        finally:
+            server.stop()
+
+        result = json.loads(capsys.readouterr().out)
+        assert result["success"] is True
+        assert result["data"]["files"] == ["/logs/profiles/x.pstats"]
+        assert received[0]["mode"] == "cprofile"
+        assert received[0]["tasks"] == 3
+        assert received[0]["seconds"] is None
+
+    def test_default_duration(self, sock_dir: str, capsys: pytest.CaptureFixture[str]) -> None:
+        """期間を指定しなければ 30 秒"""
+        path = os.path.join(sock_dir, "control.sock")
+        received: list[dict[str, Any]] = []
+        server = ControlServer(path, {"profile": lambda msg: received.append(msg) or {"type": "profile"}})
+        server.start()
+        try:
+            with patch("yadon_agents.infra.protocol.control_socket_path", return_value=path):
+                cmd_internal_profile("all")
+        finally:
+            server.stop()
+
+        assert received[0]["seconds"] == 30.0
+
+    def test_daemon_not_running(self, sock_dir: str, capsys: pytest.CaptureFixture[str]) -> None:
+        """制御ソケットがなければ success=false"""
+        missing = os.path.join(sock_dir, "missing.sock")
+        with patch("yadon_agents.infra.protocol.control_socket_path", return_value=missing):
+            cmd_internal_profile("yadon-1")
+
+        result = json.loads(capsys.readouterr().out)
+        assert result["success"] is False
+        assert "制御ソケット" in result["message"]
@@ -0,0 +1,125 @@
+"""startup_bench.py（yadon bench-startup）のテスト
+
+CLI は実際に新しいプロセスで起動して計測する（偽のソケットで受ける）。
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from yadon_agents import startup_bench
+from yadon_agents.startup_bench import (
+    StartupBenchConfig,
+    compare,
+    format_summary,
+    measure_cli,
+    measure_daemon,
+    parse_importtime,
+)
+
+_IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        300 |     yadon_agents.config.agent
+import time:      2000 |       2300 |   yadon_agents.config
+import time:       500 |       2800 | yadon_agents
+import time:      1500 |       1500 | json
+Traceback は無視する行
+"""
+
+
+def _report(wall: float, first: float | None, imports: float, ready: float | None = None) -> dict:
+    report = {
+        "config": {"runs": 3, "threshold": 0.2},
+        "cli": {
+            "_status": {
+                "args": ["_status"],
+                "wall_ms": {"p50": wall, "p95": wall},
+                "first_write_ms": {"p50": first} if first is not None else None,
+                "imports": {"total_ms": imports, "modules": 10, "packages": {"yadon_agents": imports}},
+            },
+        },
+    }
+    if ready is not None:
+        report["daemon"] = {"ready_ms": ready, "agents": {"yadon-1": ready}}
+    return report
+
+
+class TestParseImporttime:
+    """parse_importtime() のテスト"""
+
+    def test_breakdown(self) -> None:
+        """合計・トップレベルのパッケージ別・自身の時間の長いモジュールを求めること"""
+        result = parse_importtime(_IMPORTTIME_OUTPUT)
+        assert result["total_ms"] == pytest.approx(4.42)
+        assert result["modules"] == 5
+        assert result["packages"] == {"yadon_agents": 2.8, "json": 1.5}
+        assert result["slowest"][0] == {"module": "yadon_agents.config", "self_ms": 2.0, "cumulative_ms": 2.3}
+        assert result["loaded"] == ["yadon_agents", "yadon_agents.config", "yadon_agents.config.agent"]
+
+
+class TestCompare:
+    """compare() のテスト"""
+
+    def test_regression_over_threshold(self) -> None:
+        """しきい値を超えて遅くなった指標を返すこと"""
+        regressions = compare(_report(130.0, 90.0, 60.0, 900.0), _report(100.0, 90.0, 50.0, 1000.0), 0.2)
+        assert [r["metric"] for r in regressions] == ["_status.wall_p50"]
+        assert regressions[0]["ratio"] == 1.3
+
+    def test_small_absolute_delta_ignored(self) -> None:
+        """割合が大きくても差が小さければ回帰としないこと"""
+        assert compare(_report(3.0, None, 1.0), _report(1.0, None, 0.5), 0.2) == []
+
+    def test_summary(self) -> None:
+        """要約に回帰とデーモンの時間を含めること"""
+        report = _report(130.0, 90.0, 60.0, 900.0)
+        report["regressions"] = compare(report, _report(100.0, 90.0, 60.0), 0.2)
+        text = format_summary(report)
+        assert "_status.wall_p50: 100.0 -> 130.0ms" in text
+        assert "全エージェント応答まで 900ms" in text
+
+
+class TestMeasure:
+    """実際にプロセスを起動する計測のテスト"""
+
+    def test_measure_cli_status(self) -> None:
+        """_status が偽のソケットに書き込むまでの時間とインポートの内訳を測れること"""
+        result = measure_cli("_status", runs=1)
+        assert result["wall_ms"]["count"] == 1
+        assert 0 < result["first_write_ms"]["p50"] < result["wall_ms"]["p50"]
+        # 高速経路（entry.py）で処理し、cli.py は読み込まない
+        assert "yadon_agents.entry" in result["imports"]["loaded"]
+        assert "yadon_agents.cli" not in result["imports"]["loaded"]
+
+    def test_measure_cli_without_socket(self) -> None:
+        """ソケットを使わないサブコマンドは書き込み時間なし"""
+        result = measure_cli("history", runs=1)
+        assert result["first_write_ms"] is None
+
+    def test_unknown_case(self) -> None:
+        with pytest.raises(ValueError):
+            measure_cli("stop", runs=1)
+
+    def test_daemon_failure_reported(self) -> None:
+        """デーモンが起動できなければ理由を返すこと"""
+        with patch.object(startup_bench, "DAEMON_MODULE", "yadon_agents.no_such_daemon"):
+            result = measure_daemon(workers=1, timeout=10)
+        assert result["ready_ms"] is None
+        assert "終了しました" in result["error"]
+
+    def test_main_baseline_roundtrip(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """ベースラインを保存し、次の実行で比べること"""
+        baseline = tmp_path / "baseline.json"
+        config = StartupBenchConfig(runs=1, cases=("history",), daemon=False, threshold=100.0)
+        assert startup_bench.main(config, output=str(tmp_path / "a.json"), baseline=str(baseline),
+                                  save_baseline=True) == 0
+        assert json.loads(baseline.read_text())["cli"]["history"]["wall_ms"]["count"] == 1
+
+        assert startup_bench.main(config, output=str(tmp_path / "b.json"), baseline=str(baseline)) == 0
+        assert "回帰なし" in capsys.readouterr().out
+        assert json.loads((tmp_path / "b.json").read_text())["regressions"] == []
@@ -0,0 +1,94 @@
+"""top.py（yadon top）のテスト"""
+
+from __future__ import annotations
+
+import os
+import socket
+from typing import Any
+
+import pytest
+
+from yadon_agents.infra.status_stream import StatusStreamServer
+from yadon_agents.top import RateTracker, render, run_top
+
+
+def _snapshot(t: float, tasks: dict[str, float], subtasks: dict[str, float]) -> dict[str, Any]:
+    return {
+        "time": t,
+        "agents": [
+            {"name": "yadoran", "role": "manager", "state": "busy", "current_task": "task-1",
+             "detail": "implement (2/3)", "started": t - 75, "backend": "claude", "queue": 1},
+            {"name": "yadon-1", "state": "busy", "current_task": "task-1-implement-sub1",
+             "detail": "README を更新", "started": t - 3, "backend": "claude"},
+            {"name": "yadon-2", "state": "idle", "current_task": None, "detail": None,
+             "started": None, "backend": None},
+        ],
+        "tasks": tasks,
+        "subtasks": subtasks,
+        "dispatch_errors": {},
+        "subtasks_waiting": 1,
+        "concurrency": {"claude": {"in_flight": 1, "limit": 4, "waiting": 2}},
+        "breakers": {"claude": {"state": "closed"}},
+    }
+
+
+class TestRateTracker:
+    def test_rates_from_counter_deltas(self) -> None:
+        """直近のカウンター差分から1分あたりの完了数とエラー率を求めること"""
+        rates = RateTracker(window=60)
+        rates.update(_snapshot(0, {"success": 10}, {"yadon-1/success": 5}))
+        rates.update(_snapshot(30, {"success": 12, "partial_error": 1}, {"yadon-1/success": 8, "yadon-1/error": 1}))
+
+        per_minute, errors = rates.rate("__tasks__")
+        assert per_minute == pytest.approx(6.0)
+        assert errors == pytest.approx(1 / 3)
+        per_minute, errors = rates.rate("yadon-1")
+        assert per_minute == pytest.approx(8.0)
+        assert errors == pytest.approx(0.25)
+
+    def test_window_drops_old_snapshots(self) -> None:
+        """window より古いスナップショットは差分の起点から外れること"""
+        rates = RateTracker(window=10)
+        rates.update(_snapshot(0, {"success": 0}, {}))
+        rates.update(_snapshot(20, {"success": 100}, {}))
+        rates.update(_snapshot(30, {"success": 101}, {}))
+
+        per_minute, _ = rates.rate("__tasks__")
+        assert per_minute == pytest.approx(6.0)
+
+    def test_no_history(self) -> None:
+        """スナップショットが1つ以下なら 0 件・エラー率なし"""
+        rates = RateTracker()
+        rates.update(_snapshot(0, {}, {}))
+        assert rates.rate("__tasks__") == (0.0, None)
+
+
+class TestRender:
+    def test_rows_per_agent(self) -> None:
+        """エージェントごとに状態・経過時間・バックエンド・待ち数・タスクを表示すること"""
+        lines = render(_snapshot(100, {"success": 3}, {}), RateTracker(), 1.0)
+        text = "\n".join(lines)
+
+        manager_row = next(line for line in lines if line.startswith("yadoran"))
+        assert "1m15s" in manager_row and "implement (2/3)" in manager_row
+        worker_row = next(line for line in lines if line.startswith("yadon-1"))
+        assert "3.0s" in worker_row and "claude" in worker_row and "README を更新" in worker_row
+        assert "同時実行 1/4 待機 2" in text
+        assert "完了 3件" in text
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unixソケットが必要")
+class TestRunTop:
+    def test_once_prints_one_frame(self, sock_dir: str, capsys: pytest.CaptureFixture[str]) -> None:
+        """once では状態ストリームから1画面分を表示して終わること"""
+        path = os.path.join(sock_dir, "status.sock")
+        server = StatusStreamServer(path, lambda: _snapshot(100, {"success": 1}, {}))
+        server.start()
+        try:
+            run_top(path, 0.1, once=True)
+        finally:
+            server.stop()
+
+        out = capsys.readouterr().out
+        assert "yadon top" in out
+        assert "yadon-2" in out
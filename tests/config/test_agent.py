@@ -23,11 +23,14 @@ from yadon_agents.config.agent import (
     PROCESS_STOP_RETRIES,
     PROCESS_STOP_INTERVAL,
     SOCKET_WAIT_TIMEOUT,
-    SOCKET_WAIT_INTERVAL,
+    DAEMON_READY_TIMEOUT,
     SUMMARY_MAX_LENGTH,
     BUBBLE_TASK_MAX_LENGTH,
     BUBBLE_RESULT_MAX_LENGTH,
+    DEFAULT_WORKER_NICE,
+    ProcessLimits,
     # 関数
+    get_process_limits,
     get_yadon_count,
     get_yadon_messages,
     get_yadon_variant,
@@ -92,7 +95,7 @@ class TestCliConstants:
     def test_socket_wait_settings(self):
         """ソケット待機設定が適切であること"""
         assert SOCKET_WAIT_TIMEOUT == 15
-        assert SOCKET_WAIT_INTERVAL == 0.5
+        assert DAEMON_READY_TIMEOUT == 10.0
 
 
 class TestOutputLimitConstants:
@@ -328,3 +331,252 @@ class TestBackwardCompatProxy:
 
         with pytest.raises(AttributeError):
             _ = agent.NONEXISTENT_ATTRIBUTE
+
+
+class TestGetProcessLimits:
+    """get_process_limits() のテスト"""
+
+    @pytest.fixture(autouse=True)
+    def _clear_env(self, monkeypatch):
+        import os
+        for key in list(os.environ):
+            if key.startswith("YADON_") and (
+                "RLIMIT" in key or key.endswith(("NICE", "CPUS", "IOPRIO"))
+            ):
+                monkeypatch.delenv(key)
+
+    def test_defaults(self):
+        """未設定時は制限なし、ワーカーのみ nice / I/O優先度の既定値"""
+        assert get_process_limits("manager") == ProcessLimits()
+        assert get_process_limits("worker") == ProcessLimits(nice=DEFAULT_WORKER_NICE, ioprio=(2, 7))
+
+    def test_tier_specific_env(self, monkeypatch):
+        """tier 固有の環境変数が反映されること"""
+        monkeypatch.setenv("YADON_WORKER_RLIMIT_AS", "2048")
+        monkeypatch.setenv("YADON_WORKER_RLIMIT_CPU", "300")
+        monkeypatch.setenv("YADON_WORKER_RLIMIT_NOFILE", "1024")
+        monkeypatch.setenv("YADON_WORKER_NICE", "5")
+
+        limits = get_process_limits("worker")
+
+        assert limits == ProcessLimits(address_space_mb=2048, cpu_seconds=300, open_files=1024, nice=5, ioprio=(2, 7))
+        assert get_process_limits("manager").cpu_seconds is None
+
+    def test_global_fallback(self, monkeypatch):
+        """tier 固有の指定がなければ YADON_RLIMIT_* にフォールバックすること"""
+        monkeypatch.setenv("YADON_RLIMIT_NOFILE", "512")
+        monkeypatch.setenv("YADON_MANAGER_RLIMIT_NOFILE", "256")
+
+        assert get_process_limits("worker").open_files == 512
+        assert get_process_limits("manager").open_files == 256
+
+    def test_invalid_value_ignored(self, monkeypatch):
+        """数値でない値は無視されること"""
+        monkeypatch.setenv("YADON_WORKER_RLIMIT_CPU", "abc")
+
+        assert get_process_limits("worker").cpu_seconds is None
+
+
+class TestStallSettings:
+    """get_stall_timeout() / get_stall_retries() のテスト"""
+
+    def test_defaults(self, monkeypatch):
+        from yadon_agents.config.agent import STALL_RETRIES, STALL_TIMEOUT, get_stall_retries, get_stall_timeout
+        monkeypatch.delenv("YADON_STALL_TIMEOUT", raising=False)
+        monkeypatch.delenv("YADON_STALL_RETRIES", raising=False)
+
+        assert get_stall_timeout() == STALL_TIMEOUT
+        assert get_stall_retries() == STALL_RETRIES
+
+    def test_env_override(self, monkeypatch):
+        from yadon_agents.config.agent import get_stall_retries, get_stall_timeout
+        monkeypatch.setenv("YADON_STALL_TIMEOUT", "45")
+        monkeypatch.setenv("YADON_STALL_RETRIES", "0")
+
+        assert get_stall_timeout() == 45.0
+        assert get_stall_retries() == 0
+
+    def test_zero_disables_watch(self, monkeypatch):
+        from yadon_agents.config.agent import get_stall_timeout
+        monkeypatch.setenv("YADON_STALL_TIMEOUT", "0")
+
+        assert get_stall_timeout() is None
+
+
+class TestManifestSettings:
+    """get_manifest_max_bytes() / get_context_bundle() / get_tracing() のテスト"""
+
+    def test_default(self, monkeypatch):
+        from yadon_agents.config.agent import CHANGE_MANIFEST_MAX_BYTES, get_manifest_max_bytes
+        monkeypatch.delenv("YADON_MANIFEST_BYTES", raising=False)
+
+        assert get_manifest_max_bytes() == CHANGE_MANIFEST_MAX_BYTES
+
+    def test_env_override(self, monkeypatch):
+        from yadon_agents.config.agent import get_manifest_max_bytes
+        monkeypatch.setenv("YADON_MANIFEST_BYTES", "0")
+
+        assert get_manifest_max_bytes() == 0
+
+
+    def test_context_bundle_toggle(self, monkeypatch):
+        from yadon_agents.config.agent import get_context_bundle
+        monkeypatch.delenv("YADON_CONTEXT_BUNDLE", raising=False)
+        assert get_context_bundle() is True
+
+        monkeypatch.setenv("YADON_CONTEXT_BUNDLE", "0")
+        assert get_context_bundle() is False
+
+
+    def test_tracing_toggle(self, monkeypatch):
+        from yadon_agents.config.agent import get_tracing
+        monkeypatch.delenv("YADON_TRACE", raising=False)
+        assert get_tracing() is True
+
+        monkeypatch.setenv("YADON_TRACE", "off")
+        assert get_tracing() is False
+
+
+class TestMetricsSettings:
+    """get_metrics_socket() / get_metrics_port() のテスト"""
+
+    def test_defaults(self, monkeypatch):
+        from yadon_agents.config.agent import get_metrics_port, get_metrics_socket
+        monkeypatch.delenv("YADON_METRICS_SOCKET", raising=False)
+        monkeypatch.delenv("YADON_METRICS_PORT", raising=False)
+
+        assert get_metrics_socket() is None
+        assert get_metrics_port() is None
+
+    def test_env_override(self, monkeypatch):
+        from yadon_agents.config.agent import get_metrics_port, get_metrics_socket
+        monkeypatch.setenv("YADON_METRICS_SOCKET", "/run/yadon/metrics.sock")
+        monkeypatch.setenv("YADON_METRICS_PORT", "9464")
+
+        assert get_metrics_socket() == "/run/yadon/metrics.sock"
+        assert get_metrics_port() == 9464
+
+    def test_disable_socket_and_invalid_port(self, monkeypatch):
+        from yadon_agents.config.agent import get_metrics_port, get_metrics_socket
+        monkeypatch.setenv("YADON_METRICS_SOCKET", "off")
+        monkeypatch.setenv("YADON_METRICS_PORT", "70000")
+
+        assert get_metrics_socket() == ""
+        assert get_metrics_port() is None
+
+
+class TestHistoryAndTopSettings:
+    """get_history_path() / get_top_interval() / メモリ診断の設定のテスト"""
+
+    def test_history_path(self, monkeypatch):
+        from yadon_agents.config.agent import get_history_path
+        monkeypatch.delenv("YADON_HISTORY", raising=False)
+        assert get_history_path() is None
+
+        monkeypatch.setenv("YADON_HISTORY", "/var/lib/yadon/history.sqlite3")
+        assert get_history_path() == "/var/lib/yadon/history.sqlite3"
+
+        monkeypatch.setenv("YADON_HISTORY", "0")
+        assert get_history_path() == ""
+
+    def test_top_interval(self, monkeypatch):
+        from yadon_agents.config.agent import TOP_INTERVAL, get_top_interval
+        monkeypatch.delenv("YADON_TOP_INTERVAL", raising=False)
+        assert get_top_interval() == TOP_INTERVAL
+
+        monkeypatch.setenv("YADON_TOP_INTERVAL", "0.5")
+        assert get_top_interval() == 0.5
+
+        monkeypatch.setenv("YADON_TOP_INTERVAL", "-1")
+        assert get_top_interval() == TOP_INTERVAL
+
+    def test_memory_settings(self, monkeypatch):
+        from yadon_agents.config.agent import MEMORY_INTERVAL, get_memory_interval, get_tracemalloc_frames
+        monkeypatch.delenv("YADON_TRACEMALLOC", raising=False)
+        monkeypatch.delenv("YADON_MEMORY_INTERVAL", raising=False)
+        assert get_tracemalloc_frames() == 0
+        assert get_memory_interval() == MEMORY_INTERVAL
+
+        monkeypatch.setenv("YADON_TRACEMALLOC", "10")
+        monkeypatch.setenv("YADON_MEMORY_INTERVAL", "0")
+        assert get_tracemalloc_frames() == 10
+        assert get_memory_interval() == 0
+
+
+class TestCpuAndIoPriority:
+    """CPUアフィニティ・I/O優先度の設定のテスト"""
+
+    @pytest.fixture(autouse=True)
+    def _clear_env(self, monkeypatch):
+        import os
+        for key in list(os.environ):
+            if key.startswith("YADON_") and key.endswith(("CPUS", "IOPRIO")):
+                monkeypatch.delenv(key)
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("0-3,6", frozenset({0, 1, 2, 3, 6})),
+        (" 2 ", frozenset({2})),
+        ("", None),
+        ("a-b", None),
+        ("-1", None),
+    ])
+    def test_parse_cpu_list(self, raw, expected):
+        from yadon_agents.config.agent import parse_cpu_list
+        assert parse_cpu_list(raw) == expected
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("idle", (3, 0)),
+        ("be:7", (2, 7)),
+        ("BE", (2, 4)),
+        ("rt:0", (1, 0)),
+        ("be:8", None),
+        ("fast", None),
+    ])
+    def test_parse_ioprio(self, raw, expected):
+        from yadon_agents.config.agent import parse_ioprio
+        assert parse_ioprio(raw) == expected
+
+    def test_tier_cpus(self, monkeypatch):
+        monkeypatch.setenv("YADON_WORKER_CPUS", "1-2")
+        monkeypatch.setenv("YADON_CPUS", "0")
+
+        assert get_process_limits("worker").cpus == frozenset({1, 2})
+        assert get_process_limits("manager").cpus == frozenset({0})
+
+    def test_workers_avoid_daemon_cpus(self, monkeypatch):
+        """YADON_DAEMON_CPUS を設定するとワーカーの既定CPUから除外されること"""
+        monkeypatch.setattr("os.cpu_count", lambda: 4)
+        monkeypatch.setenv("YADON_DAEMON_CPUS", "0")
+
+        assert get_process_limits("worker").cpus == frozenset({1, 2, 3})
+        assert get_process_limits("manager").cpus is None
+
+    def test_daemon_reserving_all_cpus_leaves_workers_unpinned(self, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 1)
+        monkeypatch.setenv("YADON_DAEMON_CPUS", "0")
+
+        assert get_process_limits("worker").cpus is None
+
+    def test_ioprio_env(self, monkeypatch):
+        monkeypatch.setenv("YADON_WORKER_IOPRIO", "idle")
+        monkeypatch.setenv("YADON_MANAGER_IOPRIO", "bogus")
+
+        assert get_process_limits("worker").ioprio == (3, 0)
+        assert get_process_limits("manager").ioprio is None
+
+
+class TestStateIsolationSettings:
+    """get_state_isolation() / get_state_share_paths() のテスト"""
+
+    @pytest.mark.parametrize("raw, expected", [("1", True), ("true", True), ("", False), ("0", False)])
+    def test_isolation_flag(self, monkeypatch, raw, expected):
+        from yadon_agents.config.agent import get_state_isolation
+        monkeypatch.setenv("YADON_ISOLATE_STATE", raw)
+
+        assert get_state_isolation() is expected
+
+    def test_share_paths(self, monkeypatch):
+        from yadon_agents.config.agent import get_state_share_paths
+        monkeypatch.setenv("YADON_ISOLATE_SHARE", ".config/tool, /.aws/ ,")
+
+        assert get_state_share_paths() == (".config/tool", ".aws")
@@ -14,6 +14,8 @@ from yadon_agents.config.llm import (
     LLMBackendConfig,
     LLMModelConfig,
     get_backend_config,
+    get_failover_chain,
+    get_model_for_backend,
     get_model_for_tier,
     get_worker_backend_name,
 )
@@ -334,6 +336,20 @@ class TestBackendConfigAllBackends:
         assert config.command == "opencode"
         assert config.batch_subcommand == "run -q"
 
+    def test_simulated_config_complete(self, monkeypatch):
+        """Simulated バックエンドは python -m で疑似LLMを起動する設定であること"""
+        import sys
+
+        monkeypatch.setenv("LLM_BACKEND", "simulated")
+
+        config = get_backend_config()
+
+        assert config.name == "simulated"
+        assert config.command == sys.executable
+        assert config.launcher_args == ("-m", "yadon_agents.infra.simulated_llm")
+        assert config.usage_format == "claude"
+        assert get_model_for_tier("worker") == "sim-worker"
+
     def test_invalid_backend_fallback(self, monkeypatch):
         """無効なバックエンド指定時のフォールバック"""
         monkeypatch.setenv("LLM_BACKEND", "nonexistent-backend")
@@ -376,3 +392,41 @@ class TestBackendConfigAllBackends:
             assert isinstance(config.flags, dict)
             # フラグが存在することを確認（内容は backend 依存）
             assert config.flags is not None
+
+
+class TestGetFailoverChain:
+    """get_failover_chain() のテスト"""
+
+    @pytest.fixture(autouse=True)
+    def _clear_env(self, monkeypatch):
+        import os
+        for key in list(os.environ):
+            if key.endswith("_FAILOVER") or key.endswith("_BACKEND"):
+                monkeypatch.delenv(key)
+
+    def test_primary_only_by_default(self, monkeypatch):
+        monkeypatch.setenv("LLM_BACKEND", "gemini")
+        assert get_failover_chain("manager") == ["gemini"]
+
+    def test_tier_chain(self, monkeypatch):
+        """tier 別のリストが主バックエンドの後ろに続き、不正値・重複は除外されること"""
+        monkeypatch.setenv("YADON_MANAGER_FAILOVER", "gemini, claude, bogus, gemini")
+        monkeypatch.setenv("YADON_FAILOVER", "copilot")
+
+        assert get_failover_chain("manager") == ["claude", "gemini"]
+        assert get_failover_chain("worker") == ["claude", "copilot"]
+
+    def test_worker_chain(self, monkeypatch):
+        monkeypatch.setenv("YADON_2_BACKEND", "copilot")
+        monkeypatch.setenv("YADON_2_FAILOVER", "opencode")
+        monkeypatch.setenv("YADON_WORKER_FAILOVER", "gemini")
+
+        assert get_failover_chain("worker", worker_number=2) == ["copilot", "opencode"]
+        assert get_failover_chain("worker", worker_number=3) == ["claude", "gemini"]
+
+    def test_model_for_backend(self):
+        from yadon_agents.config.llm import BACKEND_CONFIGS
+
+        assert get_model_for_backend(BACKEND_CONFIGS["gemini"], "worker") == "gemini-3.0-flash"
+        with pytest.raises(ValueError):
+            get_model_for_backend(BACKEND_CONFIGS["gemini"], "boss")
@@ -23,3 +23,33 @@ def sock_dir(tmp_path):
     # cleanup
     import shutil
     shutil.rmtree(short_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def _reset_circuit_breakers():
+    """サーキットブレーカーはプロセス共有のため、テストごとに初期化する。"""
+    from yadon_agents.infra.circuit_breaker import reset_breakers
+
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+@pytest.fixture(autouse=True)
+def _reset_concurrency_limiters():
+    """同時実行数リミッターはプロセス共有のため、テストごとに初期化する。"""
+    from yadon_agents.infra.concurrency import reset_limiters
+
+    reset_limiters()
+    yield
+    reset_limiters()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_history(tmp_path, monkeypatch):
+    """タスク履歴はテストごとの一時ファイルに書き、ライタースレッドを後始末する。"""
+    from yadon_agents.infra.history import reset_history
+
+    monkeypatch.setenv("YADON_HISTORY", str(tmp_path / "history.sqlite3"))
+    yield
+    reset_history()
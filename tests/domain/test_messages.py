@@ -37,6 +37,14 @@ class TestTaskMessage:
         assert d["from"] == "yadoran"
         assert d["payload"]["instruction"] == "READMEを更新"
         assert d["payload"]["project_dir"] == "/work"
+        assert "trace" not in d["payload"]
+
+    def test_trace_context(self):
+        msg = TaskMessage(
+            from_agent="yadoran", instruction="x", project_dir="/work",
+            trace={"trace_id": "task-1", "parent_id": "abc"},
+        )
+        assert msg.to_dict()["payload"]["trace"] == {"trace_id": "task-1", "parent_id": "abc"}
 
     def test_frozen(self):
         msg = TaskMessage(from_agent="a", instruction="b", project_dir="/c")
@@ -57,6 +65,34 @@ class TestResultMessage:
         assert d["type"] == "result"
         assert d["status"] == "success"
         assert d["payload"]["output"] == "done"
+        assert "output_path" not in d["payload"]
+
+    def test_to_dict_with_output_path(self):
+        msg = ResultMessage(
+            task_id="t1",
+            from_agent="yadon-1",
+            status="success",
+            output="head...tail",
+            summary="完了",
+            output_path="/logs/outputs/t1.log",
+        )
+        d = msg.to_dict()
+        assert d["payload"]["output_path"] == "/logs/outputs/t1.log"
+
+    def test_to_dict_with_resources(self):
+        msg = ResultMessage(
+            task_id="t1",
+            from_agent="yadon-1",
+            status="success",
+            output="done",
+            summary="完了",
+            resources={"wall_ms": 1200, "user_cpu_ms": 300},
+        )
+        d = msg.to_dict()
+        assert d["payload"]["resources"]["wall_ms"] == 1200
+        assert "resources" not in ResultMessage(
+            task_id="t", from_agent="a", status="s", output="o", summary="s",
+        ).to_dict()["payload"]
 
     def test_frozen(self):
         msg = ResultMessage(task_id="t", from_agent="a", status="s", output="o", summary="s")
@@ -79,6 +115,11 @@ class TestStatusResponse:
         assert d["state"] == "idle"
         assert d["current_task"] is None
         assert "workers" not in d
+        assert "breakers" not in d
+
+    def test_to_dict_with_breakers(self):
+        r = StatusResponse(from_agent="yadoran", state="idle", breakers={"claude": {"state": "open"}})
+        assert r.to_dict()["breakers"] == {"claude": {"state": "open"}}
 
     def test_to_dict_with_workers(self):
         r = StatusResponse(
@@ -0,0 +1,78 @@
+"""domain/run_result.py のテスト"""
+
+from __future__ import annotations
+
+import pytest
+
+from yadon_agents.domain.run_result import LLMRunResult, LLMUsage, ResourceUsage, sum_resources, sum_usage
+
+
+class TestLLMUsage:
+    def test_add(self):
+        a = LLMUsage(input_tokens=1, output_tokens=2, cost_usd=0.5, duration_ms=100)
+        b = LLMUsage(input_tokens=10, cache_read_tokens=5, cost_usd=0.25, unreported_calls=1)
+
+        total = a + b
+
+        assert total.input_tokens == 11
+        assert total.output_tokens == 2
+        assert total.cache_read_tokens == 5
+        assert total.cost_usd == pytest.approx(0.75)
+        assert total.calls == 2
+        assert total.unreported_calls == 1
+
+    def test_roundtrip(self):
+        usage = LLMUsage(input_tokens=3, cost_usd=0.1234567, duration_ms=9)
+
+        restored = LLMUsage.from_dict(usage.to_dict())
+
+        assert restored.input_tokens == 3
+        assert restored.cost_usd == pytest.approx(0.123457)
+        assert restored.duration_ms == 9
+
+    def test_from_dict_ignores_unknown_keys(self):
+        assert LLMUsage.from_dict({"input_tokens": 1, "foo": "bar"}).input_tokens == 1
+
+    def test_sum_usage_empty(self):
+        assert sum_usage([]).calls == 0
+
+    def test_sum_usage(self):
+        assert sum_usage([LLMUsage(output_tokens=1)] * 3).output_tokens == 3
+
+
+class TestResourceUsage:
+    def test_add_takes_max_rss(self):
+        a = ResourceUsage(wall_ms=100, user_cpu_ms=30, max_rss_kb=500, voluntary_switches=2)
+        b = ResourceUsage(wall_ms=200, sys_cpu_ms=10, max_rss_kb=300, block_output=8)
+
+        total = a + b
+
+        assert total.wall_ms == 300
+        assert total.cpu_ms == 40
+        assert total.max_rss_kb == 500
+        assert total.voluntary_switches == 2
+        assert total.block_output == 8
+        assert total.runs == 2
+
+    def test_cpu_ratio(self):
+        assert ResourceUsage(wall_ms=1000, user_cpu_ms=150, sys_cpu_ms=50).cpu_ratio == pytest.approx(0.2)
+        assert ResourceUsage().cpu_ratio == 0.0
+
+    def test_roundtrip(self):
+        resources = ResourceUsage(wall_ms=10, user_cpu_ms=4, max_rss_kb=2048, involuntary_switches=3)
+
+        d = resources.to_dict()
+
+        assert d["cpu_ratio"] == 0.4
+        assert ResourceUsage.from_dict(d) == resources
+
+    def test_sum_resources_empty(self):
+        assert sum_resources([]).runs == 0
+
+
+class TestLLMRunResult:
+    def test_defaults(self):
+        r = LLMRunResult(output="x", returncode=0)
+        assert r.output_path is None
+        assert r.usage is None
+        assert r.backend is None
@@ -10,7 +10,7 @@ from typing import get_type_hints
 
 import pytest
 
-from yadon_agents.domain.task_types import Phase, Subtask
+from yadon_agents.domain.task_types import Phase, Subtask, infer_paths, subtask_paths
 
 
 class TestSubtask:
@@ -282,3 +282,42 @@ class TestTypeCompatibility:
         restored = json.loads(json_str)
         assert restored["name"] == "implement"
         assert restored["subtasks"][0]["instruction"] == "テスト"
+
+
+class TestSubtaskPaths:
+    """infer_paths() / subtask_paths() のテスト"""
+
+    def test_infer_paths_from_instruction(self) -> None:
+        """日本語の指示文からファイル・ディレクトリのパスを抜き出すこと"""
+        text = "src/yadon_agents/cli.py の status を修正し、README.md と tests/ を更新する"
+        assert infer_paths(text) == frozenset({"src/yadon_agents/cli.py", "README.md", "tests"})
+
+    def test_infer_paths_ignores_urls_and_parent_refs(self) -> None:
+        """URL・親ディレクトリ参照・略語はパスとみなさないこと"""
+        text = "https://example.com/a.html を参照 (e.g. ../outside.py) して修正"
+        assert infer_paths(text) == frozenset()
+
+    @pytest.mark.parametrize("text", [
+        "config.agent の設定を読む",
+        "os.path.join を pathlib に置き換える",
+        "self.current_task_id を更新する",
+        "yadon_agents.infra.process の run_process を直す",
+        "v1.2 から挙動が変わった",
+    ])
+    def test_infer_paths_ignores_dotted_identifiers(self, text: str) -> None:
+        """モジュール名・属性参照・バージョン番号はパスとみなさないこと"""
+        assert infer_paths(text) == frozenset()
+
+    def test_infer_paths_accepts_known_extensions_and_slashes(self) -> None:
+        """既知の拡張子で終わる語と `/` を含む語はパスとみなすこと"""
+        text = "pyproject.toml と config/agent と Main.JAVA を確認する。"
+        assert infer_paths(text) == frozenset({"pyproject.toml", "config/agent", "Main.JAVA"})
+
+    def test_declared_paths_take_precedence(self) -> None:
+        """paths が宣言されていれば指示文からの推定より優先すること"""
+        subtask: Subtask = {"instruction": "README.md を更新", "paths": ["./docs/", "src/a.py"]}
+        assert subtask_paths(subtask) == frozenset({"docs", "src/a.py"})
+
+    def test_no_paths(self) -> None:
+        """パスが分からなければ空集合を返すこと"""
+        assert subtask_paths({"instruction": "全体をレビューする"}) == frozenset()
@@ -0,0 +1,116 @@
+"""フェーズ間の変更マニフェストのテスト"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from yadon_agents.infra.change_manifest import TreeState, build_manifest, capture
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=repo, check=True, capture_output=True, text=True,
+    ).stdout
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git が必要")
+class TestGitManifest:
+    @pytest.fixture
+    def repo(self, tmp_path: Path) -> Path:
+        path = tmp_path / "repo"
+        path.mkdir()
+        _git(path, "init", "-q")
+        (path / "a.py").write_text("x = 1\n")
+        (path / "old.txt").write_text("old\n")
+        _git(path, "add", "-A")
+        _git(path, "commit", "-q", "-m", "init")
+        return path
+
+    def test_lists_changes_with_stats_and_hunks(self, repo: Path) -> None:
+        """未コミットの変更・追加・削除を増減行数と差分付きで挙げること"""
+        before = capture(repo)
+        assert before is not None and before.commit
+
+        (repo / "a.py").write_text("x = 2\ny = 3\n")
+        (repo / "新規.md").write_text("# doc\n")
+        (repo / "old.txt").unlink()
+
+        manifest = build_manifest(repo, before)
+
+        assert "（3ファイル）" in manifest
+        assert "- M a.py (+2 -1)" in manifest
+        assert "- A 新規.md (+1 -0)" in manifest
+        assert "- D old.txt (+0 -1)" in manifest
+        assert "+y = 3" in manifest
+        # HEAD とインデックスは変えない
+        assert _git(repo, "diff", "--cached", "--name-only") == ""
+
+    def test_no_changes(self, repo: Path) -> None:
+        """変更がなければ空文字列を返すこと"""
+        before = capture(repo)
+        assert before is not None
+        assert build_manifest(repo, before) == ""
+
+    def test_subdirectory_paths_are_relative(self, repo: Path) -> None:
+        """サブディレクトリで作業する場合はそこからの相対パスで、配下の変更だけを挙げること"""
+        sub = repo / "pkg"
+        sub.mkdir()
+        before = capture(sub)
+        assert before is not None
+        (sub / "mod.py").write_text("z = 0\n")
+        (repo / "a.py").write_text("outside\n")
+
+        manifest = build_manifest(sub, before)
+
+        assert "- A mod.py" in manifest
+        assert "a.py" not in manifest.replace("mod.py", "")
+
+    def test_truncated_to_max_bytes(self, repo: Path) -> None:
+        """上限を超える差分は切り詰めること"""
+        before = capture(repo)
+        assert before is not None
+        (repo / "a.py").write_text("".join(f"line{i} = {i}\n" for i in range(500)))
+
+        manifest = build_manifest(repo, before, max_bytes=1000)
+
+        assert len(manifest.encode("utf-8")) <= 1100
+        assert "- M a.py (+500 -1)" in manifest
+        assert "省略" in manifest
+
+
+class TestScanManifest:
+    def test_detects_added_modified_deleted(self, tmp_path: Path) -> None:
+        """git 以外では mtime とサイズの走査で変更を挙げること"""
+        (tmp_path / "keep.txt").write_text("a")
+        (tmp_path / "edit.txt").write_text("a")
+        (tmp_path / "gone.txt").write_text("a")
+        (tmp_path / "node_modules").mkdir()
+        before = capture(tmp_path)
+        assert before is not None and before.files is not None
+
+        (tmp_path / "edit.txt").write_text("changed")
+        os.utime(tmp_path / "edit.txt", ns=(1, 1))
+        (tmp_path / "gone.txt").unlink()
+        (tmp_path / "new.txt").write_text("n")
+        (tmp_path / "node_modules" / "dep.js").write_text("ignored")
+
+        manifest = build_manifest(tmp_path, before)
+
+        assert "- A new.txt" in manifest
+        assert "- M edit.txt" in manifest
+        assert "- D gone.txt" in manifest
+        assert "keep.txt" not in manifest
+        assert "dep.js" not in manifest
+
+    def test_disabled(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """YADON_MANIFEST_BYTES=0 ならマニフェストを作らないこと"""
+        monkeypatch.setenv("YADON_MANIFEST_BYTES", "0")
+        before = TreeState(files={})
+        (tmp_path / "new.txt").write_text("n")
+        assert build_manifest(tmp_path, before) == ""
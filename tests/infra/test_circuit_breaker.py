@@ -0,0 +1,136 @@
+"""infra/circuit_breaker.py のテスト"""
+
+from __future__ import annotations
+
+import pytest
+
+from yadon_agents.config.agent import BreakerSettings
+from yadon_agents.infra.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    breaker_snapshot,
+    get_breaker,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    settings = BreakerSettings(window=4, min_calls=2, failure_ratio=0.5, open_seconds=10.0)
+    return CircuitBreaker("claude", settings, clock=clock)
+
+
+class TestCircuitBreaker:
+    def test_stays_closed_below_min_calls(self, breaker):
+        """最小呼び出し数に満たなければ遮断しないこと"""
+        breaker.record("error")
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    def test_opens_on_failure_ratio(self, breaker):
+        """失敗率が閾値に達すると遮断すること（タイムアウトも失敗に数える）"""
+        breaker.record("success")
+        breaker.record("timeout")
+
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.snapshot()["rejected"] == 1
+
+    def test_successes_keep_closed(self, breaker):
+        for outcome in ("success", "success", "success", "error"):
+            breaker.record(outcome)
+        assert breaker.state == CLOSED
+
+    def test_half_open_after_timer(self, breaker, clock):
+        """遮断時間経過後は1件だけ試行を許可すること"""
+        breaker.record("error")
+        breaker.record("error")
+        clock.now = 10.0
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+    def test_release_returns_probe(self, breaker, clock):
+        """試行を記録せずに返却したら、次の呼び出しが試行できること"""
+        breaker.record("error")
+        breaker.record("error")
+        clock.now = 10.0
+        assert breaker.allow()
+
+        breaker.release()
+
+        assert breaker.allow()
+
+    def test_half_open_success_closes(self, breaker, clock):
+        breaker.record("error")
+        breaker.record("error")
+        clock.now = 10.0
+        breaker.allow()
+
+        breaker.record("success")
+
+        assert breaker.state == CLOSED
+        assert breaker.snapshot()["recent_calls"] == 0
+
+    def test_half_open_failure_reopens(self, breaker, clock):
+        breaker.record("error")
+        breaker.record("error")
+        clock.now = 10.0
+        breaker.allow()
+
+        breaker.record("timeout")
+
+        assert breaker.state == OPEN
+        clock.now = 15.0
+        assert breaker.snapshot()["retry_in"] == 5.0
+
+    def test_snapshot_counts(self, breaker):
+        breaker.record("success")
+        breaker.record("error")
+
+        snap = breaker.snapshot()
+
+        assert snap["recent_calls"] == 2
+        assert snap["recent_errors"] == 1
+        assert snap["failure_ratio"] == 0.5
+        assert snap["total_success"] == 1
+
+    def test_unknown_outcome(self, breaker):
+        with pytest.raises(ValueError):
+            breaker.record("maybe")
+
+
+class TestRegistry:
+    def test_shared_per_backend(self):
+        """同じバックエンド名なら同じブレーカーが返ること"""
+        assert get_breaker("gemini") is get_breaker("gemini")
+        assert get_breaker("gemini") is not get_breaker("claude")
+
+    def test_settings_from_env(self, monkeypatch):
+        monkeypatch.setenv("YADON_BREAKER_OPEN_SECONDS", "5")
+        monkeypatch.setenv("YADON_BREAKER_MIN_CALLS", "7")
+
+        breaker = get_breaker("copilot")
+
+        assert breaker.settings.open_seconds == 5.0
+        assert breaker.settings.min_calls == 7
+
+    def test_snapshot(self):
+        get_breaker("claude").record("success")
+
+        assert breaker_snapshot()["claude"]["state"] == CLOSED
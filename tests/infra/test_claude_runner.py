@@ -22,7 +22,7 @@ class TestSubprocessClaudeRunner:
         mock_result.stderr = "error line 1\n"
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             output, returncode = runner.run(
                 prompt="test prompt",
                 model_tier="worker",
@@ -34,16 +34,16 @@ class TestSubprocessClaudeRunner:
             assert returncode == 0
             mock_run.assert_called_once()
             call_kwargs = mock_run.call_args[1]
-            assert call_kwargs["capture_output"] is True
-            assert call_kwargs["text"] is True
-            assert call_kwargs["timeout"] == 30
+            assert call_kwargs["input"] == "test prompt"
+            # 実行枠の待ち時間を差し引いた残り
+            assert call_kwargs["timeout"] == pytest.approx(30, abs=1)
             assert call_kwargs["cwd"] == "/tmp"
 
     def test_run_timeout(self):
         """TimeoutExpired でタイムアウトメッセージを返す"""
         runner = SubprocessClaudeRunner()
 
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 60)):
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=subprocess.TimeoutExpired("cmd", 60)):
             output, returncode = runner.run(
                 prompt="test prompt",
                 model_tier="manager",
@@ -61,7 +61,7 @@ class TestSubprocessClaudeRunner:
 
         test_error = RuntimeError("subprocess not found")
 
-        with patch("subprocess.run", side_effect=test_error):
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=test_error):
             output, returncode = runner.run(
                 prompt="test prompt",
                 model_tier="coordinator",
@@ -81,7 +81,7 @@ class TestSubprocessClaudeRunner:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             runner.run(
                 prompt="test",
                 model_tier="worker",
@@ -93,3 +93,27 @@ class TestSubprocessClaudeRunner:
             call_args = mock_run.call_args[0][0]
             assert "--output-format" in call_args
             assert "json" in call_args
+
+    @pytest.mark.parametrize("spilled", [False, True])
+    def test_spill_dir_pruned_only_when_spilled(self, spilled: bool):
+        """スピルファイルが残ったときだけ古いスピルファイルを間引く（毎回の glob はしない）"""
+        runner = SubprocessClaudeRunner()
+
+        def fake_run(cmd, **kwargs):
+            if spilled:
+                kwargs["spill_path"].write_text("full output")
+            result = MagicMock()
+            result.stdout, result.stderr, result.returncode = "out", "", 0
+            return result
+
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=fake_run) as mock_run, \
+                patch("yadon_agents.infra.claude_runner.prune_oldest") as prune:
+            runner.run(prompt="test", model_tier="worker", cwd="/tmp", timeout=30, output_format="text")
+
+        spill = mock_run.call_args[1]["spill_path"]
+        try:
+            assert prune.called is spilled
+            if spilled:
+                assert prune.call_args[0][0] == spill.parent
+        finally:
+            spill.unlink(missing_ok=True)
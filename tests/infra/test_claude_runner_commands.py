@@ -13,6 +13,18 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from yadon_agents.infra.claude_runner import SubprocessClaudeRunner, run_claude
+from yadon_agents.infra.process import ProcessResult
+
+
+def _decoded(stdout: str):
+    """run_process の代わりに、渡された stdout_decoder で stdout を変換して返す"""
+    def run(cmd, **kwargs):
+        raw = stdout.encode("utf-8")
+        decoder = kwargs.get("stdout_decoder")
+        if decoder is not None:
+            raw = decoder.feed(raw) + decoder.flush()
+        return ProcessResult(stdout=raw.decode("utf-8"), stderr="", returncode=0)
+    return run
 
 
 class TestBuildInteractiveCommand:
@@ -127,7 +139,7 @@ class TestRunWithBatchPromptStyles:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             runner.run(prompt="test", model_tier="worker", cwd="/tmp")
 
         call_args = mock_run.call_args[0][0]
@@ -146,7 +158,7 @@ class TestRunWithBatchPromptStyles:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             runner.run(prompt="test prompt", model_tier="worker", cwd="/tmp")
 
         call_args = mock_run.call_args[0][0]
@@ -166,7 +178,7 @@ class TestRunWithBatchPromptStyles:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             runner.run(prompt="test", model_tier="worker", cwd="/tmp")
 
         call_args = mock_run.call_args[0][0]
@@ -185,7 +197,7 @@ class TestRunErrorHandling:
 
         runner = SubprocessClaudeRunner()
 
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 120)):
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=subprocess.TimeoutExpired("cmd", 120)):
             output, returncode = runner.run(
                 prompt="test",
                 model_tier="worker",
@@ -203,7 +215,7 @@ class TestRunErrorHandling:
 
         runner = SubprocessClaudeRunner()
 
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 30)):
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=subprocess.TimeoutExpired("cmd", 30)):
             output, returncode = runner.run(
                 prompt="test",
                 model_tier="worker",
@@ -221,7 +233,7 @@ class TestRunErrorHandling:
 
         runner = SubprocessClaudeRunner()
 
-        with patch("subprocess.run", side_effect=RuntimeError("コマンドが見つかりません")):
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=RuntimeError("コマンドが見つかりません")):
             output, returncode = runner.run(
                 prompt="test",
                 model_tier="worker",
@@ -242,7 +254,7 @@ class TestRunErrorHandling:
         mock_result.stderr = "error message"
         mock_result.returncode = 1
 
-        with patch("subprocess.run", return_value=mock_result):
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result):
             output, returncode = runner.run(
                 prompt="test",
                 model_tier="worker",
@@ -269,7 +281,7 @@ class TestRunWithWorkerNumber:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             runner.run(prompt="test", model_tier="worker", cwd="/tmp")
 
         call_args = mock_run.call_args[0][0]
@@ -287,7 +299,7 @@ class TestRunWithWorkerNumber:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             runner.run(prompt="test", model_tier="worker", cwd="/tmp")
 
         call_args = mock_run.call_args[0][0]
@@ -308,7 +320,7 @@ class TestRunBackendSpecificFlags:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             runner.run(prompt="test", model_tier="worker", cwd="/tmp")
 
         call_args = mock_run.call_args[0][0]
@@ -325,7 +337,7 @@ class TestRunBackendSpecificFlags:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             runner.run(prompt="test", model_tier="worker", cwd="/tmp")
 
         call_args = mock_run.call_args[0][0]
@@ -346,7 +358,7 @@ class TestRunWithOutputFormat:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             runner.run(
                 prompt="test",
                 model_tier="worker",
@@ -359,8 +371,8 @@ class TestRunWithOutputFormat:
         assert "json" in call_args
 
     def test_run_without_output_format(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """output_format=None で --output-format フラグが追加されないこと"""
-        monkeypatch.setenv("LLM_BACKEND", "claude")
+        """構造化出力非対応のバックエンドでは output_format=None で --output-format が追加されないこと"""
+        monkeypatch.setenv("LLM_BACKEND", "copilot")
 
         runner = SubprocessClaudeRunner()
 
@@ -369,7 +381,7 @@ class TestRunWithOutputFormat:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             runner.run(
                 prompt="test",
                 model_tier="worker",
@@ -380,6 +392,79 @@ class TestRunWithOutputFormat:
         call_args = mock_run.call_args[0][0]
         assert "--output-format" not in call_args
 
+    def test_run_requests_json_for_usage(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """stream 形式のないバックエンドでは output_format=None でJSON出力を要求し、本文を取り出すこと"""
+        monkeypatch.setenv("LLM_BACKEND", "gemini")
+
+        runner = SubprocessClaudeRunner()
+        stdout = '{"response": "本文", "stats": {"models": {}}}'
+
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=_decoded(stdout)) as mock_run:
+            output, returncode = runner.run(prompt="test", model_tier="worker", cwd="/tmp")
+
+        call_args = mock_run.call_args[0][0]
+        assert call_args[call_args.index("--output-format") + 1] == "json"
+        assert mock_run.call_args[1]["stall_timeout"] is None
+        assert output == "本文"
+        assert returncode == 0
+
+    def test_stream_json_without_stall_watch(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """停滞監視が無効でも stream 形式を要求し（読みながら本文を取り出せる）、監視はしないこと"""
+        monkeypatch.setenv("LLM_BACKEND", "claude")
+        monkeypatch.setenv("YADON_STALL_TIMEOUT", "0")
+
+        stdout = '{"type": "result", "result": "本文", "usage": {"input_tokens": 3}}\n'
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=_decoded(stdout)) as mock_run:
+            output, _ = SubprocessClaudeRunner().run(prompt="test", model_tier="worker", cwd="/tmp")
+
+        call_args = mock_run.call_args[0][0]
+        assert call_args[call_args.index("--output-format") + 1] == "stream-json"
+        assert mock_run.call_args[1]["stall_timeout"] is None
+        assert output == "本文"
+
+    def test_run_requests_stream_json_for_stall_watch(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """停滞監視が有効なら stream-json（+ --verbose）を要求し、最終行の結果を取り出すこと"""
+        monkeypatch.setenv("LLM_BACKEND", "claude")
+        monkeypatch.setenv("YADON_STALL_TIMEOUT", "120")
+
+        runner = SubprocessClaudeRunner()
+
+        stdout = (
+            '{"type": "system", "subtype": "init"}\n'
+            '{"type": "assistant", "message": {"content": []}}\n'
+            '{"type": "result", "result": "本文", "usage": {"input_tokens": 3}}\n'
+        )
+
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=_decoded(stdout)) as mock_run:
+            result = runner.run_detailed(prompt="test", model_tier="worker", cwd="/tmp")
+
+        call_args = mock_run.call_args[0][0]
+        assert call_args[call_args.index("--output-format") + 1] == "stream-json"
+        assert "--verbose" in call_args
+        assert mock_run.call_args[1]["stall_timeout"] == 120
+        assert result.output == "本文"
+        assert result.usage.input_tokens == 3
+
+    @pytest.mark.parametrize("backend,output_format,watched", [
+        ("gemini", None, False),
+        ("claude", "text", False),
+        ("copilot", None, True),
+        ("opencode", "text", True),
+        ("copilot", "json", False),
+    ])
+    def test_stall_watch_only_for_streaming_output(
+        self, monkeypatch: pytest.MonkeyPatch, backend: str, output_format: str | None, watched: bool,
+    ) -> None:
+        """出力がまとめて書き出される形式では停滞監視しないこと"""
+        monkeypatch.setenv("LLM_BACKEND", backend)
+        monkeypatch.setenv("YADON_STALL_TIMEOUT", "120")
+
+        mock_result = MagicMock(stdout="ok", stderr="", returncode=0, resources=None)
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
+            SubprocessClaudeRunner().run(prompt="test", model_tier="worker", output_format=output_format)
+
+        assert (mock_run.call_args[1]["stall_timeout"] is not None) is watched
+
 
 class TestLegacyRunClaude:
     """後方互換の run_claude() 関数テスト"""
@@ -393,19 +478,19 @@ class TestLegacyRunClaude:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             # haiku -> worker
             run_claude(prompt="test", model="haiku", cwd="/tmp")
             call_args = mock_run.call_args[0][0]
             assert "haiku" in call_args
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             # sonnet -> manager
             run_claude(prompt="test", model="sonnet", cwd="/tmp")
             call_args = mock_run.call_args[0][0]
             assert "sonnet" in call_args
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             # opus -> coordinator
             run_claude(prompt="test", model="opus", cwd="/tmp")
             call_args = mock_run.call_args[0][0]
@@ -420,7 +505,7 @@ class TestLegacyRunClaude:
         mock_result.stderr = ""
         mock_result.returncode = 0
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result) as mock_run:
             run_claude(prompt="test", model="unknown-model", cwd="/tmp")
             call_args = mock_run.call_args[0][0]
             # worker tier のモデル（haiku）が使用される
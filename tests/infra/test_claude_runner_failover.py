@@ -0,0 +1,167 @@
+"""SubprocessClaudeRunner のフェイルオーバーとサーキットブレーカー連携のテスト"""
+
+from __future__ import annotations
+
+import subprocess
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from yadon_agents.domain.run_result import ResourceUsage
+from yadon_agents.infra.circuit_breaker import OPEN, get_breaker
+from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+
+
+def _result(stdout: str = "ok", returncode: int = 0, resources: ResourceUsage | None = None) -> MagicMock:
+    return MagicMock(
+        stdout=stdout, stderr="", returncode=returncode,
+        output_bytes=len(stdout), output_path=None, resources=resources,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _env(monkeypatch, tmp_path):
+    for key in ("YADON_FAILOVER", "YADON_WORKER_FAILOVER", "YADON_MANAGER_FAILOVER", "YADON_1_FAILOVER"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.delenv("YADON_1_BACKEND", raising=False)
+    monkeypatch.setenv("LLM_BACKEND", "copilot")
+    monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+    monkeypatch.setattr("yadon_agents.infra.usage.log_dir", lambda: tmp_path)
+
+
+class TestFailover:
+    def test_no_chain_runs_primary_only(self):
+        """フェイルオーバー未設定なら失敗しても主バックエンドのみ実行すること"""
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=_result("x", 1)) as mock_run:
+            result = SubprocessClaudeRunner().run_detailed("p", "worker")
+
+        assert mock_run.call_count == 1
+        assert result.returncode == 1
+        assert result.backend == "copilot"
+
+    def test_failover_to_next_backend(self, monkeypatch):
+        """失敗したら次のバックエンドのモデルで再実行すること"""
+        monkeypatch.setenv("YADON_WORKER_FAILOVER", "opencode")
+
+        with patch(
+            "yadon_agents.infra.claude_runner.run_process",
+            side_effect=[_result("rate limited", 1), _result("done")],
+        ) as mock_run:
+            result = SubprocessClaudeRunner().run_detailed("p", "worker", run_id="t1")
+
+        assert result.returncode == 0
+        assert result.output == "done"
+        assert result.backend == "opencode"
+        assert result.model == "kimi/kimi-k2.5"
+        assert result.usage.calls == 2
+        second_cmd = mock_run.call_args_list[1][0][0]
+        assert second_cmd[0] == "opencode"
+        assert mock_run.call_args_list[1][1]["spill_path"].name == "t1.opencode.log"
+
+    def test_failover_sums_resources(self, monkeypatch):
+        """フェイルオーバー時は全試行の資源使用量が合算されること"""
+        monkeypatch.setenv("YADON_WORKER_FAILOVER", "opencode")
+
+        with patch(
+            "yadon_agents.infra.claude_runner.run_process",
+            side_effect=[
+                _result("boom", 1, ResourceUsage(wall_ms=100, user_cpu_ms=10, max_rss_kb=50)),
+                _result("done", 0, ResourceUsage(wall_ms=300, user_cpu_ms=20, max_rss_kb=80)),
+            ],
+        ):
+            result = SubprocessClaudeRunner().run_detailed("p", "worker")
+
+        assert result.resources == ResourceUsage(wall_ms=400, user_cpu_ms=30, max_rss_kb=80, runs=2)
+
+    def test_timeout_counts_as_failure(self, monkeypatch):
+        monkeypatch.setenv("YADON_FAILOVER", "opencode")
+
+        with patch(
+            "yadon_agents.infra.claude_runner.run_process",
+            side_effect=[subprocess.TimeoutExpired(["copilot"], 1), _result("done")],
+        ):
+            result = SubprocessClaudeRunner().run_detailed("p", "manager", timeout=60)
+
+        assert result.output == "done"
+        assert get_breaker("copilot").snapshot()["recent_timeouts"] == 1
+
+    def test_fallback_finishes_within_caller_timeout(self, monkeypatch):
+        """主バックエンドがタイムアウトしても、後続のバックエンドが呼び出し側の期限内に実行されること"""
+        monkeypatch.setenv("YADON_WORKER_FAILOVER", "opencode")
+        clock = [1000.0]
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.time.monotonic", lambda: clock[0])
+        timeouts: list[float] = []
+
+        def run(cmd, **kwargs):
+            timeouts.append(kwargs["timeout"])
+            if cmd[0] == "copilot":
+                # 与えられた時間を使い切ってタイムアウトする
+                clock[0] += kwargs["timeout"]
+                raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+            clock[0] += 10
+            return _result("done")
+
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=run):
+            result = SubprocessClaudeRunner().run_detailed("p", "worker", timeout=600)
+
+        assert result.output == "done"
+        assert result.backend == "opencode"
+        assert timeouts == [300, 300]
+        assert clock[0] - 1000.0 <= 600
+
+    def test_single_backend_gets_full_timeout(self):
+        """フェイルオーバー未設定なら timeout 全体を1回の実行に与えること"""
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=_result("ok")) as mock_run:
+            SubprocessClaudeRunner().run_detailed("p", "worker", timeout=600)
+
+        assert mock_run.call_args[1]["timeout"] == pytest.approx(600, abs=1)
+
+    def test_worker_specific_chain(self, monkeypatch):
+        """YADON_{N}_FAILOVER が tier 別設定より優先されること"""
+        monkeypatch.setenv("YADON_1_BACKEND", "gemini")
+        monkeypatch.setenv("YADON_WORKER_FAILOVER", "opencode")
+        monkeypatch.setenv("YADON_1_FAILOVER", "copilot")
+
+        with patch(
+            "yadon_agents.infra.claude_runner.run_process",
+            side_effect=[_result("x", 1), _result("done")],
+        ) as mock_run:
+            SubprocessClaudeRunner(worker_number=1).run_detailed("p", "worker")
+
+        assert [c[0][0][0] for c in mock_run.call_args_list] == ["gemini", "copilot"]
+
+    def test_open_breaker_is_skipped(self, monkeypatch):
+        """遮断中のバックエンドは実行せずに次へ進むこと"""
+        monkeypatch.setenv("YADON_WORKER_FAILOVER", "opencode")
+        breaker = get_breaker("copilot")
+        for _ in range(breaker.settings.min_calls):
+            breaker.record("error")
+        assert breaker.state == OPEN
+
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=_result("done")) as mock_run:
+            result = SubprocessClaudeRunner().run_detailed("p", "worker")
+
+        assert mock_run.call_count == 1
+        assert mock_run.call_args[0][0][0] == "opencode"
+        assert result.backend == "opencode"
+
+    def test_all_open_fails_fast(self):
+        """全バックエンドが遮断中なら実行せずにエラーを返すこと"""
+        breaker = get_breaker("copilot")
+        for _ in range(breaker.settings.min_calls):
+            breaker.record("error")
+
+        with patch("yadon_agents.infra.claude_runner.run_process") as mock_run:
+            result = SubprocessClaudeRunner().run_detailed("p", "worker")
+
+        mock_run.assert_not_called()
+        assert result.returncode == 1
+        assert "遮断中" in result.output
+
+    def test_repeated_failures_open_breaker(self):
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=_result("x", 1)):
+            runner = SubprocessClaudeRunner()
+            for _ in range(get_breaker("copilot").settings.min_calls):
+                runner.run_detailed("p", "worker")
+
+        assert get_breaker("copilot").state == OPEN
@@ -0,0 +1,225 @@
+"""infra/concurrency.py（AIMD 同時実行数制御）のテスト"""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from yadon_agents.config.agent import ConcurrencySettings, get_concurrency_settings
+from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.infra.concurrency import (
+    NEUTRAL,
+    OVERLOAD,
+    SUCCESS,
+    AdaptiveLimiter,
+    get_limiter,
+    is_rate_limited,
+    limiter_snapshot,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 0.001
+        return self.now
+
+
+def _limiter(**overrides) -> AdaptiveLimiter:
+    values = {"initial": 4, "minimum": 1, "maximum": 8, "decrease_factor": 0.5}
+    values.update(overrides)
+    return AdaptiveLimiter("claude", ConcurrencySettings(**values), clock=FakeClock())
+
+
+class TestAdaptiveLimiter:
+    def test_additive_increase(self):
+        """上限 L のとき約 L 回の成功で上限が 1 増えること"""
+        limiter = _limiter()
+        for _ in range(3):
+            limiter.release(limiter.acquire(), SUCCESS)
+        assert limiter.limit == 4
+
+        for _ in range(2):
+            limiter.release(limiter.acquire(), SUCCESS)
+
+        assert limiter.limit == 5
+
+    def test_increase_capped(self):
+        limiter = _limiter(initial=8)
+        for _ in range(20):
+            limiter.release(limiter.acquire(), SUCCESS)
+
+        assert limiter.limit == 8
+
+    def test_multiplicative_decrease(self):
+        limiter = _limiter(initial=8)
+        limiter.release(limiter.acquire(), OVERLOAD)
+
+        assert limiter.limit == 4
+        assert limiter.snapshot()["decreases"] == 1
+
+    def test_decrease_floor(self):
+        limiter = _limiter(initial=1)
+        limiter.release(limiter.acquire(), OVERLOAD)
+
+        assert limiter.limit == 1
+
+    def test_burst_of_failures_decreases_once(self):
+        """同時に実行していた呼び出しの過負荷は1回分の削減として扱うこと"""
+        limiter = _limiter(initial=8)
+        tickets = [limiter.acquire() for _ in range(4)]
+        for ticket in tickets:
+            limiter.release(ticket, OVERLOAD)
+
+        assert limiter.limit == 4
+
+    def test_neutral_keeps_limit(self):
+        limiter = _limiter()
+        limiter.release(limiter.acquire(), NEUTRAL)
+        assert limiter.limit == 4
+
+    def test_acquire_waits_for_slot(self):
+        """上限に達している間は待機し、返却されたら確保できること"""
+        limiter = AdaptiveLimiter("claude", ConcurrencySettings(initial=1, minimum=1, maximum=1))
+        first = limiter.acquire()
+        acquired = []
+
+        t = threading.Thread(target=lambda: acquired.append(limiter.acquire(timeout=5)))
+        t.start()
+        time.sleep(0.1)
+        assert limiter.snapshot()["waiting"] == 1
+        assert not acquired
+
+        limiter.release(first, NEUTRAL)
+        t.join(timeout=5)
+
+        assert acquired and acquired[0] is not None
+        assert limiter.snapshot()["in_flight"] == 1
+
+    def test_acquire_timeout(self):
+        limiter = AdaptiveLimiter("claude", ConcurrencySettings(initial=1, minimum=1, maximum=1))
+        limiter.acquire()
+
+        assert limiter.acquire(timeout=0.05) is None
+        assert limiter.snapshot()["waiting"] == 0
+
+    def test_acquire_abort(self):
+        limiter = AdaptiveLimiter("claude", ConcurrencySettings(initial=1, minimum=1, maximum=1))
+        limiter.acquire()
+
+        assert limiter.acquire(should_abort=lambda: True) is None
+
+
+class TestRateLimitDetection:
+    @pytest.mark.parametrize("text", [
+        "Error: 429 Too Many Requests",
+        "API Error: rate_limit_error",
+        "Quota exceeded for quota metric",
+        "RESOURCE_EXHAUSTED",
+        "Overloaded",
+    ])
+    def test_detects(self, text):
+        assert is_rate_limited(text)
+
+    def test_plain_error(self):
+        assert not is_rate_limited("SyntaxError: invalid syntax at line 4290")
+
+
+class TestSettings:
+    def test_backend_override(self, monkeypatch):
+        monkeypatch.setenv("YADON_CONCURRENCY_MAX", "10")
+        monkeypatch.setenv("YADON_CLAUDE_OPUS_CONCURRENCY_MAX", "2")
+        monkeypatch.setenv("YADON_CONCURRENCY_INITIAL", "6")
+
+        assert get_concurrency_settings("gemini").maximum == 10
+        opus = get_concurrency_settings("claude-opus")
+        assert opus.maximum == 2
+        assert opus.initial == 2
+
+    def test_initial_covers_workers(self, monkeypatch):
+        """初期値の既定はワーカー数を下回らないこと（全ワーカーが最初から並列に動ける）"""
+        monkeypatch.delenv("YADON_CONCURRENCY_INITIAL", raising=False)
+        monkeypatch.delenv("YADON_CLAUDE_CONCURRENCY_INITIAL", raising=False)
+        monkeypatch.setenv("YADON_COUNT", "7")
+        assert get_concurrency_settings("claude").initial == 7
+        monkeypatch.setenv("YADON_COUNT", "2")
+        assert get_concurrency_settings("claude").initial == 4
+
+    def test_registry_uses_settings(self, monkeypatch):
+        monkeypatch.setenv("YADON_GEMINI_CONCURRENCY_INITIAL", "3")
+
+        assert get_limiter("gemini").limit == 3
+        assert limiter_snapshot()["gemini"]["limit"] == 3
+
+
+class TestRunnerIntegration:
+    """SubprocessClaudeRunner からの信号送出"""
+
+    @pytest.fixture(autouse=True)
+    def _env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("LLM_BACKEND", "copilot")
+        monkeypatch.delenv("YADON_FAILOVER", raising=False)
+        monkeypatch.delenv("YADON_WORKER_FAILOVER", raising=False)
+        monkeypatch.setenv("YADON_CONCURRENCY_INITIAL", "8")
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+        monkeypatch.setattr("yadon_agents.infra.usage.log_dir", lambda: tmp_path)
+
+    def _run(self, **mock_kwargs):
+        with patch("yadon_agents.infra.claude_runner.run_process", **mock_kwargs):
+            return SubprocessClaudeRunner().run_detailed("p", "worker", timeout=60)
+
+    def test_rate_limited_output_decreases(self):
+        self._run(return_value=MagicMock(stdout="", stderr="429 rate limit", returncode=1,
+                                         output_bytes=0, output_path=None, resources=None))
+        assert get_limiter("copilot").limit == 4
+
+    def test_timeout_decreases(self):
+        self._run(side_effect=subprocess.TimeoutExpired(["copilot"], 60))
+        assert get_limiter("copilot").limit == 4
+
+    def test_rate_limit_words_in_answer_are_neutral(self):
+        """回答本文に「quota」「429」等が含まれていても、stderr に出ていなければ減らさないこと"""
+        self._run(return_value=MagicMock(stdout="quota の 429 応答を処理するテストが失敗", stderr="", returncode=1,
+                                         output_bytes=0, output_path=None, resources=None))
+        assert get_limiter("copilot").limit == 8
+
+    def test_slot_wait_counts_against_timeout(self):
+        """枠の待ち時間を実行のタイムアウトから差し引くこと"""
+        limiter = get_limiter("copilot")
+        held = [limiter.acquire() for _ in range(limiter.limit)]
+        threading.Timer(0.3, limiter.release, args=(held.pop(), NEUTRAL)).start()
+
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=MagicMock(
+            stdout="ok", stderr="", returncode=0, output_bytes=2, output_path=None, resources=None,
+        )) as mock_run:
+            SubprocessClaudeRunner().run_detailed("p", "worker", timeout=5)
+
+        assert mock_run.call_args[1]["timeout"] <= 4.8
+        for ticket in held:
+            limiter.release(ticket, NEUTRAL)
+
+    def test_other_error_is_neutral(self):
+        self._run(return_value=MagicMock(stdout="", stderr="boom", returncode=1,
+                                         output_bytes=0, output_path=None, resources=None))
+        assert get_limiter("copilot").limit == 8
+        assert get_limiter("copilot").snapshot()["in_flight"] == 0
+
+    def test_slot_wait_timeout(self):
+        """枠を確保できなければプロセスを起動せずにエラーを返すこと"""
+        limiter = get_limiter("copilot")
+        held = [limiter.acquire() for _ in range(limiter.limit)]
+
+        with patch("yadon_agents.infra.claude_runner.run_process") as mock_run:
+            result = SubprocessClaudeRunner().run_detailed("p", "worker", timeout=0.05)
+
+        mock_run.assert_not_called()
+        assert result.returncode == 1
+        assert "同時実行枠" in result.output
+        for ticket in held:
+            limiter.release(ticket, NEUTRAL)
@@ -0,0 +1,78 @@
+"""リポジトリ概要（コンテキストバンドル）のテスト"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from yadon_agents.infra import context_bundle
+from yadon_agents.infra.context_bundle import build_bundle
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "cache"
+    path.mkdir()
+    monkeypatch.setattr(context_bundle, "_cache_dir", lambda: path)
+    return path
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    path = tmp_path / "proj"
+    (path / "pkg").mkdir(parents=True)
+    (path / "pkg" / "core.py").write_text(
+        "LIMIT = 3\n_hidden = 1\n\nclass Engine:\n    pass\n\nasync def run():\n    pass\n\ndef _private():\n    pass\n"
+    )
+    (path / "pkg" / "broken.py").write_text("def (:\n")
+    (path / "README.md").write_text("# プロジェクト\n\n説明文\n")
+    (path / "CLAUDE.md").write_text("ルール\n" * 2000)
+    return path
+
+
+def test_bundle_contents(project: Path) -> None:
+    """ファイル一覧・公開シンボル・ドキュメントの抜粋を含むこと"""
+    path = build_bundle(project)
+
+    assert path is not None
+    text = path.read_text(encoding="utf-8")
+    assert "pkg/core.py (" in text
+    assert "- pkg/core.py: LIMIT, class Engine, def run()" in text
+    assert "_hidden" not in text and "_private" not in text
+    assert "pkg/broken.py:" not in text
+    assert "## README.md（抜粋）\n\n# プロジェクト" in text
+    assert "...（以下省略）" in text
+
+
+def test_large_tree_is_grouped(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """ファイルが多い場合はディレクトリ単位で集計すること"""
+    monkeypatch.setattr(context_bundle, "CONTEXT_BUNDLE_TREE_FILES", 2)
+    path = build_bundle(project)
+
+    assert path is not None
+    text = path.read_text(encoding="utf-8")
+    assert "pkg/ (2件, " in text
+    assert "pkg/core.py (" not in text
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git が必要")
+def test_git_bundle_is_cached_by_tree(project: Path, cache_dir: Path) -> None:
+    """git 作業ツリーでは内容が同じならキャッシュを再利用し、変われば作り直すこと"""
+    subprocess.run(["git", "init", "-q"], cwd=project, check=True)
+    (project / ".gitignore").write_text("build/\n")
+    (project / "build").mkdir()
+    (project / "build" / "out.py").write_text("X = 1\n")
+
+    first = build_bundle(project)
+    assert first is not None
+    assert "build/out.py" not in first.read_text(encoding="utf-8")
+    assert build_bundle(project) == first
+
+    (project / "pkg" / "new.py").write_text("def added():\n    pass\n")
+    second = build_bundle(project)
+    assert second is not None and second != first
+    assert "def added()" in second.read_text(encoding="utf-8")
+    assert len(list(cache_dir.glob("*.md"))) == 2
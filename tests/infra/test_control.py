@@ -0,0 +1,39 @@
+"""infra/control.py のテスト"""
+
+from __future__ import annotations
+
+import os
+import socket
+from typing import Any
+
+import pytest
+
+from yadon_agents.infra.control import ControlServer
+from yadon_agents.infra.protocol import send_message
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unixソケットが必要")
+
+
+def _echo(msg: dict[str, Any]) -> dict[str, Any]:
+    return {"type": "echo", "value": msg.get("value")}
+
+
+def _reject(msg: dict[str, Any]) -> dict[str, Any]:
+    raise ValueError("不正な指定")
+
+
+class TestControlServer:
+    def test_dispatches_by_type(self, sock_dir: str) -> None:
+        """type ごとのハンドラーの応答を返し、停止でソケットが消えること"""
+        path = os.path.join(sock_dir, "control.sock")
+        server = ControlServer(path, {"echo": _echo, "reject": _reject})
+        server.start()
+        try:
+            assert send_message(path, {"type": "echo", "value": 3}) == {"type": "echo", "value": 3}
+            error = send_message(path, {"type": "reject"})
+            assert error["type"] == "error" and "不正な指定" in error["message"]
+            unknown = send_message(path, {"type": "nope"})
+            assert unknown["type"] == "error"
+        finally:
+            server.stop()
+        assert not os.path.exists(path)
@@ -0,0 +1,44 @@
+"""infra/filenames.py のテスト"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from yadon_agents.infra.filenames import prune_oldest, safe_filename
+
+
+@pytest.mark.parametrize(("name", "expected"), [
+    ("task-1", "task-1"),
+    ("../../x", ".._.._x"),
+    ("a b/c", "a_b_c"),
+    ("..", "__"),
+    ("", "_"),
+])
+def test_safe_filename(name: str, expected: str) -> None:
+    """パス区切り・空白を置き換え、`.` だけの名前も残さないこと"""
+    assert safe_filename(name) == expected
+
+
+def test_prune_oldest_keeps_newest(tmp_path: Path) -> None:
+    """一致するファイルを新しい順に keep 個だけ残し、削除したパスを返すこと"""
+    for i in range(5):
+        path = tmp_path / f"{i}.log"
+        path.write_text(str(i))
+        os.utime(path, (1000 + i, 1000 + i))
+    (tmp_path / "other.txt").write_text("x")
+
+    removed = prune_oldest(tmp_path, "*.log", 2)
+
+    assert sorted(p.name for p in removed) == ["0.log", "1.log", "2.log"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["3.log", "4.log", "other.txt"]
+
+
+def test_prune_oldest_under_limit(tmp_path: Path) -> None:
+    """keep 個以下なら何も削除しないこと"""
+    (tmp_path / "a.log").write_text("a")
+
+    assert prune_oldest(tmp_path, "*.log", 2) == []
+    assert (tmp_path / "a.log").exists()
@@ -0,0 +1,185 @@
+"""infra/history.py のテスト"""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from yadon_agents.config.agent import HISTORY_OUTPUT_MAX_CHARS
+from yadon_agents.infra import history
+from yadon_agents.infra.history import HistoryStore, get_history, history_file
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    s = HistoryStore(tmp_path / "history.sqlite3")
+    yield s
+    s.close()
+
+
+def _task(store: HistoryStore, task_id: str, started: float, status: str = "success") -> None:
+    store.record_task(
+        task_id=task_id, instruction=f"{task_id} の指示", project_dir="/work", status=status,
+        started=started, finished=started + 2, duration=2.0, summary="完了", output="出力",
+        usage={"total": {"input_tokens": 10, "output_tokens": 5, "cost_usd": 0.01}},
+    )
+
+
+class TestHistoryStore:
+    def test_task_round_trip(self, store: HistoryStore) -> None:
+        """タスク・フェーズ・サブタスクを書いて、フェーズ・サブタスク付きで読めること"""
+        _task(store, "task-1", 100.0)
+        store.record_phase(task_id="task-1", idx=0, name="implement", status="success",
+                           subtasks=1, started=100.5, duration=1.0)
+        store.record_subtask(
+            subtask_id="task-1-implement-sub1", task_id="task-1", phase="implement", worker="yadon-1",
+            status="success", backend="claude", started=100.5, duration=1.0, summary="ok",
+            output_path="/logs/outputs/x.txt", usage={"input_tokens": 10},
+        )
+        store.flush()
+
+        task = store.task("task-1")
+        assert task is not None
+        assert task["status"] == "success"
+        assert task["usage"]["total"]["cost_usd"] == 0.01
+        assert [p["name"] for p in task["phases"]] == ["implement"]
+        assert task["subtasks"][0]["backend"] == "claude"
+        assert task["subtasks"][0]["output_path"] == "/logs/outputs/x.txt"
+        assert task["subtasks"][0]["usage"] == {"input_tokens": 10}
+
+    def test_task_output_is_truncated(self, store: HistoryStore) -> None:
+        """タスクの出力は全文ではなく先頭の抜粋だけを保存すること"""
+        store.record_task(task_id="task-1", instruction="x", project_dir="/w", started=1.0,
+                          status="success", output="あ" * (HISTORY_OUTPUT_MAX_CHARS + 500))
+        store.flush()
+
+        output = store.task("task-1")["output"]
+        assert output.startswith("あ" * HISTORY_OUTPUT_MAX_CHARS + "\n")
+        assert "500文字省略" in output
+        assert len(output) < HISTORY_OUTPUT_MAX_CHARS + 100
+
+    def test_running_row_is_replaced(self, store: HistoryStore) -> None:
+        """開始時の running を完了時の記録で上書きすること"""
+        store.record_task(task_id="task-1", instruction="x", project_dir="/w", started=1.0, status="running")
+        _task(store, "task-1", 1.0, status="partial_error")
+        store.flush()
+
+        assert store.task("task-1")["status"] == "partial_error"
+        assert len(store.recent()) == 1
+
+    def test_recent_filters(self, store: HistoryStore) -> None:
+        """新しい順に返し、状態・開始時刻で絞り込めること"""
+        _task(store, "task-a", 100.0)
+        _task(store, "task-b", 200.0, status="partial_error")
+        _task(store, "task-c", 300.0)
+        store.flush()
+
+        assert [t["task_id"] for t in store.recent()] == ["task-c", "task-b", "task-a"]
+        assert [t["task_id"] for t in store.recent(limit=1)] == ["task-c"]
+        assert [t["task_id"] for t in store.recent(status="partial_error")] == ["task-b"]
+        assert [t["task_id"] for t in store.recent(since=150.0)] == ["task-c", "task-b"]
+
+    def test_prefix_lookup(self, store: HistoryStore) -> None:
+        """一意な前方一致で引け、曖昧・不一致なら None"""
+        _task(store, "task-20260101-aaaa", 1.0)
+        _task(store, "task-20260101-abcd", 2.0)
+        _task(store, "task-20260102-ffff", 3.0)
+        store.flush()
+
+        assert store.task("task-20260102")["task_id"] == "task-20260102-ffff"
+        assert store.task("task-20260101-a") is None
+        assert store.task("nope") is None
+
+    def test_wal_mode_and_indexes(self, store: HistoryStore) -> None:
+        """WAL モードで、一覧・絞り込み用のインデックスがあること"""
+        _task(store, "task-1", 1.0)
+        store.flush()
+
+        conn = sqlite3.connect(str(store.path))
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            plan = " ".join(str(r) for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE status = ? ORDER BY started DESC LIMIT 5", ("x",),
+            ))
+        finally:
+            conn.close()
+        assert {"tasks_started", "tasks_status_started", "subtasks_task"} <= indexes
+        assert "tasks_status_started" in plan
+
+    def test_records_are_batched(self, store: HistoryStore) -> None:
+        """同時期の記録をまとめて書くこと（記録ごとにコミットしない）"""
+        statements: list[str] = []
+        original = history._connect
+
+        def connect(path: Path) -> sqlite3.Connection:
+            conn = original(path)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        with patch.object(history, "_connect", connect):
+            for i in range(50):
+                _task(store, f"task-{i:03d}", float(i))
+            store.flush()
+
+        commits = [s for s in statements if s.strip().upper() == "COMMIT"]
+        assert 0 < len(commits) < 50
+        assert len(store.recent(limit=100)) == 50
+
+    def test_queue_full_drops_record(self, store: HistoryStore) -> None:
+        """キューが溢れたら呼び出し側を待たせずに記録を捨てること"""
+        with patch.object(store._queue, "put_nowait", side_effect=queue.Full):
+            _task(store, "task-dropped", 1.0)
+        store.flush()
+
+        assert store.task("task-dropped") is None
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """ファイルがなければ空の一覧・None を返し、ファイルを作らないこと"""
+        s = HistoryStore(tmp_path / "none.sqlite3")
+        assert s.recent() == []
+        assert s.task("task-1") is None
+        assert not (tmp_path / "none.sqlite3").exists()
+
+
+    def test_reader_is_read_only(self, tmp_path: Path) -> None:
+        """読み出しは読み取り専用で開き、スキーマ作成などの書き込みをしないこと"""
+        path = tmp_path / "empty.sqlite3"
+        sqlite3.connect(str(path)).close()
+        reader = HistoryStore(path)
+
+        assert reader.recent() == []
+        assert reader.task("task-1") is None
+        with sqlite3.connect(str(path)) as conn:
+            assert conn.execute("SELECT name FROM sqlite_master").fetchall() == []
+
+        conn = reader._read()
+        assert conn is not None
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("CREATE TABLE x (a)")
+        conn.close()
+
+    def test_reader_sees_writer_records(self, store: HistoryStore) -> None:
+        """別のストア（CLI 側）から、ライターが書いた記録を読めること"""
+        _task(store, "task-1", 1.0)
+        store.flush()
+
+        assert [t["task_id"] for t in HistoryStore(store.path).recent()] == ["task-1"]
+
+
+class TestGetHistory:
+    def test_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """YADON_HISTORY=0 なら記録しない"""
+        monkeypatch.setenv("YADON_HISTORY", "0")
+        assert history_file() is None
+        assert get_history() is None
+
+    def test_shared_per_path(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """同じパスなら同じストアを返すこと"""
+        monkeypatch.setenv("YADON_HISTORY", str(tmp_path / "h.sqlite3"))
+        assert get_history() is get_history()
+        assert get_history().path == tmp_path / "h.sqlite3"
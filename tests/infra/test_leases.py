@@ -0,0 +1,67 @@
+"""infra/leases.py のテスト"""
+
+from __future__ import annotations
+
+from yadon_agents.infra.leases import LeaseTable, paths_overlap, schedule_order
+
+
+def _paths(*items: str) -> frozenset[str]:
+    return frozenset(items)
+
+
+class TestPathsOverlap:
+    def test_same_path(self) -> None:
+        """同じパスは重なること"""
+        assert paths_overlap(_paths("src/a.py"), _paths("src/a.py"))
+
+    def test_parent_directory(self) -> None:
+        """ディレクトリとその配下のファイルは重なること"""
+        assert paths_overlap(_paths("src"), _paths("src/a.py"))
+        assert paths_overlap(_paths("src/a.py"), _paths("src"))
+
+    def test_prefix_is_not_parent(self) -> None:
+        """名前の前方一致だけでは重ならないこと"""
+        assert not paths_overlap(_paths("src/a"), _paths("src/ab.py"))
+
+    def test_empty(self) -> None:
+        """空集合は何とも重ならないこと"""
+        assert not paths_overlap(frozenset(), _paths("src"))
+
+
+class TestScheduleOrder:
+    def test_independent_subtasks_keep_order(self) -> None:
+        """競合がなければ番号順のままであること"""
+        order = schedule_order({1: _paths("a.py"), 2: _paths("b.py"), 3: frozenset()})
+        assert order == [1, 2, 3]
+
+    def test_conflicting_subtask_moves_back(self) -> None:
+        """多くと競合するサブタスクを後回しにして並列度を上げること"""
+        order = schedule_order({1: _paths("src"), 2: _paths("src/a.py"), 3: _paths("src/b.py")})
+        assert order == [2, 3, 1]
+
+
+class TestLeaseTable:
+    def test_acquire_and_release(self) -> None:
+        """重なるリースは解放されるまで取得できないこと"""
+        table = LeaseTable()
+        assert table.try_acquire("yadon-1", "t-1", _paths("src/a.py"))
+        assert not table.try_acquire("yadon-2", "t-2", _paths("src"))
+        assert table.try_acquire("yadon-3", "t-3", _paths("docs"))
+
+        table.release("yadon-1")
+        assert table.try_acquire("yadon-2", "t-2", _paths("src"))
+
+    def test_empty_paths_take_no_lease(self) -> None:
+        """パスのないサブタスクはリースを取らずに通ること"""
+        table = LeaseTable()
+        assert table.try_acquire("yadon-1", "t-1", frozenset())
+        assert table.snapshot() == {}
+
+    def test_snapshot(self) -> None:
+        """保持中のリースをステータス用に返すこと"""
+        table = LeaseTable()
+        table.try_acquire("yadon-1", "t-1", _paths("b.py", "a.py"))
+        snap = table.snapshot()
+        assert snap["yadon-1"]["task"] == "t-1"
+        assert snap["yadon-1"]["paths"] == ["a.py", "b.py"]
+        assert snap["yadon-1"]["held_for"] >= 0
@@ -0,0 +1,123 @@
+"""infra/memory.py のテスト"""
+
+from __future__ import annotations
+
+import threading
+import tracemalloc
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from yadon_agents.infra import memory, metrics
+
+
+class _Leaky:
+    pass
+
+
+@pytest.fixture(autouse=True)
+def _reset_memory() -> Iterator[None]:
+    was_tracing = tracemalloc.is_tracing()
+    memory._previous = None
+    memory._previous_types = None
+    yield
+    if not was_tracing and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    memory._previous = None
+    memory._previous_types = None
+
+
+class TestSample:
+    def test_values(self) -> None:
+        """RSS・スレッド数・オブジェクト数を測れること"""
+        values = memory.sample()
+        assert values["rss_bytes"] > 0
+        assert values["threads"] >= 1
+        assert values["gc_objects"] > 0
+
+    def test_update_gauges(self) -> None:
+        """ゲージに書くこと"""
+        values = memory.update_gauges()
+        assert metrics.PROCESS_THREADS.value() == values["threads"]
+        assert metrics.PROCESS_RSS_BYTES.value() == values["rss_bytes"]
+
+    def test_rss_without_proc(self) -> None:
+        """/proc がなければ最大 RSS で代用すること"""
+        with patch("builtins.open", side_effect=OSError):
+            assert memory.rss_bytes() > 0
+
+
+class TestMonitor:
+    def test_updates_periodically(self) -> None:
+        """間隔ごとにゲージを更新し、stop で止まること"""
+        called = threading.Event()
+        with patch.object(memory, "update_gauges", side_effect=lambda: called.set()):
+            monitor = memory.MemoryMonitor(0.01)
+            monitor.start()
+            assert called.wait(5)
+            monitor.stop()
+
+    def test_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """YADON_MEMORY_INTERVAL=0 なら起動しない"""
+        monkeypatch.setenv("YADON_MEMORY_INTERVAL", "0")
+        assert memory.start_memory_monitor() is None
+
+
+class TestTake:
+    def test_type_growth_without_tracemalloc(self) -> None:
+        """tracemalloc が無効でも、前回から増えた型を返すこと"""
+        if tracemalloc.is_tracing():
+            pytest.skip("tracemalloc が有効な環境")
+        first = memory.take()
+        assert first["tracing"] is False
+        assert first["baseline"] is True
+        assert first["sites"] == []
+
+        kept = [_Leaky() for _ in range(500)]
+        second = memory.take()
+        assert second["baseline"] is False
+        growth = {t["type"]: t["count_diff"] for t in second["types"]}
+        assert growth[f"{__name__}._Leaky"] == 500
+        del kept
+
+    def test_allocation_sites_diff(self) -> None:
+        """tracemalloc を有効にすると、前回から増えた確保箇所を返すこと"""
+        memory.start_tracing(1)
+        memory.take()
+        kept = [bytearray(1024) for _ in range(200)]
+        report = memory.take(top=5)
+        assert report["tracing"] is True
+        assert report["baseline"] is False
+        top = report["sites"][0]
+        assert "test_memory.py:" in top["site"]
+        assert top["size_diff"] >= 200 * 1024
+        assert report["tracemalloc_bytes"] > 0
+        del kept
+
+    def test_traceback_group(self) -> None:
+        """traceback 単位ではトレースバックも返すこと"""
+        memory.start_tracing(5)
+        report = memory.take(top=3, group="traceback")
+        assert report["baseline"] is True
+        assert all("traceback" in site for site in report["sites"])
+
+    def test_invalid_group(self) -> None:
+        with pytest.raises(ValueError):
+            memory.take(group="module")
+
+
+class TestControlHandler:
+    def test_start_and_stop(self) -> None:
+        """start で tracemalloc を有効にし、stop で止めること"""
+        if tracemalloc.is_tracing():
+            pytest.skip("tracemalloc が有効な環境")
+        handle = memory.control_handler()
+        report = handle({"type": "memory", "start": 2, "top": 3})
+        assert report["tracing"] is True
+        assert len(report["sites"]) <= 3
+        assert tracemalloc.get_traceback_limit() == 2
+
+        stopped = handle({"type": "memory", "stop": True})
+        assert stopped["stopped"] is True
+        assert not tracemalloc.is_tracing()
@@ -0,0 +1,138 @@
+"""メトリクス（infra/metrics.py）のテスト"""
+
+from __future__ import annotations
+
+import socket
+from pathlib import Path
+
+import pytest
+
+from yadon_agents.infra.circuit_breaker import reset_breakers
+from yadon_agents.infra.concurrency import get_limiter, reset_limiters
+from yadon_agents.infra.metrics import REGISTRY, Family, MetricsServer, Registry, start_metrics_server
+
+
+def _fetch_unix(path: str) -> str:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(5)
+        s.connect(path)
+        s.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+        return b"".join(iter(lambda: s.recv(65536), b"")).decode("utf-8")
+
+
+class TestRegistry:
+    def test_counter_and_gauge(self) -> None:
+        """ラベルごとの値を Prometheus テキスト形式で出力すること"""
+        registry = Registry()
+        tasks = registry.counter("t_tasks_total", "タスク数", ["status"])
+        busy = registry.gauge("t_busy", "実行中")
+        tasks.inc(status="success")
+        tasks.inc(2, status="error")
+        busy.inc()
+        busy.inc()
+        busy.dec()
+
+        text = registry.render()
+
+        assert "# TYPE t_tasks_total counter" in text
+        assert 't_tasks_total{status="error"} 2' in text
+        assert 't_tasks_total{status="success"} 1' in text
+        assert "t_busy 1" in text
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """ヒストグラムは累積バケット・合計・件数を出力すること"""
+        registry = Registry()
+        hist = registry.histogram("t_seconds", "所要時間", ["backend"], buckets=(1.0, 10.0))
+        hist.observe(0.5, backend="claude")
+        hist.observe(5.0, backend="claude")
+        hist.observe(50.0, backend="claude")
+
+        text = registry.render()
+
+        assert 't_seconds_bucket{backend="claude",le="1"} 1' in text
+        assert 't_seconds_bucket{backend="claude",le="10"} 2' in text
+        assert 't_seconds_bucket{backend="claude",le="+Inf"} 3' in text
+        assert 't_seconds_sum{backend="claude"} 55.5' in text
+        assert 't_seconds_count{backend="claude"} 3' in text
+
+    def test_label_mismatch(self) -> None:
+        """宣言と異なるラベルは ValueError になること"""
+        counter = Registry().counter("t_total", "x", ["worker"])
+        with pytest.raises(ValueError):
+            counter.inc(backend="claude")
+
+    def test_same_name_returns_existing(self) -> None:
+        """同じ名前の登録は既存のメトリクスを返すこと"""
+        registry = Registry()
+        assert registry.counter("t_total", "x") is registry.counter("t_total", "x")
+
+    def test_label_values_are_escaped(self) -> None:
+        """ラベル値の引用符・改行をエスケープすること"""
+        registry = Registry()
+        registry.gauge("t_g", "x", ["name"]).set(1, name='a"b\nc')
+        assert 't_g{name="a\\"b\\nc"} 1' in registry.render()
+
+    def test_collectors(self) -> None:
+        """コレクターの値は取得時に集めること（失敗しても他は出力する）"""
+        registry = Registry()
+        registry.register_collector(lambda: [Family("t_depth", "待ち", "gauge", [({"q": "a"}, 3)])])
+
+        def broken() -> list[Family]:
+            raise RuntimeError("x")
+
+        registry.register_collector(broken)
+        assert 't_depth{q="a"} 3' in registry.render()
+
+    def test_backend_collector(self) -> None:
+        """バックエンドの同時実行数が既定レジストリに出ること"""
+        reset_limiters()
+        reset_breakers()
+        try:
+            get_limiter("claude")
+            text = REGISTRY.render()
+            assert 'yadon_backend_in_flight{backend="claude"} 0' in text
+            assert "# TYPE yadon_llm_run_duration_seconds histogram" in text
+        finally:
+            reset_limiters()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unixソケットが必要")
+class TestMetricsServer:
+    def test_unix_socket(self, tmp_path: Path) -> None:
+        """Unixソケットで HTTP 応答として返すこと"""
+        server = MetricsServer(str(tmp_path / "metrics.sock"))
+        server.start()
+        try:
+            response = _fetch_unix(str(tmp_path / "metrics.sock"))
+        finally:
+            server.stop()
+
+        head, _, body = response.partition("\r\n\r\n")
+        assert head.startswith("HTTP/1.0 200 OK")
+        assert "text/plain; version=0.0.4" in head
+        assert "# TYPE yadon_tasks_total counter" in body
+        assert not (tmp_path / "metrics.sock").exists()
+
+    def test_tcp_port(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """YADON_METRICS_PORT を指定すると localhost の TCP でも返すこと"""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        monkeypatch.setenv("YADON_METRICS_SOCKET", "off")
+        monkeypatch.setenv("YADON_METRICS_PORT", str(port))
+
+        server = start_metrics_server("test")
+        assert server is not None and server.socket_path is None
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=5) as s:
+                s.sendall(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+                response = b"".join(iter(lambda: s.recv(65536), b"")).decode("utf-8")
+        finally:
+            server.stop()
+        assert "yadon_subtasks_total" in response
+
+    def test_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Unixソケットも TCP も無効なら起動しないこと"""
+        monkeypatch.setenv("YADON_METRICS_SOCKET", "0")
+        monkeypatch.delenv("YADON_METRICS_PORT", raising=False)
+        assert start_metrics_server("test") is None
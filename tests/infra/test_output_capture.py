@@ -0,0 +1,184 @@
+"""LLM出力の上限付きキャプチャとスピルのテスト"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.infra.process import ProcessResult, _BoundedBuffer, run_process
+from yadon_agents.infra.usage import StructuredOutputDecoder
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="POSIX専用")
+
+
+class TestBoundedBuffer:
+    """_BoundedBuffer のテスト"""
+
+    def test_small_output_kept_whole(self):
+        """上限以下の出力はそのまま保持されること"""
+        buf = _BoundedBuffer(10)
+        buf.write(b"abc")
+        buf.write(b"def")
+
+        assert not buf.truncated
+        assert buf.text() == "abcdef"
+
+    def test_keeps_head_and_tail(self):
+        """上限超過時は先頭と末尾だけが残ること"""
+        buf = _BoundedBuffer(10)
+        for i in range(100):
+            buf.write(str(i % 10).encode())
+
+        assert buf.truncated
+        assert buf.total == 100
+        assert bytes(buf.head) == b"01234"
+        assert bytes(buf.tail) == b"56789"
+        text = buf.text("/tmp/full.log")
+        assert text.startswith("01234")
+        assert text.endswith("56789")
+        assert "90 バイト省略" in text
+        assert "/tmp/full.log" in text
+
+    def test_unlimited(self):
+        """limit=None では全量を保持すること"""
+        buf = _BoundedBuffer(None)
+        buf.write(b"x" * 100000)
+
+        assert not buf.truncated
+        assert len(buf.text()) == 100000
+
+
+@posix_only
+class TestRunProcessCapture:
+    """run_process() の上限付きキャプチャ"""
+
+    def test_large_output_spilled(self, tmp_path: Path):
+        """上限を超えた出力は全量がスピルファイルに書き出されること"""
+        spill = tmp_path / "out" / "task.log"
+        code = "import sys; sys.stdout.write('A' * 100000 + 'END')"
+
+        result = run_process([sys.executable, "-c", code], max_capture=1000, spill_path=spill)
+
+        assert result.output_path == str(spill)
+        assert result.output_bytes == 100003
+        assert len(result.stdout) < 2000
+        assert result.stdout.endswith("END")
+        assert spill.read_bytes() == b"A" * 100000 + b"END"
+
+    def test_structured_result_larger_than_cap(self, tmp_path: Path):
+        """上限を超える本文でも stream-json を解析でき、保持とスピルの対象は本文になること"""
+        spill = tmp_path / "task.log"
+        code = (
+            "import json, sys\n"
+            "print(json.dumps({'type': 'system', 'subtype': 'init'}))\n"
+            "print(json.dumps({'type': 'assistant', 'message': {'content': [{'type': 'tool_use'}] * 2000}}))\n"
+            "print(json.dumps({'type': 'result', 'result': 'B' * 200000 + 'END', 'usage': {'output_tokens': 7}}))\n"
+        )
+        decoder = StructuredOutputDecoder("claude", stream=True)
+
+        result = run_process(
+            [sys.executable, "-c", code], max_capture=65536, spill_path=spill, stdout_decoder=decoder,
+        )
+
+        assert decoder.usage.output_tokens == 7
+        assert result.stdout.startswith("BBBB")
+        assert result.stdout.endswith("END")
+        assert "{" not in result.stdout
+        assert result.output_bytes == 200003
+        assert spill.read_text() == "B" * 200000 + "END"
+
+    def test_large_json_document_is_not_buffered(self, tmp_path: Path):
+        """上限を超える1文書の出力（gemini）は溜め込まずに保持上限とスピルへ流すこと"""
+        spill = tmp_path / "task.log"
+        code = "import json\nprint(json.dumps({'response': 'C' * 200000, 'stats': {}}))\n"
+        decoder = StructuredOutputDecoder("gemini", stream=False, max_pending=65536)
+
+        result = run_process(
+            [sys.executable, "-c", code], max_capture=65536, spill_path=spill, stdout_decoder=decoder,
+        )
+
+        assert decoder.usage is None
+        assert len(result.stdout) < 70000
+        assert result.output_bytes > 200000
+        assert spill.read_text().startswith('{"response": "CCC')
+
+    def test_small_output_removes_spill(self, tmp_path: Path):
+        """上限内の出力ではスピルファイルが残らないこと"""
+        spill = tmp_path / "task.log"
+
+        result = run_process(["echo", "hello"], max_capture=1000, spill_path=spill)
+
+        assert result.stdout == "hello\n"
+        assert result.output_path is None
+        assert not spill.exists()
+
+    def test_large_input_does_not_deadlock(self):
+        """子がすぐ読まない大きな入力でもデッドロックしないこと"""
+        data = "x" * 1_000_000
+        result = run_process(["cat"], input=data, max_capture=100, timeout=10)
+
+        assert result.output_bytes == 1_000_000
+
+    def test_timeout_keeps_partial_output(self, tmp_path: Path):
+        """タイムアウト時も途中までの出力が例外に格納されること"""
+        with pytest.raises(subprocess.TimeoutExpired) as exc_info:
+            run_process(["sh", "-c", "echo started; sleep 30"], timeout=0.5)
+
+        assert "started" in exc_info.value.output
+
+
+class TestRunnerSpill:
+    """SubprocessClaudeRunner.run_detailed() のスピル連携"""
+
+    def test_run_detailed_returns_output_path(self, monkeypatch, tmp_path: Path):
+        """スピルファイルのパスが LLMRunResult に載ること"""
+        monkeypatch.setenv("LLM_BACKEND", "claude")
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+        runner = SubprocessClaudeRunner(worker_number=1)
+        process_result = ProcessResult(
+            stdout="head...tail", stderr="", returncode=0,
+            output_bytes=5_000_000, output_path=str(tmp_path / "outputs" / "task-1.log"),
+        )
+
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=process_result) as mock_run:
+            result = runner.run_detailed(prompt="p", model_tier="worker", run_id="task-1")
+
+        assert result.output_path == str(tmp_path / "outputs" / "task-1.log")
+        assert result.output_bytes == 5_000_000
+        assert mock_run.call_args[1]["spill_path"] == tmp_path / "outputs" / "task-1.log"
+        assert mock_run.call_args[1]["max_capture"] > 0
+
+    def test_capture_limit_env(self, monkeypatch, tmp_path: Path):
+        """YADON_OUTPUT_MAX_BYTES で保持上限を変更できること"""
+        monkeypatch.setenv("YADON_OUTPUT_MAX_BYTES", "4096")
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+        runner = SubprocessClaudeRunner()
+
+        with patch(
+            "yadon_agents.infra.claude_runner.run_process",
+            return_value=ProcessResult(stdout="", stderr="", returncode=0),
+        ) as mock_run:
+            runner.run(prompt="p", model_tier="worker")
+
+        assert mock_run.call_args[1]["max_capture"] == 4096
+
+    def test_run_id_sanitized(self, monkeypatch, tmp_path: Path):
+        """run_id のパス区切り文字がファイル名から除去されること"""
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+        runner = SubprocessClaudeRunner()
+
+        with patch(
+            "yadon_agents.infra.claude_runner.run_process",
+            return_value=ProcessResult(stdout="", stderr="", returncode=0),
+        ) as mock_run:
+            runner.run_detailed(prompt="p", model_tier="worker", run_id="../evil/id")
+
+        spill = mock_run.call_args[1]["spill_path"]
+        assert spill.parent == tmp_path / "outputs"
+        assert "/" not in spill.name
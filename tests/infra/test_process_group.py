@@ -0,0 +1,240 @@
+"""run_process() のプロセスグループ管理・資源制限テスト"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from yadon_agents.config.agent import ProcessLimits
+from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.infra.process import (
+    ProcessResult,
+    ProcessTimeout,
+    _make_preexec,
+    apply_daemon_affinity,
+    run_process,
+)
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="POSIX専用")
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # ゾンビは終了済みとみなす
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split()[2] != "Z"
+    except OSError:
+        return True
+
+
+@posix_only
+class TestRunProcess:
+    """run_process() の基本動作"""
+
+    def test_captures_stdout_and_stderr(self):
+        """stdout と stderr が別々に取得されること"""
+        result = run_process(["sh", "-c", "echo out; echo err >&2; exit 3"])
+
+        assert isinstance(result, ProcessResult)
+        assert result.stdout == "out\n"
+        assert result.stderr == "err\n"
+        assert result.returncode == 3
+
+    def test_passes_input(self):
+        """input が標準入力に渡されること"""
+        result = run_process(["cat"], input="hello")
+
+        assert result.stdout == "hello"
+
+    def test_runs_in_new_session(self):
+        """子プロセスが独自のプロセスグループで起動されること"""
+        result = run_process([sys.executable, "-c", "import os; print(os.getpgid(0) == os.getpid())"])
+
+        assert result.stdout.strip() == "True"
+
+    def test_timeout_kills_whole_group(self, tmp_path):
+        """タイムアウト時に孫プロセスもまとめて停止されること"""
+        pid_file = tmp_path / "grandchild.pid"
+        script = f"sleep 60 & echo $! > {pid_file}; wait"
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_process(["sh", "-c", script], timeout=0.5)
+
+        grandchild = int(pid_file.read_text().strip())
+        deadline = time.time() + 3
+        while _alive(grandchild) and time.time() < deadline:
+            time.sleep(0.05)
+        assert not _alive(grandchild)
+
+    def test_open_files_limit_applied(self):
+        """RLIMIT_NOFILE が子プロセスに適用されること"""
+        result = run_process(["sh", "-c", "ulimit -n"], limits=ProcessLimits(open_files=64))
+
+        assert result.stdout.strip() == "64"
+
+    def test_nice_applied(self):
+        """nice 値が子プロセスに適用されること（LLM CLI と同じくプロンプトを読んでから確認する）"""
+        base = os.nice(0)
+        result = run_process(
+            [sys.executable, "-c", "import os, sys; sys.stdin.read(); print(os.nice(0))"],
+            input="prompt",
+            limits=ProcessLimits(nice=5),
+        )
+
+        assert int(result.stdout.strip()) == min(base + 5, 19)
+
+    @pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Linux専用")
+    def test_cpu_affinity_applied(self):
+        """CPUアフィニティが子プロセスに適用されること"""
+        cpu = min(os.sched_getaffinity(0))
+        result = run_process(
+            [sys.executable, "-c", "import os, sys; sys.stdin.read(); print(sorted(os.sched_getaffinity(0)))"],
+            input="prompt",
+            limits=ProcessLimits(cpus=frozenset({cpu})),
+        )
+
+        assert result.stdout.strip() == f"[{cpu}]"
+
+    @pytest.mark.skipif(
+        not sys.platform.startswith("linux") or shutil.which("ionice") is None, reason="Linux + ionice 専用",
+    )
+    def test_ioprio_applied(self):
+        """I/O優先度が子プロセスに適用されること"""
+        result = run_process(
+            ["sh", "-c", "cat > /dev/null; ionice -p $$"], input="prompt", limits=ProcessLimits(ioprio=(3, 0)),
+        )
+
+        assert result.stdout.strip() == "idle"
+
+    def test_preexec_only_for_rlimits(self):
+        """nice / CPUアフィニティ / I/O優先度だけなら preexec_fn を使わない（マルチスレッドからの fork 対策）"""
+        assert _make_preexec(ProcessLimits(nice=10, cpus=frozenset({0}), ioprio=(2, 7))) is None
+        assert _make_preexec(ProcessLimits(open_files=64)) is not None
+
+    def test_on_start_receives_popen(self):
+        """on_start コールバックに Popen が渡されること"""
+        started = []
+        run_process(["true"], on_start=started.append)
+
+        assert len(started) == 1
+        assert started[0].pid > 0
+
+
+@posix_only
+class TestResourceUsage:
+    """wait4() による資源使用量の取得"""
+
+    def test_cpu_and_rss_recorded(self):
+        """子プロセスのCPU時間・最大RSS・実時間が記録されること"""
+        script = "x = bytearray(32 * 1024 * 1024)\nn = 0\nfor i in range(2_000_000): n += i"
+
+        result = run_process([sys.executable, "-c", script])
+
+        resources = result.resources
+        assert result.returncode == 0
+        assert resources is not None
+        assert resources.user_cpu_ms > 0
+        assert resources.max_rss_kb >= 32 * 1024
+        assert resources.wall_ms >= resources.cpu_ms // 2
+        assert resources.runs == 1
+
+    def test_descendants_included(self):
+        """子プロセスが回収した孫プロセスのCPU時間も含まれること"""
+        grandchild = "n = 0\nfor i in range(2_000_000): n += i"
+        script = f"import subprocess, sys; subprocess.run([sys.executable, '-c', {grandchild!r}])"
+
+        result = run_process([sys.executable, "-c", script])
+
+        assert result.resources.user_cpu_ms >= 50
+
+    def test_sleeping_process_uses_little_cpu(self):
+        """待っているだけのプロセスは cpu_ratio が小さいこと"""
+        result = run_process(["sleep", "0.5"])
+
+        assert result.resources.wall_ms >= 450
+        assert result.resources.cpu_ratio < 0.5
+
+    def test_exit_code_preserved(self):
+        """wait4 で回収しても終了コードが正しく設定されること"""
+        assert run_process(["sh", "-c", "exit 3"]).returncode == 3
+        assert run_process(["sh", "-c", "kill -TERM $$"]).returncode == -15
+
+    def test_timeout_carries_resources(self):
+        """タイムアウト時も停止までの資源使用量が例外に格納されること"""
+        with pytest.raises(ProcessTimeout) as exc_info:
+            run_process(["sleep", "30"], timeout=0.3)
+
+        assert exc_info.value.resources is not None
+        assert exc_info.value.resources.wall_ms >= 300
+
+
+class TestRunnerProcessLimits:
+    """SubprocessClaudeRunner からの資源制限の受け渡し"""
+
+    def test_worker_tier_limits_passed(self, monkeypatch):
+        """tier 別の資源制限が run_process に渡されること"""
+        monkeypatch.setenv("LLM_BACKEND", "claude")
+        monkeypatch.setenv("YADON_WORKER_RLIMIT_CPU", "120")
+        runner = SubprocessClaudeRunner()
+
+        with patch(
+            "yadon_agents.infra.claude_runner.run_process",
+            return_value=ProcessResult(stdout="ok", stderr="", returncode=0),
+        ) as mock_run:
+            runner.run(prompt="test", model_tier="worker", cwd="/tmp")
+
+        limits = mock_run.call_args[1]["limits"]
+        assert limits.cpu_seconds == 120
+
+    @posix_only
+    def test_cancel_kills_running_process(self):
+        """cancel() で実行中のプロセスグループが停止されること"""
+        runner = SubprocessClaudeRunner()
+
+        def fake_run(cmd, **kwargs):
+            return run_process(["sleep", "30"], **kwargs)
+
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=fake_run):
+            t = threading.Thread(target=runner.run, args=("test", "worker"))
+            t.start()
+            deadline = time.time() + 3
+            while not runner._active and time.time() < deadline:
+                time.sleep(0.01)
+            procs = list(runner._active)
+            runner.cancel()
+            t.join(timeout=5)
+
+        assert not t.is_alive()
+        assert procs and all(p.poll() is not None for p in procs)
+        assert not runner._active
+
+
+class TestDaemonAffinity:
+    """apply_daemon_affinity() のテスト"""
+
+    def test_noop_when_unset(self, monkeypatch):
+        monkeypatch.delenv("YADON_DAEMON_CPUS", raising=False)
+        with patch("os.sched_setaffinity", create=True) as mock_set:
+            apply_daemon_affinity()
+
+        mock_set.assert_not_called()
+
+    def test_pins_current_process(self, monkeypatch):
+        monkeypatch.setenv("YADON_DAEMON_CPUS", "0")
+        with patch("os.sched_setaffinity", create=True) as mock_set:
+            apply_daemon_affinity()
+
+        mock_set.assert_called_once_with(0, frozenset({0}))
@@ -0,0 +1,119 @@
+"""infra/profiler.py のテスト"""
+
+from __future__ import annotations
+
+import pstats
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from yadon_agents.infra import profiler
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path: Path):
+    with patch.object(profiler, "_profile_dir", return_value=tmp_path):
+        yield tmp_path
+    for agent in list(profiler._sessions):
+        profiler.stop(agent)
+
+
+def _busy(msg: dict[str, float]) -> str:
+    deadline = time.monotonic() + msg["seconds"]
+    total = 0
+    while time.monotonic() < deadline:
+        total += sum(range(100))
+    return "done"
+
+
+class TestRunTask:
+    def test_passthrough_when_off(self) -> None:
+        """プロファイル中でなければそのまま呼ぶこと"""
+        assert not profiler.active("yadon-1")
+        assert profiler.run_task("yadon-1", lambda msg: msg * 2, 21) == 42
+
+
+class TestCProfile:
+    def test_profiles_n_tasks(self) -> None:
+        """tasks 件のタスクを cProfile で計測し、pstats と上位関数の一覧を書くこと"""
+        files = profiler.start("yadon-1", mode="cprofile", tasks=2)
+        assert profiler.active("yadon-1")
+
+        profiler.run_task("yadon-1", _busy, {"seconds": 0.01})
+        assert profiler.active("yadon-1")
+        profiler.run_task("yadon-1", _busy, {"seconds": 0.01})
+
+        assert profiler.wait("yadon-1", timeout=5)
+        assert not profiler.active("yadon-1")
+        stats = pstats.Stats(files[0])
+        assert any(func[2] == "_busy" for func in stats.stats)  # type: ignore[attr-defined]
+        assert "_busy" in Path(files[1]).read_text(encoding="utf-8")
+
+    def test_other_agent_not_measured(self) -> None:
+        """別のエージェントのタスクは数えないこと"""
+        profiler.start("yadon-1", mode="cprofile", tasks=1)
+        profiler.run_task("yadon-2", _busy, {"seconds": 0.0})
+
+        assert profiler.active("yadon-1")
+
+    def test_stop_during_task_writes_after_it(self) -> None:
+        """計測中のタスクがあれば、その完了を待って書き出すこと"""
+        files = profiler.start("yadon-1", mode="cprofile", seconds=60)
+        worker = threading.Thread(target=profiler.run_task, args=("yadon-1", _busy, {"seconds": 0.3}))
+        worker.start()
+        time.sleep(0.05)
+        profiler.stop("yadon-1")
+        assert not Path(files[0]).exists()
+
+        worker.join()
+        assert profiler.wait("yadon-1", timeout=5)
+        assert Path(files[0]).exists()
+
+
+class TestSampling:
+    def test_collapsed_stacks_for_agent_threads(self) -> None:
+        """エージェントのスレッドのスタックだけを collapsed 形式で書くこと"""
+        files = profiler.start("yadoran", mode="sample", seconds=0.3, interval=0.005)
+        target = threading.Thread(target=_busy, args=({"seconds": 0.25},), name="yadoran-conn")
+        other = threading.Thread(target=_busy, args=({"seconds": 0.25},), name="yadon-1-conn")
+        target.start()
+        other.start()
+        target.join()
+        other.join()
+
+        assert profiler.wait("yadoran", timeout=5)
+        lines = Path(files[0]).read_text(encoding="utf-8").splitlines()
+        assert lines
+        assert all(line.startswith("yadoran-conn;") for line in lines)
+        assert any("_busy" in line for line in lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+
+
+class TestValidation:
+    def test_invalid_requests(self) -> None:
+        """種類・期間の指定が不正なら ValueError"""
+        with pytest.raises(ValueError):
+            profiler.start("yadon-1", mode="perf", seconds=1)
+        with pytest.raises(ValueError):
+            profiler.start("yadon-1")
+        with pytest.raises(ValueError):
+            profiler.start("all", mode="cprofile", seconds=1)
+
+    def test_one_session_per_agent(self) -> None:
+        """同じエージェントを重ねてプロファイルできないこと"""
+        profiler.start("yadon-1", seconds=60)
+        with pytest.raises(ValueError):
+            profiler.start("yadon-1", seconds=60)
+
+    def test_control_handler(self) -> None:
+        """制御コマンドで開始・停止でき、未知のエージェントは拒否すること"""
+        handle = profiler.control_handler(["yadoran", "yadon-1"])
+        response = handle({"type": "profile", "agent": "yadon-1", "seconds": 60})
+        assert response["files"][0].endswith(".collapsed")
+        assert handle({"type": "profile", "agent": "yadon-1", "stop": True})["stopped"] is True
+        with pytest.raises(ValueError):
+            handle({"type": "profile", "agent": "yadon-9", "seconds": 1})
@@ -0,0 +1,217 @@
+"""infra/quota.py（プロセス間共有リクエスト枠）のテスト"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import yadon_agents
+from yadon_agents.config.agent import QuotaSettings, get_quota_settings
+from yadon_agents.infra.circuit_breaker import get_breaker
+from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.infra.quota import QuotaLedger
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fcntl が必要")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def ledger(tmp_path: Path, clock) -> QuotaLedger:
+    return QuotaLedger(tmp_path / "quota.json", clock=clock)
+
+
+SETTINGS = QuotaSettings(rate_per_minute=60, burst=2)
+
+
+class TestQuotaLedger:
+    def test_burst_then_wait(self, ledger):
+        """容量ぶん消費した後は補充までの秒数を返すこと"""
+        assert ledger.try_acquire("claude:worker", SETTINGS) == 0.0
+        assert ledger.try_acquire("claude:worker", SETTINGS) == 0.0
+        assert ledger.try_acquire("claude:worker", SETTINGS) == pytest.approx(1.0)
+
+    def test_refill(self, ledger, clock):
+        ledger.try_acquire("claude:worker", SETTINGS)
+        ledger.try_acquire("claude:worker", SETTINGS)
+        clock.now += 1.0
+
+        assert ledger.try_acquire("claude:worker", SETTINGS) == 0.0
+
+    def test_buckets_are_independent(self, ledger):
+        ledger.try_acquire("claude:worker", SETTINGS)
+        ledger.try_acquire("claude:worker", SETTINGS)
+
+        assert ledger.try_acquire("claude:manager", SETTINGS) == 0.0
+
+    def test_shared_between_instances(self, tmp_path, clock):
+        """同じファイルを使う別インスタンス（別プロセス相当）と残量を共有すること"""
+        a = QuotaLedger(tmp_path / "quota.json", clock=clock)
+        b = QuotaLedger(tmp_path / "quota.json", clock=clock)
+        a.try_acquire("gemini:worker", SETTINGS)
+        a.try_acquire("gemini:worker", SETTINGS)
+
+        assert b.try_acquire("gemini:worker", SETTINGS) > 0
+        assert b.snapshot()["gemini:worker"]["tokens"] == pytest.approx(0.0)
+
+    def test_unlimited_without_rate(self, ledger):
+        for _ in range(10):
+            assert ledger.try_acquire("claude:worker", QuotaSettings()) == 0.0
+        assert not ledger.path.exists()
+
+    def test_corrupt_file_is_reset(self, ledger):
+        ledger.path.write_text("{not json")
+        assert ledger.try_acquire("claude:worker", SETTINGS) == 0.0
+
+    def test_acquire_waits(self, ledger, clock):
+        """policy=wait では補充されるまで待つこと"""
+        ledger.try_acquire("claude:worker", SETTINGS)
+        ledger.try_acquire("claude:worker", SETTINGS)
+        slept = []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            clock.now += seconds
+
+        assert ledger.acquire("claude:worker", SETTINGS, timeout=10, sleep=sleep)
+        assert sum(slept) == pytest.approx(1.0)
+
+    def test_acquire_fail_policy(self, ledger):
+        settings = QuotaSettings(rate_per_minute=60, burst=1, policy="fail")
+        assert ledger.acquire("claude:worker", settings)
+        assert not ledger.acquire("claude:worker", settings)
+
+    def test_acquire_timeout(self, ledger):
+        settings = QuotaSettings(rate_per_minute=1, burst=1)
+        ledger.try_acquire("claude:worker", settings)
+
+        assert not ledger.acquire("claude:worker", settings, timeout=5, sleep=lambda s: None)
+
+    def test_concurrent_threads_do_not_overspend(self, tmp_path):
+        """ロックにより同時に消費しても容量を超えないこと"""
+        ledger = QuotaLedger(tmp_path / "quota.json")
+        settings = QuotaSettings(rate_per_minute=0.001, burst=5)
+        results = []
+
+        def worker():
+            results.append(ledger.try_acquire("claude:worker", settings) == 0.0)
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results.count(True) == 5
+
+    def test_shared_across_processes(self, tmp_path):
+        """別プロセスが消費した枠がこのプロセスから見えること"""
+        path = tmp_path / "quota.json"
+        src_dir = str(Path(yadon_agents.__file__).resolve().parents[1])
+        code = (
+            "import sys; from pathlib import Path;"
+            "from yadon_agents.config.agent import QuotaSettings;"
+            "from yadon_agents.infra.quota import QuotaLedger;"
+            "s = QuotaSettings(rate_per_minute=0.001, burst=3);"
+            "l = QuotaLedger(Path(sys.argv[1]));"
+            "[l.try_acquire('claude:worker', s) for _ in range(3)]"
+        )
+        subprocess.run([sys.executable, "-c", code, str(path)], check=True, env={"PYTHONPATH": src_dir})
+
+        settings = QuotaSettings(rate_per_minute=0.001, burst=3)
+        assert QuotaLedger(path).try_acquire("claude:worker", settings) > 0
+
+
+class TestQuotaSettings:
+    @pytest.fixture(autouse=True)
+    def _clear_env(self, monkeypatch):
+        import os
+        for key in list(os.environ):
+            if "QUOTA" in key:
+                monkeypatch.delenv(key)
+
+    def test_disabled_by_default(self):
+        assert get_quota_settings("claude", "worker").rate_per_minute is None
+
+    def test_lookup_order(self, monkeypatch):
+        monkeypatch.setenv("YADON_QUOTA_RPM", "100")
+        monkeypatch.setenv("YADON_CLAUDE_QUOTA_RPM", "50")
+        monkeypatch.setenv("YADON_CLAUDE_WORKER_QUOTA_RPM", "10")
+        monkeypatch.setenv("YADON_QUOTA_POLICY", "fail")
+
+        assert get_quota_settings("claude", "worker") == QuotaSettings(rate_per_minute=10, burst=10, policy="fail")
+        assert get_quota_settings("claude", "manager").rate_per_minute == 50
+        assert get_quota_settings("gemini", "worker").rate_per_minute == 100
+
+    def test_burst_and_invalid_policy(self, monkeypatch):
+        monkeypatch.setenv("YADON_CLAUDE_OPUS_QUOTA_RPM", "6")
+        monkeypatch.setenv("YADON_QUOTA_BURST", "2")
+        monkeypatch.setenv("YADON_QUOTA_POLICY", "explode")
+
+        settings = get_quota_settings("claude-opus", "coordinator")
+
+        assert settings.burst == 2
+        assert settings.policy == "wait"
+
+
+class TestRunnerIntegration:
+    def test_exhausted_quota_skips_spawn(self, monkeypatch, tmp_path):
+        """枠がなければプロセスを起動せず、ブレーカーにも記録しないこと"""
+        monkeypatch.setenv("LLM_BACKEND", "copilot")
+        monkeypatch.delenv("YADON_FAILOVER", raising=False)
+        monkeypatch.delenv("YADON_WORKER_FAILOVER", raising=False)
+        monkeypatch.setenv("YADON_QUOTA_FILE", str(tmp_path / "quota.json"))
+        monkeypatch.setenv("YADON_COPILOT_QUOTA_RPM", "1")
+        monkeypatch.setenv("YADON_QUOTA_BURST", "1")
+        monkeypatch.setenv("YADON_QUOTA_POLICY", "fail")
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+        monkeypatch.setattr("yadon_agents.infra.usage.log_dir", lambda: tmp_path)
+        ok = MagicMock(stdout="ok", stderr="", returncode=0, output_bytes=2, output_path=None, resources=None)
+        runner = SubprocessClaudeRunner()
+
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=ok) as mock_run:
+            first = runner.run_detailed("p", "worker")
+            second = runner.run_detailed("p", "worker")
+
+        assert first.returncode == 0
+        assert mock_run.call_count == 1
+        assert second.returncode == 1
+        assert "リクエスト枠" in second.output
+        assert get_breaker("copilot").snapshot()["recent_calls"] == 1
+
+    def test_quota_wait_counts_against_timeout(self, monkeypatch, tmp_path):
+        """リクエスト枠の待ち時間を実行のタイムアウトから差し引くこと"""
+        monkeypatch.setenv("LLM_BACKEND", "copilot")
+        monkeypatch.delenv("YADON_FAILOVER", raising=False)
+        monkeypatch.delenv("YADON_WORKER_FAILOVER", raising=False)
+        monkeypatch.setenv("YADON_QUOTA_FILE", str(tmp_path / "quota.json"))
+        monkeypatch.setenv("YADON_COPILOT_QUOTA_RPM", "120")
+        monkeypatch.setenv("YADON_QUOTA_BURST", "1")
+        monkeypatch.setenv("YADON_QUOTA_POLICY", "wait")
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+        monkeypatch.setattr("yadon_agents.infra.usage.log_dir", lambda: tmp_path)
+        ok = MagicMock(stdout="ok", stderr="", returncode=0, output_bytes=2, output_path=None, resources=None)
+        runner = SubprocessClaudeRunner()
+
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=ok) as mock_run:
+            runner.run_detailed("p", "worker", timeout=10)
+            second = runner.run_detailed("p", "worker", timeout=10)
+
+        assert second.queue_ms >= 300
+        assert mock_run.call_args[1]["timeout"] <= 10 - 0.3
@@ -0,0 +1,102 @@
+"""infra/readiness.py（起動完了通知）のテスト"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from yadon_agents.infra import readiness
+
+
+class _Agent:
+    def __init__(self, name: str):
+        self.name = name
+        self.started = threading.Event()
+        self.ready_at: float | None = None
+        self.startup_error: str | None = None
+
+    def ready(self, at: float) -> None:
+        self.ready_at = at
+        self.started.set()
+
+    def fail(self, error: str) -> None:
+        self.startup_error = error
+        self.started.set()
+
+
+class TestReadiness:
+    def test_ready_with_timings(self) -> None:
+        """全エージェントが起動したら ready と、開始からのエージェント別の秒数を返すこと"""
+        started = time.monotonic()
+        agents = [_Agent("yadoran"), _Agent("yadon-1")]
+        agents[0].ready(started + 0.25)
+        threading.Timer(0.05, agents[1].ready, args=(started + 0.5,)).start()
+        report = readiness.readiness(agents, started, timeout=5)
+        assert report["status"] == "ready"
+        assert report["agents"] == {"yadoran": 0.25, "yadon-1": 0.5}
+        assert report["errors"] == {}
+
+    def test_failed(self) -> None:
+        """起動に失敗したエージェントがあれば failed と理由を返すこと"""
+        agents = [_Agent("yadoran"), _Agent("yadon-1")]
+        agents[0].ready(time.monotonic())
+        agents[1].fail("Address already in use")
+        report = readiness.readiness(agents, time.monotonic(), timeout=5)
+        assert report["status"] == "failed"
+        assert report["errors"] == {"yadon-1": "Address already in use"}
+
+    def test_timeout(self) -> None:
+        """期限までに起動しなければ timeout"""
+        report = readiness.readiness([_Agent("yadon-1")], time.monotonic(), timeout=0.05)
+        assert report["status"] == "timeout"
+        assert "yadon-1" in report["errors"]
+
+
+class TestPipe:
+    def test_notify_and_wait(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """YADON_READY_FD のパイプに通知し、wait_ready が受け取ること"""
+        read_fd, write_fd = os.pipe()
+        monkeypatch.setenv(readiness.READY_FD_ENV, str(write_fd))
+        agent = _Agent("yadon-1")
+        thread = readiness.notify_when_ready([agent], time.monotonic(), timeout=5)
+        assert thread is not None
+        # 子プロセスへ引き継がないよう環境変数は消す
+        assert readiness.READY_FD_ENV not in os.environ
+        agent.ready(time.monotonic())
+        report = readiness.wait_ready(read_fd, timeout=5)
+        thread.join(timeout=5)
+        assert report is not None
+        assert report["status"] == "ready"
+        assert list(report["agents"]) == ["yadon-1"]
+
+    def test_without_fd(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """YADON_READY_FD がなければ通知しない"""
+        monkeypatch.delenv(readiness.READY_FD_ENV, raising=False)
+        assert readiness.notify_when_ready([_Agent("yadon-1")], time.monotonic()) is None
+
+    def test_eof_returns_none(self) -> None:
+        """通知せずに書き込み側が閉じられたら（デーモンの終了）、タイムアウトを待たずに None"""
+        read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+        begin = time.monotonic()
+        assert readiness.wait_ready(read_fd, timeout=10) is None
+        assert time.monotonic() - begin < 1
+
+    def test_timeout_returns_none(self) -> None:
+        read_fd, write_fd = os.pipe()
+        try:
+            assert readiness.wait_ready(read_fd, timeout=0.05) is None
+        finally:
+            os.close(write_fd)
+
+    def test_partial_writes(self) -> None:
+        """改行まで読み進めること"""
+        read_fd, write_fd = os.pipe()
+        line = json.dumps({"status": "ready", "elapsed": 1.0, "agents": {}, "errors": {}}) + "\n"
+        os.write(write_fd, line[:10].encode())
+        threading.Timer(0.05, lambda: (os.write(write_fd, line[10:].encode()), os.close(write_fd))).start()
+        assert readiness.wait_ready(read_fd, timeout=5)["status"] == "ready"
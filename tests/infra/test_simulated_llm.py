@@ -0,0 +1,256 @@
+"""infra/simulated_llm.py（疑似LLMバックエンド）のテスト"""
+
+from __future__ import annotations
+
+import io
+import json
+import random
+import threading
+from pathlib import Path
+
+import pytest
+
+import yadon_agents
+from yadon_agents.agent.manager import _extract_json
+from yadon_agents.config.agent import SimulationConfig, get_simulation_config
+from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.infra.simulated_llm import (
+    SimulatedLLMRunner,
+    format_claude_json,
+    main,
+    sample_latency,
+    simulate,
+)
+from yadon_agents.infra.usage import parse_structured_output
+
+DECOMPOSE_PROMPT = """以下のタスクを3フェーズ（implement → docs → review）に分解してください。
+```json
+{"phases": []}
+```
+- 各フェーズ内のサブタスクは最大3つまで（並列実行される）
+"""
+
+
+def _config(**overrides) -> SimulationConfig:
+    values = {"latency": "fixed:0", "failure_rate": 0.0, "output_bytes": 256, "seed": 0}
+    values.update(overrides)
+    return SimulationConfig(**values)
+
+
+class TestSimulationConfig:
+    """get_simulation_config() のテスト"""
+
+    def test_defaults(self, monkeypatch):
+        for key in ("YADON_SIM_LATENCY", "YADON_SIM_FAILURE_RATE", "YADON_SIM_OUTPUT_BYTES", "YADON_SIM_SEED"):
+            monkeypatch.delenv(key, raising=False)
+
+        config = get_simulation_config("worker")
+
+        assert config.failure_rate == 0.0
+        assert config.seed == 0
+        assert config.output_bytes > 0
+
+    def test_env_and_tier_override(self, monkeypatch):
+        """tier 別の遅延指定が優先され、失敗率は 0〜1 に丸められること"""
+        monkeypatch.setenv("YADON_SIM_LATENCY", "fixed:1")
+        monkeypatch.setenv("YADON_SIM_MANAGER_LATENCY", "exp:0.5")
+        monkeypatch.setenv("YADON_SIM_FAILURE_RATE", "1.5")
+        monkeypatch.setenv("YADON_SIM_SEED", "7")
+
+        assert get_simulation_config("worker").latency == "fixed:1"
+        assert get_simulation_config("manager").latency == "exp:0.5"
+        assert get_simulation_config("worker").failure_rate == 1.0
+        assert get_simulation_config("worker").seed == 7
+
+
+class TestSampleLatency:
+    """sample_latency() のテスト"""
+
+    @pytest.mark.parametrize("spec,low,high", [
+        ("fixed:0.25", 0.25, 0.25),
+        ("uniform:0.1,0.2", 0.1, 0.2),
+        ("lognormal:0.1,0.5", 0.0, 100.0),
+        ("exp:0.1", 0.0, 100.0),
+    ])
+    def test_distributions(self, spec, low, high):
+        value = sample_latency(spec, random.Random(1))
+        assert low <= value <= high
+
+    @pytest.mark.parametrize("spec", ["", "fixed", "uniform:1", "normal:1,2", "fixed:abc"])
+    def test_invalid_spec(self, spec):
+        with pytest.raises(ValueError):
+            sample_latency(spec, random.Random(1))
+
+
+class TestSimulate:
+    """simulate() のテスト"""
+
+    def test_deterministic(self):
+        """同じシード・プロンプトなら同じ応答になること"""
+        config = _config(latency="uniform:0,1")
+        assert simulate("x", "worker", config) == simulate("x", "worker", config)
+        assert simulate("x", "worker", config).latency != simulate("x", "worker", _config(latency="uniform:0,1", seed=1)).latency
+
+    def test_decompose_prompt_returns_phases(self):
+        """分解プロンプトには上限以内のサブタスクを持つ3フェーズJSONを返すこと"""
+        response = simulate(DECOMPOSE_PROMPT, "manager", _config())
+
+        data = _extract_json(response.text)
+        assert [p["name"] for p in data["phases"]] == ["implement", "docs", "review"]
+        assert 1 <= len(data["phases"][0]["subtasks"]) <= 3
+
+    def test_worker_output_size(self):
+        """ワーカー応答がおおよそ指定サイズになること"""
+        response = simulate("実装してください", "worker", _config(output_bytes=4096))
+
+        size = len(response.text.encode("utf-8"))
+        assert 4096 - 64 <= size <= 4096
+        assert response.text.startswith("[simulated] 完了")
+
+    def test_failure_rate(self):
+        response = simulate("x", "worker", _config(failure_rate=1.0))
+        assert response.returncode == 1
+
+    def test_claude_json_is_parseable(self):
+        """claude 形式のJSONとして使用量まで解析できること"""
+        response = simulate("x" * 400, "worker", _config())
+
+        text, usage = parse_structured_output("claude", format_claude_json(response))
+
+        assert text == response.text
+        assert usage.input_tokens == 100
+        assert usage.output_tokens == response.usage.output_tokens
+
+
+class TestSimulatedLLMRunner:
+    """SimulatedLLMRunner（プロセス内実行）のテスト"""
+
+    def test_run_detailed(self):
+        runner = SimulatedLLMRunner(_config())
+
+        result = runner.run_detailed("実装", "worker")
+
+        assert result.returncode == 0
+        assert result.backend == "simulated"
+        assert result.model == "sim-worker"
+        assert result.usage.input_tokens > 0
+
+    def test_run_json(self):
+        output, rc = SimulatedLLMRunner(_config()).run("実装", "worker", output_format="json")
+
+        assert rc == 0
+        assert json.loads(output)["type"] == "result"
+
+    def test_timeout(self):
+        result = SimulatedLLMRunner(_config(latency="fixed:5")).run_detailed("x", "worker", timeout=0.01)
+
+        assert result.returncode == 1
+        assert "タイムアウト" in result.output
+
+    def test_cancel_interrupts_wait(self):
+        """cancel() で待機中の呼び出しが即座に終わること"""
+        runner = SimulatedLLMRunner(_config(latency="fixed:30"))
+        results = []
+        t = threading.Thread(target=lambda: results.append(runner.run_detailed("x", "worker")))
+        t.start()
+        runner.cancel()
+        t.join(timeout=5)
+
+        assert not t.is_alive()
+        assert results[0].returncode == 1
+
+
+class TestMain:
+    """claude CLI 互換エントリーポイントのテスト"""
+
+    @pytest.fixture(autouse=True)
+    def _fast(self, monkeypatch):
+        monkeypatch.setenv("YADON_SIM_LATENCY", "fixed:0")
+        monkeypatch.delenv("YADON_SIM_FAILURE_RATE", raising=False)
+
+    def test_batch_stdin_json(self, monkeypatch, capsys):
+        monkeypatch.setattr("sys.stdin", io.StringIO(DECOMPOSE_PROMPT))
+
+        rc = main(["-p", "--model", "sim-manager", "--output-format", "json", "--dangerously-skip-permissions"])
+
+        assert rc == 0
+        data = json.loads(capsys.readouterr().out)
+        assert "phases" in _extract_json(data["result"])
+
+    def test_failure_goes_to_stderr(self, monkeypatch, capsys):
+        monkeypatch.setenv("YADON_SIM_FAILURE_RATE", "1")
+
+        rc = main(["--prompt", "x", "--model", "sim-worker"])
+
+        assert rc == 1
+        assert "疑似エラー" in capsys.readouterr().err
+
+    def test_invalid_latency(self, monkeypatch, capsys):
+        monkeypatch.setenv("YADON_SIM_LATENCY", "bogus")
+
+        assert main(["--prompt", "x"]) == 2
+
+
+class TestSimulatedStall:
+    """シミュレーションバックエンドのハング模擬"""
+
+    def test_stall_rate(self):
+        config = _config(stall_rate=1.0)
+
+        assert simulate("x", "worker", config).stalls
+
+    def test_no_stall_draw_when_disabled(self):
+        """stall_rate=0 なら乱数列を消費せず従来と同じ応答になること"""
+        config = _config(latency="uniform:0,1", seed=7)
+
+        assert simulate("x", "worker", config) == simulate("x", "worker", config)
+        assert not simulate("x", "worker", config).stalls
+
+    def test_in_process_runner_reports_stalled(self, monkeypatch):
+        monkeypatch.setenv("YADON_STALL_TIMEOUT", "0.05")
+        runner = SimulatedLLMRunner(_config(stall_rate=1.0))
+
+        result = runner.run_detailed("x", "worker", timeout=5)
+
+        assert result.stalled
+        assert result.returncode == 1
+        assert "停滞" in result.output
+
+    def test_stream_json_emits_result_line(self, monkeypatch, capsys):
+        monkeypatch.setenv("YADON_SIM_LATENCY", "fixed:0")
+        monkeypatch.delenv("YADON_SIM_FAILURE_RATE", raising=False)
+
+        rc = main(["--prompt", "x", "--model", "sim-worker", "--output-format", "stream-json"])
+
+        lines = capsys.readouterr().out.splitlines()
+        assert rc == 0
+        assert '"init"' in lines[0]
+        assert '"result"' in lines[-1]
+
+
+class TestSubprocessBackend:
+    """LLM_BACKEND=simulated で SubprocessClaudeRunner から起動できること"""
+
+    def test_end_to_end(self, monkeypatch, tmp_path: Path):
+        src_dir = str(Path(yadon_agents.__file__).resolve().parents[1])
+        monkeypatch.setenv("PYTHONPATH", src_dir)
+        monkeypatch.setenv("LLM_BACKEND", "simulated")
+        monkeypatch.setenv("YADON_SIM_LATENCY", "fixed:0")
+        monkeypatch.delenv("YADON_SIM_FAILURE_RATE", raising=False)
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+        monkeypatch.setattr("yadon_agents.infra.usage.log_dir", lambda: tmp_path)
+
+        result = SubprocessClaudeRunner().run_detailed(DECOMPOSE_PROMPT, "manager", cwd=str(tmp_path))
+
+        assert result.returncode == 0, result.output
+        assert result.backend == "simulated"
+        assert "phases" in _extract_json(result.output)
+        assert result.usage.input_tokens > 0
+        assert result.usage.unreported_calls == 0
+
+
+def test_interactive_command():
+    """対話モードの起動コマンドがモジュール実行であること"""
+    cmd = SimulatedLLMRunner().build_interactive_command("coordinator")
+
+    assert cmd[1:4] == ["-m", "yadon_agents.infra.simulated_llm", "--model"]
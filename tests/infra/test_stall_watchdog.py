@@ -0,0 +1,64 @@
+"""出力停滞の監視（ストールウォッチドッグ）のテスト"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+import yadon_agents
+from yadon_agents.infra.circuit_breaker import breaker_snapshot
+from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.infra.process import ProcessStalled, run_process
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="POSIX専用")
+
+
+@posix_only
+class TestRunProcessStall:
+    """run_process(stall_timeout=...) のテスト"""
+
+    def test_silent_process_is_stalled(self):
+        """出力が途絶えたプロセスは全体タイムアウトより前に停止されること"""
+        started = time.monotonic()
+        with pytest.raises(ProcessStalled) as exc_info:
+            run_process(["sh", "-c", "echo started; sleep 30"], timeout=30, stall_timeout=1)
+
+        assert time.monotonic() - started < 10
+        assert "started" in exc_info.value.output
+        assert exc_info.value.idle >= 1
+
+    def test_progressing_process_is_not_stalled(self):
+        """定期的に出力していれば停滞監視の秒数を超えても完了すること"""
+        script = "for i in 1 2 3; do echo $i; sleep 0.6; done"
+
+        result = run_process(["sh", "-c", script], timeout=30, stall_timeout=1)
+
+        assert result.returncode == 0
+        assert result.stdout.split() == ["1", "2", "3"]
+
+
+@posix_only
+class TestRunnerStall:
+    """SubprocessClaudeRunner の停滞検出"""
+
+    def test_stalled_backend(self, monkeypatch, tmp_path: Path):
+        """停滞した呼び出しは stalled として返り、ブレーカーにはタイムアウトとして記録されること"""
+        src_dir = str(Path(yadon_agents.__file__).resolve().parents[1])
+        monkeypatch.setenv("PYTHONPATH", src_dir)
+        monkeypatch.setenv("LLM_BACKEND", "simulated")
+        monkeypatch.setenv("YADON_SIM_LATENCY", "fixed:0")
+        monkeypatch.setenv("YADON_SIM_STALL_RATE", "1")
+        monkeypatch.setenv("YADON_STALL_TIMEOUT", "1")
+        monkeypatch.delenv("YADON_FAILOVER", raising=False)
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+        monkeypatch.setattr("yadon_agents.infra.usage.log_dir", lambda: tmp_path)
+
+        result = SubprocessClaudeRunner().run_detailed("実装", "worker", cwd=str(tmp_path), timeout=30)
+
+        assert result.stalled
+        assert result.returncode != 0
+        assert "停滞" in result.output
+        assert breaker_snapshot()["simulated"]["total_timeout"] == 1
@@ -0,0 +1,137 @@
+"""実行主体ごとの状態ディレクトリ分離のテスト"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.infra.process import ProcessResult
+from yadon_agents.infra.state_dir import isolated_env, prepare_state_dir, state_root
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="POSIX専用")
+
+
+@pytest.fixture
+def real_home(tmp_path: Path) -> Path:
+    home = tmp_path / "real-home"
+    (home / ".claude").mkdir(parents=True)
+    (home / ".claude" / ".credentials.json").write_text('{"token": "x"}')
+    (home / ".claude" / "projects").mkdir()
+    (home / ".claude.json").write_text('{"numStartups": 1}')
+    (home / ".gitconfig").write_text("[user]\n")
+    return home
+
+
+@pytest.fixture(autouse=True)
+def _state_dir(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("YADON_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.delenv("YADON_ISOLATE_SHARE", raising=False)
+
+
+def test_state_root_override(tmp_path: Path):
+    assert state_root() == tmp_path / "state"
+
+
+def test_state_root_default_per_user(monkeypatch):
+    monkeypatch.delenv("YADON_STATE_DIR")
+
+    assert state_root().name.startswith("yadon-state-")
+
+
+@posix_only
+class TestPrepareStateDir:
+    def test_credentials_linked_and_state_copied(self, real_home: Path):
+        """認証情報はリンクで共有し、状態ファイルはコピーし、セッション履歴は共有しないこと"""
+        root = prepare_state_dir("worker-1", real_home=real_home)
+        home = root / "home"
+
+        creds = home / ".claude" / ".credentials.json"
+        assert creds.is_symlink()
+        assert creds.resolve() == (real_home / ".claude" / ".credentials.json").resolve()
+        assert (home / ".gitconfig").is_symlink()
+        assert not (home / ".claude.json").is_symlink()
+        assert (home / ".claude.json").read_text() == '{"numStartups": 1}'
+        assert not (home / ".claude" / "projects").exists()
+        assert (root / "tmp").is_dir()
+        assert (root / "cache").is_dir()
+
+    def test_missing_sources_skipped(self, real_home: Path):
+        root = prepare_state_dir("worker-1", real_home=real_home)
+
+        assert not os.path.lexists(root / "home" / ".gemini" / "oauth_creds.json")
+
+    def test_idempotent_keeps_worker_state(self, real_home: Path):
+        """再準備してもワーカー側で更新された状態ファイルを上書きしないこと"""
+        root = prepare_state_dir("worker-1", real_home=real_home)
+        (root / "home" / ".claude.json").write_text('{"numStartups": 9}')
+
+        prepare_state_dir("worker-1", real_home=real_home)
+
+        assert (root / "home" / ".claude.json").read_text() == '{"numStartups": 9}'
+
+    def test_workers_are_separate(self, real_home: Path):
+        a = prepare_state_dir("worker-1", real_home=real_home)
+        b = prepare_state_dir("worker-2", real_home=real_home)
+
+        assert a != b
+        (a / "tmp" / "lock").write_text("1")
+        assert not (b / "tmp" / "lock").exists()
+
+    def test_extra_share_paths(self, monkeypatch, real_home: Path):
+        (real_home / ".config" / "tool").mkdir(parents=True)
+        monkeypatch.setenv("YADON_ISOLATE_SHARE", ".config/tool")
+
+        root = prepare_state_dir("worker-1", real_home=real_home)
+
+        assert (root / "home" / ".config" / "tool").is_symlink()
+
+
+@posix_only
+def test_isolated_env(monkeypatch, real_home: Path, tmp_path: Path):
+    monkeypatch.setenv("HOME", str(real_home))
+
+    env = isolated_env("worker-3")
+
+    root = tmp_path / "state" / "worker-3"
+    assert env["HOME"] == str(root / "home")
+    assert env["TMPDIR"] == str(root / "tmp")
+    assert env["XDG_CACHE_HOME"] == str(root / "cache")
+    assert env["PATH"] == os.environ["PATH"]
+
+
+class TestRunnerIsolation:
+    """SubprocessClaudeRunner からの環境変数の受け渡し"""
+
+    def _run(self, runner: SubprocessClaudeRunner, tier: str = "worker") -> dict:
+        with patch(
+            "yadon_agents.infra.claude_runner.run_process",
+            return_value=ProcessResult(stdout="ok", stderr="", returncode=0),
+        ) as mock_run:
+            runner.run(prompt="test", model_tier=tier, output_format="text")
+        return mock_run.call_args[1]
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("YADON_ISOLATE_STATE", raising=False)
+
+        assert self._run(SubprocessClaudeRunner(worker_number=1))["env"] is None
+
+    @posix_only
+    def test_worker_gets_own_home(self, monkeypatch, real_home: Path, tmp_path: Path):
+        monkeypatch.setenv("YADON_ISOLATE_STATE", "1")
+        monkeypatch.setenv("HOME", str(real_home))
+
+        worker_env = self._run(SubprocessClaudeRunner(worker_number=2))["env"]
+        manager_env = self._run(SubprocessClaudeRunner(), tier="manager")["env"]
+
+        assert worker_env["HOME"] == str(tmp_path / "state" / "worker-2" / "home")
+        assert manager_env["HOME"] == str(tmp_path / "state" / "manager" / "home")
+
+    def test_prepare_failure_falls_back(self, monkeypatch):
+        monkeypatch.setenv("YADON_ISOLATE_STATE", "1")
+
+        with patch("yadon_agents.infra.claude_runner.isolated_env", side_effect=OSError("read-only")):
+            assert self._run(SubprocessClaudeRunner(worker_number=1))["env"] is None
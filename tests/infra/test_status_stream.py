@@ -0,0 +1,65 @@
+"""infra/status_stream.py のテスト"""
+
+from __future__ import annotations
+
+import os
+import socket
+from typing import Any
+
+import pytest
+
+from yadon_agents.infra import metrics
+from yadon_agents.infra.status_stream import StatusStreamServer, snapshot, subscribe
+
+
+class _Agent:
+    def __init__(self, name: str, state: str = "idle"):
+        self.name = name
+        self.state = state
+
+    def activity(self) -> dict[str, Any]:
+        return {"name": self.name, "state": self.state, "current_task": None}
+
+
+class TestSnapshot:
+    def test_includes_agents_and_counters(self) -> None:
+        """エージェントの状態とカウンターのラベル別の値を含むこと"""
+        metrics.SUBTASKS.inc(worker="yadon-9", status="success")
+        data = snapshot([_Agent("yadoran", "busy"), _Agent("yadon-9")])
+
+        assert [a["name"] for a in data["agents"]] == ["yadoran", "yadon-9"]
+        assert data["agents"][0]["state"] == "busy"
+        assert data["subtasks"]["yadon-9/success"] >= 1
+        assert "tasks" in data and "concurrency" in data and "breakers" in data
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unixソケットが必要")
+class TestStatusStreamServer:
+    def test_subscribe_streams_snapshots(self, sock_dir: str) -> None:
+        """1回の接続で複数のスナップショットが届き、停止でソケットが消えること"""
+        path = os.path.join(sock_dir, "status.sock")
+        counter = iter(range(100))
+        server = StatusStreamServer(path, lambda: {"seq": next(counter)})
+        server.start()
+        try:
+            received = []
+            for item in subscribe(path, interval=0.1):
+                received.append(item["seq"])
+                if len(received) == 3:
+                    break
+        finally:
+            server.stop()
+
+        assert received == [0, 1, 2]
+        assert not os.path.exists(path)
+
+    def test_stream_ends_when_server_stops(self, sock_dir: str) -> None:
+        """サーバーが止まると購読も終わること"""
+        path = os.path.join(sock_dir, "status.sock")
+        server = StatusStreamServer(path, lambda: {"ok": True})
+        server.start()
+        stream = subscribe(path, interval=0.1)
+        assert next(stream) == {"ok": True}
+        server.stop()
+
+        assert len(list(stream)) <= 2
@@ -0,0 +1,126 @@
+"""タスクトレース（infra/tracing.py）のテスト"""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from yadon_agents.infra import tracing
+
+
+@pytest.fixture(autouse=True)
+def trace_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(tracing, "_trace_dir", lambda: tmp_path)
+    monkeypatch.delenv("YADON_TRACE", raising=False)
+    return tmp_path
+
+
+def _records(trace_id: str) -> dict[str, dict]:
+    lines = tracing.trace_path(trace_id).read_text(encoding="utf-8").splitlines()
+    return {r["name"]: r for r in map(json.loads, lines)}
+
+
+def test_span_without_trace_is_noop(trace_dir: Path) -> None:
+    """トレース文脈がなければ何も記録しないこと"""
+    with tracing.span("orphan") as attrs:
+        attrs["x"] = 1
+    assert tracing.context() is None
+    assert list(trace_dir.iterdir()) == []
+
+
+def test_nested_spans_and_annotations() -> None:
+    """入れ子のスパンが親子関係と属性付きで記録されること"""
+    @tracing.traced("inner")
+    def inner() -> int:
+        tracing.annotate(phase="implement")
+        return 42
+
+    with tracing.start_trace("t-1"):
+        with tracing.span("outer", task="t-1"):
+            assert inner() == 42
+
+    records = _records("t-1")
+    assert records["outer"]["parent_id"] is None
+    assert records["inner"]["parent_id"] == records["outer"]["span_id"]
+    assert records["inner"]["attrs"] == {"phase": "implement"}
+    assert records["outer"]["attrs"] == {"task": "t-1"}
+    assert records["outer"]["duration"] >= records["inner"]["duration"]
+
+
+def test_error_is_recorded() -> None:
+    """例外で抜けたスパンにはエラーが記録されること"""
+    with tracing.start_trace("t-err"):
+        with pytest.raises(ValueError):
+            with tracing.span("boom"):
+                raise ValueError("失敗")
+    assert _records("t-err")["boom"]["attrs"]["error"] == "ValueError: 失敗"
+
+
+def test_context_propagates_to_thread_pool_and_messages() -> None:
+    """wrap() でスレッドプールに、context()/use_context() でメッセージ越しに文脈を引き継ぐこと"""
+    def remote(ctx: dict[str, str] | None) -> None:
+        with tracing.use_context(ctx):
+            with tracing.span("remote"):
+                pass
+
+    def job() -> None:
+        with tracing.span("job"):
+            remote(tracing.context())
+
+    with tracing.start_trace("t-2"):
+        with tracing.span("root"):
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pool.submit(tracing.wrap(job)).result()
+
+    records = _records("t-2")
+    assert records["job"]["parent_id"] == records["root"]["span_id"]
+    assert records["remote"]["parent_id"] == records["job"]["span_id"]
+    assert records["job"]["tid"] != records["root"]["tid"]
+
+
+def test_disabled(trace_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """YADON_TRACE=0 なら記録しないこと"""
+    monkeypatch.setenv("YADON_TRACE", "0")
+    with tracing.start_trace("t-off"):
+        with tracing.span("x"):
+            assert tracing.context() is None
+    assert list(trace_dir.iterdir()) == []
+    assert tracing.export("t-off") is None
+
+
+def test_export_chrome_trace() -> None:
+    """Chrome trace-event 形式（完了イベントとスレッド名）で書き出すこと"""
+    with tracing.start_trace("t-3"):
+        with tracing.span("manager.handle_task"):
+            with tracing.span("llm.run", tier="worker"):
+                pass
+
+    path = tracing.export("t-3")
+
+    assert path is not None and path.name == "t-3.trace.json"
+    data = json.loads(path.read_text())
+    complete = [e for e in data["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in complete] == ["manager.handle_task", "llm.run"]
+    assert complete[1]["cat"] == "llm"
+    assert complete[1]["args"]["tier"] == "worker"
+    assert complete[0]["ts"] <= complete[1]["ts"]
+    assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in data["traceEvents"])
+
+
+@pytest.mark.parametrize("trace_id", ["../../x", "/etc/passwd", "..", "a/../../b"])
+def test_trace_path_stays_in_trace_dir(trace_dir: Path, trace_id: str) -> None:
+    """ソケットから届いたタスク ID にパス区切りや .. があってもトレースディレクトリの外に書かないこと"""
+    path = tracing.trace_path(trace_id)
+    assert path.parent == trace_dir
+    assert "/" not in path.name
+
+    with tracing.start_trace(trace_id):
+        with tracing.span("manager.handle_task"):
+            pass
+    exported = tracing.export(trace_id)
+
+    assert exported is not None and exported.parent == trace_dir
+    assert {p.parent for p in trace_dir.rglob("*")} == {trace_dir}
@@ -0,0 +1,209 @@
+"""infra/usage.py（使用量解析・台帳）のテスト"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from yadon_agents.domain.run_result import LLMUsage
+from yadon_agents.infra.claude_runner import SubprocessClaudeRunner
+from yadon_agents.infra.usage import StructuredOutputDecoder, append_usage_record, parse_structured_output
+
+CLAUDE_JSON = json.dumps({
+    "type": "result",
+    "subtype": "success",
+    "is_error": False,
+    "duration_ms": 5400,
+    "duration_api_ms": 5100,
+    "result": "実装しました",
+    "total_cost_usd": 0.0123,
+    "usage": {
+        "input_tokens": 120,
+        "cache_creation_input_tokens": 300,
+        "cache_read_input_tokens": 4000,
+        "output_tokens": 80,
+    },
+})
+
+GEMINI_JSON = json.dumps({
+    "response": "done",
+    "stats": {
+        "models": {
+            "gemini-3.0-flash": {
+                "api": {"totalRequests": 2, "totalErrors": 0, "totalLatencyMs": 900},
+                "tokens": {"prompt": 1000, "candidates": 50, "total": 1060, "cached": 400, "thoughts": 10},
+            },
+        },
+    },
+}, indent=2)
+
+
+class TestParseStructuredOutput:
+    """parse_structured_output() のテスト"""
+
+    def test_claude(self):
+        """claude の result オブジェクトから本文と使用量を取り出すこと"""
+        text, usage = parse_structured_output("claude", CLAUDE_JSON)
+
+        assert text == "実装しました"
+        assert usage.input_tokens == 120
+        assert usage.output_tokens == 80
+        assert usage.cache_read_tokens == 4000
+        assert usage.cache_creation_tokens == 300
+        assert usage.cost_usd == pytest.approx(0.0123)
+        assert usage.api_duration_ms == 5100
+
+    def test_claude_with_leading_noise(self):
+        """JSONの前に警告行があっても最終行を解析できること"""
+        parsed = parse_structured_output("claude", "warning: something\n" + CLAUDE_JSON)
+
+        assert parsed is not None
+        assert parsed[0] == "実装しました"
+
+    def test_gemini(self):
+        """gemini の stats からトークン数を集計すること"""
+        text, usage = parse_structured_output("gemini", GEMINI_JSON)
+
+        assert text == "done"
+        assert usage.input_tokens == 600
+        assert usage.cache_read_tokens == 400
+        assert usage.output_tokens == 60
+        assert usage.api_duration_ms == 900
+        assert usage.calls == 1
+
+    def test_truncated_output_returns_none(self):
+        """切り詰められたJSONは None になること"""
+        assert parse_structured_output("claude", CLAUDE_JSON[:40] + "\n... [省略] ...\n" + CLAUDE_JSON[-20:]) is None
+
+    def test_unknown_format_returns_none(self):
+        """未対応の形式は None になること"""
+        assert parse_structured_output("copilot", CLAUDE_JSON) is None
+
+    def test_plain_text_returns_none(self):
+        """JSONでない出力は None になること"""
+        assert parse_structured_output("claude", "just text") is None
+
+
+class TestStructuredOutputDecoder:
+    """StructuredOutputDecoder のテスト"""
+
+    def test_stream_events_split_across_chunks(self):
+        """行が chunk をまたいでも、結果イベントの本文と使用量だけを取り出すこと"""
+        raw = ('{"type": "system", "subtype": "init"}\n'
+               '{"type": "assistant", "message": {"content": []}}\n' + CLAUDE_JSON + "\n").encode("utf-8")
+        decoder = StructuredOutputDecoder("claude", stream=True)
+        out = b"".join(decoder.feed(raw[i:i + 7]) for i in range(0, len(raw), 7)) + decoder.flush()
+
+        assert out.decode("utf-8") == "実装しました"
+        assert decoder.usage.input_tokens == 120
+
+    def test_stream_passes_non_json_lines(self):
+        """JSON でない行（エラーメッセージ等）はそのまま通すこと"""
+        decoder = StructuredOutputDecoder("claude", stream=True)
+        out = decoder.feed(b"Error: not logged in\n") + decoder.flush()
+
+        assert out == b"Error: not logged in\n"
+        assert decoder.usage is None
+
+    def test_document(self):
+        """1つの JSON 文書は EOF で解析すること"""
+        decoder = StructuredOutputDecoder("gemini", stream=False)
+        raw = GEMINI_JSON.encode("utf-8")
+
+        assert decoder.feed(raw[:50]) == b""
+        assert decoder.feed(raw[50:]) + decoder.flush() == b"done"
+        assert decoder.usage.output_tokens == 60
+
+    def test_document_unparsable_returned_raw(self):
+        decoder = StructuredOutputDecoder("gemini", stream=False)
+        decoder.feed(b"quota exceeded")
+
+        assert decoder.flush() == b"quota exceeded"
+
+
+    def test_large_document_passes_through(self):
+        """max_pending を超える文書は溜めずにそのまま通し、使用量は不明とすること"""
+        decoder = StructuredOutputDecoder("gemini", stream=False, max_pending=1024)
+        raw = json.dumps({"response": "x" * 100_000, "stats": {}}).encode("utf-8")
+        chunks = [raw[i:i + 4096] for i in range(0, len(raw), 4096)]
+
+        first = decoder.feed(chunks[0])
+        assert first == chunks[0]
+        assert len(decoder._pending) == 0
+        out = first + b"".join(decoder.feed(c) for c in chunks[1:]) + decoder.flush()
+
+        assert out == raw
+        assert decoder.usage is None
+
+
+class TestUsageLedger:
+    """append_usage_record() のテスト"""
+
+    def test_appends_jsonl(self, tmp_path: Path):
+        """1呼び出し1行で追記されること"""
+        with patch("yadon_agents.infra.usage.log_dir", return_value=tmp_path):
+            append_usage_record({"run_id": "a", "input_tokens": 1})
+            append_usage_record({"run_id": "b", "input_tokens": 2})
+
+        lines = (tmp_path / "usage_ledger.jsonl").read_text(encoding="utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [r["run_id"] for r in records] == ["a", "b"]
+        assert "ts" in records[0]
+
+    def test_unserializable_record_ignored(self, tmp_path: Path):
+        """書き込めないレコードでも例外を送出しないこと"""
+        with patch("yadon_agents.infra.usage.log_dir", return_value=tmp_path):
+            append_usage_record({"bad": object()})
+
+        assert not (tmp_path / "usage_ledger.jsonl").exists() or \
+            (tmp_path / "usage_ledger.jsonl").read_text() == ""
+
+
+class TestRunnerUsage:
+    """SubprocessClaudeRunner の使用量付与と台帳記録"""
+
+    def test_run_detailed_attaches_usage_and_records(self, monkeypatch, tmp_path: Path):
+        """解析した使用量が結果に付与され、台帳に記録されること"""
+        monkeypatch.setenv("LLM_BACKEND", "claude")
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+        runner = SubprocessClaudeRunner(worker_number=2)
+        def run(cmd, **kwargs):
+            decoder = kwargs["stdout_decoder"]
+            text = decoder.feed(CLAUDE_JSON.encode("utf-8") + b"\n") + decoder.flush()
+            return MagicMock(stdout=text.decode("utf-8"), stderr="", returncode=0, output_bytes=len(text),
+                             output_path=None, resources=None)
+
+        with patch("yadon_agents.infra.claude_runner.run_process", side_effect=run), \
+                patch("yadon_agents.infra.usage.log_dir", return_value=tmp_path):
+            result = runner.run_detailed(prompt="p", model_tier="worker", run_id="task-1-sub1")
+
+        assert result.output == "実装しました"
+        assert result.backend == "claude"
+        assert result.model == "haiku"
+        assert result.usage.input_tokens == 120
+        assert result.usage.duration_ms >= 0
+
+        record = json.loads((tmp_path / "usage_ledger.jsonl").read_text(encoding="utf-8"))
+        assert record["run_id"] == "task-1-sub1"
+        assert record["tier"] == "worker"
+        assert record["worker"] == 2
+        assert record["backend"] == "claude"
+        assert record["output_tokens"] == 80
+        assert record["reported"] is True
+
+    def test_unreported_backend(self, monkeypatch, tmp_path: Path):
+        """構造化出力非対応のバックエンドでは所要時間のみ記録されること"""
+        monkeypatch.setenv("LLM_BACKEND", "opencode")
+        monkeypatch.setattr("yadon_agents.infra.claude_runner.log_dir", lambda: tmp_path)
+        runner = SubprocessClaudeRunner()
+        mock_result = MagicMock(stdout="text", stderr="", returncode=0, output_bytes=4, output_path=None, resources=None)
+
+        with patch("yadon_agents.infra.claude_runner.run_process", return_value=mock_result), \
+                patch("yadon_agents.infra.usage.log_dir", return_value=tmp_path):
+            result = runner.run_detailed(prompt="p", model_tier="worker")
+
+        assert result.output == "text"
+        assert result.usage == LLMUsage(duration_ms=result.usage.duration_ms, unreported_calls=1)
@@ -0,0 +1,131 @@
+"""git worktree によるワーカー分離のテスト"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from yadon_agents.infra.worktree import WorktreePool, apply_patch, is_git_repo, snapshot
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git が必要")
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=repo, check=True, capture_output=True, text=True,
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q")
+    (path / "a.txt").write_text("one\ntwo\nthree\n")
+    (path / "pkg").mkdir()
+    (path / "pkg" / "mod.py").write_text("x = 1\n")
+    (path / ".gitignore").write_text("build/\n")
+    _git(path, "add", "-A")
+    _git(path, "commit", "-q", "-m", "init")
+    return path
+
+
+def test_is_git_repo(repo: Path, tmp_path: Path):
+    assert is_git_repo(repo)
+    assert not is_git_repo(tmp_path)
+
+
+class TestSnapshot:
+    def test_includes_untracked_and_keeps_index(self, repo: Path):
+        """未追跡・変更済みファイルを含み、HEAD とインデックスは変えないこと"""
+        (repo / "a.txt").write_text("changed\n")
+        (repo / "new.txt").write_text("new\n")
+        (repo / "build").mkdir()
+        (repo / "build" / "out.o").write_text("ignored\n")
+        head = _git(repo, "rev-parse", "HEAD")
+
+        commit = snapshot(repo)
+
+        files = _git(repo, "ls-tree", "-r", "--name-only", commit).split()
+        assert "new.txt" in files
+        assert "build/out.o" not in files
+        assert _git(repo, "show", f"{commit}:a.txt") == "changed\n"
+        assert _git(repo, "rev-parse", "HEAD") == head
+        assert "new.txt" in _git(repo, "status", "--porcelain")
+        assert _git(repo, "diff", "--cached", "--name-only") == ""
+
+
+class TestWorktreePool:
+    def test_checkout_and_reuse(self, repo: Path):
+        """worktree が作られ、再利用時は変更が破棄されること"""
+        pool = WorktreePool(repo)
+        base = pool.snapshot()
+
+        tree = pool.checkout("yadon-1", base)
+        (tree / "a.txt").write_text("dirty\n")
+        (tree / "tmp.txt").write_text("x\n")
+        again = pool.checkout("yadon-1", base)
+
+        assert again == tree
+        assert (tree / "a.txt").read_text() == "one\ntwo\nthree\n"
+        assert not (tree / "tmp.txt").exists()
+        assert ".git" in tree.parts
+
+    def test_worktree_sees_uncommitted_changes(self, repo: Path):
+        (repo / "wip.txt").write_text("wip\n")
+        pool = WorktreePool(repo)
+
+        tree = pool.checkout("yadon-1", pool.snapshot())
+
+        assert (tree / "wip.txt").read_text() == "wip\n"
+
+    def test_merge_disjoint_changes(self, repo: Path):
+        pool = WorktreePool(repo)
+        base = pool.snapshot()
+        t1 = pool.checkout("yadon-1", base)
+        t2 = pool.checkout("yadon-2", base)
+        (t1 / "a.txt").write_text("ONE\ntwo\nthree\n")
+        (t2 / "pkg" / "mod.py").write_text("x = 2\n")
+        (t2 / "added.bin").write_bytes(b"\x00\x01\x02")
+
+        assert pool.merge(t1, base)
+        assert pool.merge(t2, base)
+
+        assert (repo / "a.txt").read_text() == "ONE\ntwo\nthree\n"
+        assert (repo / "pkg" / "mod.py").read_text() == "x = 2\n"
+        assert (repo / "added.bin").read_bytes() == b"\x00\x01\x02"
+
+    def test_conflict_leaves_tree_untouched(self, repo: Path):
+        pool = WorktreePool(repo)
+        base = pool.snapshot()
+        t1 = pool.checkout("yadon-1", base)
+        t2 = pool.checkout("yadon-2", base)
+        (t1 / "a.txt").write_text("one\nTWO\nthree\n")
+        (t2 / "a.txt").write_text("one\nzwei\nthree\n")
+        (t2 / "other.txt").write_text("x\n")
+
+        assert pool.merge(t1, base)
+        assert not pool.merge(t2, base)
+
+        assert (repo / "a.txt").read_text() == "one\nTWO\nthree\n"
+        assert not (repo / "other.txt").exists()
+
+    def test_subdirectory_project(self, repo: Path):
+        """project_dir がサブディレクトリでも対応するディレクトリで作業できること"""
+        pool = WorktreePool(repo / "pkg")
+        base = pool.snapshot()
+        tree = pool.checkout("yadon-1", base)
+        workdir = pool.workdir(tree)
+        (workdir / "mod.py").write_text("x = 3\n")
+
+        assert workdir.name == "pkg"
+        assert pool.merge(tree, base)
+        assert (repo / "pkg" / "mod.py").read_text() == "x = 3\n"
+
+
+def test_apply_empty_patch(repo: Path):
+    assert apply_patch(repo, "")
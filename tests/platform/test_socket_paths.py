@@ -80,6 +80,21 @@ class TestSocketDirectory:
             pytest.skip("Linux only")
         assert SOCKET_DIR == "/tmp"
 
+    def test_socket_dir_from_env(self, monkeypatch):
+        """YADON_SOCKET_DIR でソケットのディレクトリを変更できること"""
+        import importlib
+
+        from yadon_agents.infra import socket_paths
+
+        monkeypatch.setenv("YADON_SOCKET_DIR", "/run/yadon/")
+        try:
+            reloaded = importlib.reload(socket_paths)
+            assert reloaded.SOCKET_DIR == "/run/yadon"
+            assert reloaded.agent_socket_path("yadoran") == "/run/yadon/yadon-agent-yadoran.sock"
+        finally:
+            monkeypatch.delenv("YADON_SOCKET_DIR")
+            importlib.reload(socket_paths)
+
 
 class TestSocketPathFormat:
     """ソケットパスフォーマットのテスト"""
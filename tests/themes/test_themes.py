@@ -80,6 +80,15 @@ class TestThemeLoading:
         with pytest.raises(ModuleNotFoundError):
             get_theme()
 
+    def test_theme_identity_matches_theme(self) -> None:
+        """theme_identity() は ThemeConfig を組み立てずに get_theme() と同じ値を返すことを確認"""
+        from yadon_agents import themes
+
+        assert themes.theme_identity() == ("yadon", "yadoran")
+        assert themes._cached_theme is None
+        theme = themes.get_theme()
+        assert themes.theme_identity() == (theme.socket_prefix, theme.agent_role_manager)
+
 
 class TestThemeConfigValues:
     """ThemeConfig の値検証テスト"""